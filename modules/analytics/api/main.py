@@ -24,7 +24,8 @@ from modules.analytics.api.routes import (
     sessions,
     users,
 )
-from modules.analytics.storage.cache import CacheConfig, init_cache
+from modules.analytics.core.tracker import HIGH_THROUGHPUT_BATCH_SIZE, get_tracker, init_tracker
+from modules.analytics.storage.cache import CacheConfig, get_cache, init_cache
 from modules.analytics.storage.database import DatabaseConfig, init_database
 
 logger = logging.getLogger(__name__)
@@ -46,6 +47,9 @@ async def lifespan(app: FastAPI):
     cache_config = CacheConfig(host="localhost")
     cache = init_cache(cache_config)
 
+    # Initialize shared event tracker
+    tracker = init_tracker(db, high_throughput=True, batch_size=HIGH_THROUGHPUT_BATCH_SIZE)
+
     # Health checks
     if not db.health_check():
         logger.error("Database health check failed")
@@ -58,6 +62,7 @@ async def lifespan(app: FastAPI):
 
     # Shutdown
     logger.info("Shutting down analytics API...")
+    tracker.stop(flush_remaining=True)
     db.dispose()
     cache.close()
     logger.info("Analytics API shutdown complete")
@@ -108,6 +113,18 @@ def create_app() -> FastAPI:
         """Health check endpoint."""
         return {"status": "healthy", "service": "analytics"}
 
+    # Cache counters for TTL tuning
+    @app.get("/health/cache")
+    async def cache_stats():
+        """Cache hit/miss counters per key prefix."""
+        return {"stats": get_cache().get_stats()}
+
+    # Ingestion counters for the event tracker
+    @app.get("/health/tracker")
+    async def tracker_stats():
+        """Event buffer depth, flush latency and drop counters."""
+        return {"stats": get_tracker().get_stats()}
+
     # Root endpoint
     @app.get("/")
     async def root():
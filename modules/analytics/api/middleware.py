@@ -6,14 +6,14 @@ Middleware for request tracking and rate limiting.
 
 import logging
 import time
-from typing import Callable
+from typing import Callable, Dict, List, Optional
 
 from fastapi import Request, Response
 from starlette.middleware.base import BaseHTTPMiddleware
 
-from modules.analytics.core.tracker import EventTracker
+from modules.analytics.api.rate_limit import RateLimiter, RateLimitRule
+from modules.analytics.core.tracker import get_tracker
 from modules.analytics.storage.cache import get_cache
-from modules.analytics.storage.database import get_database
 from shared.constants import DEFAULT_RATE_LIMIT_PER_MINUTE
 
 logger = logging.getLogger(__name__)
@@ -33,12 +33,8 @@ class AnalyticsMiddleware(BaseHTTPMiddleware):
         try:
             duration = time.time() - start_time
 
-            # Get tracker
-            db = get_database()
-            tracker = EventTracker(db, auto_start=False)
-
-            # Track API request event
-            tracker.track(
+            # Buffered; flushed in bulk by the shared tracker's workers
+            get_tracker().track(
                 name="api_request",
                 event_type="api_request",
                 properties={
@@ -51,9 +47,6 @@ class AnalyticsMiddleware(BaseHTTPMiddleware):
                 ip_address=request.client.host if request.client else None,
             )
 
-            # Flush immediately for API tracking
-            tracker.flush()
-
         except Exception as e:
             logger.error(f"Error tracking request: {e}")
 
@@ -66,31 +59,48 @@ class AnalyticsMiddleware(BaseHTTPMiddleware):
 class RateLimitMiddleware(BaseHTTPMiddleware):
     """Middleware for rate limiting."""
 
-    def __init__(self, app, rate_limit: int = DEFAULT_RATE_LIMIT_PER_MINUTE):
-        """Initialize rate limit middleware."""
+    def __init__(
+        self,
+        app,
+        rate_limit: int = DEFAULT_RATE_LIMIT_PER_MINUTE,
+        rules: Optional[List[RateLimitRule]] = None,
+        api_key_limits: Optional[Dict[str, int]] = None,
+    ):
+        """
+        Initialize rate limit middleware.
+
+        Args:
+            app: ASGI application
+            rate_limit: Global requests per minute per client
+            rules: Per-route rules checked after the global rule
+            api_key_limits: Per-API-key overrides of rule limits
+        """
         super().__init__(app)
         self.rate_limit = rate_limit
+        self.rules = [RateLimitRule("global", rate_limit)] + list(rules or [])
+        self.api_key_limits = api_key_limits
+        self._limiter: Optional[RateLimiter] = None
+
+    def get_limiter(self) -> RateLimiter:
+        """Get the limiter, created once the cache is initialized."""
+        if self._limiter is None:
+            self._limiter = RateLimiter(get_cache(), self.rules, self.api_key_limits)
+        return self._limiter
 
     async def dispatch(self, request: Request, call_next: Callable) -> Response:
         """Process request with rate limiting."""
-        # Get client identifier
-        client_id = request.client.host if request.client else "unknown"
-
-        # Check rate limit
         try:
-            cache = get_cache()
-            key = f"rate_limit:{client_id}"
-
-            # Increment request count
-            count = cache.increment(key, 1, ttl=60)
+            decision = await self.get_limiter().check(request)
 
-            # Check if over limit
-            if count > self.rate_limit:
-                logger.warning(f"Rate limit exceeded for {client_id}")
+            if not decision.allowed:
+                logger.warning(
+                    f"Rate limit {decision.rule.name} exceeded for "
+                    f"{RateLimiter.client_identity(request)[0]}"
+                )
                 return Response(
                     content="Rate limit exceeded",
                     status_code=429,
-                    headers={"Retry-After": "60"}
+                    headers={"Retry-After": str(decision.retry_after)},
                 )
 
         except Exception as e:
@@ -0,0 +1,353 @@
+"""
+Rate Limiting
+
+Sliding-window rate limiter with local token budgets.
+
+Each API node leases batches of tokens from a shared Redis sliding-window
+counter and spends them locally, so most requests are decided without a
+network round trip. Redis is only consulted, asynchronously, when a local
+budget runs low.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from modules.analytics.storage.cache import LocalLRUCache, RedisCache
+from shared.constants import DEFAULT_RATE_LIMIT_PER_MINUTE
+
+logger = logging.getLogger(__name__)
+
+# Share of a limit leased to one node per Redis round trip
+DEFAULT_LEASE_FRACTION = 0.1
+
+# Refill in the background once a budget drops to this share of its lease
+REFILL_WATERMARK = 0.25
+
+# Seconds a denied client is rejected locally before Redis is asked again
+DENIAL_RECHECK_SECONDS = 1.0
+
+# Seconds a request waits for an in-flight refill before failing open
+REFILL_WAIT_TIMEOUT = 0.5
+
+# Local budgets kept per node (least recently used are evicted)
+MAX_LOCAL_BUDGETS = 100_000
+
+# Atomic sliding-window counter. Two fixed-window counters are blended by
+# how much of the previous window still overlaps the sliding window. Up to
+# ARGV[3] tokens are granted, never pushing the blended count past the
+# limit. Keys share KEYS[1]'s hash tag so the script is cluster-safe.
+_RESERVE_SCRIPT = """
+local limit = tonumber(ARGV[1])
+local window = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local current = math.floor(now / window)
+local elapsed = now - current * window
+local current_key = KEYS[1] .. ':' .. current
+local previous_key = KEYS[1] .. ':' .. (current - 1)
+local used_current = tonumber(redis.call('GET', current_key) or '0')
+local used_previous = tonumber(redis.call('GET', previous_key) or '0')
+local used = used_previous * (window - elapsed) / window + used_current
+local grant = math.min(requested, math.floor(limit - used))
+if grant > 0 then
+    redis.call('INCRBY', current_key, grant)
+    redis.call('PEXPIRE', current_key, window * 2)
+    return {grant, 0}
+end
+local retry = window - elapsed
+if used_previous > 0 and used_current + 1 <= limit then
+    local drain = math.ceil((used - limit + 1) * window / used_previous)
+    if drain < retry then
+        retry = drain
+    end
+end
+return {0, retry}
+"""
+
+
+class RateLimitRule:
+    """A request limit over a sliding window."""
+
+    def __init__(
+        self,
+        name: str,
+        limit: int,
+        window: int = 60,
+        path_prefix: Optional[str] = None,
+        methods: Optional[Sequence[str]] = None,
+    ):
+        """
+        Initialize rule.
+
+        Args:
+            name: Rule name (part of the Redis key)
+            limit: Requests allowed per window
+            window: Window length in seconds
+            path_prefix: Only apply to paths with this prefix (None = all)
+            methods: Only apply to these HTTP methods (None = all)
+        """
+        if limit < 1 or window < 1:
+            raise ValueError("Rate limit and window must be positive")
+
+        self.name = name
+        self.limit = limit
+        self.window = window
+        self.path_prefix = path_prefix
+        self.methods = {method.upper() for method in methods} if methods else None
+
+    def matches(self, path: str, method: str) -> bool:
+        """Check whether the rule applies to a request."""
+        if self.path_prefix and not path.startswith(self.path_prefix):
+            return False
+        if self.methods and method.upper() not in self.methods:
+            return False
+        return True
+
+
+class RateLimitDecision:
+    """Outcome of a rate limit check."""
+
+    __slots__ = ("allowed", "rule", "retry_after")
+
+    def __init__(self, allowed: bool, rule: Optional[RateLimitRule] = None, retry_after: int = 0):
+        self.allowed = allowed
+        self.rule = rule
+        self.retry_after = retry_after
+
+
+class _Budget:
+    """Tokens leased from Redis for one rule and client."""
+
+    __slots__ = ("tokens", "expires_at", "denied_until", "retry_after", "refill")
+
+    def __init__(self):
+        self.tokens = 0
+        self.expires_at = 0.0
+        self.denied_until = 0.0
+        self.retry_after = 0
+        self.refill: Optional[asyncio.Task] = None
+
+
+class RateLimiter:
+    """
+    Sliding-window rate limiter with batched Redis synchronization.
+
+    Each (rule, client) pair has a local budget of tokens leased from Redis.
+    Requests spend tokens without any I/O; when a budget falls below the
+    refill watermark a lease for more tokens is requested in the background
+    through an atomic Lua script. Only a request that finds its budget
+    empty waits, asynchronously, for that lease.
+
+    Leased tokens count against the shared limit as soon as they are
+    granted, so a cluster never admits more than the limit in a window;
+    unused tokens of an expired lease are simply forfeited.
+
+    Clients are identified by API key (``X-API-Key``) when present,
+    otherwise by IP address. Redis failures fail open, matching the
+    previous middleware behaviour.
+    """
+
+    def __init__(
+        self,
+        cache: RedisCache,
+        rules: Optional[List[RateLimitRule]] = None,
+        api_key_limits: Optional[Dict[str, int]] = None,
+        lease_fraction: float = DEFAULT_LEASE_FRACTION,
+        key_prefix: str = "nexus:analytics:rate_limit",
+    ):
+        """
+        Initialize rate limiter.
+
+        Args:
+            cache: Cache whose async Redis client stores the shared counters
+            rules: Rules checked in order; every matching rule must allow
+                the request (defaults to one global per-minute rule)
+            api_key_limits: Per-API-key overrides of rule limits
+            lease_fraction: Share of a limit leased per Redis round trip
+            key_prefix: Redis key prefix
+        """
+        self.cache = cache
+        self.rules = rules or [RateLimitRule("global", DEFAULT_RATE_LIMIT_PER_MINUTE)]
+        self.api_key_limits = api_key_limits or {}
+        self.lease_fraction = lease_fraction
+        self.key_prefix = key_prefix
+
+        max_window = max(rule.window for rule in self.rules)
+        self._budgets = LocalLRUCache(MAX_LOCAL_BUDGETS, max_window * 2)
+        self._script = None
+
+        # Counters
+        self._allowed = 0
+        self._denied = 0
+        self._redis_calls = 0
+        self._redis_errors = 0
+
+    @staticmethod
+    def client_identity(request: Any) -> Tuple[str, Optional[str]]:
+        """
+        Identify the client of a request.
+
+        Args:
+            request: Starlette request
+
+        Returns:
+            Tuple of (identity, API key or None)
+        """
+        api_key = request.headers.get("x-api-key")
+        if api_key:
+            digest = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+            return f"key:{digest}", api_key
+
+        host = request.client.host if request.client else "unknown"
+        return f"ip:{host}", None
+
+    async def check(self, request: Any) -> RateLimitDecision:
+        """
+        Check a request against every matching rule.
+
+        Args:
+            request: Starlette request
+
+        Returns:
+            Decision; denied decisions carry the rule and Retry-After seconds
+        """
+        identity, api_key = self.client_identity(request)
+        path = request.url.path
+        method = request.method
+
+        for rule in self.rules:
+            if not rule.matches(path, method):
+                continue
+
+            limit = self.api_key_limits.get(api_key, rule.limit) if api_key else rule.limit
+            allowed, retry_after = await self.acquire(rule, identity, limit)
+            if not allowed:
+                self._denied += 1
+                return RateLimitDecision(False, rule, retry_after)
+
+        self._allowed += 1
+        return RateLimitDecision(True)
+
+    async def acquire(self, rule: RateLimitRule, identity: str, limit: int) -> Tuple[bool, int]:
+        """
+        Spend one token from a local budget.
+
+        Args:
+            rule: Rule being enforced
+            identity: Client identity
+            limit: Effective limit for this client
+
+        Returns:
+            Tuple of (allowed, Retry-After seconds when denied)
+        """
+        budget_key = f"{rule.name}:{identity}"
+        found, budget = self._budgets.get(budget_key)
+        if not found:
+            budget = _Budget()
+            self._budgets.set(budget_key, budget)
+
+        now = time.monotonic()
+        if budget.expires_at <= now:
+            budget.tokens = 0
+
+        if budget.tokens <= 0:
+            if budget.denied_until > now:
+                return False, budget.retry_after
+
+            refill = self._start_refill(budget, budget_key, rule, limit)
+            try:
+                await asyncio.wait_for(asyncio.shield(refill), REFILL_WAIT_TIMEOUT)
+            except asyncio.TimeoutError:
+                logger.warning(f"Rate limit refill timed out for {budget_key}")
+                return True, 0
+
+            if budget.tokens <= 0:
+                return False, budget.retry_after
+
+        budget.tokens -= 1
+
+        if budget.tokens <= self._lease_size(limit) * REFILL_WATERMARK:
+            self._start_refill(budget, budget_key, rule, limit)
+
+        return True, 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter counters.
+
+        Returns:
+            Dictionary with allowed/denied requests, Redis calls and errors
+            and the number of local budgets
+        """
+        return {
+            "allowed": self._allowed,
+            "denied": self._denied,
+            "redis_calls": self._redis_calls,
+            "redis_errors": self._redis_errors,
+            "budgets": len(self._budgets),
+        }
+
+    def _lease_size(self, limit: int) -> int:
+        """Tokens requested per Redis round trip."""
+        return max(1, int(limit * self.lease_fraction))
+
+    def _start_refill(
+        self, budget: _Budget, budget_key: str, rule: RateLimitRule, limit: int
+    ) -> asyncio.Task:
+        """Start a background lease request unless one is in flight."""
+        if budget.refill is None or budget.refill.done():
+            budget.refill = asyncio.ensure_future(self._refill(budget, budget_key, rule, limit))
+        return budget.refill
+
+    async def _refill(
+        self, budget: _Budget, budget_key: str, rule: RateLimitRule, limit: int
+    ) -> None:
+        """Lease tokens from Redis into a local budget."""
+        lease = self._lease_size(limit)
+        granted, retry_after_ms = await self._reserve(budget_key, limit, rule.window, lease)
+        now = time.monotonic()
+
+        if granted > 0:
+            if budget.expires_at <= now:
+                budget.tokens = 0
+            budget.tokens += granted
+            budget.expires_at = now + rule.window
+            budget.denied_until = 0.0
+        elif budget.tokens <= 0:
+            budget.retry_after = max(1, math.ceil(retry_after_ms / 1000))
+            budget.denied_until = now + min(DENIAL_RECHECK_SECONDS, budget.retry_after)
+
+    async def _reserve(self, budget_key: str, limit: int, window: int, amount: int) -> Tuple[int, int]:
+        """
+        Atomically reserve tokens in the shared sliding window.
+
+        Args:
+            budget_key: Rule and client key
+            limit: Requests allowed per window
+            window: Window length in seconds
+            amount: Tokens requested
+
+        Returns:
+            Tuple of (tokens granted, milliseconds until a retry may succeed)
+        """
+        self._redis_calls += 1
+        try:
+            if self._script is None:
+                self._script = self.cache.get_async_client().register_script(_RESERVE_SCRIPT)
+
+            granted, retry_after_ms = await self._script(
+                keys=[f"{self.key_prefix}:{{{budget_key}}}"],
+                args=[limit, window * 1000, amount],
+            )
+            return int(granted), int(retry_after_ms)
+
+        except Exception as e:
+            # Fail open: admit a lease's worth of requests without Redis
+            self._redis_errors += 1
+            logger.error(f"Rate limit reservation error for {budget_key}: {e}", exc_info=True)
+            return amount, 0
@@ -8,6 +8,7 @@ from sqlalchemy.orm import Session
 from modules.analytics.api.dependencies import get_db_session
 from modules.analytics.models.cohort import CohortCreate, CohortQuery
 from modules.analytics.processing.cohort import CohortEngine
+from modules.analytics.storage.cache import get_cache
 from modules.analytics.storage.database import get_database
 from modules.analytics.storage.repositories import CohortRepository
 
@@ -40,8 +41,34 @@ def analyze_cohort(query: CohortQuery):
     from datetime import timedelta
 
     cohort_date = query.start_date or (get_utc_now() - timedelta(days=30))
-    analysis = engine.analyze_retention_cohort(cohort_date, periods=query.periods)
+    analysis = engine.analyze_retention_cohort(
+        cohort_date, periods=query.periods, period_type=query.period_type
+    )
 
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis failed")
     return analysis
+
+
+@router.post("/retention-matrix")
+def retention_matrix(query: CohortQuery):
+    """Build the cohort x period retention matrix."""
+    database = get_database()
+
+    try:
+        cache = get_cache()
+    except RuntimeError:
+        cache = None
+
+    engine = CohortEngine(database, cache=cache)
+
+    from shared.utils import get_utc_now
+
+    end_date = query.end_date or get_utc_now()
+    matrix = engine.analyze_retention_matrix(
+        query.start_date, end_date, periods=query.periods, period_type=query.period_type
+    )
+
+    if not matrix:
+        raise HTTPException(status_code=404, detail="Analysis failed")
+    return matrix
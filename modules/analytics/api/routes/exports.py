@@ -2,11 +2,12 @@
 Exports API Routes
 """
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
 
 from modules.analytics.api.dependencies import get_db_session
 from modules.analytics.export.exporters import DataExporter
+from modules.analytics.processing.tasks import export_job_task
 from modules.analytics.storage.repositories import ExportJobRepository
 from shared.constants import ExportFormat
 
@@ -22,7 +23,7 @@ def create_export(export_data: dict, db: Session = Depends(get_db_session)):
     job = export_job_repo.create(db, **export_data)
     db.commit()
 
-    # TODO: Trigger async export task
+    export_job_task.delay(job.id)
     return {"job_id": job.id, "status": "pending"}
 
 
@@ -7,7 +7,7 @@ from sqlalchemy.orm import Session
 
 from modules.analytics.api.dependencies import get_db_session
 from modules.analytics.models.funnel import FunnelCreate, FunnelQuery
-from modules.analytics.processing.funnel import FunnelEngine
+from modules.analytics.processing.funnel import FunnelEngine, IncrementalFunnelEngine
 from modules.analytics.storage.database import get_database
 from modules.analytics.storage.repositories import FunnelRepository
 
@@ -50,15 +50,29 @@ def get_funnel(funnel_id: str, db: Session = Depends(get_db_session)):
 def analyze_funnel(funnel_id: str, query: FunnelQuery, db: Session = Depends(get_db_session)):
     """Analyze funnel conversion."""
     database = get_database()
-    engine = FunnelEngine(database)
 
     from shared.utils import get_utc_now
     from datetime import timedelta
 
     end_date = query.end_date or get_utc_now()
-    start_date = query.start_date or (end_date - timedelta(days=30))
 
-    analysis = engine.analyze_funnel(funnel_id, start_date, end_date)
+    if query.incremental:
+        engine = IncrementalFunnelEngine(database)
+        conversion_window = (
+            timedelta(seconds=query.conversion_window_seconds)
+            if query.conversion_window_seconds
+            else None
+        )
+        # Without a start date the engine keeps the previous run's start,
+        # so the window stays anchored and the run stays incremental
+        analysis = engine.analyze_funnel(
+            funnel_id, query.start_date, end_date, conversion_window=conversion_window
+        )
+    else:
+        start_date = query.start_date or (end_date - timedelta(days=30))
+        engine = FunnelEngine(database)
+        analysis = engine.analyze_funnel(funnel_id, start_date, end_date)
+
     if not analysis:
         raise HTTPException(status_code=404, detail="Analysis failed")
     return analysis
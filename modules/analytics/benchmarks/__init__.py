@@ -0,0 +1,6 @@
+"""
+Analytics Benchmarks
+
+Standalone throughput benchmarks for analytics processing paths.
+Run a benchmark with ``python -m modules.analytics.benchmarks.<name>``.
+"""
@@ -0,0 +1,151 @@
+"""
+Event Processor Benchmark
+
+Compares events/sec of the per-event and set-based batch paths of
+EventProcessor against a file-backed SQLite database.
+
+Usage:
+    python -m modules.analytics.benchmarks.bench_processor --sizes 10000 100000
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from modules.analytics.core.processor import EventProcessor
+from modules.analytics.storage.database import Database, DatabaseConfig
+from modules.analytics.storage.models import EventORM, GoalORM, SessionORM, UserORM
+from shared.utils import generate_uuid, get_utc_now
+
+EVENT_TYPES = ["page_view", "click", "form_submit", "purchase", "search_query"]
+
+
+def _seed(db: Database, num_events: int, num_users: int, num_sessions: int) -> None:
+    """Populate the database with users, sessions, goals and unprocessed events."""
+    rng = random.Random(42)
+    start = get_utc_now() - timedelta(days=1)
+    user_ids = [generate_uuid() for _ in range(num_users)]
+    sessions = [(generate_uuid(), rng.choice(user_ids)) for _ in range(num_sessions)]
+
+    with db.session() as session:
+        # Leave a share of users to be created by the processor
+        session.bulk_insert_mappings(
+            UserORM,
+            [
+                {"id": user_id, "first_seen_at": start, "last_seen_at": start}
+                for user_id in user_ids[: num_users // 2]
+            ],
+        )
+        session.bulk_insert_mappings(
+            SessionORM,
+            [
+                {
+                    "id": session_id,
+                    "user_id": user_id,
+                    "started_at": start,
+                    "last_activity_at": start,
+                    "page_views": 0,
+                    "events_count": 0,
+                }
+                for session_id, user_id in sessions
+            ],
+        )
+        session.bulk_insert_mappings(
+            GoalORM,
+            [
+                {"id": generate_uuid(), "name": "Purchase", "event_type": "purchase", "value": 50.0},
+                {
+                    "id": generate_uuid(),
+                    "name": "Signup form",
+                    "event_type": "form_submit",
+                    "conditions": {"form": "signup"},
+                },
+            ],
+        )
+
+        events = []
+        for i in range(num_events):
+            session_id, user_id = rng.choice(sessions)
+            events.append(
+                {
+                    "id": generate_uuid(),
+                    "name": "event",
+                    "event_type": rng.choice(EVENT_TYPES),
+                    "properties": {"form": rng.choice(["signup", "contact"])},
+                    "user_id": user_id,
+                    "session_id": session_id,
+                    "timestamp": start + timedelta(milliseconds=i),
+                    "processed": False,
+                }
+            )
+        session.bulk_insert_mappings(EventORM, events)
+
+
+def _run(process: Callable[[int], int], batch_size: int) -> int:
+    """Drain the unprocessed queue and return the number of events processed."""
+    total = 0
+    while True:
+        count = process(batch_size)
+        if count == 0:
+            return total
+        total += count
+
+
+def benchmark(num_events: int, batch_size: int) -> Dict[str, float]:
+    """
+    Benchmark both processing paths for one dataset size.
+
+    Args:
+        num_events: Number of events to seed
+        batch_size: Events per processing batch
+
+    Returns:
+        Events/sec for each path
+    """
+    results = {}
+
+    for mode in ("per_event", "batch"):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            db = Database(DatabaseConfig(f"sqlite:///{path}"))
+            db.create_tables()
+            _seed(db, num_events, num_users=max(num_events // 20, 1), num_sessions=max(num_events // 10, 1))
+
+            processor = EventProcessor(db)
+            process = processor.process_events if mode == "per_event" else processor.process_events_batch
+
+            started = time.perf_counter()
+            processed = _run(process, batch_size)
+            elapsed = time.perf_counter() - started
+
+            results[mode] = processed / elapsed if elapsed else 0.0
+            db.dispose()
+        finally:
+            os.remove(path)
+
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="EventProcessor throughput benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--batch-size", type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    print(f"{'events':>10} {'per_event ev/s':>16} {'batch ev/s':>12} {'speedup':>8}")
+    for size in args.sizes:
+        results = benchmark(size, args.batch_size)
+        speedup = results["batch"] / results["per_event"] if results["per_event"] else 0.0
+        print(
+            f"{size:>10} {results['per_event']:>16.0f} {results['batch']:>12.0f} {speedup:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""
+Rate Limiter Benchmark
+
+Measures per-request rate limiting overhead at a fixed open-loop request
+rate: the previous approach (a synchronous Redis INCR inside the async
+dispatch) against RateLimiter's local token budgets. Latency includes the
+time a request waits for the event loop, so blocking calls show up as
+queueing delay.
+
+Without --redis-url, Redis is simulated in process with --rtt-ms of
+latency per round trip.
+
+Usage:
+    python -m modules.analytics.benchmarks.bench_rate_limit --rps 5000 --seconds 5
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from types import SimpleNamespace
+from typing import Dict, List, Optional
+
+from modules.analytics.api.rate_limit import RateLimiter, RateLimitRule
+
+
+class _SimulatedScript:
+    """In-process fixed-window reservation with simulated round-trip time."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.used: Dict[str, int] = {}
+
+    async def __call__(self, keys, args):
+        await asyncio.sleep(self.rtt)
+        limit, _, requested = args
+        granted = max(0, min(requested, limit - self.used.get(keys[0], 0)))
+        self.used[keys[0]] = self.used.get(keys[0], 0) + granted
+        return [granted, 0 if granted else 1000]
+
+
+class _SimulatedCache:
+    """Cache stand-in whose Redis calls cost one simulated round trip."""
+
+    def __init__(self, rtt: float):
+        self.rtt = rtt
+        self.counts: Dict[str, int] = {}
+        self._script = _SimulatedScript(rtt)
+
+    def increment(self, key: str, amount: int = 1, ttl: Optional[int] = None) -> int:
+        # The previous middleware's blocking INCR (plus TTL check)
+        time.sleep(self.rtt * 2)
+        self.counts[key] = self.counts.get(key, 0) + amount
+        return self.counts[key]
+
+    def get_async_client(self):
+        return SimpleNamespace(register_script=lambda source: self._script)
+
+
+def _request(i: int, clients: int) -> SimpleNamespace:
+    """Build a request from one of the simulated clients."""
+    return SimpleNamespace(
+        headers={},
+        client=SimpleNamespace(host=f"10.0.{(i % clients) // 256}.{i % 256}"),
+        url=SimpleNamespace(path="/api/v1/events"),
+        method="POST",
+    )
+
+
+async def _drive(check, rps: int, seconds: float, clients: int) -> Dict[str, float]:
+    """Issue checks at a fixed rate and collect latencies in microseconds."""
+    latencies: List[float] = []
+    interval = 1.0 / rps
+    total = int(rps * seconds)
+    tasks = []
+
+    async def one(i: int, scheduled: float) -> None:
+        await check(_request(i, clients))
+        latencies.append((time.perf_counter() - scheduled) * 1e6)
+
+    started = time.perf_counter()
+    for i in range(total):
+        scheduled = started + i * interval
+        delay = scheduled - time.perf_counter()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        tasks.append(asyncio.ensure_future(one(i, scheduled)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50_us": statistics.median(latencies),
+        "p99_us": latencies[int(len(latencies) * 0.99) - 1],
+        "max_us": latencies[-1],
+    }
+
+
+def benchmark(
+    rps: int, seconds: float, clients: int, rtt_ms: float, redis_url: Optional[str] = None
+) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark both limiter implementations.
+
+    Args:
+        rps: Target requests per second
+        seconds: Duration per implementation
+        clients: Distinct client IPs
+        rtt_ms: Simulated Redis round trip in milliseconds
+        redis_url: Use a real Redis instead of the simulation
+
+    Returns:
+        Achieved rate and latency percentiles per implementation
+    """
+    if redis_url:
+        from modules.analytics.storage.cache import CacheConfig, RedisCache
+
+        url = redis_url.replace("redis://", "").split("/")[0]
+        host, _, port = url.partition(":")
+        cache = RedisCache(CacheConfig(host=host, port=int(port or 6379)), key_prefix="bench")
+    else:
+        cache = _SimulatedCache(rtt_ms / 1000)
+
+    limit = rps * 60
+
+    async def legacy(request) -> bool:
+        return cache.increment(f"rate_limit:{request.client.host}", 1, ttl=60) <= limit
+
+    async def run_limiter() -> Dict[str, float]:
+        limiter = RateLimiter(cache, [RateLimitRule("bench", limit)])
+        return await _drive(limiter.check, rps, seconds, clients)
+
+    results = {
+        "legacy_sync_incr": asyncio.run(_drive(legacy, rps, seconds, clients)),
+        "token_budget": asyncio.run(run_limiter()),
+    }
+
+    if redis_url:
+        cache.close()
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Rate limiting middleware overhead benchmark")
+    parser.add_argument("--rps", type=int, default=5000)
+    parser.add_argument("--seconds", type=float, default=5.0)
+    parser.add_argument("--clients", type=int, default=500)
+    parser.add_argument("--rtt-ms", type=float, default=0.2)
+    parser.add_argument("--redis-url", default=None)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.rps, args.seconds, args.clients, args.rtt_ms, args.redis_url)
+
+    print(f"{'limiter':>18} {'achieved rps':>13} {'p50 us':>10} {'p99 us':>10} {'max us':>10}")
+    for name, result in results.items():
+        print(
+            f"{name:>18} {result['rps']:>13.0f} {result['p50_us']:>10.0f} "
+            f"{result['p99_us']:>10.0f} {result['max_us']:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
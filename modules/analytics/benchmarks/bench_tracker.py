@@ -0,0 +1,122 @@
+"""
+Event Tracker Benchmark
+
+Compares the default EventTracker against high-throughput mode: producer
+throughput (track() calls/sec) and end-to-end ingestion (events/sec
+persisted) against a file-backed SQLite database. PostgreSQL runs use
+COPY and are considerably faster on the flush side.
+
+Usage:
+    python -m modules.analytics.benchmarks.bench_tracker --events 100000 --producers 4
+"""
+
+import argparse
+import os
+import tempfile
+import threading
+import time
+from typing import Dict, List
+
+from modules.analytics.core.tracker import HIGH_THROUGHPUT_BATCH_SIZE, EventTracker
+from modules.analytics.storage.database import Database, DatabaseConfig
+
+EVENT_TYPES = ["page_view", "button_click", "form_submit", "purchase", "search_query"]
+
+
+def _produce(tracker: EventTracker, count: int, offset: int) -> None:
+    """Track count events from one producer thread."""
+    for i in range(count):
+        tracker.track(
+            name="event",
+            event_type=EVENT_TYPES[i % len(EVENT_TYPES)],
+            properties={"index": offset + i},
+            user_id=f"user_{(offset + i) % 1000}",
+            session_id=f"session_{(offset + i) % 5000}",
+        )
+
+
+def benchmark(num_events: int, producers: int, flush_workers: int) -> Dict[str, Dict[str, float]]:
+    """
+    Benchmark both tracker modes for one event count.
+
+    Args:
+        num_events: Total events tracked
+        producers: Concurrent producer threads
+        flush_workers: Flush workers in high-throughput mode
+
+    Returns:
+        Producer and end-to-end events/sec per mode, plus tracker stats
+    """
+    results = {}
+    per_producer = num_events // producers
+
+    for mode in ("default", "high_throughput"):
+        fd, path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        try:
+            db = Database(DatabaseConfig(f"sqlite:///{path}"))
+            db.create_tables()
+
+            if mode == "default":
+                tracker = EventTracker(db, batch_size=1000, flush_interval=1)
+            else:
+                tracker = EventTracker(
+                    db,
+                    batch_size=HIGH_THROUGHPUT_BATCH_SIZE,
+                    flush_interval=1,
+                    high_throughput=True,
+                    buffer_size=max(num_events, 1),
+                    flush_workers=flush_workers,
+                )
+
+            threads = [
+                threading.Thread(target=_produce, args=(tracker, per_producer, i * per_producer))
+                for i in range(producers)
+            ]
+
+            started = time.perf_counter()
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            produced = time.perf_counter() - started
+
+            # Drain whatever the background workers have not written yet
+            while tracker.get_queue_size():
+                tracker.flush()
+            tracker.stop()
+            total = time.perf_counter() - started
+
+            tracked = per_producer * producers
+            results[mode] = {
+                "track_per_sec": tracked / produced if produced else 0.0,
+                "ingest_per_sec": tracked / total if total else 0.0,
+                "stats": tracker.get_stats(),
+            }
+            db.dispose()
+        finally:
+            os.remove(path)
+
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="EventTracker ingestion benchmark")
+    parser.add_argument("--events", type=int, nargs="+", default=[50_000, 200_000])
+    parser.add_argument("--producers", type=int, default=4)
+    parser.add_argument("--flush-workers", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    print(f"{'events':>10} {'mode':>16} {'track ev/s':>12} {'ingest ev/s':>12} {'avg flush ms':>13}")
+    for size in args.events:
+        results = benchmark(size, args.producers, args.flush_workers)
+        for mode, result in results.items():
+            print(
+                f"{size:>10} {mode:>16} {result['track_per_sec']:>12.0f} "
+                f"{result['ingest_per_sec']:>12.0f} {result['stats']['avg_flush_ms']:>13.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -8,17 +8,120 @@ import logging
 from datetime import datetime, timedelta
 from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
-from modules.analytics.storage.database import Database
+from modules.analytics.core.hll import HyperLogLog
+from modules.analytics.storage.database import Database, as_naive_utc
 from modules.analytics.storage.models import EventORM, MetricORM, SessionORM
-from modules.analytics.storage.repositories import MetricRepository
+from modules.analytics.storage.repositories import MetricRepository, RollupRepository
 from shared.constants import AggregationPeriod, MetricType
 from shared.utils import generate_uuid, get_utc_now, safe_divide
 
 logger = logging.getLogger(__name__)
 
+# Grains materialized in the rollup tables, finest last
+ROLLUP_GRAINS = (AggregationPeriod.DAY, AggregationPeriod.HOUR)
+
+# Event dimensions rolled up alongside the per-event-type totals
+ROLLUP_DIMENSIONS = ("country", "device_type", "browser", "os", "module")
+
+# Checkpoint name for the event rollups
+ROLLUP_CHECKPOINT = "events"
+
+# Watermark of a new checkpoint, before any event was created
+ROLLUP_EPOCH = datetime.min
+
+# Events younger than this are left for the next run so that slow
+# transactions committing older created_at values are not skipped
+ROLLUP_SETTLE_SECONDS = 60
+
+# Rows streamed per fetch when scanning events for rollups
+ROLLUP_SCAN_CHUNK_SIZE = 10_000
+
+# Pending rollup keys held in memory before merging into the tables
+ROLLUP_FLUSH_KEYS = 5_000
+
+_GRAIN_DELTAS = {
+    AggregationPeriod.HOUR: timedelta(hours=1),
+    AggregationPeriod.DAY: timedelta(days=1),
+}
+
+
+def _truncate_timestamp(ts: datetime, period: AggregationPeriod) -> datetime:
+    """
+    Truncate a timestamp to the start of its period (like date_trunc).
+
+    Args:
+        ts: Timestamp
+        period: Aggregation period
+
+    Returns:
+        Period start
+    """
+    if period == AggregationPeriod.MINUTE:
+        return ts.replace(second=0, microsecond=0)
+    if period == AggregationPeriod.HOUR:
+        return ts.replace(minute=0, second=0, microsecond=0)
+
+    day = ts.replace(hour=0, minute=0, second=0, microsecond=0)
+    if period == AggregationPeriod.DAY:
+        return day
+    if period == AggregationPeriod.WEEK:
+        return day - timedelta(days=day.weekday())
+    if period == AggregationPeriod.MONTH:
+        return day.replace(day=1)
+    if period == AggregationPeriod.QUARTER:
+        return day.replace(month=3 * ((day.month - 1) // 3) + 1, day=1)
+    return day.replace(month=1, day=1)
+
+
+def _plan_rollup_segments(
+    start_date: datetime,
+    end_date: datetime,
+    grains: List[AggregationPeriod],
+) -> Tuple[List[tuple], List[tuple]]:
+    """
+    Split [start_date, end_date] into rollup-backed and raw segments.
+
+    Whole buckets of the coarsest grain are taken first, the ragged edges
+    are refined with finer grains, and whatever is left (partial buckets)
+    is read from raw events.
+
+    Args:
+        start_date: Range start (inclusive)
+        end_date: Range end (inclusive)
+        grains: Rollup grains to use, coarsest first
+
+    Returns:
+        Tuple of (grain, start, end) rollup segments and
+        (start, end, end_inclusive) raw segments
+    """
+    rollup_segments = []
+    raw_segments = [(start_date, end_date, True)]
+
+    for grain in grains:
+        remaining = []
+        for seg_start, seg_end, inclusive in raw_segments:
+            full_start = _truncate_timestamp(seg_start, grain)
+            if full_start < seg_start:
+                full_start += _GRAIN_DELTAS[grain]
+            full_end = _truncate_timestamp(seg_end, grain)
+
+            if full_start >= full_end:
+                remaining.append((seg_start, seg_end, inclusive))
+                continue
+
+            rollup_segments.append((grain, full_start, full_end))
+            if seg_start < full_start:
+                remaining.append((seg_start, full_start, False))
+            if full_end < seg_end or inclusive:
+                remaining.append((full_end, seg_end, inclusive))
+
+        raw_segments = remaining
+
+    return rollup_segments, raw_segments
+
 
 class DataAggregator:
     """
@@ -40,9 +143,326 @@ class DataAggregator:
         """
         self.db = db
         self.metric_repository = MetricRepository()
+        self.rollup_repository = RollupRepository()
 
         logger.info("Data aggregator initialized")
 
+    def update_rollups(
+        self,
+        session: Session,
+        until: Optional[datetime] = None,
+    ) -> Dict[str, Any]:
+        """
+        Fold newly created events into the hourly and daily rollups.
+
+        Events are selected by created_at past the stored watermark, so
+        each run only reads what arrived since the previous one, and are
+        bucketed by their own timestamp, so late or future-dated events
+        land in the right bucket. Counts are added and distinct-count
+        sketches merged into the existing rows; the watermark advances in
+        the same transaction.
+
+        Args:
+            session: Database session
+            until: Upper created_at bound (defaults to now minus a settle delay)
+
+        Returns:
+            Dictionary with events folded, rows written and the new watermark
+        """
+        # created_at and the checkpoint hold naive UTC
+        until = as_naive_utc(until or get_utc_now() - timedelta(seconds=ROLLUP_SETTLE_SECONDS))
+
+        # A new checkpoint starts before any event, so the first run folds them all
+        checkpoint = self.rollup_repository.lock_checkpoint(
+            session, ROLLUP_CHECKPOINT, ROLLUP_EPOCH
+        )
+        since = checkpoint.processed_until
+        if since >= until:
+            return {"events": 0, "rows": 0, "processed_until": since}
+
+        dimension_columns = [getattr(EventORM, name) for name in ROLLUP_DIMENSIONS]
+        stmt = select(
+            EventORM.timestamp,
+            EventORM.event_type,
+            EventORM.user_id,
+            EventORM.session_id,
+            *dimension_columns,
+        ).where(EventORM.created_at > since, EventORM.created_at <= until)
+        stmt = stmt.execution_options(stream_results=True, yield_per=ROLLUP_SCAN_CHUNK_SIZE)
+
+        pending: Dict[tuple, list] = {}
+        events = 0
+        rows = 0
+
+        for partition in session.execute(stmt).partitions():
+            for row in partition:
+                events += 1
+                user_hash = HyperLogLog.hash_value(row.user_id) if row.user_id else None
+                session_hash = HyperLogLog.hash_value(row.session_id) if row.session_id else None
+
+                for grain in ROLLUP_GRAINS:
+                    bucket = _truncate_timestamp(row.timestamp, grain)
+                    self._fold_rollup(
+                        pending, (grain.value, bucket, row.event_type, "", ""), user_hash, session_hash
+                    )
+                    for name in ROLLUP_DIMENSIONS:
+                        value = getattr(row, name)
+                        if value is not None:
+                            self._fold_rollup(
+                                pending, (grain.value, bucket, row.event_type, name, str(value)), user_hash
+                            )
+
+            if len(pending) >= ROLLUP_FLUSH_KEYS:
+                rows += self._flush_rollups(session, pending)
+                pending = {}
+
+        rows += self._flush_rollups(session, pending)
+        self.rollup_repository.save_checkpoint(session, ROLLUP_CHECKPOINT, until)
+
+        logger.info(f"Folded {events} events into {rows} rollup rows")
+        return {"events": events, "rows": rows, "processed_until": until}
+
+    @staticmethod
+    def _fold_rollup(
+        pending: Dict[tuple, list],
+        key: tuple,
+        user_hash: Optional[int],
+        session_hash: Optional[int] = None,
+    ) -> None:
+        """Add one event to a pending rollup entry."""
+        entry = pending.get(key)
+        if entry is None:
+            # Dimension rows only track distinct users
+            entry = [0, HyperLogLog(), HyperLogLog() if not key[3] else None]
+            pending[key] = entry
+
+        entry[0] += 1
+        if user_hash is not None:
+            entry[1].add_hash(user_hash)
+        if session_hash is not None and entry[2] is not None:
+            entry[2].add_hash(session_hash)
+
+    def _flush_rollups(self, session: Session, pending: Dict[tuple, list]) -> int:
+        """Merge pending rollup entries with stored rows and upsert them."""
+        if not pending:
+            return 0
+
+        existing = self.rollup_repository.get_by_keys(session, list(pending))
+        now = get_utc_now()
+        rows = []
+
+        for key, (count, users, sessions) in pending.items():
+            current = existing.get(key)
+            if current is not None:
+                count += current.event_count
+                users.merge(HyperLogLog.from_bytes(current.users_sketch))
+                if sessions is not None and current.sessions_sketch:
+                    sessions.merge(HyperLogLog.from_bytes(current.sessions_sketch))
+
+            grain, bucket_start, event_type, dimension, dimension_value = key
+            rows.append({
+                "grain": grain,
+                "bucket_start": bucket_start,
+                "event_type": event_type,
+                "dimension": dimension,
+                "dimension_value": dimension_value,
+                "event_count": count,
+                "users_sketch": users.to_bytes(),
+                "sessions_sketch": sessions.to_bytes() if sessions is not None else None,
+                "updated_at": now,
+            })
+
+        return self.rollup_repository.upsert_rollups(session, rows)
+
+    def _plan_rollup_read(
+        self,
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+        grains: List[AggregationPeriod],
+    ) -> Optional[Tuple[List[tuple], List[tuple]]]:
+        """
+        Plan a rollup-backed read, or return None if rollups cannot serve it.
+
+        Rollups hold every event created up to the watermark, bucketed by
+        event timestamp. Events created after it are read from raw events:
+        all of them for the raw segments, and those past the watermark for
+        the rollup segments.
+
+        Args:
+            session: Database session
+            start_date: Range start
+            end_date: Range end (inclusive)
+            grains: Usable grains, coarsest first
+
+        Returns:
+            Tuple of rollup segments and raw (start, end, end_inclusive,
+            created_after) segments, or None
+        """
+        checkpoint = self.rollup_repository.get_checkpoint(session, ROLLUP_CHECKPOINT)
+        if checkpoint is None:
+            return None
+
+        rollup_segments, raw_segments = _plan_rollup_segments(start_date, end_date, grains)
+        if not rollup_segments:
+            return None
+
+        watermark = checkpoint.processed_until
+        raw_segments = [
+            (seg_start, seg_end, inclusive, None) for seg_start, seg_end, inclusive in raw_segments
+        ] + [
+            (seg_start, seg_end, False, watermark) for _, seg_start, seg_end in rollup_segments
+        ]
+        return rollup_segments, raw_segments
+
+    @staticmethod
+    def _query_raw_segments(
+        session: Session,
+        columns: List[Any],
+        raw_segments: List[tuple],
+        event_types: Optional[List[str]] = None,
+    ):
+        """Yield raw event rows for the segments not covered by rollups."""
+        for seg_start, seg_end, inclusive, created_after in raw_segments:
+            upper = EventORM.timestamp <= seg_end if inclusive else EventORM.timestamp < seg_end
+            query = session.query(*columns).filter(
+                and_(EventORM.timestamp >= seg_start, upper)
+            )
+            if created_after is not None:
+                query = query.filter(EventORM.created_at > created_after)
+            if event_types:
+                query = query.filter(EventORM.event_type.in_(event_types))
+
+            yield from query.yield_per(ROLLUP_SCAN_CHUNK_SIZE)
+
+    def _aggregate_events_from_rollups(
+        self,
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+        period: AggregationPeriod,
+        event_types: Optional[List[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Serve aggregate_events from the rollup tables.
+
+        Returns:
+            Aggregated rows, or None if the range cannot use rollups
+        """
+        if period == AggregationPeriod.MINUTE:
+            return None
+
+        grains = [AggregationPeriod.HOUR] if period == AggregationPeriod.HOUR else list(ROLLUP_GRAINS)
+        plan = self._plan_rollup_read(session, start_date, end_date, grains)
+        if plan is None:
+            return None
+        rollup_segments, raw_segments = plan
+
+        buckets: Dict[tuple, list] = {}
+
+        def entry_for(timestamp: datetime, event_type: str) -> list:
+            key = (_truncate_timestamp(timestamp, period), event_type)
+            if key not in buckets:
+                buckets[key] = [0, HyperLogLog(), HyperLogLog()]
+            return buckets[key]
+
+        for grain, seg_start, seg_end in rollup_segments:
+            rows = self.rollup_repository.get_rollups(
+                session, grain.value, seg_start, seg_end, event_types=event_types
+            )
+            for row in rows:
+                entry = entry_for(row.bucket_start, row.event_type)
+                entry[0] += row.event_count
+                entry[1].merge(HyperLogLog.from_bytes(row.users_sketch))
+                entry[2].merge(HyperLogLog.from_bytes(row.sessions_sketch))
+
+        raw_rows = self._query_raw_segments(
+            session,
+            [EventORM.timestamp, EventORM.event_type, EventORM.user_id, EventORM.session_id],
+            raw_segments,
+            event_types,
+        )
+        for row in raw_rows:
+            entry = entry_for(row.timestamp, row.event_type)
+            entry[0] += 1
+            entry[1].add(row.user_id)
+            entry[2].add(row.session_id)
+
+        return [
+            {
+                "period": bucket,
+                "event_type": event_type,
+                "count": count,
+                "unique_users": users.count(),
+                "unique_sessions": sessions.count(),
+            }
+            for (bucket, event_type), (count, users, sessions) in sorted(buckets.items())
+        ]
+
+    def _aggregate_by_dimension_from_rollups(
+        self,
+        session: Session,
+        dimension: str,
+        start_date: datetime,
+        end_date: datetime,
+        event_types: Optional[List[str]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Serve aggregate_by_dimension from the rollup tables.
+
+        Returns:
+            Aggregated rows, or None if the dimension or range cannot use rollups
+        """
+        if dimension not in ROLLUP_DIMENSIONS:
+            return None
+
+        plan = self._plan_rollup_read(session, start_date, end_date, list(ROLLUP_GRAINS))
+        if plan is None:
+            return None
+        rollup_segments, raw_segments = plan
+
+        values: Dict[str, list] = {}
+
+        def entry_for(value: str) -> list:
+            if value not in values:
+                values[value] = [0, HyperLogLog()]
+            return values[value]
+
+        for grain, seg_start, seg_end in rollup_segments:
+            rows = self.rollup_repository.get_rollups(
+                session, grain.value, seg_start, seg_end, dimension=dimension, event_types=event_types
+            )
+            for row in rows:
+                entry = entry_for(row.dimension_value)
+                entry[0] += row.event_count
+                entry[1].merge(HyperLogLog.from_bytes(row.users_sketch))
+
+        dimension_field = getattr(EventORM, dimension)
+        raw_rows = self._query_raw_segments(
+            session,
+            [dimension_field.label("dimension_value"), EventORM.user_id],
+            raw_segments,
+            event_types,
+        )
+        for row in raw_rows:
+            if row.dimension_value is None:
+                continue
+            entry = entry_for(str(row.dimension_value))
+            entry[0] += 1
+            entry[1].add(row.user_id)
+
+        aggregated = [
+            {
+                "dimension": dimension,
+                "value": value,
+                "count": count,
+                "unique_users": users.count(),
+            }
+            for value, (count, users) in values.items()
+        ]
+        aggregated.sort(key=lambda item: item["count"], reverse=True)
+        return aggregated
+
     def aggregate_events(
         self,
         session: Session,
@@ -50,21 +470,38 @@ class DataAggregator:
         end_date: datetime,
         period: AggregationPeriod = AggregationPeriod.DAY,
         event_types: Optional[List[str]] = None,
+        use_rollups: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         Aggregate events by time period.
 
+        Whole hours and days inside the range are read from the rollup
+        tables when available; distinct counts are then HyperLogLog
+        estimates. Pass use_rollups=False for exact raw-table counts.
+
         Args:
             session: Database session
             start_date: Start date
             end_date: End date
             period: Aggregation period
             event_types: Optional event types filter
+            use_rollups: Route to rollup tables when the range allows it
 
         Returns:
             List of aggregated data
         """
+        # Event timestamps are stored as naive UTC
+        start_date, end_date = as_naive_utc(start_date), as_naive_utc(end_date)
+
         try:
+            if use_rollups:
+                aggregated = self._aggregate_events_from_rollups(
+                    session, start_date, end_date, period, event_types
+                )
+                if aggregated is not None:
+                    logger.info(f"Aggregated {len(aggregated)} event periods from rollups")
+                    return aggregated
+
             # Build query
             query = session.query(
                 func.date_trunc(period.value, EventORM.timestamp).label("period"),
@@ -251,21 +688,37 @@ class DataAggregator:
         start_date: datetime,
         end_date: datetime,
         event_types: Optional[List[str]] = None,
+        use_rollups: bool = True,
     ) -> List[Dict[str, Any]]:
         """
         Aggregate events by a dimension.
 
+        Dimensions in ROLLUP_DIMENSIONS are served from the rollup tables
+        when available (unique users are HyperLogLog estimates).
+
         Args:
             session: Database session
             dimension: Dimension field name
             start_date: Start date
             end_date: End date
             event_types: Optional event types filter
+            use_rollups: Route to rollup tables when the range allows it
 
         Returns:
             List of aggregated data by dimension
         """
+        # Event timestamps are stored as naive UTC
+        start_date, end_date = as_naive_utc(start_date), as_naive_utc(end_date)
+
         try:
+            if use_rollups:
+                aggregated = self._aggregate_by_dimension_from_rollups(
+                    session, dimension, start_date, end_date, event_types
+                )
+                if aggregated is not None:
+                    logger.info(f"Aggregated by {dimension} from rollups: {len(aggregated)} values")
+                    return aggregated
+
             # Map dimension to ORM field
             dimension_field = getattr(EventORM, dimension, None)
             if dimension_field is None:
@@ -5,6 +5,7 @@ Event processing with async workers.
 """
 
 import logging
+from collections import defaultdict
 from datetime import datetime
 from typing import Any, Dict, List, Optional
 
@@ -19,7 +20,7 @@ from modules.analytics.storage.repositories import (
     SessionRepository,
     UserRepository,
 )
-from shared.utils import get_utc_now
+from shared.utils import generate_uuid, get_utc_now
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,7 @@ class EventProcessor:
     - Goal tracking
     - User/session updates
     - Real-time processing
+    - Set-based batch processing
     """
 
     def __init__(self, db: Database):
@@ -93,6 +95,176 @@ class EventProcessor:
             logger.error(f"Error in process_events: {e}", exc_info=True)
             return 0
 
+    def process_events_batch(self, batch_size: int = 1000) -> int:
+        """
+        Process unprocessed events as one set-based batch.
+
+        Instead of several round trips per event, the batch is grouped by
+        user and session, goals are loaded once and indexed by event type,
+        and all deltas are written with a handful of bulk statements. If the
+        batch fails as a whole, it is rolled back and re-run through the
+        per-event path so one bad event cannot stall the queue.
+
+        Args:
+            batch_size: Number of events to process
+
+        Returns:
+            Number of events processed
+        """
+        try:
+            with self.db.session() as session:
+                events = self.event_repo.get_unprocessed(session, limit=batch_size)
+
+                if not events:
+                    return 0
+
+                self._apply_batch(session, events)
+                self.event_repo.mark_processed(session, [event.id for event in events])
+                session.commit()
+
+                logger.info(f"Batch processed {len(events)} events")
+                return len(events)
+
+        except Exception as e:
+            logger.error(
+                f"Batch processing failed, falling back to per-event path: {e}",
+                exc_info=True,
+            )
+            return self.process_events(batch_size)
+
+    def _apply_batch(self, session: Session, events: List[EventORM]) -> None:
+        """
+        Apply user, session and goal updates for a batch of events.
+
+        Args:
+            session: Database session
+            events: Events ordered by timestamp
+        """
+        goals_by_type = self.goal_repo.get_enabled_by_event_type(session)
+
+        user_deltas: Dict[str, Dict[str, Any]] = {}
+        session_events: Dict[str, List[EventORM]] = defaultdict(list)
+        session_conversions: Dict[str, float] = defaultdict(float)
+        goal_deltas: Dict[str, Dict[str, float]] = {}
+        conversions: List[Dict[str, Any]] = []
+
+        for event in events:
+            if event.user_id:
+                delta = user_deltas.setdefault(
+                    event.user_id,
+                    {
+                        "first_seen_at": event.timestamp,
+                        "events": 0,
+                        "conversions": 0,
+                        "value": 0.0,
+                    },
+                )
+                delta["events"] += 1
+
+            if event.session_id:
+                session_events[event.session_id].append(event)
+
+            for goal in goals_by_type.get(event.event_type, []):
+                # Conversions reference the user, so anonymous events cannot convert
+                if not event.user_id or not self._check_goal_conditions(goal.conditions, event):
+                    continue
+
+                value = goal.value or 0.0
+                conversions.append(
+                    {
+                        "id": generate_uuid(),
+                        "goal_id": goal.id,
+                        "user_id": event.user_id,
+                        "session_id": event.session_id,
+                        "event_id": event.id,
+                        "value": goal.value,
+                        "properties": event.properties,
+                        "converted_at": event.timestamp,
+                    }
+                )
+
+                goal_delta = goal_deltas.setdefault(goal.id, {"conversions": 0, "value": 0.0})
+                goal_delta["conversions"] += 1
+                goal_delta["value"] += value
+
+                user_deltas[event.user_id]["conversions"] += 1
+                user_deltas[event.user_id]["value"] += value
+
+                if event.session_id:
+                    session_conversions[event.session_id] += value
+
+        # Users first: conversions hold a foreign key to them
+        self.user_repo.bulk_upsert_stats(session, user_deltas)
+        self.session_repo.bulk_apply_deltas(
+            session,
+            self._build_session_deltas(session, session_events, session_conversions),
+        )
+        if conversions:
+            session.execute(
+                self.conversion_repo.model.__table__.insert(),
+                conversions,
+            )
+        self.goal_repo.bulk_increment_conversions(session, goal_deltas)
+
+        logger.debug(
+            f"Batch applied: {len(user_deltas)} users, {len(session_events)} sessions, "
+            f"{len(conversions)} conversions"
+        )
+
+    def _build_session_deltas(
+        self,
+        session: Session,
+        session_events: Dict[str, List[EventORM]],
+        session_conversions: Dict[str, float],
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute per-session deltas for a batch.
+
+        Sessions are loaded in one query; events are replayed in timestamp
+        order so duration and bounce match the per-event path.
+
+        Args:
+            session: Database session
+            session_events: Events grouped by session ID
+            session_conversions: Conversion value grouped by session ID
+
+        Returns:
+            Deltas for ``SessionRepository.bulk_apply_deltas``
+        """
+        deltas = []
+
+        for sess in self.session_repo.get_by_ids(session, list(session_events)):
+            page_views = sess.page_views or 0
+            duration = sess.duration_seconds
+            is_bounce = bool(sess.is_bounce)
+            page_view_delta = 0
+            last_activity_at = sess.last_activity_at
+
+            for event in session_events[sess.id]:
+                last_activity_at = event.timestamp
+                if event.event_type == "page_view":
+                    page_views += 1
+                    page_view_delta += 1
+                if sess.started_at and last_activity_at:
+                    duration = int((last_activity_at - sess.started_at).total_seconds())
+                if page_views == 1 and duration is not None and duration < 30:
+                    is_bounce = True
+
+            deltas.append(
+                {
+                    "id": sess.id,
+                    "events": len(session_events[sess.id]),
+                    "page_views": page_view_delta,
+                    "conversion_value": session_conversions.get(sess.id, 0.0),
+                    "converted": sess.id in session_conversions,
+                    "last_activity_at": last_activity_at,
+                    "duration_seconds": duration,
+                    "is_bounce": is_bounce,
+                }
+            )
+
+        return deltas
+
     def _process_event(self, session: Session, event: EventORM) -> None:
         """
         Process a single event.
@@ -199,6 +371,7 @@ class EventProcessor:
                     # Create conversion
                     self.conversion_repo.create(
                         session,
+                        id=generate_uuid(),
                         goal_id=goal.id,
                         user_id=event.user_id,
                         session_id=event.session_id,
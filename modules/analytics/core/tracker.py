@@ -6,12 +6,12 @@ Event tracking system with batching and validation.
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 from queue import Queue
 import threading
 import time
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
 
 from modules.analytics.models.event import Event, EventCreate, EventBatch
 from modules.analytics.storage.database import Database
@@ -21,6 +21,131 @@ from shared.utils import generate_uuid, get_utc_now
 
 logger = logging.getLogger(__name__)
 
+# Ring buffer capacity in high-throughput mode
+DEFAULT_BUFFER_SIZE = 100_000
+
+# Events per flush in high-throughput mode
+HIGH_THROUGHPUT_BATCH_SIZE = 5000
+
+# Flush worker threads in high-throughput mode
+DEFAULT_FLUSH_WORKERS = 2
+
+BACKPRESSURE_DROP = "drop"
+BACKPRESSURE_BLOCK = "block"
+
+_event_list_adapter = TypeAdapter(List[EventCreate])
+
+
+class EventRingBuffer:
+    """
+    Bounded FIFO ring buffer of preallocated slots.
+
+    Producers never allocate queue nodes; a full buffer either rejects the
+    item immediately or waits for space, so memory stays bounded under
+    load spikes. Consumers take items in batches.
+    """
+
+    def __init__(self, capacity: int):
+        """
+        Initialize ring buffer.
+
+        Args:
+            capacity: Maximum number of buffered items
+        """
+        if capacity < 1:
+            raise ValueError("Ring buffer capacity must be positive")
+
+        self.capacity = capacity
+        self._slots: List[Any] = [None] * capacity
+        self._head = 0
+        self._size = 0
+        self._closed = False
+        self._lock = threading.Lock()
+        self._not_empty = threading.Condition(self._lock)
+        self._not_full = threading.Condition(self._lock)
+
+    def put(self, item: Any, block: bool = False, timeout: Optional[float] = None) -> bool:
+        """
+        Append an item.
+
+        Args:
+            item: Item to buffer
+            block: Wait for space when the buffer is full
+            timeout: Maximum wait in seconds when blocking (None waits forever)
+
+        Returns:
+            True if buffered, False if the buffer stayed full
+        """
+        with self._lock:
+            if self._size == self.capacity:
+                if not block:
+                    return False
+                deadline = None if timeout is None else time.monotonic() + timeout
+                while self._size == self.capacity:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._not_full.wait(remaining)
+
+            self._slots[(self._head + self._size) % self.capacity] = item
+            self._size += 1
+            self._not_empty.notify()
+            return True
+
+    def get_batch(self, max_items: int, timeout: Optional[float] = None) -> List[Any]:
+        """
+        Remove up to max_items items.
+
+        Waits until max_items items are buffered, the timeout expires or the
+        buffer is closed, then returns whatever is available.
+
+        Args:
+            max_items: Maximum number of items to take
+            timeout: Maximum wait in seconds (0 returns immediately)
+
+        Returns:
+            List of items, oldest first (possibly empty)
+        """
+        with self._lock:
+            if timeout:
+                deadline = time.monotonic() + timeout
+                while self._size < max_items and not self._closed:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._not_empty.wait(remaining)
+
+            count = min(max_items, self._size)
+            if count == 0:
+                return []
+
+            items = []
+            for _ in range(count):
+                items.append(self._slots[self._head])
+                self._slots[self._head] = None
+                self._head = (self._head + 1) % self.capacity
+            self._size -= count
+
+            self._not_full.notify_all()
+            if self._size:
+                self._not_empty.notify()
+            return items
+
+    def close(self) -> None:
+        """Wake all waiting consumers so they return what is buffered."""
+        with self._lock:
+            self._closed = True
+            self._not_empty.notify_all()
+
+    def reopen(self) -> None:
+        """Let consumers wait for full batches again after close()."""
+        with self._lock:
+            self._closed = False
+
+    def __len__(self) -> int:
+        """Number of buffered items."""
+        return self._size
+
 
 class EventTracker:
     """
@@ -31,6 +156,12 @@ class EventTracker:
     - Batch processing
     - Async event queue
     - Auto-enrichment
+
+    In high-throughput mode ``track()`` only stamps an ID and timestamp and
+    appends the raw event to a bounded ring buffer. A small pool of flush
+    workers validates events a batch at a time and writes them with a
+    single COPY (or executemany INSERT) per batch. Invalid events are
+    counted and discarded by the workers rather than reported to callers.
     """
 
     def __init__(
@@ -39,6 +170,11 @@ class EventTracker:
         batch_size: int = 100,
         flush_interval: int = 5,
         auto_start: bool = True,
+        high_throughput: bool = False,
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+        backpressure: str = BACKPRESSURE_DROP,
+        block_timeout: Optional[float] = 1.0,
+        flush_workers: int = DEFAULT_FLUSH_WORKERS,
     ):
         """
         Initialize event tracker.
@@ -48,24 +184,53 @@ class EventTracker:
             batch_size: Number of events per batch
             flush_interval: Flush interval in seconds
             auto_start: Auto-start background worker
+            high_throughput: Use the ring buffer with deferred validation
+            buffer_size: Ring buffer capacity (high-throughput mode)
+            backpressure: "drop" rejects events when the buffer is full,
+                "block" waits up to block_timeout for space
+            block_timeout: Maximum wait in seconds for "block" (None waits forever)
+            flush_workers: Number of flush worker threads (high-throughput mode)
         """
+        if backpressure not in (BACKPRESSURE_DROP, BACKPRESSURE_BLOCK):
+            raise ValueError(f"Invalid backpressure policy: {backpressure}")
+
         self.db = db
         self.batch_size = min(batch_size, MAX_BATCH_SIZE)
         self.flush_interval = flush_interval
         self.repository = EventRepository()
 
+        self.high_throughput = high_throughput
+        self.backpressure = backpressure
+        self.block_timeout = block_timeout
+        self.flush_workers = max(flush_workers, 1)
+
         # Event queue
         self._queue: Queue = Queue()
+        self._buffer: Optional[EventRingBuffer] = (
+            EventRingBuffer(buffer_size) if high_throughput else None
+        )
         self._running = False
         self._worker_thread: Optional[threading.Thread] = None
+        self._flush_threads: List[threading.Thread] = []
         self._last_flush = time.time()
 
+        # High-throughput counters
+        self._stats_lock = threading.Lock()
+        self._dropped = 0
+        self._flushed = 0
+        self._invalid = 0
+        self._flush_errors = 0
+        self._flush_count = 0
+        self._flush_seconds_total = 0.0
+        self._last_flush_seconds = 0.0
+
         if auto_start:
             self.start()
 
         logger.info(
             f"Event tracker initialized: batch_size={self.batch_size}, "
-            f"flush_interval={self.flush_interval}s"
+            f"flush_interval={self.flush_interval}s, "
+            f"high_throughput={self.high_throughput}"
         )
 
     def track(
@@ -94,6 +259,20 @@ class EventTracker:
         Example:
             >>> tracker.track("button_click", "click", {"button_id": "submit"})
         """
+        if self._buffer is not None:
+            event_id = generate_uuid()
+            event_data = {
+                "name": name,
+                "event_type": event_type,
+                "properties": properties or {},
+                "user_id": user_id,
+                "session_id": session_id,
+                **kwargs,
+            }
+            if self._enqueue((event_id, get_utc_now(), event_data)):
+                return event_id
+            return None
+
         try:
             # Create event data
             event_data = {
@@ -142,6 +321,15 @@ class EventTracker:
             # Validate batch
             batch = EventBatch(events=events)
 
+            if self._buffer is not None:
+                now = get_utc_now()
+                accepted = 0
+                for event in events:
+                    if self._enqueue((generate_uuid(), now, event.model_dump())):
+                        accepted += 1
+                logger.info(f"Batch tracked: {accepted}/{len(events)} events")
+                return accepted == len(events)
+
             # Add events to queue
             for event in events:
                 event_id = generate_uuid()
@@ -167,6 +355,14 @@ class EventTracker:
         Example:
             >>> count = tracker.flush()
         """
+        if self._buffer is not None:
+            total = 0
+            while True:
+                batch = self._buffer.get_batch(self.batch_size, timeout=0)
+                if not batch:
+                    return total
+                total += self._flush_batch(batch)
+
         if self._queue.empty():
             return 0
 
@@ -218,6 +414,22 @@ class EventTracker:
             return
 
         self._running = True
+
+        if self._buffer is not None:
+            self._buffer.reopen()
+            self._flush_threads = [
+                threading.Thread(
+                    target=self._flush_worker,
+                    name=f"event-flush-{i}",
+                    daemon=True,
+                )
+                for i in range(self.flush_workers)
+            ]
+            for thread in self._flush_threads:
+                thread.start()
+            logger.info(f"Event tracker started {self.flush_workers} flush workers")
+            return
+
         self._worker_thread = threading.Thread(target=self._worker, daemon=True)
         self._worker_thread.start()
 
@@ -238,6 +450,19 @@ class EventTracker:
 
         self._running = False
 
+        if self._buffer is not None:
+            # Wake the flush workers so they drain what they can and exit
+            self._buffer.close()
+            for thread in self._flush_threads:
+                thread.join(timeout=10)
+            self._flush_threads = []
+
+            if flush_remaining:
+                self.flush()
+
+            logger.info("Event tracker flush workers stopped")
+            return
+
         if flush_remaining:
             self.flush()
 
@@ -270,6 +495,129 @@ class EventTracker:
 
         logger.info("Event tracker worker thread stopped")
 
+    def _enqueue(self, item: Tuple[str, datetime, Dict[str, Any]]) -> bool:
+        """
+        Append an unvalidated event to the ring buffer.
+
+        Args:
+            item: Tuple of event ID, timestamp and raw event data
+
+        Returns:
+            True if buffered, False if dropped by backpressure
+        """
+        if self._buffer.put(
+            item,
+            block=self.backpressure == BACKPRESSURE_BLOCK,
+            timeout=self.block_timeout,
+        ):
+            return True
+
+        with self._stats_lock:
+            self._dropped += 1
+        logger.debug("Event buffer full, dropping event")
+        return False
+
+    def _flush_worker(self) -> None:
+        """High-throughput flush worker thread."""
+        while self._running:
+            try:
+                batch = self._buffer.get_batch(self.batch_size, timeout=self.flush_interval)
+                if batch:
+                    self._flush_batch(batch)
+            except Exception as e:
+                logger.error(f"Error in flush worker: {e}", exc_info=True)
+                time.sleep(1)
+
+    def _flush_batch(self, batch: List[Tuple[str, datetime, Dict[str, Any]]]) -> int:
+        """
+        Validate and insert a batch of buffered events.
+
+        The whole batch is validated in one call; if that fails, events are
+        validated one by one so a single bad event only discards itself.
+
+        Args:
+            batch: Buffered (event ID, timestamp, raw data) tuples
+
+        Returns:
+            Number of events written
+        """
+        started = time.perf_counter()
+
+        try:
+            validated = list(zip(batch, _event_list_adapter.validate_python([e[2] for e in batch])))
+        except ValidationError:
+            validated = []
+            for item in batch:
+                try:
+                    validated.append((item, EventCreate.model_validate(item[2])))
+                except ValidationError as e:
+                    logger.debug(f"Discarding invalid event {item[0]}: {e}")
+
+        invalid = len(batch) - len(validated)
+        created_at = get_utc_now()
+        rows = []
+        for (event_id, timestamp, _), event in validated:
+            row = event.model_dump(mode="json")
+            row["id"] = event_id
+            row["timestamp"] = timestamp
+            row["created_at"] = created_at
+            row["processed"] = False
+            row["processed_at"] = None
+            rows.append(row)
+
+        count = 0
+        failed = False
+        if rows:
+            try:
+                with self.db.session() as session:
+                    count = self.repository.copy_insert(session, rows)
+                    session.commit()
+            except Exception as e:
+                failed = True
+                logger.error(f"Error flushing {len(rows)} events to database: {e}", exc_info=True)
+
+        elapsed = time.perf_counter() - started
+        with self._stats_lock:
+            self._flushed += count
+            self._invalid += invalid
+            self._flush_errors += int(failed)
+            self._flush_count += 1
+            self._flush_seconds_total += elapsed
+            self._last_flush_seconds = elapsed
+
+        if invalid:
+            logger.warning(f"Discarded {invalid} invalid events")
+        self._last_flush = time.time()
+        return count
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get ingestion counters.
+
+        Returns:
+            Dictionary with queue depth, capacity, flushed/dropped/invalid
+            event counts, flush errors and flush latency in milliseconds
+
+        Example:
+            >>> tracker.get_stats()["dropped"]
+        """
+        with self._stats_lock:
+            flushes = self._flush_count
+            return {
+                "high_throughput": self.high_throughput,
+                "queue_depth": self.get_queue_size(),
+                "capacity": self._buffer.capacity if self._buffer is not None else None,
+                "flushed": self._flushed,
+                "dropped": self._dropped,
+                "invalid": self._invalid,
+                "flush_errors": self._flush_errors,
+                "flushes": flushes,
+                "last_flush_ms": round(self._last_flush_seconds * 1000, 3),
+                "avg_flush_ms": (
+                    round(self._flush_seconds_total / flushes * 1000, 3) if flushes else 0.0
+                ),
+            }
+
     def get_queue_size(self) -> int:
         """
         Get current queue size.
@@ -280,6 +628,8 @@ class EventTracker:
         Example:
             >>> size = tracker.get_queue_size()
         """
+        if self._buffer is not None:
+            return len(self._buffer)
         return self._queue.qsize()
 
     def is_running(self) -> bool:
@@ -349,3 +699,45 @@ class EventTracker:
     def __exit__(self, exc_type, exc_val, exc_tb):
         """Context manager exit."""
         self.stop(flush_remaining=True)
+
+
+# Global tracker instance (one per process)
+_tracker_instance: Optional[EventTracker] = None
+
+
+def init_tracker(db: Database, **kwargs) -> EventTracker:
+    """
+    Initialize global event tracker.
+
+    Args:
+        db: Database instance
+        **kwargs: EventTracker options
+
+    Returns:
+        Tracker instance
+
+    Example:
+        >>> tracker = init_tracker(db, high_throughput=True)
+    """
+    global _tracker_instance
+    _tracker_instance = EventTracker(db, **kwargs)
+    logger.info("Global event tracker initialized")
+    return _tracker_instance
+
+
+def get_tracker() -> EventTracker:
+    """
+    Get global event tracker.
+
+    Returns:
+        Tracker instance
+
+    Raises:
+        RuntimeError: If tracker not initialized
+
+    Example:
+        >>> get_tracker().track("page_view", "page_view")
+    """
+    if _tracker_instance is None:
+        raise RuntimeError("Event tracker not initialized. Call init_tracker() first.")
+    return _tracker_instance
@@ -5,25 +5,104 @@ Export functionality for CSV, JSON, Excel, and PDF formats.
 """
 
 import csv
+import gzip
 import io
 import json
 import logging
-from datetime import datetime
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import chain, islice
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import IO, Any, Dict, Iterable, Iterator, List, Optional, Tuple
 
-import pandas as pd
+from openpyxl import Workbook
+from openpyxl.utils import get_column_letter
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet
 from reportlab.lib.units import inch
 from reportlab.platypus import Paragraph, SimpleDocTemplate, Table, TableStyle
 
+from sqlalchemy.orm import Session
+
 from shared.constants import ExportFormat, MAX_EXPORT_ROWS, EXPORT_CHUNK_SIZE
 from shared.utils import get_utc_now
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
+# Data rows per worksheet (Excel limit minus the header row)
+EXCEL_MAX_ROWS = 1_048_575
+
+# File extension per export format
+EXPORT_EXTENSIONS = {
+    ExportFormat.CSV: "csv",
+    ExportFormat.JSON: "json",
+    ExportFormat.EXCEL: "xlsx",
+    ExportFormat.PDF: "pdf",
+    ExportFormat.PARQUET: "parquet",
+}
+
+
+def _json_default(obj: Any) -> Any:
+    """Serialize values the json module does not handle."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Type {type(obj)} not serializable")
+
+
+def _row_to_dict(row: Any) -> Dict[str, Any]:
+    """Convert a result mapping (or single ORM entity row) to a plain dict."""
+    values = dict(row)
+    if len(values) == 1:
+        entity = next(iter(values.values()))
+        table = getattr(entity, "__table__", None)
+        if table is not None:
+            return {column.key: getattr(entity, column.key) for column in table.columns}
+    return values
+
+
+def stream_query(
+    session: Session,
+    statement: Any,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield query rows as dicts from a server-side cursor.
+
+    Rows are fetched ``chunk_size`` at a time, so memory use does not grow
+    with the size of the result.
+
+    Args:
+        session: Database session
+        statement: SQLAlchemy select statement
+        chunk_size: Rows per fetch
+
+    Returns:
+        Iterator of row dictionaries
+    """
+    result = session.execute(
+        statement.execution_options(stream_results=True, yield_per=chunk_size)
+    )
+    for partition in result.mappings().partitions():
+        for row in partition:
+            yield _row_to_dict(row)
+
+
+def _open_text(file_path: str, compress: bool = False) -> IO[str]:
+    """Open a text output file, gzip-compressed if requested."""
+    if compress:
+        return gzip.open(file_path, "wt", encoding="utf-8", newline="")
+    return open(file_path, "w", encoding="utf-8", newline="")
+
 
 class BaseExporter:
     """Base exporter class."""
@@ -49,140 +128,226 @@ class BaseExporter:
         Returns:
             True if successful
         """
+        return self.export_stream(data, file_path, **kwargs) > 0
+
+    def export_stream(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        file_path: str,
+        compress: bool = False,
+        **kwargs
+    ) -> int:
+        """
+        Export rows to file without materializing them.
+
+        Rows are consumed in EXPORT_CHUNK_SIZE chunks and written as they
+        arrive, up to max_rows.
+
+        Args:
+            rows: Row iterable (list, generator or stream_query cursor)
+            file_path: Output file path
+            compress: Gzip the output where the format allows it
+            **kwargs: Additional export options
+
+        Returns:
+            Number of rows written (0 if nothing was exported)
+        """
         raise NotImplementedError
 
+    def _iter_chunks(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        limit: Optional[int] = None,
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Split rows into EXPORT_CHUNK_SIZE chunks, stopping at the row limit."""
+        iterator = iter(rows)
+        remaining = min(limit, self.max_rows) if limit else self.max_rows
+
+        while remaining > 0:
+            chunk = list(islice(iterator, min(EXPORT_CHUNK_SIZE, remaining)))
+            if not chunk:
+                return
+            remaining -= len(chunk)
+            yield chunk
+
+    @staticmethod
+    def _discard(file_path: str) -> None:
+        """Remove a partially written file."""
+        Path(file_path).unlink(missing_ok=True)
+
 
 class CSVExporter(BaseExporter):
     """CSV file exporter."""
 
-    def export(
+    def export_stream(
         self,
-        data: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         file_path: str,
+        compress: bool = False,
         **kwargs
-    ) -> bool:
-        """Export data to CSV file."""
+    ) -> int:
+        """Export rows to CSV incrementally; columns come from the first row."""
+        count = 0
         try:
-            if not data:
+            chunks = self._iter_chunks(rows)
+            first = next(chunks, None)
+            if not first:
                 logger.warning("No data to export")
-                return False
-
-            # Limit rows
-            data = data[:self.max_rows]
-
-            # Get fieldnames from first row
-            fieldnames = list(data[0].keys())
+                return 0
 
-            # Write CSV
-            with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=fieldnames)
+            with _open_text(file_path, compress) as f:
+                writer = csv.DictWriter(
+                    f, fieldnames=list(first[0].keys()), restval="", extrasaction="ignore"
+                )
                 writer.writeheader()
-                writer.writerows(data)
 
-            logger.info(f"Exported {len(data)} rows to CSV: {file_path}")
-            return True
+                for chunk in chain([first], chunks):
+                    writer.writerows(chunk)
+                    count += len(chunk)
+
+            logger.info(f"Exported {count} rows to CSV: {file_path}")
+            return count
 
         except Exception as e:
             logger.error(f"Error exporting to CSV: {e}", exc_info=True)
-            return False
+            self._discard(file_path)
+            return 0
 
 
 class JSONExporter(BaseExporter):
     """JSON file exporter."""
 
-    def export(
+    def export_stream(
         self,
-        data: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         file_path: str,
+        compress: bool = False,
+        lines: bool = False,
+        indent: Optional[int] = 2,
         **kwargs
-    ) -> bool:
-        """Export data to JSON file."""
+    ) -> int:
+        """
+        Export rows to JSON incrementally.
+
+        Writes a JSON array by default, or newline-delimited JSON (one
+        object per line) with ``lines=True``.
+        """
+        count = 0
         try:
-            if not data:
+            chunks = self._iter_chunks(rows)
+            first = next(chunks, None)
+            if not first:
                 logger.warning("No data to export")
-                return False
+                return 0
 
-            # Limit rows
-            data = data[:self.max_rows]
+            with _open_text(file_path, compress) as f:
+                if not lines:
+                    f.write("[\n")
 
-            # Handle datetime serialization
-            def json_serializer(obj):
-                if isinstance(obj, datetime):
-                    return obj.isoformat()
-                raise TypeError(f"Type {type(obj)} not serializable")
+                for chunk in chain([first], chunks):
+                    for row in chunk:
+                        if lines:
+                            f.write(json.dumps(row, ensure_ascii=False, default=_json_default))
+                            f.write("\n")
+                        else:
+                            if count:
+                                f.write(",\n")
+                            f.write(json.dumps(row, ensure_ascii=False, indent=indent, default=_json_default))
+                        count += 1
 
-            # Write JSON
-            with open(file_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=2, default=json_serializer)
+                if not lines:
+                    f.write("\n]\n")
 
-            logger.info(f"Exported {len(data)} rows to JSON: {file_path}")
-            return True
+            logger.info(f"Exported {count} rows to {'NDJSON' if lines else 'JSON'}: {file_path}")
+            return count
 
         except Exception as e:
             logger.error(f"Error exporting to JSON: {e}", exc_info=True)
-            return False
+            self._discard(file_path)
+            return 0
 
 
 class ExcelExporter(BaseExporter):
     """Excel file exporter."""
 
-    def export(
+    def export_stream(
         self,
-        data: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         file_path: str,
+        compress: bool = False,
         **kwargs
-    ) -> bool:
-        """Export data to Excel file."""
+    ) -> int:
+        """
+        Export rows to XLSX with openpyxl write-only mode.
+
+        Rows are streamed to the sheet instead of building a DataFrame.
+        Column widths are sized from the first chunk. XLSX is already
+        zip-compressed, so ``compress`` is ignored.
+        """
+        count = 0
         try:
-            if not data:
+            chunks = self._iter_chunks(rows, limit=EXCEL_MAX_ROWS)
+            first = next(chunks, None)
+            if not first:
                 logger.warning("No data to export")
-                return False
+                return 0
 
-            # Limit rows
-            data = data[:self.max_rows]
+            headers = list(first[0].keys())
 
-            # Create DataFrame
-            df = pd.DataFrame(data)
+            workbook = Workbook(write_only=True)
+            worksheet = workbook.create_sheet(title="Data")
 
-            # Write Excel
-            with pd.ExcelWriter(file_path, engine='openpyxl') as writer:
-                df.to_excel(writer, index=False, sheet_name='Data')
+            # Widths must be set before any row is written in write-only mode
+            for idx, header in enumerate(headers, start=1):
+                max_length = max(
+                    [len(str(header))] + [len(str(row.get(header, ""))) for row in first]
+                )
+                worksheet.column_dimensions[get_column_letter(idx)].width = min(max_length + 2, 50)
 
-                # Auto-adjust column widths
-                worksheet = writer.sheets['Data']
-                for idx, col in enumerate(df.columns):
-                    max_length = max(
-                        df[col].astype(str).apply(len).max(),
-                        len(str(col))
-                    )
-                    worksheet.column_dimensions[chr(65 + idx)].width = min(max_length + 2, 50)
+            worksheet.append(headers)
+            for chunk in chain([first], chunks):
+                for row in chunk:
+                    worksheet.append([self._cell_value(row.get(header)) for header in headers])
+                count += len(chunk)
 
-            logger.info(f"Exported {len(data)} rows to Excel: {file_path}")
-            return True
+            workbook.save(file_path)
+
+            logger.info(f"Exported {count} rows to Excel: {file_path}")
+            return count
 
         except Exception as e:
             logger.error(f"Error exporting to Excel: {e}", exc_info=True)
-            return False
+            self._discard(file_path)
+            return 0
+
+    @staticmethod
+    def _cell_value(value: Any) -> Any:
+        """Convert values openpyxl cannot store."""
+        if isinstance(value, (dict, list)):
+            return json.dumps(value, default=_json_default)
+        if isinstance(value, datetime) and value.tzinfo is not None:
+            return value.replace(tzinfo=None)
+        return value
 
 
 class PDFExporter(BaseExporter):
     """PDF file exporter."""
 
-    def export(
+    def export_stream(
         self,
-        data: List[Dict[str, Any]],
+        rows: Iterable[Dict[str, Any]],
         file_path: str,
+        compress: bool = False,
         title: str = "Analytics Report",
         **kwargs
-    ) -> bool:
-        """Export data to PDF file."""
+    ) -> int:
+        """Export the first rows to a PDF table (only 100 rows are read)."""
         try:
+            # Limit rows for PDF
+            data = list(islice(iter(rows), min(100, self.max_rows)))
             if not data:
                 logger.warning("No data to export")
-                return False
-
-            # Limit rows for PDF
-            data = data[:min(100, self.max_rows)]
+                return 0
 
             # Create PDF
             doc = SimpleDocTemplate(file_path, pagesize=letter)
@@ -230,11 +395,80 @@ class PDFExporter(BaseExporter):
             doc.build(elements)
 
             logger.info(f"Exported {len(data)} rows to PDF: {file_path}")
-            return True
+            return len(data)
 
         except Exception as e:
             logger.error(f"Error exporting to PDF: {e}", exc_info=True)
-            return False
+            return 0
+
+
+class ParquetExporter(BaseExporter):
+    """Parquet file exporter (requires pyarrow)."""
+
+    def export_stream(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        file_path: str,
+        compress: bool = False,
+        **kwargs
+    ) -> int:
+        """
+        Export rows to Parquet, one row group per chunk.
+
+        The schema is inferred from the first chunk; nested values are
+        stored as JSON strings. ``compress`` selects gzip instead of snappy.
+        """
+        if not PYARROW_AVAILABLE:
+            logger.error("Parquet export requires pyarrow")
+            return 0
+
+        count = 0
+        writer = None
+        try:
+            chunks = self._iter_chunks(rows)
+            for chunk in chunks:
+                records = [self._normalize(row) for row in chunk]
+                if writer is None:
+                    schema = self._infer_schema(records)
+                    writer = pq.ParquetWriter(
+                        file_path, schema, compression="gzip" if compress else "snappy"
+                    )
+                writer.write_table(pa.Table.from_pylist(records, schema=writer.schema))
+                count += len(records)
+
+            if writer is None:
+                logger.warning("No data to export")
+                return 0
+
+            writer.close()
+            writer = None
+
+            logger.info(f"Exported {count} rows to Parquet: {file_path}")
+            return count
+
+        except Exception as e:
+            logger.error(f"Error exporting to Parquet: {e}", exc_info=True)
+            if writer is not None:
+                writer.close()
+            self._discard(file_path)
+            return 0
+
+    @staticmethod
+    def _normalize(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Store nested values as JSON so the schema stays flat."""
+        return {
+            key: json.dumps(value, default=_json_default) if isinstance(value, (dict, list)) else value
+            for key, value in row.items()
+        }
+
+    @staticmethod
+    def _infer_schema(records: List[Dict[str, Any]]) -> "pa.Schema":
+        """Infer a schema from the first chunk; all-null columns become strings."""
+        schema = pa.Table.from_pylist(records).schema
+        return pa.schema([
+            pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field
+            for field in schema
+        ])
 
 
 class DataExporter:
@@ -250,29 +484,56 @@ class DataExporter:
             ExportFormat.JSON: JSONExporter(),
             ExportFormat.EXCEL: ExcelExporter(),
             ExportFormat.PDF: PDFExporter(),
+            ExportFormat.PARQUET: ParquetExporter(),
         }
 
         logger.info(f"Data exporter initialized: {export_dir}")
 
     def export(
         self,
-        data: List[Dict[str, Any]],
+        data: Iterable[Dict[str, Any]],
         format: ExportFormat,
         filename: Optional[str] = None,
+        compress: bool = False,
         **kwargs
     ) -> Optional[str]:
         """
         Export data in specified format.
 
         Args:
-            data: Data to export
+            data: Rows to export (list or any iterable, consumed once)
             format: Export format
             filename: Optional filename
+            compress: Gzip CSV/JSON output (Parquet uses gzip codec)
             **kwargs: Additional export options
 
         Returns:
             File path if successful, None otherwise
         """
+        result = self.export_stream(data, format, filename, compress, **kwargs)
+        return result[0] if result else None
+
+    def export_stream(
+        self,
+        rows: Iterable[Dict[str, Any]],
+        format: ExportFormat,
+        filename: Optional[str] = None,
+        compress: bool = False,
+        **kwargs
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Stream rows to an export file.
+
+        Args:
+            rows: Row iterable, e.g. from stream_query
+            format: Export format
+            filename: Optional filename
+            compress: Gzip CSV/JSON output (Parquet uses gzip codec)
+            **kwargs: Additional export options
+
+        Returns:
+            Tuple of (file path, row count) if successful, None otherwise
+        """
         try:
             # Get exporter
             exporter = self.exporters.get(format)
@@ -283,15 +544,17 @@ class DataExporter:
             # Generate filename
             if not filename:
                 timestamp = get_utc_now().strftime("%Y%m%d_%H%M%S")
-                filename = f"export_{timestamp}.{format.value}"
+                filename = f"export_{timestamp}.{EXPORT_EXTENSIONS.get(format, format.value)}"
+                if compress and format in (ExportFormat.CSV, ExportFormat.JSON):
+                    filename += ".gz"
 
             file_path = str(self.export_dir / filename)
 
             # Export
-            success = exporter.export(data, file_path, **kwargs)
+            count = exporter.export_stream(rows, file_path, compress=compress, **kwargs)
 
-            if success:
-                return file_path
+            if count:
+                return file_path, count
             else:
                 return None
 
@@ -299,6 +562,33 @@ class DataExporter:
             logger.error(f"Error in export: {e}", exc_info=True)
             return None
 
+    def export_query(
+        self,
+        session: Session,
+        statement: Any,
+        format: ExportFormat,
+        filename: Optional[str] = None,
+        compress: bool = False,
+        **kwargs
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Export a query result through a server-side cursor.
+
+        Args:
+            session: Database session
+            statement: SQLAlchemy select statement
+            format: Export format
+            filename: Optional filename
+            compress: Gzip CSV/JSON output (Parquet uses gzip codec)
+            **kwargs: Additional export options
+
+        Returns:
+            Tuple of (file path, row count) if successful, None otherwise
+        """
+        return self.export_stream(
+            stream_query(session, statement), format, filename, compress, **kwargs
+        )
+
     def cleanup_old_exports(self, days: int = 7) -> int:
         """
         Clean up export files older than specified days.
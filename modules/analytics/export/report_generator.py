@@ -6,18 +6,27 @@ Custom report generation with templates.
 
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 from jinja2 import Template
+from sqlalchemy import and_, select
 
 from modules.analytics.core.aggregator import DataAggregator
 from modules.analytics.export.exporters import DataExporter
 from modules.analytics.storage.database import Database
+from modules.analytics.storage.models import EventORM, MetricORM, SessionORM
 from shared.constants import ExportFormat
 from shared.utils import format_number, get_time_range, get_utc_now
 
 logger = logging.getLogger(__name__)
 
+# Raw export sources: export type -> (model, time column name)
+EXPORT_SOURCES = {
+    "events": (EventORM, "timestamp"),
+    "sessions": (SessionORM, "started_at"),
+    "metrics": (MetricORM, "timestamp"),
+}
+
 
 class ReportGenerator:
     """Custom report generator."""
@@ -106,25 +115,22 @@ class ReportGenerator:
             File path if successful
         """
         try:
-            report_data = []
-
-            for section in sections:
-                section_title = section.get("title", "Section")
-                section_data = section.get("data", [])
+            def report_rows() -> Iterator[Dict[str, Any]]:
+                for section in sections:
+                    section_title = section.get("title", "Section")
 
-                # Add section header
-                report_data.append({
-                    "Section": section_title,
-                    "Data": ""
-                })
+                    # Add section header
+                    yield {
+                        "Section": section_title,
+                        "Data": ""
+                    }
 
-                # Add section data
-                for item in section_data:
-                    report_data.append(item)
+                    # Add section data (may itself be a row iterator)
+                    yield from section.get("data", [])
 
             # Export
             return self.exporter.export(
-                report_data,
+                report_rows(),
                 format,
                 title=title
             )
@@ -132,3 +138,55 @@ class ReportGenerator:
         except Exception as e:
             logger.error(f"Error generating custom report: {e}", exc_info=True)
             return None
+
+    def export_raw_data(
+        self,
+        export_type: str,
+        start_date: datetime,
+        end_date: datetime,
+        format: ExportFormat = ExportFormat.CSV,
+        compress: bool = False,
+        filename: Optional[str] = None,
+    ) -> Optional[Tuple[str, int]]:
+        """
+        Export raw rows for a time range without loading them into memory.
+
+        Rows are read through a server-side cursor and written chunk by
+        chunk by the format's exporter.
+
+        Args:
+            export_type: Source table key in EXPORT_SOURCES
+            start_date: Range start
+            end_date: Range end
+            format: Export format
+            compress: Gzip the output where the format allows it
+            filename: Optional filename
+
+        Returns:
+            Tuple of (file path, row count) if successful
+        """
+        try:
+            source = EXPORT_SOURCES.get(export_type)
+            if source is None:
+                logger.error(f"Unsupported export type: {export_type}")
+                return None
+
+            model, time_field = source
+            time_column = getattr(model, time_field)
+            statement = select(*model.__table__.columns).where(
+                and_(time_column >= start_date, time_column <= end_date)
+            ).order_by(time_column)
+
+            with self.db.session() as session:
+                return self.exporter.export_query(
+                    session,
+                    statement,
+                    format,
+                    filename=filename,
+                    compress=compress,
+                    title=f"{export_type.title()} Export",
+                )
+
+        except Exception as e:
+            logger.error(f"Error exporting {export_type}: {e}", exc_info=True)
+            return None
@@ -75,6 +75,22 @@ class CohortAnalysis(BaseModel):
     churn_rate: float
 
 
+class RetentionMatrix(BaseModel):
+    """Dense cohort x period retention grid."""
+
+    period_type: AggregationPeriod
+    start_date: datetime
+    end_date: datetime
+    cohort_dates: List[datetime] = Field(..., description="Start of each cohort (rows)")
+    cohort_sizes: List[int] = Field(..., description="Users acquired in each cohort")
+    active_users: List[List[int]] = Field(
+        ..., description="Active users per cohort (row) and period (column)"
+    )
+    retention_rates: List[List[float]] = Field(
+        ..., description="Retention rate per cohort (row) and period (column)"
+    )
+
+
 class CohortComparisonMetric(BaseModel):
     """Metric comparison across cohorts."""
 
@@ -92,3 +108,6 @@ class CohortQuery(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     periods: int = Field(default=12, ge=1, le=52, description="Number of periods")
+    period_type: AggregationPeriod = Field(
+        default=AggregationPeriod.WEEK, description="Period type for retention"
+    )
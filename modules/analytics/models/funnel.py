@@ -106,3 +106,9 @@ class FunnelQuery(BaseModel):
     start_date: Optional[datetime] = None
     end_date: Optional[datetime] = None
     user_segment: Optional[str] = None
+    incremental: bool = Field(
+        default=False, description="Use the ordered, incremental funnel engine"
+    )
+    conversion_window_seconds: Optional[int] = Field(
+        None, gt=0, description="Maximum time from entering to completing (incremental only)"
+    )
@@ -4,11 +4,14 @@ Attribution Modeling
 Multi-channel attribution for conversions.
 """
 
+import bisect
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+import math
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from sqlalchemy import and_
+from sqlalchemy import and_, select
 from sqlalchemy.orm import Session
 
 from modules.analytics.storage.database import Database
@@ -18,6 +21,24 @@ from shared.utils import safe_divide
 
 logger = logging.getLogger(__name__)
 
+# Event types counted as marketing touchpoints
+TOUCHPOINT_EVENT_TYPES = [
+    'page_view', 'button_click', 'link_click',
+    'search_query', 'module_open'
+]
+
+# Models supported by the bulk attribution pass
+BULK_ATTRIBUTION_MODELS = [
+    AttributionModel.FIRST_TOUCH,
+    AttributionModel.LAST_TOUCH,
+    AttributionModel.LINEAR,
+    AttributionModel.TIME_DECAY,
+    AttributionModel.POSITION_BASED,
+]
+
+# Touchpoint rows fetched per round trip in bulk attribution
+ATTRIBUTION_SCAN_CHUNK_SIZE = 10_000
+
 
 class AttributionEngine:
     """Multi-channel attribution engine."""
@@ -80,6 +101,222 @@ class AttributionEngine:
             logger.error(f"Error calculating attribution: {e}", exc_info=True)
             return {}
 
+    def calculate_bulk_attribution(
+        self,
+        start_date: datetime,
+        end_date: datetime,
+        models: Optional[List[AttributionModel]] = None,
+        lookback_days: int = 30,
+    ) -> Dict[str, Any]:
+        """
+        Calculate attribution for all conversions in a date range.
+
+        Touchpoints of every converting user are read with one windowed,
+        user-ordered query and each conversion is credited under all
+        requested models in a single pass over its touchpoints.
+
+        Args:
+            start_date: Conversion range start
+            end_date: Conversion range end
+            models: Attribution models to compute (defaults to all supported)
+            lookback_days: Touchpoint lookback window per conversion
+
+        Returns:
+            Dictionary with conversion counts and per-model channel totals
+        """
+        models = [AttributionModel(m) for m in (models or BULK_ATTRIBUTION_MODELS)]
+        unsupported = [m for m in models if m not in BULK_ATTRIBUTION_MODELS]
+        if unsupported:
+            logger.warning(f"Skipping unsupported attribution models: {unsupported}")
+            models = [m for m in models if m in BULK_ATTRIBUTION_MODELS]
+
+        totals: Dict[str, Dict[str, float]] = {m.value: defaultdict(float) for m in models}
+        lookback = timedelta(days=lookback_days)
+        conversion_count = 0
+        attributed_count = 0
+
+        try:
+            with self.db.session() as session:
+                conversions = self._get_conversions_by_user(session, start_date, end_date)
+                conversion_count = sum(len(times) for times in conversions.values())
+
+                for user_id, touchpoints in self._iter_user_touchpoints(
+                    session, start_date - lookback, end_date, start_date, end_date
+                ):
+                    timestamps = [timestamp for timestamp, _ in touchpoints]
+
+                    for converted_at in conversions.get(user_id, []):
+                        low = bisect.bisect_left(timestamps, converted_at - lookback)
+                        high = bisect.bisect_right(timestamps, converted_at)
+                        if low == high:
+                            continue
+
+                        credits = self._credit_all_models(
+                            touchpoints[low:high], converted_at, models
+                        )
+                        for model, channel_credits in credits.items():
+                            for channel, credit in channel_credits.items():
+                                totals[model][channel] += credit
+                        attributed_count += 1
+
+        except Exception as e:
+            logger.error(f"Error calculating bulk attribution: {e}", exc_info=True)
+            return {}
+
+        return {
+            "start_date": start_date,
+            "end_date": end_date,
+            "conversions": conversion_count,
+            "attributed_conversions": attributed_count,
+            "models": {
+                model: dict(sorted(channels.items(), key=lambda item: -item[1]))
+                for model, channels in totals.items()
+            },
+        }
+
+    def _get_conversions_by_user(
+        self,
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, List[datetime]]:
+        """Get conversion times in range grouped by user."""
+        rows = session.query(
+            GoalConversionORM.user_id,
+            GoalConversionORM.converted_at,
+        ).filter(
+            and_(
+                GoalConversionORM.converted_at >= start_date,
+                GoalConversionORM.converted_at <= end_date,
+            )
+        ).all()
+
+        conversions: Dict[str, List[datetime]] = defaultdict(list)
+        for user_id, converted_at in rows:
+            conversions[user_id].append(converted_at)
+        return conversions
+
+    def _iter_user_touchpoints(
+        self,
+        session: Session,
+        window_start: datetime,
+        window_end: datetime,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Iterable[Tuple[str, List[Tuple[datetime, str]]]]:
+        """
+        Stream touchpoints of converting users, grouped by user.
+
+        Yields:
+            Tuples of user ID and that user's time-ordered (timestamp, channel)
+            touchpoints within the window
+        """
+        converting_users = select(GoalConversionORM.user_id).where(
+            and_(
+                GoalConversionORM.converted_at >= start_date,
+                GoalConversionORM.converted_at <= end_date,
+            )
+        ).distinct()
+
+        query = (
+            select(
+                EventORM.user_id,
+                EventORM.timestamp,
+                EventORM.properties,
+                EventORM.referrer,
+            )
+            .where(
+                and_(
+                    EventORM.user_id.in_(converting_users),
+                    EventORM.timestamp >= window_start,
+                    EventORM.timestamp <= window_end,
+                    EventORM.event_type.in_(TOUCHPOINT_EVENT_TYPES),
+                )
+            )
+            .order_by(EventORM.user_id, EventORM.timestamp)
+            .execution_options(stream_results=True, yield_per=ATTRIBUTION_SCAN_CHUNK_SIZE)
+        )
+
+        current_user = None
+        touchpoints: List[Tuple[datetime, str]] = []
+
+        for user_id, timestamp, properties, referrer in session.execute(query):
+            if user_id != current_user:
+                if touchpoints:
+                    yield current_user, touchpoints
+                current_user, touchpoints = user_id, []
+
+            touchpoints.append((timestamp, self._resolve_channel(properties, referrer)))
+
+        if touchpoints:
+            yield current_user, touchpoints
+
+    def _credit_all_models(
+        self,
+        touchpoints: List[Tuple[datetime, str]],
+        conversion_date: datetime,
+        models: List[AttributionModel],
+    ) -> Dict[str, Dict[str, float]]:
+        """
+        Credit one conversion under several models in a single pass.
+
+        Args:
+            touchpoints: Time-ordered (timestamp, channel) pairs
+            conversion_date: Conversion time
+            models: Attribution models to compute
+
+        Returns:
+            Channel credits keyed by model value
+        """
+        count = len(touchpoints)
+        credits = {model.value: defaultdict(float) for model in models}
+
+        first_touch = credits.get(AttributionModel.FIRST_TOUCH.value)
+        last_touch = credits.get(AttributionModel.LAST_TOUCH.value)
+        linear = credits.get(AttributionModel.LINEAR.value)
+        time_decay = credits.get(AttributionModel.TIME_DECAY.value)
+        position = credits.get(AttributionModel.POSITION_BASED.value)
+
+        decay_weights = []
+        for index, (timestamp, channel) in enumerate(touchpoints):
+            if linear is not None:
+                linear[channel] += 1.0 / count
+
+            if time_decay is not None:
+                # 7-day half-life, matching _time_decay_attribution
+                weight = math.exp(-(conversion_date - timestamp).days / 7)
+                decay_weights.append((channel, weight))
+
+            if position is not None:
+                if count == 1:
+                    position[channel] += 1.0
+                elif count == 2:
+                    position[channel] += 0.5
+                elif index in (0, count - 1):
+                    position[channel] += 0.4
+                else:
+                    position[channel] += 0.2 / (count - 2)
+
+        if first_touch is not None:
+            first_touch[touchpoints[0][1]] += 1.0
+        if last_touch is not None:
+            last_touch[touchpoints[-1][1]] += 1.0
+        if time_decay is not None:
+            total_weight = sum(weight for _, weight in decay_weights)
+            for channel, weight in decay_weights:
+                time_decay[channel] += weight / total_weight
+
+        return credits
+
+    @staticmethod
+    def _resolve_channel(properties: Optional[Dict[str, Any]], referrer: Optional[str]) -> str:
+        """Resolve a marketing channel from event properties and referrer."""
+        return (properties or {}).get("utm_source") or referrer or "direct"
+
+    def _get_channel(self, touchpoint: EventORM) -> str:
+        """Get the marketing channel of a touchpoint event."""
+        return self._resolve_channel(touchpoint.properties, touchpoint.referrer)
+
     def _get_touchpoints(
         self,
         session: Session,
@@ -88,8 +325,6 @@ class AttributionEngine:
         lookback_days: int = 30
     ) -> List[EventORM]:
         """Get user touchpoints before conversion."""
-        from datetime import timedelta
-
         lookback_start = conversion_date - timedelta(days=lookback_days)
 
         touchpoints = session.query(EventORM).filter(
@@ -97,10 +332,7 @@ class AttributionEngine:
                 EventORM.user_id == user_id,
                 EventORM.timestamp >= lookback_start,
                 EventORM.timestamp <= conversion_date,
-                EventORM.event_type.in_([
-                    'page_view', 'button_click', 'link_click',
-                    'search_query', 'module_open'
-                ])
+                EventORM.event_type.in_(TOUCHPOINT_EVENT_TYPES)
             )
         ).order_by(EventORM.timestamp).all()
 
@@ -112,7 +344,7 @@ class AttributionEngine:
             return {}
 
         first_touchpoint = touchpoints[0]
-        channel = first_touchpoint.utm_source or first_touchpoint.referrer or "direct"
+        channel = self._get_channel(first_touchpoint)
 
         return {channel: 1.0}
 
@@ -122,7 +354,7 @@ class AttributionEngine:
             return {}
 
         last_touchpoint = touchpoints[-1]
-        channel = last_touchpoint.utm_source or last_touchpoint.referrer or "direct"
+        channel = self._get_channel(last_touchpoint)
 
         return {channel: 1.0}
 
@@ -135,7 +367,7 @@ class AttributionEngine:
         attribution = {}
 
         for touchpoint in touchpoints:
-            channel = touchpoint.utm_source or touchpoint.referrer or "direct"
+            channel = self._get_channel(touchpoint)
             attribution[channel] = attribution.get(channel, 0.0) + credit_per_touchpoint
 
         return attribution
@@ -149,8 +381,6 @@ class AttributionEngine:
         if not touchpoints:
             return {}
 
-        import math
-
         # Calculate time-based weights (exponential decay)
         weights = []
         total_weight = 0
@@ -165,7 +395,7 @@ class AttributionEngine:
         attribution = {}
 
         for touchpoint, weight in zip(touchpoints, weights):
-            channel = touchpoint.utm_source or touchpoint.referrer or "direct"
+            channel = self._get_channel(touchpoint)
             credit = weight / total_weight
             attribution[channel] = attribution.get(channel, 0.0) + credit
 
@@ -180,21 +410,21 @@ class AttributionEngine:
 
         if len(touchpoints) == 1:
             # Single touchpoint gets 100%
-            channel = touchpoints[0].utm_source or touchpoints[0].referrer or "direct"
+            channel = self._get_channel(touchpoints[0])
             attribution[channel] = 1.0
         elif len(touchpoints) == 2:
             # First and last get 50% each
-            first_channel = touchpoints[0].utm_source or touchpoints[0].referrer or "direct"
-            last_channel = touchpoints[-1].utm_source or touchpoints[-1].referrer or "direct"
+            first_channel = self._get_channel(touchpoints[0])
+            last_channel = self._get_channel(touchpoints[-1])
             attribution[first_channel] = attribution.get(first_channel, 0.0) + 0.5
             attribution[last_channel] = attribution.get(last_channel, 0.0) + 0.5
         else:
             # First gets 40%
-            first_channel = touchpoints[0].utm_source or touchpoints[0].referrer or "direct"
+            first_channel = self._get_channel(touchpoints[0])
             attribution[first_channel] = attribution.get(first_channel, 0.0) + 0.4
 
             # Last gets 40%
-            last_channel = touchpoints[-1].utm_source or touchpoints[-1].referrer or "direct"
+            last_channel = self._get_channel(touchpoints[-1])
             attribution[last_channel] = attribution.get(last_channel, 0.0) + 0.4
 
             # Middle touchpoints share 20%
@@ -202,7 +432,7 @@ class AttributionEngine:
             credit_per_middle = 0.2 / len(middle_touchpoints)
 
             for touchpoint in middle_touchpoints:
-                channel = touchpoint.utm_source or touchpoint.referrer or "direct"
+                channel = self._get_channel(touchpoint)
                 attribution[channel] = attribution.get(channel, 0.0) + credit_per_middle
 
         return attribution
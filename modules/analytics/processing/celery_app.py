@@ -84,10 +84,27 @@ def create_celery_app(config: CeleryConfig) -> Celery:
             "task": "modules.analytics.processing.tasks.aggregate_metrics_task",
             "schedule": crontab(minute=0),  # Every hour
         },
+        "update-rollups-every-5-minutes": {
+            "task": "modules.analytics.processing.tasks.update_rollups_task",
+            "schedule": 300.0,  # Every 5 minutes
+        },
         "cleanup-expired-exports": {
             "task": "modules.analytics.processing.tasks.cleanup_exports_task",
             "schedule": crontab(hour=2, minute=0),  # Daily at 2 AM
         },
+        "attribution-report-nightly": {
+            "task": "modules.analytics.processing.tasks.attribution_report_task",
+            "schedule": crontab(hour=3, minute=0),  # Daily at 3 AM
+        },
+        "score-users-hourly": {
+            "task": "modules.analytics.processing.tasks.score_users_task",
+            "schedule": crontab(minute=30),  # Every hour, incremental
+        },
+        "score-users-full-weekly": {
+            "task": "modules.analytics.processing.tasks.score_users_task",
+            "schedule": crontab(hour=4, minute=0, day_of_week=0),  # Sundays at 4 AM
+            "kwargs": {"incremental": False},
+        },
     }
 
     logger.info("Celery application created")
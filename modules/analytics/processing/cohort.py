@@ -5,17 +5,24 @@ Cohort analysis and retention tracking.
 """
 
 import logging
+import math
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import List, Optional, Tuple
 
+import numpy as np
 from sqlalchemy import and_, func
 from sqlalchemy.orm import Session
 
-from modules.analytics.models.cohort import CohortAnalysis, CohortRetention
-from modules.analytics.storage.database import Database
+from modules.analytics.models.cohort import (
+    CohortAnalysis,
+    CohortRetention,
+    RetentionMatrix,
+)
+from modules.analytics.storage.cache import RedisCache
+from modules.analytics.storage.database import Database, as_naive_utc
 from modules.analytics.storage.models import SessionORM, UserORM
 from modules.analytics.storage.repositories import CohortRepository
-from shared.constants import AggregationPeriod, CohortType
+from shared.constants import CACHE_TTL_LONG, AggregationPeriod, CohortType
 from shared.utils import safe_divide
 
 logger = logging.getLogger(__name__)
@@ -24,12 +31,211 @@ logger = logging.getLogger(__name__)
 class CohortEngine:
     """Cohort analysis engine."""
 
-    def __init__(self, db: Database):
-        """Initialize cohort engine."""
+    def __init__(self, db: Database, cache: Optional[RedisCache] = None):
+        """
+        Initialize cohort engine.
+
+        Args:
+            db: Database instance
+            cache: Optional cache for retention matrices
+        """
         self.db = db
+        self.cache = cache
         self.repository = CohortRepository()
         logger.info("Cohort engine initialized")
 
+    def analyze_retention_matrix(
+        self,
+        start_date: Optional[datetime],
+        end_date: datetime,
+        periods: int = 12,
+        period_type: AggregationPeriod = AggregationPeriod.WEEK,
+        use_cache: bool = True,
+    ) -> Optional[RetentionMatrix]:
+        """
+        Build the full cohort x period retention grid.
+
+        Cohorts are consecutive periods starting at ``start_date``; period
+        ``p`` of a cohort has the same bounds as in
+        :meth:`analyze_retention_cohort`. Two queries fetch first-seen and
+        session timestamps, and the grid is computed with one vectorized
+        NumPy pass instead of one query per cell.
+
+        Args:
+            start_date: Start of the first cohort (defaults to ``periods``
+                periods of ``period_type`` before ``end_date``)
+            end_date: End of the cohort range (exclusive)
+            periods: Number of periods per cohort
+            period_type: Period type (day, week, month)
+            use_cache: Read and write the cached matrix
+
+        Returns:
+            Retention matrix
+        """
+        delta = self._get_period_delta(period_type)
+        if start_date is None:
+            start_date = end_date - delta * periods
+        start_date, end_date = as_naive_utc(start_date), as_naive_utc(end_date)
+
+        cache_key = (
+            f"cohort:retention_matrix:{AggregationPeriod(period_type).value}:"
+            f"{start_date.isoformat()}:{end_date.isoformat()}:{periods}"
+        )
+
+        if self.cache and use_cache:
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                return RetentionMatrix(**cached)
+
+        try:
+            num_cohorts = max(math.ceil((end_date - start_date) / delta), 0)
+            activity_end = start_date + delta * (num_cohorts + periods)
+
+            with self.db.session() as session:
+                user_ids, first_seen = self._load_first_seen(session, start_date, end_date)
+                session_users, started = self._load_activity(
+                    session, start_date, end_date, activity_end
+                )
+
+            cohort_sizes, active = self._compute_retention_grid(
+                start_date,
+                delta,
+                num_cohorts,
+                periods,
+                user_ids,
+                first_seen,
+                session_users,
+                started,
+            )
+
+            with np.errstate(divide="ignore", invalid="ignore"):
+                rates = np.where(
+                    cohort_sizes[:, None] > 0,
+                    active * 100.0 / cohort_sizes[:, None],
+                    0.0,
+                )
+
+            matrix = RetentionMatrix(
+                period_type=period_type,
+                start_date=start_date,
+                end_date=end_date,
+                cohort_dates=[start_date + delta * c for c in range(num_cohorts)],
+                cohort_sizes=cohort_sizes.tolist(),
+                active_users=active.tolist(),
+                retention_rates=np.round(rates, 2).tolist(),
+            )
+
+            if self.cache and use_cache:
+                self.cache.set(cache_key, matrix.model_dump(), ttl=CACHE_TTL_LONG)
+
+            return matrix
+
+        except Exception as e:
+            logger.error(f"Error building retention matrix: {e}", exc_info=True)
+            return None
+
+    def _load_first_seen(
+        self,
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Load (user_id, first_seen_at) for users acquired in range."""
+        rows = session.query(UserORM.id, UserORM.first_seen_at).filter(
+            and_(
+                UserORM.first_seen_at >= start_date,
+                UserORM.first_seen_at < end_date,
+            )
+        ).all()
+
+        user_ids = np.array([row[0] for row in rows], dtype=object)
+        first_seen = np.array([as_naive_utc(row[1]) for row in rows], dtype="datetime64[us]")
+        return user_ids, first_seen
+
+    def _load_activity(
+        self,
+        session: Session,
+        start_date: datetime,
+        end_date: datetime,
+        activity_end: datetime,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Load (user_id, started_at) for sessions of users acquired in range."""
+        rows = session.query(SessionORM.user_id, SessionORM.started_at).join(
+            UserORM, UserORM.id == SessionORM.user_id
+        ).filter(
+            and_(
+                UserORM.first_seen_at >= start_date,
+                UserORM.first_seen_at < end_date,
+                SessionORM.started_at >= start_date,
+                SessionORM.started_at < activity_end,
+            )
+        ).all()
+
+        user_ids = np.array([row[0] for row in rows], dtype=object)
+        started = np.array([as_naive_utc(row[1]) for row in rows], dtype="datetime64[us]")
+        return user_ids, started
+
+    @staticmethod
+    def _compute_retention_grid(
+        start_date: datetime,
+        delta: timedelta,
+        num_cohorts: int,
+        periods: int,
+        user_ids: np.ndarray,
+        first_seen: np.ndarray,
+        session_users: np.ndarray,
+        started: np.ndarray,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Count cohort sizes and distinct active users per (cohort, period).
+
+        Args:
+            start_date: Start of the first cohort
+            delta: Period length
+            num_cohorts: Number of cohorts
+            periods: Number of periods per cohort
+            user_ids: Cohort user IDs
+            first_seen: First-seen time per cohort user
+            session_users: User ID per session
+            started: Start time per session
+
+        Returns:
+            Tuple of cohort sizes (num_cohorts,) and active users
+            (num_cohorts, periods)
+        """
+        origin = np.datetime64(as_naive_utc(start_date), "us")
+        step = np.timedelta64(delta, "us")
+
+        if len(user_ids) == 0:
+            return (
+                np.zeros(num_cohorts, dtype=np.int64),
+                np.zeros((num_cohorts, periods), dtype=np.int64),
+            )
+
+        user_cohort = ((first_seen - origin) // step).astype(np.int64)
+        cohort_sizes = np.bincount(user_cohort, minlength=num_cohorts)[:num_cohorts]
+
+        active = np.zeros((num_cohorts, periods), dtype=np.int64)
+        if len(session_users) == 0:
+            return cohort_sizes, active
+
+        # Map session users onto cohort users, dropping any that were not loaded
+        order = np.argsort(user_ids)
+        slots = np.searchsorted(user_ids, session_users, sorter=order)
+        positions = order[np.minimum(slots, len(order) - 1)]
+        known = user_ids[positions] == session_users
+
+        cohort = user_cohort[positions]
+        period = ((started - origin) // step).astype(np.int64) - cohort
+        valid = known & (period >= 0) & (period < periods)
+
+        # Distinct (user, cell) pairs, then count per cell
+        cells = cohort[valid] * periods + period[valid]
+        pairs = np.unique(positions[valid].astype(np.int64) * (num_cohorts * periods) + cells)
+        counts = np.bincount(pairs % (num_cohorts * periods), minlength=num_cohorts * periods)
+
+        return cohort_sizes, counts.reshape(num_cohorts, periods)
+
     def analyze_retention_cohort(
         self,
         cohort_date: datetime,
@@ -165,16 +371,20 @@ class CohortEngine:
         period_type: AggregationPeriod
     ) -> tuple:
         """Get start and end dates for a period."""
-        if period_type == AggregationPeriod.DAY:
-            delta = timedelta(days=1)
-        elif period_type == AggregationPeriod.WEEK:
-            delta = timedelta(weeks=1)
-        elif period_type == AggregationPeriod.MONTH:
-            delta = timedelta(days=30)
-        else:
-            delta = timedelta(days=1)
+        delta = self._get_period_delta(period_type)
 
         period_start = cohort_date + (delta * period)
         period_end = period_start + delta
 
         return period_start, period_end
+
+    @staticmethod
+    def _get_period_delta(period_type: AggregationPeriod) -> timedelta:
+        """Get the length of one period."""
+        if period_type == AggregationPeriod.DAY:
+            return timedelta(days=1)
+        if period_type == AggregationPeriod.WEEK:
+            return timedelta(weeks=1)
+        if period_type == AggregationPeriod.MONTH:
+            return timedelta(days=30)
+        return timedelta(days=1)
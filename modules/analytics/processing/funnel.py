@@ -4,21 +4,31 @@ Funnel Analysis Engine
 Funnel analysis and conversion tracking.
 """
 
+import hashlib
 import logging
-from datetime import datetime
-from typing import Dict, List, Optional
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
-from sqlalchemy import and_, func
+from sqlalchemy import and_, func, select
 from sqlalchemy.orm import Session
 
 from modules.analytics.models.funnel import FunnelAnalysis, FunnelStepStats
-from modules.analytics.storage.database import Database
+from modules.analytics.storage.database import Database, as_naive_utc
 from modules.analytics.storage.models import EventORM, FunnelORM, FunnelStepORM
-from modules.analytics.storage.repositories import FunnelRepository
+from modules.analytics.storage.repositories import (
+    FunnelRepository,
+    FunnelStateRepository,
+)
 from shared.utils import safe_divide
 
 logger = logging.getLogger(__name__)
 
+# Events fetched per round trip during the ordered scan
+FUNNEL_SCAN_CHUNK_SIZE = 10_000
+
+# Analysis window used when no start date is given and no state exists
+DEFAULT_FUNNEL_WINDOW = timedelta(days=30)
+
 
 class FunnelEngine:
     """Funnel analysis engine."""
@@ -200,3 +210,343 @@ class FunnelEngine:
             completion_rate=round(completion_rate, 2),
             drop_off_rate=round(drop_off_rate, 2)
         )
+
+
+class IncrementalFunnelEngine:
+    """
+    Funnel engine over one time-ordered event scan.
+
+    Each user advances through a compact state machine that enforces step
+    order and an optional conversion window. States and a watermark are
+    persisted per funnel, so re-running the same funnel over a later end
+    date only reads events newer than the previous run.
+    """
+
+    def __init__(self, db: Database, chunk_size: int = FUNNEL_SCAN_CHUNK_SIZE):
+        """
+        Initialize incremental funnel engine.
+
+        Args:
+            db: Database instance
+            chunk_size: Events fetched per round trip during the scan
+        """
+        self.db = db
+        self.chunk_size = chunk_size
+        self.repository = FunnelRepository()
+        self.state_repo = FunnelStateRepository()
+        logger.info("Incremental funnel engine initialized")
+
+    def analyze_funnel(
+        self,
+        funnel_id: str,
+        start_date: Optional[datetime],
+        end_date: datetime,
+        conversion_window: Optional[timedelta] = None,
+    ) -> Optional[FunnelAnalysis]:
+        """
+        Analyze ordered funnel conversion.
+
+        Persisted state is reused when the funnel steps, start date and
+        conversion window match the previous run and ``end_date`` has not
+        moved backwards; otherwise state is rebuilt from ``start_date``.
+        Without a start date the previous run's start is kept, so repeated
+        calls with a moving end date stay incremental.
+
+        A resumed run only reads events after the previous ``end_date``.
+        Events that arrive later with an earlier timestamp are therefore
+        not counted until the state is rebuilt, e.g. by changing the start
+        date.
+
+        Args:
+            funnel_id: Funnel ID
+            start_date: Analysis start date (defaults to the persisted
+                start, or DEFAULT_FUNNEL_WINDOW before ``end_date``)
+            end_date: Analysis end date
+            conversion_window: Maximum time from entering to completing
+
+        Returns:
+            Funnel analysis results
+        """
+        try:
+            with self.db.session() as session:
+                funnel = self.repository.get_by_id(session, funnel_id)
+                if not funnel or not funnel.steps:
+                    logger.error(f"Funnel not found: {funnel_id}")
+                    return None
+
+                sorted_steps = sorted(funnel.steps, key=lambda s: s.order)
+                step_types = [step.event_type for step in sorted_steps]
+                window_seconds = (
+                    int(conversion_window.total_seconds()) if conversion_window else None
+                )
+                signature = self._steps_signature(step_types)
+
+                # Checkpoints are stored as naive UTC
+                end_date = as_naive_utc(end_date)
+                checkpoint = self.state_repo.get_checkpoint(session, funnel_id)
+                if start_date is not None:
+                    start_date = as_naive_utc(start_date)
+                elif checkpoint is not None:
+                    start_date = checkpoint.window_start
+                else:
+                    start_date = end_date - DEFAULT_FUNNEL_WINDOW
+
+                resumable = (
+                    checkpoint is not None
+                    and checkpoint.window_start == start_date
+                    and checkpoint.conversion_window_seconds == window_seconds
+                    and checkpoint.steps_signature == signature
+                    and checkpoint.processed_until <= end_date
+                )
+
+                if resumable:
+                    scan_from = checkpoint.processed_until
+                else:
+                    self.state_repo.reset(session, funnel_id)
+                    scan_from = start_date
+
+                scanned = self._fold_events(
+                    session,
+                    funnel_id,
+                    step_types,
+                    scan_from,
+                    end_date,
+                    conversion_window,
+                    resume=resumable,
+                )
+
+                self.state_repo.save_checkpoint(
+                    session,
+                    funnel_id,
+                    window_start=start_date,
+                    processed_until=end_date,
+                    conversion_window_seconds=window_seconds,
+                    steps_signature=signature,
+                )
+                session.commit()
+
+                logger.info(
+                    f"Funnel {funnel_id}: scanned {scanned} events "
+                    f"({'incremental' if resumable else 'full'})"
+                )
+
+                return self._build_analysis(
+                    session, funnel, sorted_steps, start_date, end_date
+                )
+
+        except Exception as e:
+            logger.error(f"Error analyzing funnel incrementally: {e}", exc_info=True)
+            return None
+
+    def _fold_events(
+        self,
+        session: Session,
+        funnel_id: str,
+        step_types: List[str],
+        scan_from: datetime,
+        end_date: datetime,
+        conversion_window: Optional[timedelta],
+        resume: bool,
+    ) -> int:
+        """
+        Advance user states over new events and persist them.
+
+        Args:
+            session: Database session
+            funnel_id: Funnel ID
+            step_types: Event type of each step, in order
+            scan_from: Lower time bound of the scan
+            end_date: Upper time bound of the scan (inclusive)
+            conversion_window: Maximum time from entering to completing
+            resume: Continue from persisted state; ``scan_from`` is then
+                an exclusive watermark and existing states are loaded
+
+        Returns:
+            Number of events scanned
+        """
+        states: Dict[str, Dict[str, Any]] = {}
+        dirty = set()
+        scanned = 0
+
+        for chunk in self._scan_events(
+            session, set(step_types), scan_from, end_date, inclusive=not resume
+        ):
+            unseen = {user_id for user_id, _, _ in chunk if user_id not in states}
+            if unseen:
+                loaded = (
+                    self.state_repo.get_states(session, funnel_id, unseen) if resume else {}
+                )
+                for user_id in unseen:
+                    states[user_id] = loaded.get(user_id) or self._new_state()
+
+            for user_id, event_type, timestamp in chunk:
+                if self._advance(states[user_id], event_type, timestamp, step_types, conversion_window):
+                    dirty.add(user_id)
+
+            scanned += len(chunk)
+
+        self.state_repo.upsert_states(
+            session, funnel_id, {user_id: states[user_id] for user_id in dirty}
+        )
+        return scanned
+
+    def _scan_events(
+        self,
+        session: Session,
+        event_types: set,
+        scan_from: datetime,
+        end_date: datetime,
+        inclusive: bool,
+    ) -> Iterator[List[Tuple[str, str, datetime]]]:
+        """Yield (user_id, event_type, timestamp) chunks in time order."""
+        lower = (
+            EventORM.timestamp >= scan_from if inclusive else EventORM.timestamp > scan_from
+        )
+        query = (
+            select(EventORM.user_id, EventORM.event_type, EventORM.timestamp)
+            .where(
+                and_(
+                    EventORM.event_type.in_(event_types),
+                    lower,
+                    EventORM.timestamp <= end_date,
+                    EventORM.user_id.isnot(None),
+                )
+            )
+            .order_by(EventORM.timestamp, EventORM.id)
+            .execution_options(stream_results=True, yield_per=self.chunk_size)
+        )
+
+        result = session.execute(query)
+        for partition in result.partitions():
+            yield [tuple(row) for row in partition]
+
+    @staticmethod
+    def _new_state() -> Dict[str, Any]:
+        """Create an empty user state."""
+        return {
+            "current_step": 0,
+            "max_step": 0,
+            "entered_at": None,
+            "last_step_at": None,
+            "completion_seconds": None,
+        }
+
+    @staticmethod
+    def _advance(
+        state: Dict[str, Any],
+        event_type: str,
+        timestamp: datetime,
+        step_types: List[str],
+        conversion_window: Optional[timedelta],
+    ) -> bool:
+        """
+        Advance one user's state machine by one event.
+
+        Args:
+            state: User state, updated in place
+            event_type: Event type
+            timestamp: Event time
+            step_types: Event type of each step, in order
+            conversion_window: Maximum time from entering to completing
+
+        Returns:
+            True if the state changed
+        """
+        total_steps = len(step_types)
+        current = state["current_step"]
+
+        if current == total_steps:
+            return False
+
+        # An attempt that outlived the window starts over
+        if (
+            conversion_window is not None
+            and current > 0
+            and timestamp - state["entered_at"] > conversion_window
+        ):
+            current = 0
+
+        if event_type != step_types[current]:
+            # A repeated first step restarts an attempt still at that step,
+            # leaving it the most time to finish within the window
+            if conversion_window is not None and current == 1 and event_type == step_types[0]:
+                state["entered_at"] = timestamp
+                state["last_step_at"] = timestamp
+                state["current_step"] = current
+                return True
+            if current != state["current_step"]:
+                state["current_step"] = current
+                return True
+            return False
+
+        if current == 0:
+            state["entered_at"] = timestamp
+
+        current += 1
+        state["current_step"] = current
+        state["last_step_at"] = timestamp
+        state["max_step"] = max(state["max_step"], current)
+
+        if current == total_steps and state["completion_seconds"] is None:
+            state["completion_seconds"] = (timestamp - state["entered_at"]).total_seconds()
+
+        return True
+
+    def _build_analysis(
+        self,
+        session: Session,
+        funnel: FunnelORM,
+        sorted_steps: List[FunnelStepORM],
+        start_date: datetime,
+        end_date: datetime,
+    ) -> FunnelAnalysis:
+        """Build funnel analysis from persisted states."""
+        distribution = self.state_repo.get_step_distribution(session, funnel.id)
+        total_steps = len(sorted_steps)
+
+        # reached[k]: users who completed at least k steps
+        reached = [0] * (total_steps + 2)
+        for max_step, count in distribution.items():
+            for k in range(min(max_step, total_steps) + 1):
+                reached[k] += count
+
+        total_entered = reached[1]
+        total_completed = reached[total_steps]
+
+        step_stats = []
+        for index, step in enumerate(sorted_steps):
+            entered = reached[max(index, 1)]
+            completed = reached[index + 1]
+            dropped = entered - completed
+
+            step_stats.append(
+                FunnelStepStats(
+                    step_id=step.id,
+                    step_name=step.name,
+                    order=step.order,
+                    entered=entered,
+                    completed=completed,
+                    dropped=dropped,
+                    completion_rate=round(safe_divide(completed, entered) * 100, 2),
+                    drop_off_rate=round(safe_divide(dropped, entered) * 100, 2),
+                )
+            )
+
+        avg_completion = self.state_repo.get_avg_completion_seconds(session, funnel.id)
+
+        return FunnelAnalysis(
+            funnel_id=funnel.id,
+            funnel_name=funnel.name,
+            start_date=start_date,
+            end_date=end_date,
+            total_entered=total_entered,
+            total_completed=total_completed,
+            overall_conversion_rate=round(safe_divide(total_completed, total_entered) * 100, 2),
+            steps=step_stats if total_entered else [],
+            avg_completion_time=round(avg_completion, 2) if avg_completion is not None else None,
+        )
+
+    @staticmethod
+    def _steps_signature(step_types: List[str]) -> str:
+        """Hash the ordered step definition to detect funnel edits."""
+        return hashlib.sha256("|".join(step_types).encode()).hexdigest()
@@ -6,18 +6,34 @@ ML-based predictive analytics for user behavior.
 
 import logging
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Any, Dict, List, Optional
 
 import numpy as np
-from sqlalchemy import and_, func
+from sqlalchemy import and_, case, func
 from sqlalchemy.orm import Session
 
-from modules.analytics.storage.database import Database
+from modules.analytics.storage.database import Database, as_naive_utc
 from modules.analytics.storage.models import EventORM, SessionORM, UserORM
-from shared.utils import get_utc_now
+from modules.analytics.storage.repositories import UserScoreRepository
+from shared.utils import chunk_list, get_utc_now
 
 logger = logging.getLogger(__name__)
 
+# Users scored per feature-matrix chunk in batch scoring
+SCORING_CHUNK_SIZE = 10_000
+
+# Columns of the batch scoring feature matrix
+FEATURE_COLUMNS = [
+    "days_since_last_seen",
+    "user_age_days",
+    "total_sessions",
+    "lifetime_value",
+    "avg_session_duration",
+    "recent_sessions",
+    "previous_sessions",
+    "distinct_modules",
+]
+
 
 class PredictiveEngine:
     """Predictive analytics engine."""
@@ -25,8 +41,258 @@ class PredictiveEngine:
     def __init__(self, db: Database):
         """Initialize predictive engine."""
         self.db = db
+        self.score_repo = UserScoreRepository()
         logger.info("Predictive engine initialized")
 
+    def score_users_batch(
+        self,
+        incremental: bool = False,
+        active_days: Optional[int] = 90,
+        ltv_months: int = 12,
+        chunk_size: int = SCORING_CHUNK_SIZE,
+    ) -> Dict[str, Any]:
+        """
+        Score churn, LTV and engagement for many users at once.
+
+        Users are processed in chunks: each chunk's feature matrix is built
+        with three grouped queries, scored with NumPy using the same rules
+        as the per-user methods, and written back with one bulk upsert.
+        The run commits once: the newest scored_at is the incremental
+        watermark, so a run that fails partway must not advance it.
+
+        Incremental mode only rescores users with sessions started after
+        their last score. Recency-based components still drift for users
+        without new sessions, so schedule periodic full runs as well.
+
+        Args:
+            incremental: Only rescore users with new sessions
+            active_days: Limit full runs to users seen within this many days
+                (None scores every user)
+            ltv_months: LTV prediction period in months
+            chunk_size: Users per chunk
+
+        Returns:
+            Dictionary with run statistics
+        """
+        # Timestamp columns hold naive UTC
+        now = as_naive_utc(get_utc_now())
+        scored = 0
+
+        try:
+            with self.db.session() as session:
+                if incremental:
+                    user_ids = self.score_repo.get_users_with_new_sessions(session)
+                else:
+                    query = session.query(UserORM.id)
+                    if active_days is not None:
+                        query = query.filter(
+                            UserORM.last_seen_at >= now - timedelta(days=active_days)
+                        )
+                    user_ids = [row.id for row in query.all()]
+
+                for chunk in chunk_list(user_ids, chunk_size):
+                    ids, features = self._build_feature_matrix(session, chunk, now)
+                    if not ids:
+                        continue
+
+                    churn, ltv, engagement = self._score_feature_matrix(features, ltv_months)
+
+                    self.score_repo.bulk_upsert_scores(
+                        session,
+                        [
+                            {
+                                "user_id": user_id,
+                                "churn_probability": float(churn[i]),
+                                "predicted_ltv": float(ltv[i]),
+                                "engagement_score": float(engagement[i]),
+                                "scored_at": now,
+                            }
+                            for i, user_id in enumerate(ids)
+                        ],
+                    )
+                    scored += len(ids)
+
+            logger.info(
+                f"Scored {scored} users ({'incremental' if incremental else 'full'})"
+            )
+            return {
+                "mode": "incremental" if incremental else "full",
+                "users_scored": scored,
+                "scored_at": now,
+            }
+
+        except Exception as e:
+            logger.error(f"Error in batch scoring: {e}", exc_info=True)
+            return {
+                "mode": "incremental" if incremental else "full",
+                "users_scored": scored,
+                "error": str(e),
+            }
+
+    def _build_feature_matrix(
+        self,
+        session: Session,
+        user_ids: List[str],
+        now: datetime,
+    ) -> tuple:
+        """
+        Build the feature matrix for a chunk of users.
+
+        Args:
+            session: Database session
+            user_ids: User IDs in the chunk
+            now: Reference time for recency features
+
+        Returns:
+            Tuple of ordered user IDs and a float matrix with
+            ``FEATURE_COLUMNS`` as columns
+        """
+        users = session.query(
+            UserORM.id,
+            UserORM.first_seen_at,
+            UserORM.last_seen_at,
+            UserORM.total_sessions,
+            UserORM.lifetime_value,
+        ).filter(UserORM.id.in_(user_ids)).all()
+
+        ids = [row.id for row in users]
+        index = {user_id: i for i, user_id in enumerate(ids)}
+        features = np.zeros((len(ids), len(FEATURE_COLUMNS)), dtype=np.float64)
+
+        for i, row in enumerate(users):
+            features[i, 0] = (now - row.last_seen_at).days
+            features[i, 1] = (now - row.first_seen_at).days
+            features[i, 2] = row.total_sessions or 0
+            features[i, 3] = row.lifetime_value or 0.0
+
+        if not ids:
+            return ids, features
+
+        recent_start = now - timedelta(days=7)
+        previous_start = now - timedelta(days=14)
+
+        session_stats = session.query(
+            SessionORM.user_id,
+            func.avg(SessionORM.duration_seconds),
+            func.sum(case((SessionORM.started_at >= recent_start, 1), else_=0)),
+            func.sum(
+                case(
+                    (
+                        and_(
+                            SessionORM.started_at >= previous_start,
+                            SessionORM.started_at < recent_start,
+                        ),
+                        1,
+                    ),
+                    else_=0,
+                )
+            ),
+        ).filter(
+            SessionORM.user_id.in_(ids)
+        ).group_by(SessionORM.user_id).all()
+
+        for user_id, avg_duration, recent, previous in session_stats:
+            i = index[user_id]
+            features[i, 4] = float(avg_duration or 0)
+            features[i, 5] = recent or 0
+            features[i, 6] = previous or 0
+
+        module_counts = session.query(
+            EventORM.user_id,
+            func.count(func.distinct(EventORM.module)),
+        ).filter(
+            and_(
+                EventORM.user_id.in_(ids),
+                EventORM.module.isnot(None),
+            )
+        ).group_by(EventORM.user_id).all()
+
+        for user_id, modules_count in module_counts:
+            features[index[user_id], 7] = modules_count or 0
+
+        return ids, features
+
+    @staticmethod
+    def _score_feature_matrix(features: np.ndarray, ltv_months: int = 12) -> tuple:
+        """
+        Score a feature matrix with the per-user scoring rules.
+
+        Args:
+            features: Matrix with ``FEATURE_COLUMNS`` as columns
+            ltv_months: LTV prediction period in months
+
+        Returns:
+            Tuple of churn probability, predicted LTV and engagement score arrays
+        """
+        (
+            days_inactive,
+            age_days,
+            total_sessions,
+            lifetime_value,
+            avg_duration,
+            recent,
+            previous,
+            modules_count,
+        ) = features.T
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            frequency = np.where(age_days > 0, total_sessions / age_days * 7, 0.0)
+            trend = np.where(
+                previous > 0, np.clip((recent - previous) / previous, -1.0, 1.0), 0.0
+            )
+            monthly_value = np.where(age_days > 0, lifetime_value / age_days * 30, 0.0)
+
+        # Churn
+        churn = np.select(
+            [days_inactive > 30, days_inactive > 14, days_inactive > 7],
+            [0.4, 0.2, 0.1],
+            default=0.0,
+        )
+        churn = churn + 0.2 * (avg_duration < 60) + 0.2 * (frequency < 1) + 0.2 * (trend < -0.5)
+        churn = np.minimum(churn, 1.0)
+
+        # LTV
+        ltv = np.maximum(monthly_value * ltv_months * (1 + trend * 0.1), 0.0)
+
+        # Engagement
+        recency_score = np.select(
+            [
+                days_inactive == 0,
+                days_inactive <= 1,
+                days_inactive <= 7,
+                days_inactive <= 14,
+                days_inactive <= 30,
+            ],
+            [1.0, 0.9, 0.7, 0.5, 0.3],
+            default=0.1,
+        )
+        frequency_score = np.select(
+            [frequency >= 7, frequency >= 3, frequency >= 1, frequency > 0],
+            [1.0, 0.7, 0.5, 0.3],
+            default=0.1,
+        )
+        duration_score = np.select(
+            [avg_duration >= 600, avg_duration >= 300, avg_duration >= 120, avg_duration > 0],
+            [1.0, 0.7, 0.5, 0.3],
+            default=0.1,
+        )
+        diversity_score = np.select(
+            [modules_count >= 10, modules_count >= 5, modules_count >= 3, modules_count > 0],
+            [1.0, 0.7, 0.5, 0.3],
+            default=0.1,
+        )
+        engagement = np.minimum(
+            (
+                recency_score * 0.3
+                + frequency_score * 0.3
+                + duration_score * 0.2
+                + diversity_score * 0.2
+            ) * 100,
+            100.0,
+        )
+
+        return churn, ltv, engagement
+
     def predict_churn(self, user_id: str) -> float:
         """
         Predict churn probability for a user.
@@ -44,7 +310,7 @@ class PredictiveEngine:
                     return 0.0
 
                 # Get user metrics
-                days_since_last_seen = (get_utc_now() - user.last_seen_at).days
+                days_since_last_seen = (as_naive_utc(get_utc_now()) - user.last_seen_at).days
                 avg_session_duration = self._get_avg_session_duration(session, user_id)
                 session_frequency = self._get_session_frequency(session, user_id)
                 engagement_trend = self._get_engagement_trend(session, user_id)
@@ -96,7 +362,7 @@ class PredictiveEngine:
                     return 0.0
 
                 # Calculate average monthly value
-                user_age_days = (get_utc_now() - user.first_seen_at).days
+                user_age_days = (as_naive_utc(get_utc_now()) - user.first_seen_at).days
                 if user_age_days == 0:
                     return 0.0
 
@@ -167,7 +433,7 @@ class PredictiveEngine:
         if not user:
             return 0.0
 
-        user_age_days = (get_utc_now() - user.first_seen_at).days
+        user_age_days = (as_naive_utc(get_utc_now()) - user.first_seen_at).days
         if user_age_days == 0:
             return 0.0
 
@@ -177,7 +443,7 @@ class PredictiveEngine:
     def _get_engagement_trend(self, session: Session, user_id: str) -> float:
         """Get engagement trend (-1 to 1)."""
         # Compare last 7 days to previous 7 days
-        now = get_utc_now()
+        now = as_naive_utc(get_utc_now())
         recent_start = now - timedelta(days=7)
         previous_start = now - timedelta(days=14)
 
@@ -204,7 +470,7 @@ class PredictiveEngine:
 
     def _get_recency_score(self, user: UserORM) -> float:
         """Get recency score (0-1)."""
-        days_since_last_seen = (get_utc_now() - user.last_seen_at).days
+        days_since_last_seen = (as_naive_utc(get_utc_now()) - user.last_seen_at).days
 
         if days_since_last_seen == 0:
             return 1.0
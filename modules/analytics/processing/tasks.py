@@ -5,15 +5,21 @@ Celery tasks for analytics processing.
 """
 
 import logging
+import os
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import List, Optional
 
 from modules.analytics.core.aggregator import DataAggregator
 from modules.analytics.core.processor import EventProcessor
+from modules.analytics.export.exporters import DataExporter
+from modules.analytics.export.report_generator import ReportGenerator
+from modules.analytics.processing.attribution import AttributionEngine
 from modules.analytics.processing.celery_app import get_celery
+from modules.analytics.processing.predictive import PredictiveEngine
 from modules.analytics.storage.database import get_database
-from shared.constants import AggregationPeriod
-from shared.utils import get_utc_now
+from modules.analytics.storage.repositories import ExportJobRepository
+from shared.constants import AggregationPeriod, ExportFormat
+from shared.utils import get_utc_now, parse_datetime
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +27,13 @@ app = get_celery()
 
 
 @app.task(name="modules.analytics.processing.tasks.process_events_task")
-def process_events_task(batch_size: int = 1000) -> dict:
+def process_events_task(batch_size: int = 1000, batch_mode: bool = True) -> dict:
     """
     Process unprocessed events.
 
     Args:
         batch_size: Number of events to process
+        batch_mode: Use set-based batch processing instead of per-event
 
     Returns:
         Task result dictionary
@@ -35,7 +42,10 @@ def process_events_task(batch_size: int = 1000) -> dict:
         db = get_database()
         processor = EventProcessor(db)
 
-        count = processor.process_events(batch_size)
+        if batch_mode:
+            count = processor.process_events_batch(batch_size)
+        else:
+            count = processor.process_events(batch_size)
 
         logger.info(f"Processed {count} events")
         return {"status": "success", "events_processed": count}
@@ -93,6 +103,34 @@ def aggregate_metrics_task(hours: int = 1) -> dict:
         return {"status": "error", "error": str(e)}
 
 
+@app.task(name="modules.analytics.processing.tasks.update_rollups_task")
+def update_rollups_task() -> dict:
+    """
+    Fold newly arrived events into the event rollup tables.
+
+    Returns:
+        Task result dictionary
+    """
+    try:
+        db = get_database()
+        aggregator = DataAggregator(db)
+
+        with db.session() as session:
+            result = aggregator.update_rollups(session)
+            session.commit()
+
+        logger.info(f"Updated rollups with {result['events']} events")
+        return {
+            "status": "success",
+            "events": result["events"],
+            "rows": result["rows"],
+        }
+
+    except Exception as e:
+        logger.error(f"Error in update_rollups_task: {e}", exc_info=True)
+        return {"status": "error", "error": str(e)}
+
+
 @app.task(name="modules.analytics.processing.tasks.cleanup_exports_task")
 def cleanup_exports_task() -> dict:
     """
@@ -103,8 +141,6 @@ def cleanup_exports_task() -> dict:
     """
     try:
         db = get_database()
-        from modules.analytics.storage.repositories import ExportJobRepository
-
         repo = ExportJobRepository()
 
         with db.session() as session:
@@ -114,7 +150,6 @@ def cleanup_exports_task() -> dict:
             for export in expired:
                 # Delete file if exists
                 if export.file_path:
-                    import os
                     if os.path.exists(export.file_path):
                         os.remove(export.file_path)
 
@@ -129,3 +164,164 @@ def cleanup_exports_task() -> dict:
     except Exception as e:
         logger.error(f"Error in cleanup_exports_task: {e}", exc_info=True)
         return {"status": "error", "error": str(e)}
+
+
+@app.task(name="modules.analytics.processing.tasks.export_job_task")
+def export_job_task(job_id: str) -> dict:
+    """
+    Run an export job, streaming rows straight to the export file.
+
+    Job query_params may hold start_date/end_date (ISO strings) or days,
+    plus compress.
+
+    Args:
+        job_id: Export job ID
+
+    Returns:
+        Task result dictionary
+    """
+    db = None
+    repo = ExportJobRepository()
+
+    try:
+        db = get_database()
+
+        with db.session() as session:
+            job = repo.get_by_id(session, job_id)
+            if not job:
+                return {"status": "error", "error": "Export job not found"}
+
+            export_type = job.export_type
+            export_format = ExportFormat(job.format)
+            params = job.query_params or {}
+
+            repo.update(session, job_id, status="processing", started_at=get_utc_now())
+            session.commit()
+
+        end_date = parse_datetime(params["end_date"]) if params.get("end_date") else get_utc_now()
+        start_date = (
+            parse_datetime(params["start_date"])
+            if params.get("start_date")
+            else end_date - timedelta(days=params.get("days", 30))
+        )
+
+        generator = ReportGenerator(db, DataExporter())
+        result = generator.export_raw_data(
+            export_type,
+            start_date,
+            end_date,
+            format=export_format,
+            compress=bool(params.get("compress", False)),
+        )
+
+        with db.session() as session:
+            if result:
+                file_path, row_count = result
+                repo.update(
+                    session,
+                    job_id,
+                    status="completed",
+                    file_path=file_path,
+                    file_size=os.path.getsize(file_path),
+                    row_count=row_count,
+                    completed_at=get_utc_now(),
+                )
+            else:
+                repo.update(
+                    session,
+                    job_id,
+                    status="failed",
+                    error_message="Export produced no data or failed",
+                    completed_at=get_utc_now(),
+                )
+            session.commit()
+
+        if not result:
+            return {"status": "error", "error": "Export failed"}
+
+        logger.info(f"Export job {job_id} wrote {result[1]} rows")
+        return {"status": "success", "file_path": result[0], "row_count": result[1]}
+
+    except Exception as e:
+        logger.error(f"Error in export_job_task: {e}", exc_info=True)
+        if db is not None:
+            try:
+                with db.session() as session:
+                    repo.update(
+                        session,
+                        job_id,
+                        status="failed",
+                        error_message=str(e),
+                        completed_at=get_utc_now(),
+                    )
+                    session.commit()
+            except Exception:
+                logger.error(f"Could not mark export job {job_id} as failed", exc_info=True)
+        return {"status": "error", "error": str(e)}
+
+
+@app.task(name="modules.analytics.processing.tasks.attribution_report_task")
+def attribution_report_task(days: int = 1, models: Optional[List[str]] = None) -> dict:
+    """
+    Build channel attribution totals for recent conversions.
+
+    Args:
+        days: Number of days of conversions to attribute
+        models: Attribution model names (defaults to all supported)
+
+    Returns:
+        Task result dictionary
+    """
+    try:
+        db = get_database()
+        engine = AttributionEngine(db)
+
+        end_date = get_utc_now()
+        start_date = end_date - timedelta(days=days)
+
+        report = engine.calculate_bulk_attribution(start_date, end_date, models=models)
+        if not report:
+            return {"status": "error", "error": "Attribution failed"}
+
+        logger.info(f"Attributed {report['attributed_conversions']} conversions")
+        return {
+            "status": "success",
+            "conversions": report["conversions"],
+            "attributed_conversions": report["attributed_conversions"],
+            "models": report["models"],
+        }
+
+    except Exception as e:
+        logger.error(f"Error in attribution_report_task: {e}", exc_info=True)
+        return {"status": "error", "error": str(e)}
+
+
+@app.task(name="modules.analytics.processing.tasks.score_users_task")
+def score_users_task(incremental: bool = True) -> dict:
+    """
+    Refresh stored churn, LTV and engagement scores.
+
+    Args:
+        incremental: Only rescore users with new sessions
+
+    Returns:
+        Task result dictionary
+    """
+    try:
+        db = get_database()
+        engine = PredictiveEngine(db)
+
+        result = engine.score_users_batch(incremental=incremental)
+        if "error" in result:
+            return {"status": "error", "error": result["error"]}
+
+        logger.info(f"Scored {result['users_scored']} users")
+        return {
+            "status": "success",
+            "mode": result["mode"],
+            "users_scored": result["users_scored"],
+        }
+
+    except Exception as e:
+        logger.error(f"Error in score_users_task: {e}", exc_info=True)
+        return {"status": "error", "error": str(e)}
@@ -4,12 +4,20 @@ Redis Cache
 Redis caching layer with decorators and TTL management.
 """
 
+import asyncio
+import fnmatch
 import functools
 import hashlib
 import json
 import logging
+import math
 import pickle
-from typing import Any, Callable, Optional, Union
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, Union
 
 import redis
 from redis import asyncio as aioredis
@@ -23,6 +31,23 @@ from shared.constants import (
 
 logger = logging.getLogger(__name__)
 
+# Seconds a single-flight recomputation lock is held in Redis
+SINGLE_FLIGHT_LOCK_TTL = 30
+
+# Seconds a caller waits for another worker's recomputation
+SINGLE_FLIGHT_WAIT = 10.0
+
+# Seconds between Redis polls while waiting on another worker
+SINGLE_FLIGHT_POLL_INTERVAL = 0.05
+
+# Deletes the lock only if it still holds our token
+_RELEASE_LOCK_SCRIPT = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
 
 class CacheConfig:
     """Redis cache configuration."""
@@ -39,6 +64,10 @@ class CacheConfig:
         socket_timeout: int = 5,
         socket_connect_timeout: int = 5,
         retry_on_timeout: bool = True,
+        l1_max_size: int = 0,
+        l1_ttl: int = CACHE_TTL_SHORT,
+        invalidation_channel: Optional[str] = None,
+        early_refresh_beta: float = 1.0,
     ):
         """
         Initialize cache configuration.
@@ -54,6 +83,12 @@ class CacheConfig:
             socket_timeout: Socket timeout in seconds
             socket_connect_timeout: Socket connect timeout in seconds
             retry_on_timeout: Retry on timeout
+            l1_max_size: In-process LRU entries (0 disables the L1 tier)
+            l1_ttl: Maximum age of L1 entries in seconds
+            invalidation_channel: Pub/sub channel for L1 invalidation
+                (defaults to "<key_prefix>:invalidations")
+            early_refresh_beta: Early refresh aggressiveness for get_or_set
+                (0 disables probabilistic early refresh)
         """
         self.host = host
         self.port = port
@@ -65,10 +100,121 @@ class CacheConfig:
         self.socket_timeout = socket_timeout
         self.socket_connect_timeout = socket_connect_timeout
         self.retry_on_timeout = retry_on_timeout
+        self.l1_max_size = l1_max_size
+        self.l1_ttl = l1_ttl
+        self.invalidation_channel = invalidation_channel
+        self.early_refresh_beta = early_refresh_beta
+
+
+class LocalLRUCache:
+    """Thread-safe in-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_size: int, ttl: int):
+        """
+        Initialize LRU cache.
+
+        Args:
+            max_size: Maximum number of entries
+            ttl: Maximum entry age in seconds
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """
+        Get a live entry.
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Tuple of (found, value)
+        """
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return False, None
+
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                return False, None
+
+            self._entries.move_to_end(key)
+            return True, value
+
+    def set(self, key: str, value: Any, ttl: Optional[int] = None) -> None:
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key: Cache key
+            value: Value to store
+            ttl: Entry TTL in seconds (capped at the L1 TTL)
+        """
+        lifetime = min(ttl, self.ttl) if ttl else self.ttl
+        with self._lock:
+            self._entries[key] = (time.monotonic() + lifetime, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        """Remove an entry."""
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def delete_pattern(self, pattern: str) -> int:
+        """Remove entries matching a glob pattern."""
+        with self._lock:
+            matched = [key for key in self._entries if fnmatch.fnmatchcase(key, pattern)]
+            for key in matched:
+                del self._entries[key]
+            return len(matched)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class _CacheEntry:
+    """Stored value with the metadata needed for early refresh."""
+
+    __slots__ = ("value", "delta", "expires_at")
+
+    def __init__(self, value: Any, delta: float, expires_at: Optional[float]):
+        self.value = value
+        self.delta = delta
+        self.expires_at = expires_at
+
+
+class _Flight:
+    """In-process single-flight slot for one key."""
+
+    __slots__ = ("event", "value", "error", "done")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value = None
+        self.error: Optional[BaseException] = None
+        self.done = False
 
 
 class RedisCache:
-    """Redis cache manager."""
+    """
+    Redis cache manager.
+
+    With ``l1_max_size`` set, reads are served from an in-process LRU in
+    front of Redis. Writes and deletes publish invalidations on a pub/sub
+    channel so other processes drop their L1 copies. L1 values are shared
+    objects, so callers must not mutate what they get back.
+    """
 
     def __init__(self, config: CacheConfig, key_prefix: str = "nexus:analytics"):
         """
@@ -83,6 +229,25 @@ class RedisCache:
         self._client: Optional[redis.Redis] = None
         self._async_client: Optional[aioredis.Redis] = None
 
+        self._l1 = (
+            LocalLRUCache(config.l1_max_size, config.l1_ttl)
+            if config.l1_max_size > 0
+            else None
+        )
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_channel = (
+            config.invalidation_channel or f"{key_prefix}:invalidations"
+        )
+        self._listener: Optional[threading.Thread] = None
+        self._listener_stop = threading.Event()
+
+        self._flights: Dict[str, _Flight] = {}
+        self._async_flights: Dict[str, asyncio.Future] = {}
+        self._flights_lock = threading.Lock()
+
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._stats_lock = threading.Lock()
+
         logger.info(f"Redis cache initialized with prefix: {key_prefix}")
 
     def get_client(self) -> redis.Redis:
@@ -160,16 +325,8 @@ class RedisCache:
             >>> cache.get("user:123")
         """
         try:
-            client = self.get_client()
-            full_key = self._make_key(key)
-            value = client.get(full_key)
-
-            if value is None:
-                logger.debug(f"Cache miss: {key}")
-                return default
-
-            logger.debug(f"Cache hit: {key}")
-            return pickle.loads(value)
+            found, stored = self._read(key)
+            return self._unwrap(stored) if found else default
 
         except Exception as e:
             logger.error(f"Cache get error for {key}: {e}", exc_info=True)
@@ -187,16 +344,8 @@ class RedisCache:
             Cached value or default
         """
         try:
-            client = self.get_async_client()
-            full_key = self._make_key(key)
-            value = await client.get(full_key)
-
-            if value is None:
-                logger.debug(f"Cache miss: {key}")
-                return default
-
-            logger.debug(f"Cache hit: {key}")
-            return pickle.loads(value)
+            found, stored = await self._async_read(key)
+            return self._unwrap(stored) if found else default
 
         except Exception as e:
             logger.error(f"Cache get error for {key}: {e}", exc_info=True)
@@ -223,15 +372,7 @@ class RedisCache:
             >>> cache.set("user:123", user_data, ttl=3600)
         """
         try:
-            client = self.get_client()
-            full_key = self._make_key(key)
-            serialized = pickle.dumps(value)
-
-            if ttl:
-                client.setex(full_key, ttl, serialized)
-            else:
-                client.set(full_key, serialized)
-
+            self._write(key, value, ttl)
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
             return True
 
@@ -257,15 +398,7 @@ class RedisCache:
             True if successful, False otherwise
         """
         try:
-            client = self.get_async_client()
-            full_key = self._make_key(key)
-            serialized = pickle.dumps(value)
-
-            if ttl:
-                await client.setex(full_key, ttl, serialized)
-            else:
-                await client.set(full_key, serialized)
-
+            await self._async_write(key, value, ttl)
             logger.debug(f"Cache set: {key} (TTL: {ttl}s)")
             return True
 
@@ -290,6 +423,9 @@ class RedisCache:
             client = self.get_client()
             full_key = self._make_key(key)
             result = client.delete(full_key)
+            if self._l1 is not None:
+                self._l1.delete(key)
+                self._publish_invalidation(keys=[key])
             logger.debug(f"Cache delete: {key}")
             return result > 0
 
@@ -311,6 +447,9 @@ class RedisCache:
             client = self.get_async_client()
             full_key = self._make_key(key)
             result = await client.delete(full_key)
+            if self._l1 is not None:
+                self._l1.delete(key)
+                await self._async_publish_invalidation(keys=[key])
             logger.debug(f"Cache delete: {key}")
             return result > 0
 
@@ -336,6 +475,10 @@ class RedisCache:
             full_pattern = self._make_key(pattern)
             keys = client.keys(full_pattern)
 
+            if self._l1 is not None:
+                self._l1.delete_pattern(pattern)
+                self._publish_invalidation(pattern=pattern)
+
             if keys:
                 count = client.delete(*keys)
                 logger.info(f"Cache pattern delete: {pattern} ({count} keys)")
@@ -365,6 +508,10 @@ class RedisCache:
             async for key in client.scan_iter(full_pattern):
                 keys.append(key)
 
+            if self._l1 is not None:
+                self._l1.delete_pattern(pattern)
+                await self._async_publish_invalidation(pattern=pattern)
+
             if keys:
                 count = await client.delete(*keys)
                 logger.info(f"Cache pattern delete: {pattern} ({count} keys)")
@@ -518,6 +665,593 @@ class RedisCache:
             logger.error(f"Cache flush error: {e}", exc_info=True)
             return False
 
+    def mget(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Get several values in one round trip.
+
+        Keys found in the L1 tier are not requested from Redis.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to values (missing keys are omitted)
+
+        Example:
+            >>> cache.mget(["user:1", "user:2"])
+        """
+        results: Dict[str, Any] = {}
+        try:
+            remote = self._mget_local(keys, results)
+            if not remote:
+                return results
+
+            values = self.get_client().mget([self._make_key(key) for key in remote])
+            self._mget_remote(remote, values, results)
+            return results
+
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}", exc_info=True)
+            return results
+
+    async def async_mget(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Asynchronously get several values in one round trip.
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of found keys to values (missing keys are omitted)
+        """
+        results: Dict[str, Any] = {}
+        try:
+            remote = self._mget_local(keys, results)
+            if not remote:
+                return results
+
+            values = await self.get_async_client().mget([self._make_key(key) for key in remote])
+            self._mget_remote(remote, values, results)
+            return results
+
+        except Exception as e:
+            logger.error(f"Cache mget error: {e}", exc_info=True)
+            return results
+
+    def mset(self, mapping: Dict[str, Any], ttl: Optional[int] = CACHE_TTL_MEDIUM) -> bool:
+        """
+        Set several values in one pipelined round trip.
+
+        Args:
+            mapping: Keys and values to cache
+            ttl: Time to live in seconds
+
+        Returns:
+            True if successful, False otherwise
+
+        Example:
+            >>> cache.mset({"user:1": u1, "user:2": u2}, ttl=600)
+        """
+        if not mapping:
+            return True
+
+        try:
+            pipe = self.get_client().pipeline(transaction=False)
+            for key, value in mapping.items():
+                self._queue_set(pipe, key, value, ttl)
+            pipe.execute()
+
+            self._after_mset(mapping, ttl)
+            self._publish_invalidation(keys=list(mapping))
+            logger.debug(f"Cache mset: {len(mapping)} keys (TTL: {ttl}s)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Cache mset error: {e}", exc_info=True)
+            return False
+
+    async def async_mset(
+        self, mapping: Dict[str, Any], ttl: Optional[int] = CACHE_TTL_MEDIUM
+    ) -> bool:
+        """
+        Asynchronously set several values in one pipelined round trip.
+
+        Args:
+            mapping: Keys and values to cache
+            ttl: Time to live in seconds
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not mapping:
+            return True
+
+        try:
+            pipe = self.get_async_client().pipeline(transaction=False)
+            for key, value in mapping.items():
+                self._queue_set(pipe, key, value, ttl)
+            await pipe.execute()
+
+            self._after_mset(mapping, ttl)
+            await self._async_publish_invalidation(keys=list(mapping))
+            logger.debug(f"Cache mset: {len(mapping)} keys (TTL: {ttl}s)")
+            return True
+
+        except Exception as e:
+            logger.error(f"Cache mset error: {e}", exc_info=True)
+            return False
+
+    def get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int] = CACHE_TTL_MEDIUM,
+    ) -> Any:
+        """
+        Get a value, computing and caching it on a miss.
+
+        Only one caller per key recomputes at a time: threads in this
+        process wait for the in-flight computation, and other processes
+        wait on a short Redis lock. Entries also refresh probabilistically
+        before they expire (XFetch), so hot keys rarely expire under load.
+        None results are returned but not cached.
+
+        Args:
+            key: Cache key
+            compute: Function producing the value
+            ttl: Time to live in seconds
+
+        Returns:
+            Cached or freshly computed value
+
+        Example:
+            >>> cache.get_or_set("report:daily", build_report, ttl=3600)
+        """
+        try:
+            found, stored = self._read(key)
+        except Exception as e:
+            logger.error(f"Cache get error for {key}: {e}", exc_info=True)
+            found, stored = False, None
+
+        if found and not self._should_refresh_early(stored):
+            return self._unwrap(stored)
+
+        stale = stored if found else None
+        if stale is not None:
+            self._record(key, "early_refreshes")
+
+        with self._flights_lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                flight = self._flights[key] = _Flight()
+
+        if not leader:
+            if stale is not None:
+                return self._unwrap(stale)
+            flight.event.wait(SINGLE_FLIGHT_WAIT)
+            if flight.done:
+                if flight.error is not None:
+                    raise flight.error
+                return flight.value
+            return compute()
+
+        try:
+            value = self._compute_with_lock(key, compute, ttl, stale)
+            flight.value = value
+            return value
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            flight.done = True
+            flight.event.set()
+            with self._flights_lock:
+                self._flights.pop(key, None)
+
+    async def async_get_or_set(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int] = CACHE_TTL_MEDIUM,
+    ) -> Any:
+        """
+        Asynchronously get a value, computing and caching it on a miss.
+
+        Same single-flight and early refresh behaviour as get_or_set;
+        concurrent coroutines in this process share one computation.
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value
+            ttl: Time to live in seconds
+
+        Returns:
+            Cached or freshly computed value
+        """
+        try:
+            found, stored = await self._async_read(key)
+        except Exception as e:
+            logger.error(f"Cache get error for {key}: {e}", exc_info=True)
+            found, stored = False, None
+
+        if found and not self._should_refresh_early(stored):
+            return self._unwrap(stored)
+
+        stale = stored if found else None
+        if stale is not None:
+            self._record(key, "early_refreshes")
+
+        pending = self._async_flights.get(key)
+        if pending is not None:
+            if stale is not None:
+                return self._unwrap(stale)
+            return await asyncio.shield(pending)
+
+        future = asyncio.get_running_loop().create_future()
+        self._async_flights[key] = future
+        try:
+            value = await self._async_compute_with_lock(key, compute, ttl, stale)
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unawaited failure is not logged by asyncio
+            future.exception()
+            raise
+        finally:
+            self._async_flights.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Get hit/miss counters per key prefix.
+
+        The prefix is the first ":"-separated segment of the key.
+
+        Returns:
+            Mapping of prefix to counters and hit rate
+
+        Example:
+            >>> cache.get_stats()["cohort"]["hit_rate"]
+        """
+        with self._stats_lock:
+            snapshot = {prefix: dict(counters) for prefix, counters in self._stats.items()}
+
+        for counters in snapshot.values():
+            hits = counters.get("l1_hits", 0) + counters.get("l2_hits", 0)
+            lookups = hits + counters.get("misses", 0)
+            counters["hits"] = hits
+            counters["hit_rate"] = round(hits / lookups, 4) if lookups else 0.0
+
+        return snapshot
+
+    def reset_stats(self) -> None:
+        """Reset hit/miss counters."""
+        with self._stats_lock:
+            self._stats.clear()
+
+    def _record(self, key: str, counter: str, amount: int = 1) -> None:
+        """Increment a per-prefix counter."""
+        prefix = key.split(":", 1)[0]
+        with self._stats_lock:
+            counters = self._stats.setdefault(prefix, {})
+            counters[counter] = counters.get(counter, 0) + amount
+
+    @staticmethod
+    def _unwrap(stored: Any) -> Any:
+        """Strip early-refresh metadata from a stored value."""
+        return stored.value if isinstance(stored, _CacheEntry) else stored
+
+    def _should_refresh_early(self, stored: Any) -> bool:
+        """
+        Decide whether to recompute an entry before it expires (XFetch).
+
+        The chance grows as expiry approaches and with the time the value
+        took to compute.
+        """
+        beta = self.config.early_refresh_beta
+        if beta <= 0 or not isinstance(stored, _CacheEntry) or stored.expires_at is None:
+            return False
+
+        return time.time() - stored.delta * beta * math.log(1.0 - random.random()) >= stored.expires_at
+
+    def _read(self, key: str) -> Tuple[bool, Any]:
+        """Read a stored value from L1, then Redis, recording counters."""
+        if self._l1 is not None:
+            self._ensure_invalidation_listener()
+            found, stored = self._l1.get(key)
+            if found:
+                self._record(key, "l1_hits")
+                return True, stored
+
+        raw = self.get_client().get(self._make_key(key))
+        return self._after_remote_read(key, raw)
+
+    async def _async_read(self, key: str) -> Tuple[bool, Any]:
+        """Asynchronously read a stored value from L1, then Redis."""
+        if self._l1 is not None:
+            self._ensure_invalidation_listener()
+            found, stored = self._l1.get(key)
+            if found:
+                self._record(key, "l1_hits")
+                return True, stored
+
+        raw = await self.get_async_client().get(self._make_key(key))
+        return self._after_remote_read(key, raw)
+
+    def _after_remote_read(self, key: str, raw: Optional[bytes]) -> Tuple[bool, Any]:
+        """Deserialize a Redis reply and fill L1."""
+        if raw is None:
+            self._record(key, "misses")
+            logger.debug(f"Cache miss: {key}")
+            return False, None
+
+        self._record(key, "l2_hits")
+        logger.debug(f"Cache hit: {key}")
+        stored = pickle.loads(raw)
+        if self._l1 is not None:
+            self._l1.set(key, stored)
+        return True, stored
+
+    def _write(self, key: str, stored: Any, ttl: Optional[int]) -> None:
+        """Write a stored value to Redis and L1, invalidating other L1s."""
+        client = self.get_client()
+        full_key = self._make_key(key)
+        serialized = pickle.dumps(stored)
+
+        if ttl:
+            client.setex(full_key, ttl, serialized)
+        else:
+            client.set(full_key, serialized)
+
+        if self._l1 is not None:
+            self._l1.set(key, stored, ttl)
+            self._publish_invalidation(keys=[key])
+
+    async def _async_write(self, key: str, stored: Any, ttl: Optional[int]) -> None:
+        """Asynchronously write a stored value to Redis and L1."""
+        client = self.get_async_client()
+        full_key = self._make_key(key)
+        serialized = pickle.dumps(stored)
+
+        if ttl:
+            await client.setex(full_key, ttl, serialized)
+        else:
+            await client.set(full_key, serialized)
+
+        if self._l1 is not None:
+            self._l1.set(key, stored, ttl)
+            await self._async_publish_invalidation(keys=[key])
+
+    def _mget_local(self, keys: List[str], results: Dict[str, Any]) -> List[str]:
+        """Serve keys from L1 and return the ones still needed from Redis."""
+        if self._l1 is None:
+            return list(keys)
+
+        self._ensure_invalidation_listener()
+        remote = []
+        for key in keys:
+            found, stored = self._l1.get(key)
+            if found:
+                self._record(key, "l1_hits")
+                results[key] = self._unwrap(stored)
+            else:
+                remote.append(key)
+        return remote
+
+    def _mget_remote(
+        self, keys: List[str], values: List[Optional[bytes]], results: Dict[str, Any]
+    ) -> None:
+        """Merge an MGET reply into results."""
+        for key, raw in zip(keys, values):
+            found, stored = self._after_remote_read(key, raw)
+            if found:
+                results[key] = self._unwrap(stored)
+
+    def _queue_set(self, pipe: Any, key: str, value: Any, ttl: Optional[int]) -> None:
+        """Queue one SET on a pipeline."""
+        serialized = pickle.dumps(value)
+        if ttl:
+            pipe.setex(self._make_key(key), ttl, serialized)
+        else:
+            pipe.set(self._make_key(key), serialized)
+
+    def _after_mset(self, mapping: Dict[str, Any], ttl: Optional[int]) -> None:
+        """Fill L1 after a pipelined write."""
+        if self._l1 is not None:
+            for key, value in mapping.items():
+                self._l1.set(key, value, ttl)
+
+    def _new_entry(self, value: Any, started: float, ttl: Optional[int]) -> _CacheEntry:
+        """Wrap a computed value with its recompute time and expiry."""
+        return _CacheEntry(
+            value,
+            time.monotonic() - started,
+            time.time() + ttl if ttl else None,
+        )
+
+    def _compute_with_lock(
+        self,
+        key: str,
+        compute: Callable[[], Any],
+        ttl: Optional[int],
+        stale: Any,
+    ) -> Any:
+        """Recompute a value, holding the cross-process lock when possible."""
+        client = self.get_client()
+        lock_key = self._make_key(f"{key}:lock")
+        token = uuid.uuid4().hex
+
+        try:
+            locked = bool(client.set(lock_key, token, nx=True, ex=SINGLE_FLIGHT_LOCK_TTL))
+        except Exception as e:
+            logger.error(f"Cache lock error for {key}: {e}", exc_info=True)
+            locked = True
+            token = None
+
+        if not locked:
+            if stale is not None:
+                return self._unwrap(stale)
+
+            deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+            while time.monotonic() < deadline:
+                time.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+                raw = client.get(self._make_key(key))
+                if raw is not None:
+                    return self._unwrap(pickle.loads(raw))
+
+        try:
+            self._record(key, "recomputes")
+            started = time.monotonic()
+            value = compute()
+            if value is not None:
+                try:
+                    self._write(key, self._new_entry(value, started, ttl), ttl)
+                except Exception as e:
+                    logger.error(f"Cache set error for {key}: {e}", exc_info=True)
+            return value
+        finally:
+            if locked and token is not None:
+                try:
+                    client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.error(f"Cache unlock error for {key}: {e}", exc_info=True)
+
+    async def _async_compute_with_lock(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: Optional[int],
+        stale: Any,
+    ) -> Any:
+        """Asynchronously recompute a value under the cross-process lock."""
+        client = self.get_async_client()
+        lock_key = self._make_key(f"{key}:lock")
+        token = uuid.uuid4().hex
+
+        try:
+            locked = bool(await client.set(lock_key, token, nx=True, ex=SINGLE_FLIGHT_LOCK_TTL))
+        except Exception as e:
+            logger.error(f"Cache lock error for {key}: {e}", exc_info=True)
+            locked = True
+            token = None
+
+        if not locked:
+            if stale is not None:
+                return self._unwrap(stale)
+
+            deadline = time.monotonic() + SINGLE_FLIGHT_WAIT
+            while time.monotonic() < deadline:
+                await asyncio.sleep(SINGLE_FLIGHT_POLL_INTERVAL)
+                raw = await client.get(self._make_key(key))
+                if raw is not None:
+                    return self._unwrap(pickle.loads(raw))
+
+        try:
+            self._record(key, "recomputes")
+            started = time.monotonic()
+            value = await compute()
+            if value is not None:
+                try:
+                    await self._async_write(key, self._new_entry(value, started, ttl), ttl)
+                except Exception as e:
+                    logger.error(f"Cache set error for {key}: {e}", exc_info=True)
+            return value
+        finally:
+            if locked and token is not None:
+                try:
+                    await client.eval(_RELEASE_LOCK_SCRIPT, 1, lock_key, token)
+                except Exception as e:
+                    logger.error(f"Cache unlock error for {key}: {e}", exc_info=True)
+
+    def _invalidation_message(
+        self, keys: Optional[List[str]] = None, pattern: Optional[str] = None
+    ) -> str:
+        """Build an invalidation message tagged with this instance's ID."""
+        return json.dumps({"origin": self._instance_id, "keys": keys or [], "pattern": pattern})
+
+    def _publish_invalidation(
+        self, keys: Optional[List[str]] = None, pattern: Optional[str] = None
+    ) -> None:
+        """Tell other processes to drop L1 entries."""
+        if self._l1 is None:
+            return
+        try:
+            self.get_client().publish(
+                self._invalidation_channel, self._invalidation_message(keys, pattern)
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}", exc_info=True)
+
+    async def _async_publish_invalidation(
+        self, keys: Optional[List[str]] = None, pattern: Optional[str] = None
+    ) -> None:
+        """Asynchronously tell other processes to drop L1 entries."""
+        if self._l1 is None:
+            return
+        try:
+            await self.get_async_client().publish(
+                self._invalidation_channel, self._invalidation_message(keys, pattern)
+            )
+        except Exception as e:
+            logger.error(f"Cache invalidation publish error: {e}", exc_info=True)
+
+    def _apply_invalidation(self, data: Union[bytes, str]) -> None:
+        """Apply an invalidation message from another process."""
+        if self._l1 is None:
+            return
+
+        message = json.loads(data)
+        if message.get("origin") == self._instance_id:
+            return
+
+        for key in message.get("keys", []):
+            self._l1.delete(key)
+        if message.get("pattern"):
+            self._l1.delete_pattern(message["pattern"])
+
+    def _ensure_invalidation_listener(self) -> None:
+        """Start the pub/sub listener thread on first L1 use."""
+        if self._listener is not None:
+            return
+
+        with self._flights_lock:
+            if self._listener is not None:
+                return
+            self._listener_stop.clear()
+            self._listener = threading.Thread(
+                target=self._listen_invalidations,
+                name="analytics-cache-invalidation",
+                daemon=True,
+            )
+            self._listener.start()
+
+    def _listen_invalidations(self) -> None:
+        """Consume invalidation messages until close() is called."""
+        pubsub = None
+        while not self._listener_stop.is_set():
+            try:
+                if pubsub is None:
+                    pubsub = self.get_client().pubsub(ignore_subscribe_messages=True)
+                    pubsub.subscribe(self._invalidation_channel)
+
+                message = pubsub.get_message(timeout=1.0)
+                if message and message.get("type") == "message":
+                    self._apply_invalidation(message["data"])
+
+            except Exception as e:
+                # Messages may have been missed while disconnected
+                logger.error(f"Cache invalidation listener error: {e}", exc_info=True)
+                self._l1.clear()
+                pubsub = None
+                self._listener_stop.wait(1.0)
+
+        if pubsub is not None:
+            try:
+                pubsub.close()
+            except Exception:
+                pass
+
     def health_check(self) -> bool:
         """
         Perform cache health check.
@@ -558,6 +1292,10 @@ class RedisCache:
 
     def close(self) -> None:
         """Close Redis connections."""
+        if self._listener is not None:
+            self._listener_stop.set()
+            self._listener.join(timeout=2)
+            self._listener = None
         if self._client:
             self._client.close()
             logger.info("Redis client closed")
@@ -630,16 +1368,8 @@ def cached(ttl: int = CACHE_TTL_MEDIUM, key_prefix: Optional[str] = None):
             if key_prefix:
                 cache_key = f"{key_prefix}:{cache_key}"
 
-            # Try to get from cache
-            cached_value = cache.get(cache_key)
-            if cached_value is not None:
-                return cached_value
-
-            # Execute function and cache result
-            result = func(*args, **kwargs)
-            cache.set(cache_key, result, ttl=ttl)
-
-            return result
+            # Single-flight lookup with early refresh
+            return cache.get_or_set(cache_key, lambda: func(*args, **kwargs), ttl=ttl)
 
         return wrapper
 
@@ -675,16 +1405,10 @@ def async_cached(ttl: int = CACHE_TTL_MEDIUM, key_prefix: Optional[str] = None):
             if key_prefix:
                 cache_key = f"{key_prefix}:{cache_key}"
 
-            # Try to get from cache
-            cached_value = await cache.async_get(cache_key)
-            if cached_value is not None:
-                return cached_value
-
-            # Execute function and cache result
-            result = await func(*args, **kwargs)
-            await cache.async_set(cache_key, result, ttl=ttl)
-
-            return result
+            # Single-flight lookup with early refresh
+            return await cache.async_get_or_set(
+                cache_key, lambda: func(*args, **kwargs), ttl=ttl
+            )
 
         return wrapper
 
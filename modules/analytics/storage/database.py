@@ -6,6 +6,7 @@ SQLAlchemy database setup with connection pooling and async support.
 
 import logging
 from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime, timezone
 from typing import AsyncGenerator, Generator, Optional
 
 from sqlalchemy import create_engine, event, pool
@@ -32,6 +33,21 @@ logger = logging.getLogger(__name__)
 Base = declarative_base()
 
 
+def as_naive_utc(value: Optional[datetime]) -> Optional[datetime]:
+    """
+    Convert a datetime to the naive UTC form stored in DateTime columns.
+
+    Args:
+        value: Naive (assumed UTC) or timezone-aware datetime
+
+    Returns:
+        Naive UTC datetime, or None
+    """
+    if value is None or value.tzinfo is None:
+        return value
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
 class DatabaseConfig:
     """Database configuration."""
 
@@ -16,6 +16,7 @@ from sqlalchemy import (
     Index,
     Integer,
     JSON,
+    LargeBinary,
     String,
     Text,
     UniqueConstraint,
@@ -56,7 +57,7 @@ class EventORM(Base):
 
     # Timestamps
     timestamp = Column(DateTime, nullable=False, index=True)
-    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
 
     # Processing
     processed = Column(Boolean, default=False, index=True)
@@ -95,6 +96,42 @@ class MetricORM(Base):
     )
 
 
+class EventRollupORM(Base):
+    """Pre-aggregated event counts and distinct-count sketches per time bucket."""
+
+    __tablename__ = "analytics_event_rollups"
+
+    grain = Column(String(20), primary_key=True)
+    bucket_start = Column(DateTime, primary_key=True)
+    event_type = Column(String(50), primary_key=True)
+    # Empty dimension marks the per-event-type total row
+    dimension = Column(String(50), primary_key=True, default="")
+    dimension_value = Column(String(255), primary_key=True, default="")
+
+    event_count = Column(Integer, nullable=False, default=0)
+    users_sketch = Column(LargeBinary, nullable=False)
+    sessions_sketch = Column(LargeBinary)
+
+    # Timestamps
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index("ix_event_rollups_grain_dimension_bucket", "grain", "dimension", "bucket_start"),
+    )
+
+
+class RollupCheckpointORM(Base):
+    """Watermark of events already folded into the rollup tables."""
+
+    __tablename__ = "analytics_rollup_checkpoints"
+
+    name = Column(String(100), primary_key=True)
+    processed_until = Column(DateTime, nullable=False)
+
+    # Timestamps
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class UserORM(Base):
     """User ORM model."""
 
@@ -123,6 +160,20 @@ class UserORM(Base):
     conversions = relationship("GoalConversionORM", back_populates="user", lazy="dynamic")
 
 
+class UserScoreORM(Base):
+    """Predictive scores per user, written by batch scoring."""
+
+    __tablename__ = "analytics_user_scores"
+
+    user_id = Column(String(36), ForeignKey("analytics_users.id"), primary_key=True)
+    churn_probability = Column(Float, nullable=False)
+    predicted_ltv = Column(Float, nullable=False)
+    engagement_score = Column(Float, nullable=False)
+
+    # Timestamps
+    scored_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+
 class SessionORM(Base):
     """Session ORM model."""
 
@@ -213,6 +264,41 @@ class FunnelStepORM(Base):
     )
 
 
+class FunnelUserStateORM(Base):
+    """Per-user progress through a funnel for incremental analysis."""
+
+    __tablename__ = "analytics_funnel_user_states"
+
+    funnel_id = Column(String(36), ForeignKey("analytics_funnels.id"), primary_key=True)
+    user_id = Column(String(36), primary_key=True)
+
+    # State machine
+    current_step = Column(Integer, nullable=False, default=0)  # Steps completed in current attempt
+    max_step = Column(Integer, nullable=False, default=0, index=True)  # Best attempt so far
+    entered_at = Column(DateTime)  # Start of current attempt
+    last_step_at = Column(DateTime)
+    completion_seconds = Column(Float)  # Time to complete, first completed attempt
+
+    __table_args__ = (
+        Index("ix_funnel_states_funnel_max_step", "funnel_id", "max_step"),
+    )
+
+
+class FunnelCheckpointORM(Base):
+    """Watermark of events already folded into funnel user states."""
+
+    __tablename__ = "analytics_funnel_checkpoints"
+
+    funnel_id = Column(String(36), ForeignKey("analytics_funnels.id"), primary_key=True)
+    window_start = Column(DateTime, nullable=False)
+    processed_until = Column(DateTime, nullable=False)
+    conversion_window_seconds = Column(Integer)
+    steps_signature = Column(String(64), nullable=False)
+
+    # Timestamps
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class CohortORM(Base):
     """Cohort ORM model."""
 
@@ -4,11 +4,15 @@ Repositories
 Repository pattern for database operations with full CRUD.
 """
 
+import io
+import json
 import logging
 from datetime import datetime
+from enum import Enum
 from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
 
-from sqlalchemy import and_, desc, func, or_
+from sqlalchemy import Boolean, and_, bindparam, desc, func, or_, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
@@ -21,20 +25,86 @@ from modules.analytics.storage.models import (
     CohortORM,
     DashboardORM,
     EventORM,
+    EventRollupORM,
     ExportJobORM,
+    FunnelCheckpointORM,
     FunnelORM,
     FunnelStepORM,
+    FunnelUserStateORM,
     GoalConversionORM,
     GoalORM,
     MetricORM,
+    RollupCheckpointORM,
     SessionORM,
     UserORM,
+    UserScoreORM,
 )
+from shared.utils import chunk_list
 
 logger = logging.getLogger(__name__)
 
 T = TypeVar("T", bound=Base)
 
+# Rows per multi-VALUES statement; keeps SQLite under its bind parameter limit
+UPSERT_CHUNK_SIZE = 500
+
+# IDs per IN list; keeps SQLite under its bind parameter limit
+IN_CLAUSE_CHUNK_SIZE = 500
+
+# Characters escaped in PostgreSQL COPY text format
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _dialect_insert(session: Session, model: Type[Base]):
+    """
+    Get a dialect-specific INSERT supporting ON CONFLICT.
+
+    Args:
+        session: Database session
+        model: SQLAlchemy ORM model class
+
+    Returns:
+        Insert construct, or None if the dialect has no ON CONFLICT support
+    """
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        return postgresql.insert(model.__table__)
+    if dialect == "sqlite":
+        return sqlite.insert(model.__table__)
+    return None
+
+
+def _copy_text(rows: List[Dict[str, Any]], columns: List[str]) -> str:
+    """
+    Encode rows in PostgreSQL COPY text format.
+
+    Args:
+        rows: Row values keyed by column name
+        columns: Column order
+
+    Returns:
+        Tab-separated, newline-terminated COPY payload
+    """
+    lines = []
+    for row in rows:
+        fields = []
+        for column in columns:
+            value = row.get(column)
+            if value is None:
+                fields.append("\\N")
+                continue
+            if isinstance(value, bool):
+                value = "t" if value else "f"
+            elif isinstance(value, datetime):
+                value = value.isoformat()
+            elif isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, (dict, list)):
+                value = json.dumps(value, default=str)
+            fields.append(str(value).translate(_COPY_ESCAPES))
+        lines.append("\t".join(fields))
+    return "\n".join(lines) + "\n"
+
 
 class BaseRepository(Generic[T]):
     """Base repository with common CRUD operations."""
@@ -472,6 +542,52 @@ class EventRepository(BaseRepository[EventORM]):
         logger.info(f"Marked {count} events as processed")
         return count
 
+    def copy_insert(self, session: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Insert many events in one round trip.
+
+        Uses ``COPY ... FROM STDIN`` on PostgreSQL (psycopg2) and a Core
+        executemany INSERT elsewhere. Rows bypass the ORM, so they must
+        carry every column value (missing keys are written as NULL).
+
+        Args:
+            session: Database session
+            rows: Event column values
+
+        Returns:
+            Number of rows inserted
+        """
+        if not rows:
+            return 0
+
+        table = EventORM.__table__
+        columns = [column.name for column in table.columns]
+
+        try:
+            if session.get_bind().dialect.name == "postgresql":
+                cursor = session.connection().connection.cursor()
+                if hasattr(cursor, "copy_expert"):
+                    try:
+                        cursor.copy_expert(
+                            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN",
+                            io.StringIO(_copy_text(rows, columns)),
+                        )
+                    finally:
+                        cursor.close()
+                    logger.debug(f"Copied {len(rows)} events")
+                    return len(rows)
+                cursor.close()
+
+            session.execute(
+                table.insert(),
+                [{column: row.get(column) for column in columns} for row in rows],
+            )
+            logger.debug(f"Bulk inserted {len(rows)} events")
+            return len(rows)
+        except SQLAlchemyError as e:
+            logger.error(f"Database error bulk inserting events: {e}")
+            raise
+
 
 class MetricRepository(BaseRepository[MetricORM]):
     """Repository for metric operations."""
@@ -532,6 +648,187 @@ class MetricRepository(BaseRepository[MetricORM]):
         return query.order_by(MetricORM.timestamp).all()
 
 
+class RollupRepository(BaseRepository[EventRollupORM]):
+    """Repository for pre-aggregated event rollups."""
+
+    ROLLUP_FIELDS = ("event_count", "users_sketch", "sessions_sketch", "updated_at")
+
+    def __init__(self):
+        super().__init__(EventRollupORM)
+
+    def get_checkpoint(
+        self, session: Session, name: str, for_update: bool = False
+    ) -> Optional[RollupCheckpointORM]:
+        """Get a rollup checkpoint, optionally locking it for the transaction."""
+        query = session.query(RollupCheckpointORM).filter(RollupCheckpointORM.name == name)
+        if for_update:
+            query = query.with_for_update().populate_existing()
+        return query.first()
+
+    def lock_checkpoint(
+        self, session: Session, name: str, initial: datetime
+    ) -> RollupCheckpointORM:
+        """
+        Get a rollup checkpoint locked for the transaction, creating it first if missing.
+
+        The row is inserted with ON CONFLICT DO NOTHING before it is locked,
+        so concurrent first runs wait on the same row instead of both
+        finding none.
+
+        Args:
+            session: Database session
+            name: Checkpoint name
+            initial: processed_until of a new checkpoint
+
+        Returns:
+            The locked checkpoint
+        """
+        stmt = _dialect_insert(session, RollupCheckpointORM)
+        if stmt is None:
+            if self.get_checkpoint(session, name) is None:
+                session.add(RollupCheckpointORM(
+                    name=name, processed_until=initial, updated_at=datetime.utcnow()
+                ))
+                session.flush()
+        else:
+            session.execute(
+                stmt.values(name=name, processed_until=initial, updated_at=datetime.utcnow())
+                .on_conflict_do_nothing(index_elements=[RollupCheckpointORM.__table__.c.name])
+            )
+
+        return self.get_checkpoint(session, name, for_update=True)
+
+    def save_checkpoint(
+        self, session: Session, name: str, processed_until: datetime
+    ) -> RollupCheckpointORM:
+        """Create or advance a rollup checkpoint."""
+        checkpoint = self.get_checkpoint(session, name)
+        if checkpoint is None:
+            checkpoint = RollupCheckpointORM(name=name)
+            session.add(checkpoint)
+
+        checkpoint.processed_until = processed_until
+        checkpoint.updated_at = datetime.utcnow()
+
+        session.flush()
+        return checkpoint
+
+    def get_rollups(
+        self,
+        session: Session,
+        grain: str,
+        start_date: datetime,
+        end_date: datetime,
+        dimension: str = "",
+        event_types: Optional[List[str]] = None,
+    ) -> List[EventRollupORM]:
+        """
+        Get rollup rows with bucket_start in [start_date, end_date).
+
+        Args:
+            session: Database session
+            grain: Rollup grain (hour or day)
+            start_date: First bucket start (inclusive)
+            end_date: Last bucket start (exclusive)
+            dimension: Dimension name, empty for per-event-type totals
+            event_types: Optional event types filter
+
+        Returns:
+            List of rollup rows
+        """
+        query = session.query(EventRollupORM).filter(
+            and_(
+                EventRollupORM.grain == grain,
+                EventRollupORM.dimension == dimension,
+                EventRollupORM.bucket_start >= start_date,
+                EventRollupORM.bucket_start < end_date,
+            )
+        )
+
+        if event_types:
+            query = query.filter(EventRollupORM.event_type.in_(event_types))
+
+        # Rows may have been rewritten by a Core upsert in this session
+        return query.populate_existing().all()
+
+    def get_by_keys(
+        self, session: Session, keys: List[tuple]
+    ) -> Dict[tuple, EventRollupORM]:
+        """
+        Get existing rollup rows by primary key.
+
+        Args:
+            session: Database session
+            keys: (grain, bucket_start, event_type, dimension, dimension_value) tuples
+
+        Returns:
+            Mapping of key to rollup row
+        """
+        wanted = set(keys)
+        rows = {}
+        by_grain: Dict[str, set] = {}
+        for grain, bucket_start, *_ in wanted:
+            by_grain.setdefault(grain, set()).add(bucket_start)
+
+        for grain, buckets in by_grain.items():
+            for chunk in chunk_list(sorted(buckets), IN_CLAUSE_CHUNK_SIZE):
+                query = session.query(EventRollupORM).filter(
+                    and_(
+                        EventRollupORM.grain == grain,
+                        EventRollupORM.bucket_start.in_(chunk),
+                    )
+                )
+                for row in query.populate_existing():
+                    key = (
+                        row.grain,
+                        row.bucket_start,
+                        row.event_type,
+                        row.dimension,
+                        row.dimension_value,
+                    )
+                    if key in wanted:
+                        rows[key] = row
+        return rows
+
+    def upsert_rollups(self, session: Session, rows: List[Dict[str, Any]]) -> int:
+        """
+        Write merged rollup rows as bulk UPSERTs.
+
+        Args:
+            session: Database session
+            rows: Rollup row dictionaries with final (already merged) values
+
+        Returns:
+            Number of rows written
+        """
+        if not rows:
+            return 0
+
+        stmt = _dialect_insert(session, EventRollupORM)
+        if stmt is None:
+            for row in rows:
+                session.merge(EventRollupORM(**row))
+            session.flush()
+            return len(rows)
+
+        table = EventRollupORM.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                table.c.grain,
+                table.c.bucket_start,
+                table.c.event_type,
+                table.c.dimension,
+                table.c.dimension_value,
+            ],
+            set_={field: getattr(stmt.excluded, field) for field in self.ROLLUP_FIELDS},
+        )
+        session.execute(stmt, rows)
+
+        session.flush()
+        logger.debug(f"Upserted {len(rows)} rollup rows")
+        return len(rows)
+
+
 class UserRepository(BaseRepository[UserORM]):
     """Repository for user operations."""
 
@@ -576,6 +873,147 @@ class UserRepository(BaseRepository[UserORM]):
         session.flush()
         return user
 
+    def bulk_upsert_stats(
+        self,
+        session: Session,
+        deltas: Dict[str, Dict[str, Any]],
+    ) -> int:
+        """
+        Apply per-user counter deltas as a single bulk UPSERT.
+
+        Users that do not exist yet are created with ``first_seen_at`` from
+        the delta; existing users get their counters incremented in place.
+
+        Args:
+            session: Database session
+            deltas: Mapping of user ID to delta with keys ``first_seen_at``,
+                ``events``, ``conversions`` and ``value``
+
+        Returns:
+            Number of users upserted
+        """
+        if not deltas:
+            return 0
+
+        now = datetime.utcnow()
+        rows = [
+            {
+                "id": user_id,
+                "first_seen_at": delta["first_seen_at"],
+                "last_seen_at": now,
+                "total_sessions": 0,
+                "total_events": delta.get("events", 0),
+                "total_conversions": delta.get("conversions", 0),
+                "lifetime_value": delta.get("value", 0.0),
+                "properties": {},
+                "created_at": now,
+                "updated_at": now,
+            }
+            for user_id, delta in deltas.items()
+        ]
+
+        stmt = _dialect_insert(session, UserORM)
+        if stmt is None:
+            # No ON CONFLICT support: fall back to row-by-row increments
+            for row in rows:
+                if not self.get_by_id(session, row["id"]):
+                    self.create(
+                        session,
+                        id=row["id"],
+                        first_seen_at=row["first_seen_at"],
+                        last_seen_at=row["first_seen_at"],
+                    )
+                self.increment_stats(
+                    session,
+                    row["id"],
+                    events=row["total_events"],
+                    conversions=row["total_conversions"],
+                    value=row["lifetime_value"],
+                )
+            return len(rows)
+
+        table = UserORM.__table__
+        for chunk in chunk_list(rows, UPSERT_CHUNK_SIZE):
+            insert_stmt = stmt.values(chunk)
+            excluded = insert_stmt.excluded
+            session.execute(
+                insert_stmt.on_conflict_do_update(
+                    index_elements=[table.c.id],
+                    set_={
+                        "total_events": func.coalesce(table.c.total_events, 0)
+                        + excluded.total_events,
+                        "total_conversions": func.coalesce(table.c.total_conversions, 0)
+                        + excluded.total_conversions,
+                        "lifetime_value": func.coalesce(table.c.lifetime_value, 0.0)
+                        + excluded.lifetime_value,
+                        "last_seen_at": excluded.last_seen_at,
+                        "updated_at": excluded.updated_at,
+                    },
+                )
+            )
+
+        session.flush()
+        logger.debug(f"Upserted stats for {len(rows)} users")
+        return len(rows)
+
+
+class UserScoreRepository(BaseRepository[UserScoreORM]):
+    """Repository for predictive user scores."""
+
+    def __init__(self):
+        super().__init__(UserScoreORM)
+
+    def get_users_with_new_sessions(self, session: Session) -> List[str]:
+        """
+        Get IDs of users with sessions started since the latest scoring run.
+
+        The newest ``scored_at`` is used as the watermark, so only sessions
+        past it are read. Without any scores every user with a session is
+        returned.
+        """
+        last_scored_at = session.query(func.max(UserScoreORM.scored_at)).scalar()
+
+        query = session.query(SessionORM.user_id)
+        if last_scored_at is not None:
+            query = query.filter(SessionORM.started_at > last_scored_at)
+
+        return [row.user_id for row in query.distinct().all()]
+
+    def bulk_upsert_scores(self, session: Session, scores: List[Dict[str, Any]]) -> int:
+        """
+        Write user scores as one bulk UPSERT statement.
+
+        Args:
+            session: Database session
+            scores: Dicts with keys ``user_id``, ``churn_probability``,
+                ``predicted_ltv``, ``engagement_score`` and ``scored_at``
+
+        Returns:
+            Number of scores written
+        """
+        if not scores:
+            return 0
+
+        stmt = _dialect_insert(session, UserScoreORM)
+        if stmt is None:
+            for score in scores:
+                session.merge(UserScoreORM(**score))
+            session.flush()
+            return len(scores)
+
+        table = UserScoreORM.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id],
+            set_={
+                field: getattr(stmt.excluded, field)
+                for field in ("churn_probability", "predicted_ltv", "engagement_score", "scored_at")
+            },
+        )
+        session.execute(stmt, scores)
+        session.flush()
+        logger.debug(f"Upserted {len(scores)} user scores")
+        return len(scores)
+
 
 class SessionRepository(BaseRepository[SessionORM]):
     """Repository for session operations."""
@@ -614,6 +1052,61 @@ class SessionRepository(BaseRepository[SessionORM]):
             .all()
         )
 
+    def get_by_ids(self, session: Session, session_ids: List[str]) -> List[SessionORM]:
+        """Get sessions by a list of IDs in one query."""
+        if not session_ids:
+            return []
+        return (
+            session.query(SessionORM)
+            .filter(SessionORM.id.in_(session_ids))
+            .all()
+        )
+
+    def bulk_apply_deltas(self, session: Session, deltas: List[Dict[str, Any]]) -> int:
+        """
+        Apply session counter deltas with one executemany UPDATE.
+
+        Counters are incremented in SQL so concurrent processors do not
+        overwrite each other; derived fields are set to the supplied values.
+
+        Args:
+            session: Database session
+            deltas: Dicts with keys ``id``, ``events``, ``page_views``,
+                ``conversion_value``, ``converted``, ``last_activity_at``,
+                ``duration_seconds`` and ``is_bounce``
+
+        Returns:
+            Number of sessions updated
+        """
+        if not deltas:
+            return 0
+
+        table = SessionORM.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                events_count=func.coalesce(table.c.events_count, 0) + bindparam("b_events"),
+                page_views=func.coalesce(table.c.page_views, 0) + bindparam("b_page_views"),
+                conversion_value=func.coalesce(table.c.conversion_value, 0.0)
+                + bindparam("b_conversion_value"),
+                converted=or_(
+                    func.coalesce(table.c.converted, False),
+                    bindparam("b_converted", type_=Boolean),
+                ),
+                last_activity_at=bindparam("b_last_activity_at"),
+                duration_seconds=bindparam("b_duration_seconds"),
+                is_bounce=bindparam("b_is_bounce"),
+            )
+        )
+        session.execute(
+            stmt,
+            [{f"b_{key}": value for key, value in delta.items()} for delta in deltas],
+        )
+        session.flush()
+        logger.debug(f"Applied deltas to {len(deltas)} sessions")
+        return len(deltas)
+
 
 class FunnelRepository(BaseRepository[FunnelORM]):
     """Repository for funnel operations."""
@@ -630,6 +1123,141 @@ class FunnelRepository(BaseRepository[FunnelORM]):
         return session.query(FunnelORM).filter(FunnelORM.enabled == True).all()
 
 
+class FunnelStateRepository(BaseRepository[FunnelUserStateORM]):
+    """Repository for incremental funnel state and checkpoints."""
+
+    STATE_FIELDS = (
+        "current_step",
+        "max_step",
+        "entered_at",
+        "last_step_at",
+        "completion_seconds",
+    )
+
+    def __init__(self):
+        super().__init__(FunnelUserStateORM)
+
+    def get_checkpoint(
+        self, session: Session, funnel_id: str
+    ) -> Optional[FunnelCheckpointORM]:
+        """Get the checkpoint for a funnel."""
+        return (
+            session.query(FunnelCheckpointORM)
+            .filter(FunnelCheckpointORM.funnel_id == funnel_id)
+            .first()
+        )
+
+    def save_checkpoint(self, session: Session, funnel_id: str, **kwargs) -> FunnelCheckpointORM:
+        """Create or update the checkpoint for a funnel."""
+        checkpoint = self.get_checkpoint(session, funnel_id)
+        if checkpoint is None:
+            checkpoint = FunnelCheckpointORM(funnel_id=funnel_id)
+            session.add(checkpoint)
+
+        for key, value in kwargs.items():
+            setattr(checkpoint, key, value)
+        checkpoint.updated_at = datetime.utcnow()
+
+        session.flush()
+        return checkpoint
+
+    def reset(self, session: Session, funnel_id: str) -> None:
+        """Drop all persisted state for a funnel."""
+        session.query(FunnelUserStateORM).filter(
+            FunnelUserStateORM.funnel_id == funnel_id
+        ).delete(synchronize_session=False)
+        checkpoint = self.get_checkpoint(session, funnel_id)
+        if checkpoint is not None:
+            session.delete(checkpoint)
+        session.flush()
+        logger.info(f"Reset incremental state for funnel {funnel_id}")
+
+    def get_states(
+        self, session: Session, funnel_id: str, user_ids: List[str]
+    ) -> Dict[str, Dict[str, Any]]:
+        """Get persisted states for a set of users, keyed by user ID."""
+        states = {}
+        for chunk in chunk_list(list(user_ids), IN_CLAUSE_CHUNK_SIZE):
+            rows = session.query(FunnelUserStateORM).filter(
+                and_(
+                    FunnelUserStateORM.funnel_id == funnel_id,
+                    FunnelUserStateORM.user_id.in_(chunk),
+                )
+            )
+            for row in rows:
+                states[row.user_id] = {
+                    field: getattr(row, field) for field in self.STATE_FIELDS
+                }
+        return states
+
+    def upsert_states(
+        self, session: Session, funnel_id: str, states: Dict[str, Dict[str, Any]]
+    ) -> int:
+        """
+        Write user states for a funnel as bulk UPSERTs.
+
+        Args:
+            session: Database session
+            funnel_id: Funnel ID
+            states: Mapping of user ID to state fields
+
+        Returns:
+            Number of states written
+        """
+        if not states:
+            return 0
+
+        rows = [
+            {"funnel_id": funnel_id, "user_id": user_id, **state}
+            for user_id, state in states.items()
+        ]
+
+        stmt = _dialect_insert(session, FunnelUserStateORM)
+        if stmt is None:
+            for row in rows:
+                session.merge(FunnelUserStateORM(**row))
+            session.flush()
+            return len(rows)
+
+        table = FunnelUserStateORM.__table__
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.funnel_id, table.c.user_id],
+            set_={field: getattr(stmt.excluded, field) for field in self.STATE_FIELDS},
+        )
+        session.execute(stmt, rows)
+
+        session.flush()
+        logger.debug(f"Upserted {len(rows)} states for funnel {funnel_id}")
+        return len(rows)
+
+    def get_step_distribution(
+        self, session: Session, funnel_id: str
+    ) -> Dict[int, int]:
+        """Get number of users per furthest step reached."""
+        rows = (
+            session.query(FunnelUserStateORM.max_step, func.count())
+            .filter(FunnelUserStateORM.funnel_id == funnel_id)
+            .group_by(FunnelUserStateORM.max_step)
+            .all()
+        )
+        return {max_step: count for max_step, count in rows}
+
+    def get_avg_completion_seconds(
+        self, session: Session, funnel_id: str
+    ) -> Optional[float]:
+        """Get average time to complete the funnel."""
+        return (
+            session.query(func.avg(FunnelUserStateORM.completion_seconds))
+            .filter(
+                and_(
+                    FunnelUserStateORM.funnel_id == funnel_id,
+                    FunnelUserStateORM.completion_seconds.isnot(None),
+                )
+            )
+            .scalar()
+        )
+
+
 class CohortRepository(BaseRepository[CohortORM]):
     """Repository for cohort operations."""
 
@@ -674,6 +1302,56 @@ class GoalRepository(BaseRepository[GoalORM]):
         session.flush()
         return goal
 
+    def get_enabled_by_event_type(self, session: Session) -> Dict[str, List[GoalORM]]:
+        """Get all enabled goals indexed by event type."""
+        index: Dict[str, List[GoalORM]] = {}
+        for goal in self.get_enabled(session):
+            index.setdefault(goal.event_type, []).append(goal)
+        return index
+
+    def bulk_increment_conversions(
+        self, session: Session, deltas: Dict[str, Dict[str, float]]
+    ) -> int:
+        """
+        Increment conversion statistics for many goals in one executemany UPDATE.
+
+        Args:
+            session: Database session
+            deltas: Mapping of goal ID to ``{"conversions": int, "value": float}``
+
+        Returns:
+            Number of goals updated
+        """
+        if not deltas:
+            return 0
+
+        table = GoalORM.__table__
+        stmt = (
+            update(table)
+            .where(table.c.id == bindparam("b_id"))
+            .values(
+                total_conversions=func.coalesce(table.c.total_conversions, 0)
+                + bindparam("b_conversions"),
+                total_value=func.coalesce(table.c.total_value, 0.0) + bindparam("b_value"),
+                updated_at=bindparam("b_updated_at"),
+            )
+        )
+        now = datetime.utcnow()
+        session.execute(
+            stmt,
+            [
+                {
+                    "b_id": goal_id,
+                    "b_conversions": delta["conversions"],
+                    "b_value": delta["value"],
+                    "b_updated_at": now,
+                }
+                for goal_id, delta in deltas.items()
+            ],
+        )
+        session.flush()
+        return len(deltas)
+
 
 class GoalConversionRepository(BaseRepository[GoalConversionORM]):
     """Repository for goal conversion operations."""
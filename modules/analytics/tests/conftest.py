@@ -20,7 +20,7 @@ from modules.analytics.storage.database import Database, Base
 from modules.analytics.core.tracker import EventTracker
 from modules.analytics.core.aggregator import DataAggregator
 from modules.analytics.core.processor import EventProcessor
-from modules.analytics.processing.funnel import FunnelEngine
+from modules.analytics.processing.funnel import FunnelEngine, IncrementalFunnelEngine
 from modules.analytics.processing.cohort import CohortEngine
 from modules.analytics.processing.attribution import AttributionEngine
 from modules.analytics.processing.predictive import PredictiveEngine
@@ -121,6 +121,12 @@ def funnel_engine(test_db) -> FunnelEngine:
     return FunnelEngine(db=test_db)
 
 
+@pytest.fixture(scope="function")
+def incremental_funnel_engine(test_db) -> IncrementalFunnelEngine:
+    """Create incremental funnel engine instance."""
+    return IncrementalFunnelEngine(db=test_db)
+
+
 @pytest.fixture(scope="function")
 def cohort_engine(test_db) -> CohortEngine:
     """Create cohort engine instance."""
@@ -8,10 +8,17 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from modules.analytics.core.aggregator import DataAggregator
-from modules.analytics.storage.models import EventORM, SessionORM, MetricORM
+from modules.analytics.core.aggregator import DataAggregator, _plan_rollup_segments
+from modules.analytics.storage.database import as_naive_utc
+from modules.analytics.storage.models import (
+    EventORM,
+    EventRollupORM,
+    MetricORM,
+    RollupCheckpointORM,
+    SessionORM,
+)
 from shared.constants import AggregationPeriod, MetricType
-from shared.utils import get_utc_now
+from shared.utils import generate_uuid, get_utc_now
 
 
 class TestDataAggregator:
@@ -432,4 +439,267 @@ class TestDataAggregator:
             assert success is False
 
 
-# Test count: 28 tests
+class TestEventRollups:
+    """Test suite for rollup maintenance and routing in DataAggregator."""
+
+    BASE = datetime(2025, 3, 3)
+
+    @pytest.fixture(autouse=True)
+    def clean_rollups(self, db_session):
+        """Start each test without events, rollups or a watermark."""
+        for model in (EventORM, EventRollupORM, RollupCheckpointORM):
+            db_session.query(model).delete()
+        db_session.commit()
+
+    def _add_events(self, db_session, created_at, specs):
+        """Add events from (hours offset, event_type, user, session, country) specs."""
+        for hours, event_type, user_id, session_id, country in specs:
+            db_session.add(EventORM(
+                id=generate_uuid(),
+                name=event_type,
+                event_type=event_type,
+                user_id=user_id,
+                session_id=session_id,
+                country=country,
+                timestamp=self.BASE + timedelta(hours=hours),
+                created_at=created_at
+            ))
+        db_session.commit()
+
+    def _seed(self, db_session):
+        specs = []
+        for day in range(4):
+            for hour in (1, 9, 17):
+                for user in range(3):
+                    specs.append((
+                        day * 24 + hour,
+                        "page_view" if user < 2 else "click",
+                        f"user_{(day + user) % 5}",
+                        f"session_{day}_{user}",
+                        "US" if user % 2 else "DE",
+                    ))
+        self._add_events(db_session, self.BASE, specs)
+        return specs
+
+    def _expected_by_day(self, specs, start, end):
+        expected = {}
+        for hours, event_type, user_id, session_id, _ in specs:
+            ts = self.BASE + timedelta(hours=hours)
+            if not start <= ts <= end:
+                continue
+            key = (ts.replace(hour=0), event_type)
+            entry = expected.setdefault(key, [0, set(), set()])
+            entry[0] += 1
+            entry[1].add(user_id)
+            entry[2].add(session_id)
+        return {key: (c, len(u), len(s)) for key, (c, u, s) in expected.items()}
+
+    def test_plan_rollup_segments(self):
+        """Test ranges split into day, hour and raw segments."""
+        start = datetime(2025, 3, 3, 10, 30)
+        end = datetime(2025, 3, 6, 5, 15)
+
+        rollup, raw = _plan_rollup_segments(
+            start, end, [AggregationPeriod.DAY, AggregationPeriod.HOUR]
+        )
+
+        assert rollup == [
+            (AggregationPeriod.DAY, datetime(2025, 3, 4), datetime(2025, 3, 6)),
+            (AggregationPeriod.HOUR, datetime(2025, 3, 3, 11), datetime(2025, 3, 4)),
+            (AggregationPeriod.HOUR, datetime(2025, 3, 6), datetime(2025, 3, 6, 5)),
+        ]
+        assert raw == [
+            (start, datetime(2025, 3, 3, 11), False),
+            (datetime(2025, 3, 6, 5), end, True),
+        ]
+
+    def test_update_rollups_incremental(self, aggregator, db_session):
+        """Test rollups fold only events created after the watermark."""
+        self._add_events(db_session, self.BASE, [(1, "page_view", "user_1", "s1", "US")])
+        first = aggregator.update_rollups(db_session, until=self.BASE + timedelta(minutes=1))
+
+        self._add_events(db_session, self.BASE + timedelta(minutes=5), [
+            (1, "page_view", "user_1", "s2", "US"),
+            (1, "page_view", "user_2", "s3", None),
+        ])
+        second = aggregator.update_rollups(db_session, until=self.BASE + timedelta(minutes=10))
+        again = aggregator.update_rollups(db_session, until=self.BASE + timedelta(minutes=10))
+
+        assert first["events"] == 1
+        assert second["events"] == 2
+        assert again["events"] == 0
+
+        hour_row = db_session.query(EventRollupORM).filter(
+            EventRollupORM.grain == "hour",
+            EventRollupORM.dimension == ""
+        ).one()
+        assert hour_row.event_count == 3
+
+        country_row = db_session.query(EventRollupORM).filter(
+            EventRollupORM.grain == "day",
+            EventRollupORM.dimension == "country"
+        ).one()
+        assert country_row.dimension_value == "US"
+        assert country_row.event_count == 2
+
+    def test_aggregate_events_from_rollups(self, aggregator, db_session):
+        """Test rollup-routed aggregation matches exact counts on unaligned ranges."""
+        specs = self._seed(db_session)
+        aggregator.update_rollups(db_session, until=self.BASE + timedelta(days=10))
+
+        start = self.BASE + timedelta(hours=5)
+        end = self.BASE + timedelta(days=3, hours=9)
+        results = aggregator.aggregate_events(db_session, start, end, AggregationPeriod.DAY)
+
+        actual = {
+            (r["period"], r["event_type"]): (r["count"], r["unique_users"], r["unique_sessions"])
+            for r in results
+        }
+        assert actual == self._expected_by_day(specs, start, end)
+
+    def test_aggregate_events_past_watermark(self, aggregator, db_session):
+        """Test events past the rollup watermark are read from raw events."""
+        self._seed(db_session)
+        aggregator.update_rollups(db_session, until=self.BASE + timedelta(hours=1))
+
+        late = self.BASE + timedelta(days=1)
+        self._add_events(db_session, late, [(30, "signup", "user_9", "session_9", "FR")])
+
+        results = aggregator.aggregate_events(
+            db_session, self.BASE, self.BASE + timedelta(days=4), AggregationPeriod.WEEK
+        )
+
+        signups = [r for r in results if r["event_type"] == "signup"]
+        assert len(signups) == 1
+        assert signups[0]["period"] == self.BASE
+        assert signups[0]["count"] == 1
+
+    def test_aggregate_by_dimension_from_rollups(self, aggregator, db_session):
+        """Test dimension aggregation is served from rollups."""
+        specs = self._seed(db_session)
+        aggregator.update_rollups(db_session, until=self.BASE + timedelta(days=10))
+
+        results = aggregator.aggregate_by_dimension(
+            db_session, "country", self.BASE, self.BASE + timedelta(days=5)
+        )
+
+        expected = {}
+        for _, _, user_id, _, country in specs:
+            entry = expected.setdefault(country, [0, set()])
+            entry[0] += 1
+            entry[1].add(user_id)
+
+        assert {r["value"]: (r["count"], r["unique_users"]) for r in results} == {
+            country: (count, len(users)) for country, (count, users) in expected.items()
+        }
+        assert results[0]["count"] >= results[-1]["count"]
+
+    def test_rollups_with_aware_datetimes(self, aggregator, db_session):
+        """Test repeated runs and reads with timezone-aware datetimes."""
+        event_type = f"aware_{generate_uuid()[:8]}"
+        now = as_naive_utc(get_utc_now())
+        for minutes in range(0, 50):
+            db_session.add(EventORM(
+                id=generate_uuid(),
+                name=event_type,
+                event_type=event_type,
+                user_id=f"user_{minutes % 5}",
+                session_id=f"session_{minutes % 10}",
+                country="US",
+                timestamp=now - timedelta(hours=3, minutes=minutes),
+                created_at=now - timedelta(hours=3)
+            ))
+        db_session.commit()
+
+        aggregator.update_rollups(db_session)
+        again = aggregator.update_rollups(db_session, until=get_utc_now())
+        assert again["events"] == 0
+
+        results = aggregator.aggregate_events(
+            db_session,
+            get_utc_now() - timedelta(hours=6),
+            get_utc_now(),
+            AggregationPeriod.HOUR,
+            event_types=[event_type]
+        )
+        assert sum(r["count"] for r in results) == 50
+        assert all(r["period"].tzinfo is None for r in results)
+
+        by_country = aggregator.aggregate_by_dimension(
+            db_session, "country", get_utc_now() - timedelta(hours=6), get_utc_now(),
+            event_types=[event_type]
+        )
+        assert [(r["value"], r["count"]) for r in by_country] == [("US", 50)]
+
+    def test_late_and_future_events_counted_once(self, aggregator, db_session):
+        """Test events created after the watermark are counted once by timestamp."""
+        event_type = f"late_{generate_uuid()[:8]}"
+        t0 = as_naive_utc(get_utc_now())
+        future = t0 + timedelta(days=1)
+
+        def add(timestamp, created_at):
+            db_session.add(EventORM(
+                id=generate_uuid(),
+                name=event_type,
+                event_type=event_type,
+                user_id="user_1",
+                session_id="session_1",
+                timestamp=timestamp,
+                created_at=created_at
+            ))
+            db_session.commit()
+
+        add(self.BASE + timedelta(hours=1), t0 - timedelta(minutes=90))
+        add(future, t0 - timedelta(minutes=90))
+        aggregator.update_rollups(db_session, until=t0 - timedelta(hours=1))
+
+        # Arrives after the watermark for a bucket that is already rolled up
+        add(self.BASE + timedelta(hours=2), t0 - timedelta(minutes=30))
+
+        def counts():
+            results = aggregator.aggregate_events(
+                db_session, self.BASE, future + timedelta(days=1), AggregationPeriod.DAY,
+                event_types=[event_type]
+            )
+            return {r["period"]: r["count"] for r in results}
+
+        expected = {self.BASE: 2, future.replace(hour=0, minute=0, second=0, microsecond=0): 1}
+        assert counts() == expected
+
+        aggregator.update_rollups(db_session, until=t0)
+        assert counts() == expected
+
+    def test_lock_checkpoint_creates_missing_row(self, aggregator, db_session):
+        """Test the checkpoint row is created before locking and kept once it exists."""
+        repository = aggregator.rollup_repository
+
+        checkpoint = repository.lock_checkpoint(db_session, "test", self.BASE)
+        assert checkpoint.processed_until == self.BASE
+        repository.save_checkpoint(db_session, "test", self.BASE + timedelta(hours=1))
+        db_session.commit()
+
+        checkpoint = repository.lock_checkpoint(db_session, "test", self.BASE)
+        assert checkpoint.processed_until == self.BASE + timedelta(hours=1)
+        db_session.commit()
+
+    def test_first_rollup_run_creates_checkpoint(self, aggregator, db_session):
+        """Test the first run folds every event and stores the watermark."""
+        self._add_events(db_session, self.BASE, [(1, "page_view", "user_1", "s1", "US")])
+
+        result = aggregator.update_rollups(db_session, until=self.BASE + timedelta(minutes=1))
+
+        assert result["events"] == 1
+        checkpoint = db_session.query(RollupCheckpointORM).one()
+        assert checkpoint.processed_until == self.BASE + timedelta(minutes=1)
+
+    def test_rollups_unused_without_checkpoint(self, aggregator, db_session):
+        """Test routing falls back to raw queries before the first rollup run."""
+        assert aggregator._aggregate_events_from_rollups(
+            db_session, self.BASE, self.BASE + timedelta(days=2), AggregationPeriod.DAY
+        ) is None
+        assert aggregator._aggregate_events_from_rollups(
+            db_session, self.BASE, self.BASE + timedelta(days=2), AggregationPeriod.MINUTE
+        ) is None
+
+
+# Test count: 34 tests
@@ -9,7 +9,8 @@ from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
 from modules.analytics.processing.attribution import AttributionEngine
-from modules.analytics.storage.models import EventORM, SessionORM
+from modules.analytics.storage.models import EventORM, GoalConversionORM, SessionORM
+from shared.constants import AttributionModel
 from shared.utils import get_utc_now, generate_uuid
 
 
@@ -274,4 +275,96 @@ class TestAttributionEngine:
         db_session.commit()
 
 
-# Test count: 15 tests
+
+class TestBulkAttribution:
+    """
+    Test suite for AttributionEngine.calculate_bulk_attribution.
+
+    The database is shared between tests, so each test uses its own users
+    and date range.
+    """
+
+    def _add_journey(self, db_session, user_id, sources, start, converted_at):
+        """Add touchpoints for a user and one conversion."""
+        for i, source in enumerate(sources):
+            db_session.add(EventORM(
+                id=generate_uuid(),
+                name="visit",
+                event_type="page_view",
+                user_id=user_id,
+                properties={"utm_source": source},
+                timestamp=start + timedelta(days=i)
+            ))
+        conversion = GoalConversionORM(
+            id=generate_uuid(),
+            goal_id="goal_1",
+            user_id=user_id,
+            event_id=generate_uuid(),
+            converted_at=converted_at
+        )
+        db_session.add(conversion)
+        return conversion
+
+    def test_bulk_matches_per_conversion(self, attribution_engine, db_session):
+        """Test bulk totals equal the sum of per-conversion attribution."""
+        start = datetime(2025, 1, 1)
+        users = [f"bulk_{i}_{generate_uuid()[:8]}" for i in range(3)]
+        conversions = [
+            self._add_journey(db_session, users[0], ["google", "facebook", "email"], start, start + timedelta(days=3)),
+            self._add_journey(db_session, users[1], ["email", "google"], start, start + timedelta(days=2)),
+            self._add_journey(db_session, users[2], ["twitter"], start, start + timedelta(days=1)),
+        ]
+        db_session.commit()
+
+        report = attribution_engine.calculate_bulk_attribution(
+            start, start + timedelta(days=10)
+        )
+
+        assert report["conversions"] == 3
+        assert report["attributed_conversions"] == 3
+
+        for model in ["first_touch", "last_touch", "linear", "time_decay", "position_based"]:
+            expected = {}
+            for conversion in conversions:
+                credits = attribution_engine.calculate_attribution(conversion.id, AttributionModel(model))
+                for channel, credit in credits.items():
+                    expected[channel] = expected.get(channel, 0.0) + credit
+
+            assert report["models"][model] == pytest.approx(expected)
+
+    def test_bulk_respects_lookback(self, attribution_engine, db_session):
+        """Test touchpoints older than the lookback window are ignored."""
+        start = datetime(2025, 4, 1)
+        user_id = f"lookback_{generate_uuid()[:8]}"
+        self._add_journey(db_session, user_id, ["old", "recent"], start, start + timedelta(days=1))
+        db_session.add(EventORM(
+            id=generate_uuid(),
+            name="visit",
+            event_type="page_view",
+            user_id=user_id,
+            properties={"utm_source": "ancient"},
+            timestamp=start - timedelta(days=40)
+        ))
+        db_session.commit()
+
+        report = attribution_engine.calculate_bulk_attribution(
+            start, start + timedelta(days=2), models=[AttributionModel.FIRST_TOUCH]
+        )
+
+        assert report["models"] == {"first_touch": {"old": 1.0}}
+
+    def test_bulk_skips_unsupported_models(self, attribution_engine, db_session):
+        """Test unsupported models are dropped from the report."""
+        start = datetime(2025, 7, 1)
+
+        report = attribution_engine.calculate_bulk_attribution(
+            start,
+            start + timedelta(days=1),
+            models=[AttributionModel.LINEAR, AttributionModel.DATA_DRIVEN]
+        )
+
+        assert report["conversions"] == 0
+        assert list(report["models"]) == ["linear"]
+
+
+# Test count: 18 tests
@@ -0,0 +1,288 @@
+"""
+Unit Tests for Redis Cache
+
+Tests for the L1 tier, batch operations, single-flight and cache counters.
+"""
+
+import fnmatch
+import json
+import pickle
+import threading
+import time
+
+import pytest
+
+from modules.analytics.storage.cache import (
+    CacheConfig,
+    LocalLRUCache,
+    RedisCache,
+    _CacheEntry,
+    cached,
+)
+
+
+class FakePubSub:
+    """Pub/sub stub that never delivers messages."""
+
+    def subscribe(self, channel):
+        pass
+
+    def get_message(self, timeout=0.0):
+        time.sleep(min(timeout, 0.01))
+        return None
+
+    def close(self):
+        pass
+
+
+class FakePipeline:
+    """Pipeline stub that applies commands on execute."""
+
+    def __init__(self, client):
+        self.client = client
+        self.commands = []
+
+    def setex(self, key, ttl, value):
+        self.commands.append((key, value))
+
+    def set(self, key, value):
+        self.commands.append((key, value))
+
+    def execute(self):
+        self.client.round_trips += 1
+        for key, value in self.commands:
+            self.client.data[key] = value
+
+
+class FakeRedis:
+    """In-memory stand-in for the sync Redis client."""
+
+    def __init__(self):
+        self.data = {}
+        self.published = []
+        self.round_trips = 0
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        self.round_trips += 1
+        return self.data.get(key)
+
+    def mget(self, keys):
+        self.round_trips += 1
+        return [self.data.get(key) for key in keys]
+
+    def set(self, key, value, nx=False, ex=None):
+        with self.lock:
+            if nx and key in self.data:
+                return None
+            self.data[key] = value
+            return True
+
+    def setex(self, key, ttl, value):
+        self.data[key] = value
+
+    def delete(self, *keys):
+        return sum(1 for key in keys if self.data.pop(key, None) is not None)
+
+    def keys(self, pattern):
+        return [key for key in self.data if fnmatch.fnmatchcase(key, pattern)]
+
+    def eval(self, script, numkeys, key, token):
+        if self.data.get(key) == token:
+            del self.data[key]
+
+    def publish(self, channel, message):
+        self.published.append((channel, json.loads(message)))
+
+    def pipeline(self, transaction=True):
+        return FakePipeline(self)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub()
+
+    def close(self):
+        pass
+
+
+def make_cache(**config):
+    cache = RedisCache(CacheConfig(**config), key_prefix="test")
+    cache._client = FakeRedis()
+    return cache
+
+
+class TestLocalLRUCache:
+    """Test suite for LocalLRUCache class."""
+
+    def test_evicts_least_recently_used(self):
+        """Test the oldest untouched entry is evicted when full."""
+        lru = LocalLRUCache(max_size=2, ttl=60)
+        lru.set("a", 1)
+        lru.set("b", 2)
+        lru.get("a")
+        lru.set("c", 3)
+
+        assert lru.get("a") == (True, 1)
+        assert lru.get("b") == (False, None)
+        assert len(lru) == 2
+
+    def test_entries_expire(self):
+        """Test entries expire after the smaller of entry and L1 TTL."""
+        lru = LocalLRUCache(max_size=10, ttl=60)
+        lru.set("a", 1, ttl=0.01)
+        time.sleep(0.02)
+
+        assert lru.get("a") == (False, None)
+
+    def test_delete_pattern(self):
+        """Test glob deletes only matching keys."""
+        lru = LocalLRUCache(max_size=10, ttl=60)
+        lru.set("user:1", 1)
+        lru.set("user:2", 2)
+        lru.set("report:1", 3)
+
+        assert lru.delete_pattern("user:*") == 2
+        assert lru.get("report:1") == (True, 3)
+
+
+class TestRedisCacheTiers:
+    """Test suite for RedisCache L1 tier and batch operations."""
+
+    def test_l1_serves_repeat_reads(self):
+        """Test repeat reads skip Redis once the L1 tier is filled."""
+        cache = make_cache(l1_max_size=100)
+        cache.set("user:1", {"name": "a"})
+        cache._l1.clear()
+
+        assert cache.get("user:1") == {"name": "a"}
+        trips = cache._client.round_trips
+        assert cache.get("user:1") == {"name": "a"}
+
+        assert cache._client.round_trips == trips
+        stats = cache.get_stats()["user"]
+        assert stats["l2_hits"] == 1
+        assert stats["l1_hits"] == 1
+        assert stats["hit_rate"] == 1.0
+        cache.close()
+
+    def test_writes_publish_invalidation(self):
+        """Test set and delete publish invalidations for other processes."""
+        cache = make_cache(l1_max_size=100)
+        cache.set("user:1", 1)
+        cache.delete("user:1")
+
+        channels = {channel for channel, _ in cache._client.published}
+        keys = [message["keys"] for _, message in cache._client.published]
+        assert channels == {"test:invalidations"}
+        assert keys == [["user:1"], ["user:1"]]
+        assert cache.get("user:1") is None
+
+    def test_apply_invalidation(self):
+        """Test invalidations from other instances evict L1 entries."""
+        cache = make_cache(l1_max_size=100)
+        cache._l1.set("user:1", 1)
+        cache._l1.set("user:2", 2)
+        cache._l1.set("report:1", 3)
+
+        cache._apply_invalidation(json.dumps({"origin": "other", "keys": ["user:1"]}))
+        assert cache._l1.get("user:1") == (False, None)
+
+        cache._apply_invalidation(json.dumps({"origin": cache._instance_id, "keys": ["user:2"]}))
+        assert cache._l1.get("user:2") == (True, 2)
+
+        cache._apply_invalidation(json.dumps({"origin": "other", "pattern": "report:*"}))
+        assert cache._l1.get("report:1") == (False, None)
+
+    def test_mget_mset(self):
+        """Test batch operations use one round trip and omit missing keys."""
+        cache = make_cache()
+        assert cache.mset({"a:1": 1, "a:2": [2]}, ttl=60) is True
+
+        trips = cache._client.round_trips
+        values = cache.mget(["a:1", "a:2", "a:3"])
+
+        assert values == {"a:1": 1, "a:2": [2]}
+        assert cache._client.round_trips == trips + 1
+        assert cache.get_stats()["a"]["misses"] == 1
+
+
+class TestSingleFlight:
+    """Test suite for get_or_set and the cached decorator."""
+
+    def test_concurrent_misses_compute_once(self):
+        """Test concurrent callers share one computation."""
+        cache = make_cache()
+        calls = []
+
+        def compute():
+            calls.append(1)
+            time.sleep(0.05)
+            return "value"
+
+        results = []
+        threads = [
+            threading.Thread(target=lambda: results.append(cache.get_or_set("hot:key", compute)))
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert results == ["value"] * 8
+        assert len(calls) == 1
+        assert "test:hot:key:lock" not in cache._client.data
+
+    def test_waits_for_other_process(self):
+        """Test a caller waits for the value when another process holds the lock."""
+        cache = make_cache()
+        cache._client.data["test:hot:key:lock"] = "other"
+
+        def publish_value():
+            time.sleep(0.05)
+            cache._client.set("test:hot:key", pickle.dumps(_CacheEntry("remote", 0.1, None)))
+
+        threading.Thread(target=publish_value).start()
+
+        assert cache.get_or_set("hot:key", lambda: "local") == "remote"
+
+    def test_early_refresh(self):
+        """Test entries near expiry are recomputed before they expire."""
+        cache = make_cache(early_refresh_beta=1.0)
+        entry = _CacheEntry("old", delta=1000.0, expires_at=time.time() + 1)
+        cache.set("report:daily", entry)
+
+        assert cache.get_or_set("report:daily", lambda: "new") == "new"
+        assert cache.get_stats()["report"]["early_refreshes"] == 1
+
+        cache = make_cache(early_refresh_beta=0)
+        cache.set("report:daily", entry)
+        assert cache.get_or_set("report:daily", lambda: "new") == "old"
+
+    def test_cached_decorator(self):
+        """Test decorated functions hit the cache after the first call."""
+        cache = make_cache()
+        calls = []
+
+        @cached(ttl=60, key_prefix="calc")
+        def square(cache, x):
+            calls.append(x)
+            return x * x
+
+        assert square(cache, 4) == 16
+        assert square(cache, 4) == 16
+        assert calls == [4]
+
+    def test_compute_error_propagates(self):
+        """Test computation errors reach the caller and release the lock."""
+        cache = make_cache()
+
+        def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError):
+            cache.get_or_set("bad:key", fail)
+
+        assert "test:bad:key:lock" not in cache._client.data
+
+
+# Test count: 12 tests
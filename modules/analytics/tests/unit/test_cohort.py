@@ -5,11 +5,12 @@ Tests for cohort analysis and retention tracking.
 """
 
 import pytest
-from datetime import datetime, timedelta
+import warnings
+from datetime import datetime, timedelta, timezone
 from unittest.mock import Mock, patch
 
 from modules.analytics.processing.cohort import CohortEngine
-from modules.analytics.models.cohort import CohortAnalysis, CohortRetention
+from modules.analytics.models.cohort import CohortAnalysis, CohortRetention, RetentionMatrix
 from modules.analytics.storage.models import UserORM, SessionORM
 from shared.constants import AggregationPeriod
 from shared.utils import get_utc_now, generate_uuid
@@ -365,4 +366,136 @@ class TestCohortEngine:
         assert analysis.initial_users == user_count
 
 
-# Test count: 19 tests
+
+class TestRetentionMatrix:
+    """Test suite for CohortEngine.analyze_retention_matrix."""
+
+    def _seed(self, db_session, start):
+        """Create two daily cohorts with known activity."""
+        # Cohort 0: three users, two return on day 1, one on day 2
+        # Cohort 1: two users, one returns on day 1 (twice)
+        users = {
+            "a": (0, [0, 1]),
+            "b": (0, [0, 1, 2]),
+            "c": (0, [0]),
+            "d": (1, [0, 1, 1]),
+            "e": (1, []),
+        }
+        # The database is shared between tests, so IDs are made unique
+        suffix = generate_uuid()[:8]
+        for user_id, (cohort, active_days) in users.items():
+            user_id = f"{user_id}_{suffix}"
+            first_seen = start + timedelta(days=cohort, hours=1)
+            db_session.add(UserORM(id=user_id, first_seen_at=first_seen, last_seen_at=first_seen))
+            for index, day in enumerate(active_days):
+                db_session.add(SessionORM(
+                    id=generate_uuid(),
+                    user_id=user_id,
+                    started_at=start + timedelta(days=cohort + day, hours=2 + index)
+                ))
+        db_session.commit()
+
+    def test_matrix_counts(self, cohort_engine, db_session):
+        """Test grid counts distinct active users per cell."""
+        start = datetime(2025, 1, 1)
+        self._seed(db_session, start)
+
+        matrix = cohort_engine.analyze_retention_matrix(
+            start,
+            start + timedelta(days=2),
+            periods=3,
+            period_type=AggregationPeriod.DAY
+        )
+
+        assert isinstance(matrix, RetentionMatrix)
+        assert matrix.cohort_sizes == [3, 2]
+        assert matrix.active_users == [[3, 2, 1], [1, 1, 0]]
+        assert matrix.retention_rates[0] == [100.0, 66.67, 33.33]
+        assert matrix.cohort_dates == [start, start + timedelta(days=1)]
+
+    def test_matrix_timezone_aware_range(self, cohort_engine, db_session):
+        """Test timezone-aware bounds are read as UTC without numpy warnings."""
+        start = datetime(2025, 3, 1)
+        self._seed(db_session, start)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            matrix = cohort_engine.analyze_retention_matrix(
+                start.replace(tzinfo=timezone.utc),
+                (start + timedelta(days=2)).replace(tzinfo=timezone.utc),
+                periods=3,
+                period_type=AggregationPeriod.DAY
+            )
+
+        assert matrix.cohort_sizes == [3, 2]
+        assert matrix.active_users == [[3, 2, 1], [1, 1, 0]]
+        assert matrix.cohort_dates == [start, start + timedelta(days=1)]
+
+    def test_matrix_matches_single_cohort(self, cohort_engine, db_session):
+        """Test each row matches the per-cohort analysis."""
+        start = datetime(2025, 2, 1)
+        self._seed(db_session, start)
+
+        matrix = cohort_engine.analyze_retention_matrix(
+            start,
+            start + timedelta(days=2),
+            periods=3,
+            period_type=AggregationPeriod.DAY
+        )
+
+        for row, cohort_date in enumerate(matrix.cohort_dates):
+            analysis = cohort_engine.analyze_retention_cohort(
+                cohort_date, periods=3, period_type=AggregationPeriod.DAY
+            )
+            assert [r.users_active for r in analysis.retention_data] == matrix.active_users[row]
+
+    def test_matrix_empty(self, cohort_engine, db_session):
+        """Test empty range yields a zero grid."""
+        start = datetime(2030, 1, 1)
+
+        matrix = cohort_engine.analyze_retention_matrix(
+            start,
+            start + timedelta(weeks=2),
+            periods=4
+        )
+
+        assert matrix.cohort_sizes == [0, 0]
+        assert matrix.active_users == [[0] * 4, [0] * 4]
+
+    def test_matrix_cached(self, test_db):
+        """Test matrix is served from cache by (period_type, range)."""
+        cache = Mock()
+        cache.get.return_value = None
+        engine = CohortEngine(test_db, cache=cache)
+        start = datetime(2030, 1, 1)
+
+        engine.analyze_retention_matrix(start, start + timedelta(weeks=1), periods=2)
+
+        key = cache.set.call_args[0][0]
+        assert key.startswith("cohort:retention_matrix:week:")
+
+        cache.get.return_value = cache.set.call_args[0][1]
+        with patch.object(engine, "_load_first_seen") as load:
+            cached = engine.analyze_retention_matrix(start, start + timedelta(weeks=1), periods=2)
+
+        load.assert_not_called()
+        assert cached.cohort_sizes == [0]
+
+    @pytest.mark.parametrize("period_type,days", [
+        (AggregationPeriod.DAY, 1),
+        (AggregationPeriod.WEEK, 7),
+        (AggregationPeriod.MONTH, 30),
+    ])
+    def test_matrix_default_start_spans_periods(self, cohort_engine, period_type, days):
+        """Test the default start covers the requested periods of the period type."""
+        end = datetime(2030, 7, 1)
+
+        matrix = cohort_engine.analyze_retention_matrix(
+            None, end, periods=6, period_type=period_type, use_cache=False
+        )
+
+        assert matrix.start_date == end - timedelta(days=6 * days)
+        assert len(matrix.cohort_dates) == 6
+
+
+# Test count: 23 tests
@@ -10,13 +10,25 @@ import json
 import csv
 from pathlib import Path
 from unittest.mock import Mock, patch, mock_open
+import gzip
 import tempfile
+from datetime import datetime
+
+from sqlalchemy import select
 
 from modules.analytics.export.exporters import (
     BaseExporter,
     CSVExporter,
-    JSONExporter
+    DataExporter,
+    ExcelExporter,
+    JSONExporter,
+    ParquetExporter,
+    stream_query,
 )
+from modules.analytics.processing.tasks import export_job_task
+from modules.analytics.storage.models import ExportJobORM, MetricORM
+from shared.constants import ExportFormat
+from shared.utils import generate_uuid
 
 
 class TestBaseExporter:
@@ -292,6 +304,148 @@ class TestPDFExporter:
         pass
 
 
+class TestStreamingExport:
+    """Test suite for streaming export paths."""
+
+    def _rows(self, count, consumed=None):
+        """Generate rows lazily, recording how many were pulled."""
+        for i in range(count):
+            if consumed is not None:
+                consumed.append(i)
+            yield {"id": i, "name": f"row {i}", "at": datetime(2025, 1, 1)}
+
+    def test_csv_stream_in_chunks(self, tmp_path):
+        """Test CSV export consumes a generator chunk by chunk."""
+        exporter = CSVExporter(max_rows=25)
+        file_path = tmp_path / "stream.csv"
+        consumed = []
+
+        with patch("modules.analytics.export.exporters.EXPORT_CHUNK_SIZE", 10):
+            count = exporter.export_stream(self._rows(100, consumed), str(file_path))
+
+        assert count == 25
+        assert len(consumed) == 25
+        with open(file_path, newline="") as f:
+            assert len(list(csv.DictReader(f))) == 25
+
+    def test_csv_stream_gzip(self, tmp_path):
+        """Test gzip-compressed CSV output."""
+        exporter = CSVExporter()
+        file_path = tmp_path / "stream.csv.gz"
+
+        assert exporter.export_stream(self._rows(5), str(file_path), compress=True) == 5
+
+        with gzip.open(file_path, "rt", newline="") as f:
+            rows = list(csv.DictReader(f))
+        assert rows[4]["name"] == "row 4"
+
+    def test_ndjson_stream(self, tmp_path):
+        """Test newline-delimited JSON output."""
+        exporter = JSONExporter()
+        file_path = tmp_path / "stream.ndjson"
+
+        assert exporter.export_stream(self._rows(3), str(file_path), lines=True) == 3
+
+        lines = file_path.read_text().splitlines()
+        assert len(lines) == 3
+        assert json.loads(lines[0])["at"] == "2025-01-01T00:00:00"
+
+    def test_json_array_stream(self, tmp_path):
+        """Test JSON array output from a generator is valid JSON."""
+        exporter = JSONExporter()
+        file_path = tmp_path / "stream.json"
+
+        assert exporter.export(self._rows(4), str(file_path)) is True
+
+        with open(file_path) as f:
+            assert [row["id"] for row in json.load(f)] == [0, 1, 2, 3]
+
+    def test_excel_write_only(self, tmp_path):
+        """Test XLSX output via openpyxl write-only mode."""
+        openpyxl = pytest.importorskip("openpyxl")
+        exporter = ExcelExporter()
+        file_path = tmp_path / "stream.xlsx"
+
+        rows = ({"id": i, "tags": ["a", "b"]} for i in range(3))
+        assert exporter.export_stream(rows, str(file_path)) == 3
+
+        sheet = openpyxl.load_workbook(file_path)["Data"]
+        values = list(sheet.values)
+        assert values[0] == ("id", "tags")
+        assert len(values) == 4
+
+    def test_parquet_stream(self, tmp_path):
+        """Test Parquet output with one row group per chunk."""
+        pq = pytest.importorskip("pyarrow.parquet")
+        exporter = ParquetExporter()
+        file_path = tmp_path / "stream.parquet"
+
+        with patch("modules.analytics.export.exporters.EXPORT_CHUNK_SIZE", 4):
+            assert exporter.export_stream(self._rows(10), str(file_path)) == 10
+
+        parquet_file = pq.ParquetFile(file_path)
+        assert parquet_file.metadata.num_rows == 10
+        assert parquet_file.metadata.num_row_groups == 3
+
+    def test_empty_stream(self, tmp_path):
+        """Test empty iterators export nothing."""
+        assert CSVExporter().export_stream(iter([]), str(tmp_path / "empty.csv")) == 0
+        assert not (tmp_path / "empty.csv").exists()
+
+    def test_export_query(self, db_session, tmp_path):
+        """Test DataExporter streams a query result through a cursor."""
+        # The test engine is shared, so only read back the rows added here
+        name = f"export_{generate_uuid()[:8]}"
+        ids = [f"{name}_{i}" for i in range(5)]
+        for i, metric_id in enumerate(ids):
+            db_session.add(MetricORM(
+                id=metric_id,
+                name=name,
+                metric_type="gauge",
+                value=float(i),
+                timestamp=datetime(2025, 1, 1, i)
+            ))
+        db_session.commit()
+
+        statement = (
+            select(MetricORM.name, MetricORM.value)
+            .where(MetricORM.name == name)
+            .order_by(MetricORM.timestamp)
+        )
+        assert [row["value"] for row in stream_query(db_session, statement)] == [0.0, 1.0, 2.0, 3.0, 4.0]
+
+        exporter = DataExporter(export_dir=str(tmp_path))
+        file_path, count = exporter.export_query(
+            db_session, select(MetricORM).where(MetricORM.name == name), ExportFormat.CSV, compress=True
+        )
+
+        assert count == 5
+        assert file_path.endswith(".csv.gz")
+        with gzip.open(file_path, "rt", newline="") as f:
+            assert {row["id"] for row in csv.DictReader(f)} == set(ids)
+
+    def test_export_job_failure_marks_job(self, test_db):
+        """Test an export job that raises is marked failed with the error."""
+        job_id = generate_uuid()
+        with test_db.session() as session:
+            session.add(ExportJobORM(
+                id=job_id, name="events", export_type="events", format="csv", query_params={"days": 1}
+            ))
+            session.commit()
+
+        with patch("modules.analytics.processing.tasks.get_database", return_value=test_db), \
+                patch("modules.analytics.processing.tasks.ReportGenerator") as generator:
+            generator.return_value.export_raw_data.side_effect = RuntimeError("disk full")
+            result = export_job_task(job_id)
+
+        assert result == {"status": "error", "error": "disk full"}
+        with test_db.session() as session:
+            job = session.get(ExportJobORM, job_id)
+            assert job.status == "failed"
+            assert job.error_message == "disk full"
+            assert job.completed_at is not None
+
+
 @pytest.fixture
 def sample_export_data():
     """Sample data for export tests."""
@@ -302,4 +456,4 @@ def sample_export_data():
     ]
 
 
-# Test count: 23 tests
+# Test count: 31 tests
@@ -8,8 +8,9 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from modules.analytics.processing.funnel import FunnelEngine
+from modules.analytics.processing.funnel import FunnelEngine, IncrementalFunnelEngine
 from modules.analytics.models.funnel import FunnelAnalysis, FunnelStepStats
+from modules.analytics.storage.database import as_naive_utc
 from modules.analytics.storage.models import EventORM, FunnelORM, FunnelStepORM
 from shared.utils import get_utc_now, generate_uuid
 
@@ -431,4 +432,194 @@ class TestFunnelEngine:
         assert analysis.overall_conversion_rate == pytest.approx(completion_rate, abs=1)
 
 
-# Test count: 20 tests
+
+def _create_ordered_funnel(db_session, event_types):
+    """Create a funnel with one step per event type."""
+    funnel = FunnelORM(id=generate_uuid(), name=f"Ordered Funnel {generate_uuid()}")
+    funnel.steps = [
+        FunnelStepORM(
+            id=generate_uuid(),
+            funnel_id=funnel.id,
+            name=f"Step {order + 1}",
+            event_type=event_type,
+            order=order
+        )
+        for order, event_type in enumerate(event_types)
+    ]
+    db_session.add(funnel)
+    db_session.commit()
+    return funnel
+
+
+def _event_types(*names):
+    """Make event type names unique to one test; the database is shared."""
+    suffix = generate_uuid()[:8]
+    return [f"{name}_{suffix}" for name in names]
+
+
+def _add_event(db_session, user_id, event_type, timestamp):
+    """Add a single event."""
+    db_session.add(EventORM(
+        id=generate_uuid(),
+        name=event_type,
+        event_type=event_type,
+        user_id=user_id,
+        timestamp=timestamp
+    ))
+
+
+class TestIncrementalFunnelEngine:
+    """Test suite for IncrementalFunnelEngine class."""
+
+    def test_enforces_step_order(self, incremental_funnel_engine, db_session):
+        """Test steps completed out of order do not count."""
+        now = get_utc_now()
+        signup, activate = _event_types("signup", "activate")
+        funnel = _create_ordered_funnel(db_session, [signup, activate])
+
+        _add_event(db_session, "in_order", signup, now)
+        _add_event(db_session, "in_order", activate, now + timedelta(minutes=1))
+        _add_event(db_session, "out_of_order", activate, now)
+        _add_event(db_session, "out_of_order", signup, now + timedelta(minutes=1))
+        db_session.commit()
+
+        analysis = incremental_funnel_engine.analyze_funnel(
+            funnel.id, now - timedelta(hours=1), now + timedelta(hours=1)
+        )
+
+        assert analysis.total_entered == 2
+        assert analysis.total_completed == 1
+        assert analysis.overall_conversion_rate == 50.0
+        assert analysis.avg_completion_time == 60.0
+
+    def test_conversion_window(self, incremental_funnel_engine, db_session):
+        """Test completions outside the conversion window do not count."""
+        now = get_utc_now()
+        signup, purchase = _event_types("signup", "purchase")
+        funnel = _create_ordered_funnel(db_session, [signup, purchase])
+
+        _add_event(db_session, "fast", signup, now)
+        _add_event(db_session, "fast", purchase, now + timedelta(minutes=5))
+        _add_event(db_session, "slow", signup, now)
+        _add_event(db_session, "slow", purchase, now + timedelta(hours=2))
+        db_session.commit()
+
+        analysis = incremental_funnel_engine.analyze_funnel(
+            funnel.id,
+            now - timedelta(hours=1),
+            now + timedelta(hours=3),
+            conversion_window=timedelta(hours=1)
+        )
+
+        assert analysis.total_entered == 2
+        assert analysis.total_completed == 1
+        assert analysis.steps[1].dropped == 1
+
+    def test_incremental_run_reads_only_new_events(self, incremental_funnel_engine, db_session):
+        """Test re-running over a later window resumes from the watermark."""
+        now = get_utc_now()
+        start = now - timedelta(hours=1)
+        signup, purchase = _event_types("signup", "purchase")
+        funnel = _create_ordered_funnel(db_session, [signup, purchase])
+
+        _add_event(db_session, "user_1", signup, now)
+        db_session.commit()
+
+        first = incremental_funnel_engine.analyze_funnel(funnel.id, start, now + timedelta(minutes=1))
+        assert first.total_completed == 0
+
+        _add_event(db_session, "user_1", purchase, now + timedelta(minutes=10))
+        db_session.commit()
+
+        with patch.object(
+            incremental_funnel_engine,
+            "_scan_events",
+            wraps=incremental_funnel_engine._scan_events
+        ) as scan:
+            second = incremental_funnel_engine.analyze_funnel(
+                funnel.id, start, now + timedelta(hours=1)
+            )
+
+        scan_from, inclusive = scan.call_args[0][2], scan.call_args[1]["inclusive"]
+        assert scan_from == as_naive_utc(now + timedelta(minutes=1))
+        assert inclusive is False
+        assert second.total_entered == 1
+        assert second.total_completed == 1
+
+    def test_changed_start_rebuilds_state(self, incremental_funnel_engine, db_session):
+        """Test a different start date discards persisted state."""
+        now = get_utc_now()
+        signup, purchase = _event_types("signup", "purchase")
+        funnel = _create_ordered_funnel(db_session, [signup, purchase])
+
+        _add_event(db_session, "user_1", signup, now - timedelta(hours=2))
+        _add_event(db_session, "user_1", purchase, now - timedelta(hours=2) + timedelta(minutes=1))
+        db_session.commit()
+
+        wide = incremental_funnel_engine.analyze_funnel(
+            funnel.id, now - timedelta(hours=3), now
+        )
+        narrow = incremental_funnel_engine.analyze_funnel(
+            funnel.id, now - timedelta(hours=1), now
+        )
+
+        assert wide.total_completed == 1
+        assert narrow.total_entered == 0
+
+    def test_default_start_keeps_previous_window(self, incremental_funnel_engine, db_session):
+        """Test omitting the start date resumes from the persisted window."""
+        now = get_utc_now()
+        signup, purchase = _event_types("signup", "purchase")
+        funnel = _create_ordered_funnel(db_session, [signup, purchase])
+
+        _add_event(db_session, "user_1", signup, now - timedelta(days=40))
+        _add_event(db_session, "user_1", purchase, now + timedelta(minutes=10))
+        db_session.commit()
+
+        incremental_funnel_engine.analyze_funnel(funnel.id, now - timedelta(days=60), now)
+
+        with patch.object(
+            incremental_funnel_engine,
+            "_scan_events",
+            wraps=incremental_funnel_engine._scan_events
+        ) as scan:
+            later = incremental_funnel_engine.analyze_funnel(
+                funnel.id, None, now + timedelta(hours=1)
+            )
+
+        assert scan.call_args[1]["inclusive"] is False
+        assert later.start_date == as_naive_utc(now - timedelta(days=60))
+        assert later.total_completed == 1
+
+    def test_advance_state_machine(self):
+        """Test a single state transition."""
+        now = get_utc_now()
+        state = IncrementalFunnelEngine._new_state()
+        steps = ["a", "b"]
+
+        assert IncrementalFunnelEngine._advance(state, "b", now, steps, None) is False
+        assert IncrementalFunnelEngine._advance(state, "a", now, steps, None) is True
+        assert state["current_step"] == 1
+        assert IncrementalFunnelEngine._advance(state, "b", now + timedelta(seconds=5), steps, None) is True
+        assert state["max_step"] == 2
+        assert state["completion_seconds"] == 5.0
+        # Completed users stay completed
+        assert IncrementalFunnelEngine._advance(state, "a", now, steps, None) is False
+
+
+    def test_repeated_first_step_restarts_window(self):
+        """Test a later repeat of the first step starts a new attempt in the window."""
+        now = get_utc_now()
+        state = IncrementalFunnelEngine._new_state()
+        steps = ["a", "b"]
+        window = timedelta(hours=1)
+
+        assert IncrementalFunnelEngine._advance(state, "a", now, steps, window) is True
+        assert IncrementalFunnelEngine._advance(state, "a", now + timedelta(minutes=50), steps, window) is True
+        assert state["entered_at"] == now + timedelta(minutes=50)
+        assert IncrementalFunnelEngine._advance(state, "b", now + timedelta(minutes=90), steps, window) is True
+        assert state["max_step"] == 2
+        assert state["completion_seconds"] == 40 * 60
+
+
+# Test count: 25 tests
@@ -0,0 +1,59 @@
+"""
+Unit Tests for HyperLogLog
+
+Tests for the mergeable distinct-count sketch used by rollups.
+"""
+
+import pytest
+
+from modules.analytics.core.hll import HyperLogLog
+
+
+class TestHyperLogLog:
+    """Test suite for HyperLogLog class."""
+
+    def test_empty_sketch(self):
+        """Test empty sketch counts zero."""
+        assert HyperLogLog().count() == 0
+
+    def test_small_cardinality_exact(self):
+        """Test small sets are counted exactly."""
+        sketch = HyperLogLog()
+        sketch.update(["a", "b", "c", "a", None])
+
+        assert sketch.count() == 3
+
+    @pytest.mark.parametrize("cardinality", [1_000, 50_000])
+    def test_large_cardinality_error(self, cardinality):
+        """Test estimate stays within a few standard errors."""
+        sketch = HyperLogLog()
+        sketch.update(f"user_{i}" for i in range(cardinality))
+
+        assert sketch.count() == pytest.approx(cardinality, rel=0.05)
+
+    def test_merge_is_union(self):
+        """Test merging sketches estimates the union."""
+        left = HyperLogLog()
+        left.update(range(0, 3000))
+        right = HyperLogLog()
+        right.update(range(2000, 5000))
+
+        assert left.merge(right).count() == pytest.approx(5000, rel=0.05)
+
+    def test_merge_precision_mismatch(self):
+        """Test merging sketches of different precision fails."""
+        with pytest.raises(ValueError):
+            HyperLogLog(10).merge(HyperLogLog(12))
+
+    def test_serialization_roundtrip(self):
+        """Test sketches survive a bytes roundtrip."""
+        sketch = HyperLogLog()
+        sketch.update(range(500))
+
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+
+        assert restored.precision == sketch.precision
+        assert restored.count() == sketch.count()
+
+
+# Test count: 7 tests
@@ -8,9 +8,10 @@ import pytest
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch, MagicMock
 import numpy as np
+from sqlalchemy import func
 
 from modules.analytics.processing.predictive import PredictiveEngine
-from modules.analytics.storage.models import EventORM, SessionORM, MetricORM
+from modules.analytics.storage.models import EventORM, SessionORM, MetricORM, UserORM, UserScoreORM
 from shared.utils import get_utc_now, generate_uuid
 
 
@@ -268,4 +269,162 @@ class TestPredictiveEngine:
         # Should forecast for specified horizon
 
 
-# Test count: 16 tests
+class TestBatchScoring:
+    """Test suite for PredictiveEngine.score_users_batch."""
+
+    def _add_user(self, db_session, user_id, age_days, inactive_days, sessions, lifetime_value=0.0, modules=()):
+        """Add a user with sessions spread over the last days and module events."""
+        now = get_utc_now()
+        db_session.add(UserORM(
+            id=user_id,
+            first_seen_at=now - timedelta(days=age_days),
+            last_seen_at=now - timedelta(days=inactive_days),
+            total_sessions=len(sessions),
+            lifetime_value=lifetime_value
+        ))
+        for days_ago, duration in sessions:
+            db_session.add(SessionORM(
+                id=generate_uuid(),
+                user_id=user_id,
+                started_at=now - timedelta(days=days_ago),
+                duration_seconds=duration
+            ))
+        for module in modules:
+            db_session.add(EventORM(
+                id=generate_uuid(),
+                name="view",
+                event_type="page_view",
+                user_id=user_id,
+                module=module,
+                timestamp=now
+            ))
+
+    def _seed(self, db_session):
+        """Add four users; IDs are unique because the database is shared between tests."""
+        suffix = generate_uuid()[:8]
+        ids = {name: f"user_{name}_{suffix}" for name in ("active", "fading", "gone", "new")}
+        self._add_user(db_session, ids["active"], 60, 0, [(0, 700), (2, 650), (3, 600), (9, 500)], 250.0, ["crm", "billing", "docs"])
+        self._add_user(db_session, ids["fading"], 120, 20, [(10, 30), (12, 45), (13, 20)], 40.0, ["crm"])
+        self._add_user(db_session, ids["gone"], 400, 90, [(95, 100)], 10.0)
+        self._add_user(db_session, ids["new"], 0, 0, [], 0.0)
+        db_session.commit()
+        return ids
+
+    def test_batch_matches_per_user(self, predictive_engine, db_session):
+        """Test batch scores equal the per-user scoring methods."""
+        ids = self._seed(db_session)
+
+        result = predictive_engine.score_users_batch(active_days=None, chunk_size=2)
+        assert result["users_scored"] >= 4
+
+        scores = {
+            row.user_id: row
+            for row in db_session.query(UserScoreORM).filter(UserScoreORM.user_id.in_(ids.values()))
+        }
+        assert set(scores) == set(ids.values())
+
+        for user_id, score in scores.items():
+            assert score.churn_probability == pytest.approx(predictive_engine.predict_churn(user_id))
+            assert score.predicted_ltv == pytest.approx(predictive_engine.predict_ltv(user_id))
+            assert score.engagement_score == pytest.approx(predictive_engine.calculate_engagement_score(user_id))
+
+    def test_full_run_filters_inactive_users(self, predictive_engine, db_session):
+        """Test full runs skip users not seen within active_days."""
+        ids = self._seed(db_session)
+
+        result = predictive_engine.score_users_batch(active_days=30)
+
+        assert result["mode"] == "full"
+        scored = {
+            row.user_id
+            for row in db_session.query(UserScoreORM.user_id).filter(UserScoreORM.user_id.in_(ids.values()))
+        }
+        assert scored == {ids["active"], ids["fading"], ids["new"]}
+
+    def test_incremental_only_rescores_new_sessions(self, predictive_engine, db_session):
+        """Test incremental runs pick up only users with sessions after the last run."""
+        ids = self._seed(db_session)
+        predictive_engine.score_users_batch(active_days=None)
+
+        result = predictive_engine.score_users_batch(incremental=True)
+        assert result["users_scored"] == 0
+
+        db_session.add(SessionORM(
+            id=generate_uuid(),
+            user_id=ids["fading"],
+            started_at=get_utc_now() + timedelta(seconds=1),
+            duration_seconds=120
+        ))
+        db_session.commit()
+
+        with patch.object(
+            predictive_engine,
+            "_build_feature_matrix",
+            wraps=predictive_engine._build_feature_matrix
+        ) as build:
+            result = predictive_engine.score_users_batch(incremental=True)
+
+        assert result["mode"] == "incremental"
+        assert result["users_scored"] == 1
+        assert build.call_args[0][1] == [ids["fading"]]
+
+    def test_failed_run_keeps_watermark(self, predictive_engine, db_session):
+        """Test a run failing partway scores nobody, so a rerun picks up every user."""
+        ids = self._seed(db_session)
+        predictive_engine.score_users_batch(active_days=None)
+        last_run = db_session.query(func.max(UserScoreORM.scored_at)).scalar()
+
+        rescored = [ids["active"], ids["fading"]]
+        for user_id in rescored:
+            db_session.add(SessionORM(
+                id=generate_uuid(),
+                user_id=user_id,
+                started_at=last_run + timedelta(microseconds=1),
+                duration_seconds=120
+            ))
+        db_session.commit()
+
+        build = predictive_engine._build_feature_matrix
+        calls = []
+
+        def fail_second_chunk(*args):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("scoring failed")
+            return build(*args)
+
+        with patch.object(predictive_engine, "_build_feature_matrix", side_effect=fail_second_chunk):
+            result = predictive_engine.score_users_batch(incremental=True, chunk_size=1)
+        assert result["error"] == "scoring failed"
+
+        def scored_at():
+            db_session.expire_all()
+            return {
+                row.user_id: row.scored_at
+                for row in db_session.query(UserScoreORM).filter(UserScoreORM.user_id.in_(rescored))
+            }
+
+        assert all(value <= last_run for value in scored_at().values())
+
+        predictive_engine.score_users_batch(incremental=True, chunk_size=1)
+        assert all(value > last_run for value in scored_at().values())
+
+    def test_score_feature_matrix_bounds(self):
+        """Test vectorized scores stay within their ranges."""
+        features = np.array([
+            [0, 30, 100, 1000.0, 900.0, 10, 1, 12],
+            [365, 400, 1, 0.0, 0.0, 0, 5, 0],
+            [0, 0, 0, 0.0, 0.0, 0, 0, 0],
+        ], dtype=np.float64)
+
+        churn, ltv, engagement = PredictiveEngine._score_feature_matrix(features)
+
+        assert np.all((churn >= 0) & (churn <= 1))
+        assert np.all(ltv >= 0)
+        assert np.all((engagement >= 0) & (engagement <= 100))
+        assert churn[1] == pytest.approx(1.0)
+        assert engagement[0] == pytest.approx(100.0)
+        assert ltv[2] == 0.0
+
+
+# Test count: 20 tests
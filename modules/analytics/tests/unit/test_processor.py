@@ -13,6 +13,13 @@ from modules.analytics.storage.models import EventORM, UserORM, SessionORM, Goal
 from shared.utils import get_utc_now, generate_uuid
 
 
+@pytest.fixture
+def no_pending_events(db_session):
+    """Mark events left unprocessed by earlier tests, since the database is shared."""
+    db_session.query(EventORM).filter(EventORM.processed == False).update({"processed": True})
+    db_session.commit()
+
+
 class TestEventProcessor:
     """Test suite for EventProcessor class."""
 
@@ -457,5 +464,128 @@ class TestEventProcessor:
             count = processor.process_events(batch_size=10)
             assert count == 0
 
+    def test_process_events_batch_success(self, processor, db_session, no_pending_events):
+        """Test set-based batch processing marks events and creates users."""
+        now = get_utc_now()
+        user_id = f"batch_user_{generate_uuid()[:8]}"
+
+        for i in range(5):
+            event = EventORM(
+                id=generate_uuid(),
+                name=f"event_{i}",
+                event_type="click",
+                user_id=user_id,
+                timestamp=now + timedelta(seconds=i),
+                processed=False
+            )
+            db_session.add(event)
+        db_session.commit()
+
+        count = processor.process_events_batch(batch_size=10)
+
+        assert count == 5
+        user = db_session.query(UserORM).filter_by(id=user_id).first()
+        assert user is not None
+        assert user.total_events == 5
+
+    def test_process_events_batch_session_deltas(self, processor, db_session, no_pending_events):
+        """Test batch processing applies session deltas in timestamp order."""
+        now = get_utc_now()
+        session_id = f"batch_session_{generate_uuid()[:8]}"
+
+        session = SessionORM(
+            id=session_id,
+            user_id="user_1",
+            started_at=now,
+            last_activity_at=now,
+            events_count=0,
+            page_views=0,
+            duration_seconds=0,
+            is_bounce=False
+        )
+        db_session.add(session)
+
+        for i in range(3):
+            event = EventORM(
+                id=generate_uuid(),
+                name="page_view",
+                event_type="page_view",
+                session_id=session_id,
+                timestamp=now + timedelta(seconds=10 + i * 30),
+                processed=False
+            )
+            db_session.add(event)
+        db_session.commit()
+
+        processor.process_events_batch(batch_size=10)
+
+        db_session.refresh(session)
+        assert session.events_count == 3
+        assert session.page_views == 3
+        assert session.duration_seconds == 70
+        # First page view was a bounce candidate, matching the per-event path
+        assert session.is_bounce is True
+
+    def test_process_events_batch_goal_conversions(self, processor, db_session, no_pending_events):
+        """Test batch processing records conversions from the goal index."""
+        now = get_utc_now()
+        # Goals of earlier tests stay enabled, so use an event type only this goal matches
+        suffix = generate_uuid()[:8]
+        event_type = f"purchase_{suffix}"
+        user_id = f"buyer_{suffix}"
+
+        goal = GoalORM(
+            id=generate_uuid(),
+            name="Batch Purchase Goal",
+            event_type=event_type,
+            enabled=True,
+            value=25.0,
+            conditions={}
+        )
+        db_session.add(goal)
+
+        for _ in range(2):
+            event = EventORM(
+                id=generate_uuid(),
+                name="purchase",
+                event_type=event_type,
+                user_id=user_id,
+                timestamp=now,
+                processed=False,
+                properties={}
+            )
+            db_session.add(event)
+        db_session.commit()
+
+        processor.process_events_batch(batch_size=10)
+
+        from modules.analytics.storage.models import GoalConversionORM
+        assert db_session.query(GoalConversionORM).filter_by(goal_id=goal.id).count() == 2
+
+        db_session.refresh(goal)
+        assert goal.total_conversions == 2
+        assert goal.total_value == 50.0
+
+        user = db_session.query(UserORM).filter_by(id=user_id).first()
+        assert user.total_conversions == 2
+        assert user.lifetime_value == 50.0
+
+    def test_process_events_batch_falls_back(self, processor, db_session, no_pending_events):
+        """Test batch failure falls back to the per-event path."""
+        event = EventORM(
+            id=generate_uuid(),
+            name="click",
+            event_type="click",
+            timestamp=get_utc_now(),
+            processed=False
+        )
+        db_session.add(event)
+        db_session.commit()
+
+        with patch.object(processor, '_apply_batch', side_effect=Exception("Batch error")):
+            count = processor.process_events_batch(batch_size=10)
+
+        assert count == 1
+
 
-# Test count: 28 tests
+# Test count: 32 tests
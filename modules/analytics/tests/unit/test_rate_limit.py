@@ -0,0 +1,186 @@
+"""
+Unit Tests for Rate Limiter
+
+Tests for local token budgets, per-route and per-API-key limits and Redis
+batching of the sliding-window rate limiter.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from modules.analytics.api.rate_limit import RateLimiter, RateLimitRule
+
+
+class FakeScript:
+    """Fixed-window stand-in for the reservation Lua script."""
+
+    def __init__(self):
+        self.used = {}
+        self.calls = 0
+        self.fail = False
+
+    async def __call__(self, keys, args):
+        self.calls += 1
+        if self.fail:
+            raise ConnectionError("redis down")
+
+        limit, window_ms, requested = args
+        key = keys[0]
+        granted = max(0, min(requested, limit - self.used.get(key, 0)))
+        self.used[key] = self.used.get(key, 0) + granted
+        return [granted, 0 if granted else 30_000]
+
+
+class FakeAsyncRedis:
+    """Async client stub that only supports script registration."""
+
+    def __init__(self, script):
+        self.script = script
+
+    def register_script(self, source):
+        return self.script
+
+
+class FakeCache:
+    """Cache stub exposing the async client."""
+
+    def __init__(self):
+        self.script = FakeScript()
+        self.client = FakeAsyncRedis(self.script)
+
+    def get_async_client(self):
+        return self.client
+
+
+def make_request(path="/api/v1/events", method="GET", host="10.0.0.1", api_key=None):
+    """Build a minimal request object."""
+    headers = {"x-api-key": api_key} if api_key else {}
+    return SimpleNamespace(
+        headers=headers,
+        client=SimpleNamespace(host=host),
+        url=SimpleNamespace(path=path),
+        method=method,
+    )
+
+
+def run_checks(limiter, requests):
+    """Check requests sequentially on one event loop."""
+
+    async def runner():
+        return [await limiter.check(request) for request in requests]
+
+    return asyncio.run(runner())
+
+
+class TestRateLimiter:
+    """Test suite for RateLimiter."""
+
+    def test_denies_after_limit(self):
+        """Test requests beyond the limit are denied with Retry-After."""
+        cache = FakeCache()
+        limiter = RateLimiter(cache, [RateLimitRule("global", 10)], lease_fraction=0.5)
+
+        decisions = run_checks(limiter, [make_request() for _ in range(12)])
+
+        assert all(d.allowed for d in decisions[:10])
+        assert not decisions[10].allowed
+        assert decisions[10].rule.name == "global"
+        assert decisions[10].retry_after == 30
+
+    def test_batches_redis_calls(self):
+        """Test tokens are leased in batches instead of per request."""
+        cache = FakeCache()
+        limiter = RateLimiter(cache, [RateLimitRule("global", 1000)], lease_fraction=0.1)
+
+        decisions = run_checks(limiter, [make_request() for _ in range(200)])
+
+        assert all(d.allowed for d in decisions)
+        assert cache.script.calls <= 4
+        assert limiter.get_stats()["allowed"] == 200
+
+    def test_clients_have_separate_budgets(self):
+        """Test each client is limited independently."""
+        cache = FakeCache()
+        limiter = RateLimiter(cache, [RateLimitRule("global", 2)], lease_fraction=1.0)
+
+        decisions = run_checks(
+            limiter,
+            [make_request(host="a"), make_request(host="a"), make_request(host="a"), make_request(host="b")],
+        )
+
+        assert [d.allowed for d in decisions] == [True, True, False, True]
+
+    def test_per_route_rule(self):
+        """Test route rules only apply to matching paths and methods."""
+        cache = FakeCache()
+        rules = [
+            RateLimitRule("global", 100),
+            RateLimitRule("exports", 1, path_prefix="/api/v1/exports", methods=["POST"]),
+        ]
+        limiter = RateLimiter(cache, rules, lease_fraction=1.0)
+
+        decisions = run_checks(
+            limiter,
+            [
+                make_request("/api/v1/exports", "POST"),
+                make_request("/api/v1/exports", "POST"),
+                make_request("/api/v1/exports", "GET"),
+                make_request("/api/v1/events", "POST"),
+            ],
+        )
+
+        assert [d.allowed for d in decisions] == [True, False, True, True]
+        assert decisions[1].rule.name == "exports"
+
+    def test_api_key_limits(self):
+        """Test API keys identify clients and can override limits."""
+        cache = FakeCache()
+        limiter = RateLimiter(
+            cache,
+            [RateLimitRule("global", 1)],
+            api_key_limits={"premium": 3},
+            lease_fraction=1.0,
+        )
+
+        decisions = run_checks(
+            limiter,
+            [make_request(api_key="premium", host=f"10.0.0.{i}") for i in range(4)],
+        )
+
+        assert [d.allowed for d in decisions] == [True, True, True, False]
+        assert all("premium" not in key for key in cache.script.used)
+
+    def test_denial_cached_locally(self):
+        """Test denied clients are rejected without asking Redis again."""
+        cache = FakeCache()
+        limiter = RateLimiter(cache, [RateLimitRule("global", 1)], lease_fraction=1.0)
+
+        run_checks(limiter, [make_request() for _ in range(2)])
+        calls = cache.script.calls
+
+        decisions = run_checks(limiter, [make_request() for _ in range(5)])
+
+        assert not any(d.allowed for d in decisions)
+        assert cache.script.calls == calls
+        assert limiter.get_stats()["denied"] == 6
+
+    def test_redis_error_fails_open(self):
+        """Test Redis errors admit requests and are counted."""
+        cache = FakeCache()
+        cache.script.fail = True
+        limiter = RateLimiter(cache, [RateLimitRule("global", 1)])
+
+        decisions = run_checks(limiter, [make_request() for _ in range(3)])
+
+        assert all(d.allowed for d in decisions)
+        assert limiter.get_stats()["redis_errors"] >= 1
+
+    def test_invalid_rule(self):
+        """Test rules reject non-positive limits."""
+        with pytest.raises(ValueError):
+            RateLimitRule("bad", 0)
+
+
+# Test count: 8 tests
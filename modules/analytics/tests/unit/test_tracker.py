@@ -9,8 +9,9 @@ import time
 from datetime import datetime, timedelta
 from unittest.mock import Mock, patch
 
-from modules.analytics.core.tracker import EventTracker
+from modules.analytics.core.tracker import EventRingBuffer, EventTracker
 from modules.analytics.models.event import EventCreate, EventBatch
+from modules.analytics.storage.models import EventORM
 from shared.utils import generate_uuid, get_utc_now
 
 
@@ -303,4 +304,141 @@ class TestEventTracker:
         assert event_id is not None
 
 
-# Test count: 32 tests
+class TestHighThroughputTracker:
+    """Test suite for the ring buffer ingestion mode."""
+
+    def test_ring_buffer_fifo_wraparound(self):
+        """Test ring buffer keeps order across wraparound."""
+        buffer = EventRingBuffer(3)
+
+        assert buffer.put(1) and buffer.put(2) and buffer.put(3)
+        assert not buffer.put(4)
+        assert buffer.get_batch(2) == [1, 2]
+
+        assert buffer.put(4) and buffer.put(5)
+        assert len(buffer) == 3
+        assert buffer.get_batch(10) == [3, 4, 5]
+        assert buffer.get_batch(10, timeout=0.01) == []
+
+    def test_drop_backpressure(self, test_db):
+        """Test events are dropped and counted when the buffer is full."""
+        tracker = EventTracker(
+            db=test_db, auto_start=False, high_throughput=True, buffer_size=5
+        )
+
+        ids = [tracker.track("page_view", "page_view") for _ in range(8)]
+
+        assert sum(1 for event_id in ids if event_id) == 5
+        assert ids[5:] == [None, None, None]
+        stats = tracker.get_stats()
+        assert stats["queue_depth"] == 5
+        assert stats["capacity"] == 5
+        assert stats["dropped"] == 3
+
+    def test_block_backpressure_times_out(self, test_db):
+        """Test blocking producers give up after block_timeout."""
+        tracker = EventTracker(
+            db=test_db,
+            auto_start=False,
+            high_throughput=True,
+            buffer_size=1,
+            backpressure="block",
+            block_timeout=0.05,
+        )
+
+        assert tracker.track("page_view", "page_view") is not None
+
+        started = time.monotonic()
+        assert tracker.track("page_view", "page_view") is None
+        assert time.monotonic() - started >= 0.05
+        assert tracker.get_stats()["dropped"] == 1
+
+    def test_invalid_backpressure_policy(self, test_db):
+        """Test unknown backpressure policies are rejected."""
+        with pytest.raises(ValueError):
+            EventTracker(db=test_db, auto_start=False, high_throughput=True, backpressure="spill")
+
+    def test_deferred_validation_discards_invalid(self, test_db, db_session):
+        """Test validation happens at flush and only drops bad events."""
+        tracker = EventTracker(db=test_db, auto_start=False, high_throughput=True)
+
+        valid_id = tracker.track(
+            "page_view",
+            "page_view",
+            properties={"path": "/tab\there"},
+            user_id="user_1",
+            country="US",
+        )
+        invalid_id = tracker.track("bad", "not_an_event_type")
+
+        assert valid_id is not None
+        assert invalid_id is not None
+
+        assert tracker.flush() == 1
+
+        event = db_session.query(EventORM).filter(EventORM.id == valid_id).one()
+        assert event.event_type == "page_view"
+        assert event.properties == {"path": "/tab\there"}
+        assert event.country == "US"
+        assert event.timestamp is not None
+        assert not event.processed
+        assert db_session.query(EventORM).filter(EventORM.id == invalid_id).first() is None
+
+        stats = tracker.get_stats()
+        assert stats["flushed"] == 1
+        assert stats["invalid"] == 1
+        assert stats["queue_depth"] == 0
+
+    def test_track_batch_uses_buffer(self, test_db, db_session):
+        """Test track_batch feeds the ring buffer."""
+        tracker = EventTracker(db=test_db, batch_size=2, auto_start=False, high_throughput=True)
+        prefix = f"batch_{generate_uuid()[:8]}"
+        events = [EventCreate(name=f"{prefix}_{i}", event_type="page_view") for i in range(5)]
+
+        assert tracker.track_batch(events)
+        assert tracker.get_queue_size() == 5
+
+        assert tracker.flush() == 5
+        assert db_session.query(EventORM).filter(EventORM.name.like(f"{prefix}_%")).count() == 5
+        assert tracker.get_stats()["flushes"] == 3
+
+    def test_flush_workers_drain_buffer(self, test_db, db_session):
+        """Test background flush workers write buffered events."""
+        tracker = EventTracker(
+            db=test_db,
+            batch_size=50,
+            flush_interval=0.05,
+            high_throughput=True,
+            flush_workers=2,
+        )
+
+        prefix = f"worker_{generate_uuid()[:8]}"
+        for i in range(120):
+            tracker.track(f"{prefix}_{i}", "button_click", user_id=f"user_{i % 7}")
+
+        deadline = time.monotonic() + 5
+        while tracker.get_stats()["flushed"] < 120 and time.monotonic() < deadline:
+            time.sleep(0.02)
+
+        tracker.stop()
+
+        stats = tracker.get_stats()
+        assert stats["flushed"] == 120
+        assert stats["flush_errors"] == 0
+        assert stats["avg_flush_ms"] > 0
+        assert db_session.query(EventORM).filter(EventORM.name.like(f"{prefix}_%")).count() == 120
+
+    def test_flush_error_counted(self, test_db):
+        """Test database errors are counted rather than raised."""
+        tracker = EventTracker(db=test_db, auto_start=False, high_throughput=True)
+        tracker.track("page_view", "page_view")
+
+        with patch.object(tracker.repository, "copy_insert", side_effect=Exception("db down")):
+            assert tracker.flush() == 0
+
+        stats = tracker.get_stats()
+        assert stats["flush_errors"] == 1
+        assert stats["flushed"] == 0
+
+
+# Test count: 40 tests
@@ -0,0 +1,6 @@
+"""
+ETL Benchmarks
+
+Standalone throughput benchmarks for ETL processing paths.
+Run a benchmark with ``python -m modules.etl.benchmarks.<name>``.
+"""
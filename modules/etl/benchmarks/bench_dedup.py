@@ -0,0 +1,122 @@
+"""
+Fuzzy Deduplication Benchmark
+
+Measures rows/sec and duplicate recall of the blocking/LSH fuzzy
+deduplication engine on synthetic customer records with injected typos.
+The pairwise SequenceMatcher engine is timed on the smaller sizes only
+(``--pairwise-max``) since it compares every pair of rows.
+
+Usage:
+    python -m modules.etl.benchmarks.bench_dedup --sizes 10000 100000 1000000
+"""
+
+import argparse
+import random
+import string
+import time
+from typing import Dict, List
+
+import pandas as pd
+
+from modules.etl.services.deduplication_service import DeduplicationService
+
+FIRST_NAMES = ["james", "mary", "robert", "patricia", "john", "jennifer", "michael", "linda", "david", "susan"]
+CITIES = ["springfield", "riverside", "franklin", "greenville", "bristol", "clinton", "fairview", "salem"]
+
+
+def _typo(text: str, rng: random.Random) -> str:
+    """Substitute one character."""
+    position = rng.randrange(len(text))
+    return text[:position] + rng.choice(string.ascii_lowercase) + text[position + 1:]
+
+
+def _generate(num_rows: int, duplicate_rate: float) -> pd.DataFrame:
+    """Generate customer records, a share of which are typo duplicates."""
+    rng = random.Random(42)
+    num_unique = int(num_rows * (1 - duplicate_rate))
+
+    records = []
+    for i in range(num_unique):
+        name = f"{rng.choice(FIRST_NAMES)} {''.join(rng.choices(string.ascii_lowercase, k=8))}"
+        records.append({
+            "name": name,
+            "email": f"{name.replace(' ', '.')}{i}@example.com",
+            "city": rng.choice(CITIES),
+            "entity": i,
+        })
+
+    for _ in range(num_rows - num_unique):
+        original = records[rng.randrange(num_unique)]
+        records.append({**original, "email": _typo(original["email"], rng)})
+
+    return pd.DataFrame(records).sample(frac=1, random_state=42).reset_index(drop=True)
+
+
+def benchmark(sizes: List[int], duplicate_rate: float, pairwise_max: int) -> List[Dict[str, float]]:
+    """
+    Benchmark fuzzy deduplication.
+
+    Args:
+        sizes: Row counts to benchmark
+        duplicate_rate: Share of rows that are typo duplicates
+        pairwise_max: Largest size also run through the pairwise engine
+
+    Returns:
+        One result row per size and engine
+    """
+    service = DeduplicationService()
+    config = {
+        "strategy": "fuzzy",
+        "subset": ["name", "email"],
+        "similarity_threshold": 0.85,
+        "blocking_keys": ["city"],
+    }
+
+    results = []
+    for size in sizes:
+        df = _generate(size, duplicate_rate)
+        expected_unique = df["entity"].nunique()
+
+        engines = ["lsh"] + (["pairwise"] if size <= pairwise_max else [])
+        for engine in engines:
+            started = time.perf_counter()
+            result, _ = service.deduplicate(df, {**config, "engine": engine})
+            elapsed = time.perf_counter() - started
+
+            # Rows left per entity beyond the first are missed duplicates
+            missed = len(result) - result["entity"].nunique()
+            lost = expected_unique - result["entity"].nunique()
+            injected = size - expected_unique
+
+            results.append({
+                "rows": size,
+                "engine": engine,
+                "seconds": elapsed,
+                "rows_per_sec": size / elapsed,
+                "recall": 1 - missed / injected if injected else 1.0,
+                "false_merges": lost,
+            })
+
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Fuzzy deduplication benchmark")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--duplicate-rate", type=float, default=0.1)
+    parser.add_argument("--pairwise-max", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.sizes, args.duplicate_rate, args.pairwise_max)
+
+    print(f"{'rows':>10} {'engine':>9} {'seconds':>9} {'rows/sec':>11} {'recall':>7} {'false merges':>13}")
+    for result in results:
+        print(
+            f"{result['rows']:>10} {result['engine']:>9} {result['seconds']:>9.2f} "
+            f"{result['rows_per_sec']:>11.0f} {result['recall']:>7.3f} {result['false_merges']:>13}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,355 @@
+"""
+ETL Pipeline Benchmark
+
+Runs representative ETLPipeline jobs end to end against synthetic CSV,
+Parquet and SQLite sources and reports, per scenario, wall time, rows/sec,
+peak RSS and time and throughput per stage as JSON. Each scenario runs in
+a fresh process so its peak RSS is its own.
+
+A report can be stored and passed back as ``--baseline``; scenarios whose
+throughput drops, or whose peak RSS grows, by more than ``--tolerance``
+are listed as regressions and the run exits with status 1.
+
+Usage:
+    python -m modules.etl.benchmarks.bench_pipeline --rows 1000000 --output report.json
+    python -m modules.etl.benchmarks.bench_pipeline --rows 1000000 --baseline report.json
+"""
+
+import argparse
+import importlib.util
+import json
+import os
+import platform
+import sqlite3
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from modules.etl.models import DataSource, DataTarget, DatabaseType, ETLJob, JobRun, LoadStrategy, SourceType
+from modules.etl.monitoring import JobMetrics, peak_rss_bytes
+from modules.etl.pipeline import ETLPipeline
+
+SOURCES = ["csv", "parquet", "sqlite"]
+
+# Pipeline config per execution mode
+MODES = {
+    "batch": {},
+    "streaming": {"streaming": True},
+    "columnar": {"streaming": True, "transform_backend": "columnar"},
+}
+
+# Representative transformation steps: cleaning, type conversion and a computed field
+TRANSFORMATION_STEPS = [
+    {"type": "cleaner", "config": {"trim_whitespace": True, "remove_extra_spaces": True}},
+    {"type": "type_converter", "config": {"type_conversions": {"amount": "float", "quantity": "integer"}}},
+    {"type": "enricher", "config": {"computed_fields": {"total": "{amount} * {quantity}"}}},
+]
+
+# Representative data quality checks for the validate stage
+DATA_QUALITY = {
+    "required_fields": ["id", "customer", "amount"],
+    "range_checks": {"quantity": {"min": 1, "max": 100}},
+}
+
+# Rows generated per write when building sources
+_GENERATE_CHUNK_ROWS = 100000
+
+STAGES = ["extract", "transform", "validate", "load"]
+
+
+def _generate_chunk(start: int, size: int, rng: np.random.Generator) -> pd.DataFrame:
+    """Generate order rows with padded text and numeric strings to clean and convert."""
+    ids = np.arange(start, start + size)
+    return pd.DataFrame({
+        "id": ids,
+        "customer": [f"  customer {i % 5000}  " for i in ids],
+        "status": rng.choice(["open", "shipped", "cancelled", "returned"], size),
+        "amount": np.round(rng.uniform(1, 500, size), 2).astype(str),
+        "quantity": rng.integers(1, 20, size),
+        "created_at": pd.Timestamp("2024-01-01") + pd.to_timedelta(ids % 86400, unit="s"),
+    })
+
+
+def generate_sources(rows: int, data_dir: str, sources: List[str]) -> Dict[str, str]:
+    """
+    Write synthetic sources, reusing files already generated at this scale.
+
+    Args:
+        rows: Rows per source
+        data_dir: Directory for source files
+        sources: Source kinds to generate
+
+    Returns:
+        Mapping of source kind to file path
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    paths = {}
+
+    for source in sources:
+        extension = "db" if source == "sqlite" else source
+        path = os.path.join(data_dir, f"orders_{rows}.{extension}")
+        paths[source] = path
+        if os.path.exists(path):
+            continue
+
+        rng = np.random.default_rng(42)
+        partial = f"{path}.partial"
+        writer = None
+        try:
+            for start in range(0, rows, _GENERATE_CHUNK_ROWS):
+                chunk = _generate_chunk(start, min(_GENERATE_CHUNK_ROWS, rows - start), rng)
+                if source == "csv":
+                    chunk.to_csv(partial, mode="a", header=start == 0, index=False)
+                elif source == "parquet":
+                    import pyarrow as pa
+                    import pyarrow.parquet as pq
+
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    writer = writer or pq.ParquetWriter(partial, table.schema)
+                    writer.write_table(table)
+                else:
+                    chunk["created_at"] = chunk["created_at"].astype(str)
+                    with sqlite3.connect(partial) as conn:
+                        chunk.to_sql("orders", conn, if_exists="append", index=False)
+        finally:
+            if writer is not None:
+                writer.close()
+        os.replace(partial, path)
+
+    return paths
+
+
+def _make_job(source: str, source_path: str, target_path: str, batch_size: int) -> ETLJob:
+    """Build an unsaved job reading a synthetic source into a SQLite table."""
+    if source == "sqlite":
+        data_source = DataSource(
+            name="bench sqlite",
+            source_type=SourceType.DATABASE,
+            database_type=DatabaseType.SQLITE,
+            database_name=source_path,
+        )
+    else:
+        data_source = DataSource(name=f"bench {source}", source_type=SourceType.FILE, file_path=source_path)
+
+    job = ETLJob(
+        id=1,
+        name=f"bench {source}",
+        extraction_query="SELECT * FROM orders",
+        extraction_config={},
+        transformation_steps=TRANSFORMATION_STEPS,
+        load_strategy=LoadStrategy.REPLACE,
+        batch_size=batch_size,
+        max_retries=0,
+        retry_delay_seconds=0,
+    )
+    job.source = data_source
+    job.target = DataTarget(
+        name="bench target",
+        target_type=SourceType.DATABASE,
+        database_type=DatabaseType.SQLITE,
+        database_name=target_path,
+        load_strategy=LoadStrategy.REPLACE,
+    )
+    return job
+
+
+def run_scenario(source: str, mode: str, source_path: str, rows: int, batch_size: int) -> Dict[str, Any]:
+    """
+    Run one pipeline job and collect its metrics.
+
+    Args:
+        source: Source kind
+        mode: Execution mode from MODES
+        source_path: Synthetic source path
+        rows: Rows in the source
+        batch_size: Job batch size
+
+    Returns:
+        Scenario report
+    """
+    with tempfile.TemporaryDirectory() as target_dir:
+        job = _make_job(source, source_path, os.path.join(target_dir, "target.db"), batch_size)
+        pipeline = ETLPipeline(job, config={**MODES[mode], "target_table": "orders", "data_quality": DATA_QUALITY})
+        job_metrics = JobMetrics(JobRun())
+
+        started = time.perf_counter()
+        result = pipeline.execute()
+        elapsed = time.perf_counter() - started
+
+    metrics = result["metrics"]
+    stage_rows = {
+        "extract": metrics["records_extracted"],
+        "transform": metrics["records_transformed"] or metrics["records_extracted"],
+        "validate": metrics["records_validated"] or metrics["records_transformed"],
+        "load": metrics["records_loaded"],
+    }
+    stage_seconds = {
+        "extract": metrics["extraction_time"],
+        "transform": metrics["transformation_time"],
+        "validate": metrics["validation_time"],
+        "load": metrics["loading_time"],
+    }
+    for stage in STAGES:
+        job_metrics.record_stage_time(stage, stage_seconds[stage], stage_rows[stage])
+
+    peak = peak_rss_bytes()
+    return {
+        "name": f"{source}/{mode}",
+        "source": source,
+        "mode": mode,
+        "rows": rows,
+        "status": result["status"],
+        "error": result.get("error"),
+        "seconds": elapsed,
+        "rows_per_sec": metrics["records_loaded"] / elapsed if elapsed else None,
+        "peak_rss_mb": peak / (1024 * 1024) if peak is not None else None,
+        "stages": job_metrics.get_stage_throughput(),
+    }
+
+
+def benchmark(
+    rows: int,
+    sources: List[str],
+    modes: List[str],
+    batch_size: int,
+    data_dir: str,
+    isolate: bool = True
+) -> Dict[str, Any]:
+    """
+    Run every source and mode combination.
+
+    Args:
+        rows: Rows per synthetic source
+        sources: Source kinds to run
+        modes: Execution modes to run
+        batch_size: Job batch size
+        data_dir: Directory for synthetic sources
+        isolate: Run each scenario in a fresh process for per-scenario peak RSS
+
+    Returns:
+        Benchmark report
+    """
+    if "parquet" in sources and importlib.util.find_spec("pyarrow") is None:
+        print("pyarrow is not installed; skipping parquet scenarios", file=sys.stderr)
+        sources = [source for source in sources if source != "parquet"]
+    paths = generate_sources(rows, data_dir, sources)
+
+    scenarios = []
+    for source in sources:
+        for mode in modes:
+            args = (source, mode, paths[source], rows, batch_size)
+            if isolate:
+                with ProcessPoolExecutor(max_workers=1) as executor:
+                    scenarios.append(executor.submit(run_scenario, *args).result())
+            else:
+                scenarios.append(run_scenario(*args))
+
+    return {
+        "meta": {
+            "rows": rows,
+            "batch_size": batch_size,
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "platform": platform.platform(),
+            "created_at": datetime.utcnow().isoformat(),
+        },
+        "scenarios": scenarios,
+    }
+
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any], tolerance: float) -> List[Dict[str, Any]]:
+    """
+    Compare a report against a baseline report.
+
+    Args:
+        report: Current benchmark report
+        baseline: Stored benchmark report
+        tolerance: Allowed relative change before a metric counts as regressed
+
+    Returns:
+        One entry per regressed metric
+    """
+    previous = {scenario["name"]: scenario for scenario in baseline.get("scenarios", [])}
+    regressions = []
+
+    def check(name: str, metric: str, current: Optional[float], before: Optional[float], higher_is_better: bool):
+        if current is None or not before:
+            return
+        change = (current - before) / before
+        if (higher_is_better and change < -tolerance) or (not higher_is_better and change > tolerance):
+            regressions.append({
+                "scenario": name, "metric": metric,
+                "baseline": before, "current": current, "change": change,
+            })
+
+    for scenario in report["scenarios"]:
+        before = previous.get(scenario["name"])
+        if not before:
+            continue
+        name = scenario["name"]
+        check(name, "rows_per_sec", scenario["rows_per_sec"], before.get("rows_per_sec"), True)
+        check(name, "peak_rss_mb", scenario["peak_rss_mb"], before.get("peak_rss_mb"), False)
+        for stage, stats in scenario["stages"].items():
+            before_stats = before.get("stages", {}).get(stage, {})
+            check(name, f"{stage}.rows_per_sec", stats["rows_per_sec"], before_stats.get("rows_per_sec"), True)
+
+    return regressions
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="ETL pipeline benchmark")
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--sources", nargs="+", choices=SOURCES, default=SOURCES)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--batch-size", type=int, default=10_000)
+    parser.add_argument("--data-dir", default=os.path.join(tempfile.gettempdir(), "etl-bench"))
+    parser.add_argument("--output", help="Write the JSON report to this path")
+    parser.add_argument("--baseline", help="Compare against a stored JSON report")
+    parser.add_argument("--tolerance", type=float, default=0.2)
+    parser.add_argument("--no-isolate", action="store_true", help="Run scenarios in this process")
+    args = parser.parse_args(argv)
+
+    report = benchmark(
+        args.rows, args.sources, args.modes, args.batch_size, args.data_dir, isolate=not args.no_isolate
+    )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f), args.tolerance)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+
+    print(f"{'scenario':>20} {'status':>8} {'seconds':>9} {'rows/sec':>11} {'peak MB':>9}  stage rows/sec")
+    for scenario in report["scenarios"]:
+        stages = " ".join(
+            f"{stage}={stats['rows_per_sec']:.0f}" for stage, stats in scenario["stages"].items()
+            if stats["rows_per_sec"]
+        )
+        print(
+            f"{scenario['name']:>20} {scenario['status']:>8} {scenario['seconds']:>9.2f} "
+            f"{scenario['rows_per_sec'] or 0:>11.0f} {scenario['peak_rss_mb'] or 0:>9.1f}  {stages}"
+        )
+    if not args.output:
+        print(output)
+
+    for regression in report.get("regressions", []):
+        print(
+            f"REGRESSION {regression['scenario']} {regression['metric']}: "
+            f"{regression['baseline']:.1f} -> {regression['current']:.1f} ({regression['change']:+.0%})"
+        )
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,695 @@
+"""
+Columnar execution backend for transformation pipelines.
+
+Compiles a TransformationPipeline into column-at-a-time kernels over a
+ColumnBatch. Configuration is resolved once per column instead of once per
+value, null and type checks are vectorized, and homogeneous columns are
+converted with numpy/pandas. Values are only handed back to the record-level
+transformer code for cells of mixed or unusual types, so results match the
+record backend exactly.
+
+Transformers without a columnar kernel (CustomTransformer, DataAggregator and
+subclasses of the built-in transformers) run per record on materialized rows.
+"""
+
+import logging
+import re
+from datetime import datetime
+from typing import List, Dict, Any, Optional, Callable
+
+import numpy as np
+import pandas as pd
+from dateutil import parser as date_parser
+
+from modules.etl.transformers import (
+    BaseTransformer,
+    DataCleaner,
+    DataValidator,
+    DataEnricher,
+    DataMapper,
+    TypeConverter,
+    TransformationPipeline,
+    DROP_FIELD
+)
+from modules.etl.expressions import MISSING
+
+logger = logging.getLogger(__name__)
+
+_NONE_TYPE = type(None)
+
+_TRUE_STRINGS = ["true", "yes", "1", "t", "y"]
+
+# int(float(x)) is only exact through int64 below this magnitude
+_INT64_LIMIT = 2.0 ** 63
+
+# Same isinstance targets as DataValidator._validate_type
+_VALIDATOR_TYPES = {
+    "string": str,
+    "integer": int,
+    "float": (int, float),
+    "boolean": bool,
+    "date": (datetime, str),
+    "array": list,
+    "object": dict
+}
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    """Build a 1-D object array without numpy unpacking nested sequences."""
+    return np.fromiter(values, dtype=object, count=len(values))
+
+
+def _full(value: Any, size: int) -> np.ndarray:
+    """Build an object array holding the same value in every cell."""
+    values = np.empty(size, dtype=object)
+    values.fill(value)
+    return values
+
+
+def _is_none(values: np.ndarray) -> np.ndarray:
+    """Return a mask of the cells that are None."""
+    return np.fromiter((v is None for v in values), dtype=bool, count=len(values))
+
+
+def _value_types(values: np.ndarray) -> set:
+    """Return the set of exact types present in a column."""
+    return set(map(type, values))
+
+
+class ColumnBatch:
+    """
+    A batch of records stored column by column.
+
+    Each column is a 1-D object array. Records may lack fields, so a column
+    can carry a boolean ``present`` mask; None means every record has it.
+    Column order follows first appearance, which is the key order the
+    record backend produces for homogeneous records.
+    """
+
+    def __init__(
+        self,
+        columns: Dict[str, np.ndarray],
+        present: Dict[str, Optional[np.ndarray]],
+        size: int
+    ):
+        self.columns = columns
+        self.present = present
+        self.size = size
+
+    @classmethod
+    def from_records(cls, records: List[Dict[str, Any]]) -> "ColumnBatch":
+        """Build a batch from a list of record dicts."""
+        size = len(records)
+        shapes = dict.fromkeys(map(tuple, records))
+        names = dict.fromkeys(key for shape in shapes for key in shape)
+        uniform = len(shapes) <= 1
+
+        columns, present = {}, {}
+        for name in names:
+            if uniform:
+                columns[name] = _object_array([record[name] for record in records])
+                present[name] = None
+            else:
+                columns[name] = _object_array([record.get(name) for record in records])
+                mask = np.fromiter((name in record for record in records), dtype=bool, count=size)
+                present[name] = None if mask.all() else mask
+
+        return cls(columns, present, size)
+
+    @classmethod
+    def from_frame(cls, frame: Any) -> "ColumnBatch":
+        """
+        Build a batch from a pandas DataFrame or Arrow Table/RecordBatch.
+
+        Every field is present in every record; missing values arrive as
+        None/NaN and are treated as the record backend treats them.
+        """
+        if not isinstance(frame, pd.DataFrame):
+            frame = frame.to_pandas()
+
+        columns = {
+            str(name): _object_array(frame[name].tolist())
+            for name in frame.columns
+        }
+        return cls(columns, dict.fromkeys(columns), len(frame))
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Materialize the batch as a list of record dicts."""
+        names = list(self.columns)
+        values = [self.columns[name].tolist() for name in names]
+
+        if all(self.present[name] is None for name in names):
+            return [dict(zip(names, row)) for row in zip(*values)] if names else [{} for _ in range(self.size)]
+
+        masks = [
+            [True] * self.size if self.present[name] is None else self.present[name].tolist()
+            for name in names
+        ]
+        return [
+            {name: value for name, value, has in zip(names, row, flags) if has}
+            for row, flags in zip(zip(*values), zip(*masks))
+        ]
+
+    def to_frame(self) -> pd.DataFrame:
+        """Materialize the batch as a DataFrame; absent fields become None."""
+        data = {}
+        for name, values in self.columns.items():
+            mask = self.present[name]
+            if mask is not None:
+                values = values.copy()
+                values[~mask] = None
+            data[name] = values
+        return pd.DataFrame(data, index=pd.RangeIndex(self.size))
+
+    def present_mask(self, name: str) -> np.ndarray:
+        """Return the presence mask for a column as an array."""
+        mask = self.present.get(name)
+        return np.ones(self.size, dtype=bool) if mask is None else mask
+
+    def set_column(self, name: str, values: np.ndarray, mask: Optional[np.ndarray] = None) -> None:
+        """Set a column, keeping its position if it already exists."""
+        if mask is not None and mask.all():
+            mask = None
+        self.columns[name] = values
+        self.present[name] = mask
+
+    def take(self, rows: np.ndarray) -> "ColumnBatch":
+        """Return a new batch with the rows selected by a boolean mask."""
+        columns = {name: values[rows] for name, values in self.columns.items()}
+        present = {
+            name: None if mask is None else mask[rows]
+            for name, mask in self.present.items()
+        }
+        return ColumnBatch(columns, present, int(rows.sum()))
+
+
+class ColumnarKernel:
+    """Columnar implementation of one transformer."""
+
+    def __init__(self, transformer: BaseTransformer):
+        self.transformer = transformer
+        self.config = transformer.config
+        self.logger = transformer.logger
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        """Transform a batch."""
+        raise NotImplementedError
+
+
+class RecordKernel(ColumnarKernel):
+    """Runs a transformer per record on materialized rows."""
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        return ColumnBatch.from_records(self.transformer.transform(batch.to_records()))
+
+
+class CleanerKernel(ColumnarKernel):
+    """Columnar DataCleaner."""
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        for name in list(batch.columns):
+            self._clean_column(batch, name)
+
+        self.logger.info(f"Cleaned {batch.size} records")
+        return batch
+
+    def _clean_column(self, batch: ColumnBatch, name: str) -> None:
+        values = batch.columns[name]
+        mask = batch.present[name]
+        cells = values if mask is None else values[mask]
+        types = _value_types(cells)
+
+        if types <= {str, _NONE_TYPE}:
+            cleaned = self._clean_strings(cells)
+        elif types <= {int, _NONE_TYPE} or types <= {float, _NONE_TYPE}:
+            cleaned = self._clean_numbers(cells, types)
+        else:
+            cleaned = _object_array([self.transformer._clean_value(v) for v in cells])
+
+        kept = np.fromiter((v is not DROP_FIELD for v in cleaned), dtype=bool, count=len(cleaned))
+        cleaned[~kept] = None
+
+        if mask is None:
+            batch.set_column(name, cleaned, kept)
+        else:
+            new_values = values.copy()
+            new_values[mask] = cleaned
+            new_mask = mask.copy()
+            new_mask[mask] = kept
+            batch.set_column(name, new_values, new_mask)
+
+    def _null_fill(self) -> Any:
+        if self.config.get("fill_null"):
+            return self.config.get("null_value", None)
+        if self.config.get("drop_null"):
+            return DROP_FIELD
+        return None
+
+    def _clean_strings(self, cells: np.ndarray) -> np.ndarray:
+        nulls = pd.isna(cells) | (cells == "")
+        result = cells.copy()
+        result[nulls] = self._null_fill()
+
+        if not nulls.all():
+            strings = pd.Series(cells[~nulls], dtype=object)
+            if self.config.get("trim_whitespace", True):
+                strings = strings.str.strip()
+            if self.config.get("remove_extra_spaces", True):
+                strings = strings.str.replace(r'\s+', ' ', regex=True)
+            if self.config.get("lowercase"):
+                strings = strings.str.lower()
+            elif self.config.get("uppercase"):
+                strings = strings.str.upper()
+            if self.config.get("remove_special_chars"):
+                strings = strings.str.replace(r'[^a-zA-Z0-9\s]', '', regex=True)
+            result[~nulls] = strings.to_numpy(dtype=object)
+
+        return result
+
+    def _clean_numbers(self, cells: np.ndarray, types: set) -> np.ndarray:
+        nulls = pd.isna(cells)
+        result = cells.copy()
+        result[nulls] = self._null_fill()
+        if nulls.all():
+            return result
+
+        numbers = cells[~nulls]
+        dtype = np.float64 if float in types else np.int64
+        try:
+            array = numbers.astype(dtype)
+        except OverflowError:
+            # ints beyond int64 take the scalar path
+            return _object_array([self.transformer._clean_value(v) for v in cells])
+
+        if self.config.get("handle_outliers"):
+            min_val = self.config.get("min_value")
+            max_val = self.config.get("max_value")
+
+            below = array < min_val if min_val is not None else np.zeros(len(array), dtype=bool)
+            if min_val is not None:
+                numbers[below] = min_val
+            if max_val is not None:
+                # Clamped cells compare min_value against max_value, as in _clean_number
+                above = np.where(below, min_val > max_val if min_val is not None else False, array > max_val)
+                numbers[above] = max_val
+
+        digits = self.config.get("round_decimals")
+        if digits is not None:
+            numbers = _object_array([round(v, digits) for v in numbers])
+
+        result[~nulls] = numbers
+        return result
+
+
+class ValidatorKernel(ColumnarKernel):
+    """
+    Columnar DataValidator.
+
+    Rules are checked field by field in configuration order, each only against
+    records that are still valid, so a record rejected by an earlier rule is
+    never evaluated by a later one. Rejections are logged once per rule with a
+    count rather than once per record.
+    """
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        validation_rules = self.config.get("validation_rules", {})
+        valid = np.ones(batch.size, dtype=bool)
+
+        for field, rules in validation_rules.items():
+            if field in batch.columns:
+                values = batch.columns[field]
+                is_none = ~batch.present_mask(field) | _is_none(values)
+            else:
+                values = _full(None, batch.size)
+                is_none = np.ones(batch.size, dtype=bool)
+
+            if rules.get("required"):
+                self._reject(valid, valid & is_none, f"Required field '{field}' is missing")
+
+            for check, message in self._checks(rules):
+                rows = np.flatnonzero(valid & ~is_none)
+                if not len(rows):
+                    break
+                failed = check(values[rows])
+                self._reject(valid, rows[failed], f"Field '{field}' {message}")
+
+        result = batch.take(valid)
+        self.logger.info(f"Validated {result.size} records, rejected {batch.size - result.size}")
+        return result
+
+    def _reject(self, valid: np.ndarray, rows: np.ndarray, message: str) -> None:
+        count = int(rows.sum()) if rows.dtype == bool else len(rows)
+        if count:
+            valid[rows] = False
+            self.logger.warning(f"Validation failed for {count} records: {message}")
+
+    def _checks(self, rules: Dict[str, Any]) -> List[Any]:
+        """Return (check, message) pairs; each check maps values to a failure mask."""
+        checks = []
+
+        if "type" in rules:
+            expected = _VALIDATOR_TYPES.get(rules["type"])
+            if expected:
+                checks.append((lambda v: self._wrong_type(v, expected), "has invalid type"))
+        if "min" in rules:
+            checks.append((lambda v: self._compare(v, lambda x: x < rules["min"]), "below minimum value"))
+        if "max" in rules:
+            checks.append((lambda v: self._compare(v, lambda x: x > rules["max"]), "above maximum value"))
+        if "pattern" in rules:
+            pattern = re.compile(rules["pattern"])
+            checks.append((
+                lambda v: np.fromiter(
+                    (isinstance(x, str) and not pattern.match(x) for x in v), dtype=bool, count=len(v)
+                ),
+                "does not match pattern"
+            ))
+        if "min_length" in rules:
+            checks.append((lambda v: self._lengths(v) < rules["min_length"], "below minimum length"))
+        if "max_length" in rules:
+            checks.append((lambda v: self._lengths(v) > rules["max_length"], "above maximum length"))
+        if "enum" in rules:
+            allowed = rules["enum"]
+            checks.append((
+                lambda v: np.fromiter((x not in allowed for x in v), dtype=bool, count=len(v)),
+                "not in allowed values"
+            ))
+
+        return checks
+
+    @staticmethod
+    def _wrong_type(values: np.ndarray, expected: Any) -> np.ndarray:
+        accepted = {t for t in _value_types(values) if issubclass(t, expected)}
+        return np.fromiter((type(v) not in accepted for v in values), dtype=bool, count=len(values))
+
+    @staticmethod
+    def _compare(values: np.ndarray, op: Callable[[Any], Any]) -> np.ndarray:
+        types = _value_types(values)
+        if types <= {int} or types <= {float}:
+            try:
+                return np.asarray(op(values.astype(np.float64 if float in types else np.int64)), dtype=bool)
+            except OverflowError:
+                pass
+        return np.fromiter((bool(op(v)) for v in values), dtype=bool, count=len(values))
+
+    @staticmethod
+    def _lengths(values: np.ndarray) -> np.ndarray:
+        if _value_types(values) <= {str}:
+            return pd.Series(values, dtype=object).str.len().to_numpy()
+        return np.fromiter((len(str(v)) for v in values), dtype=np.int64, count=len(values))
+
+
+class MapperKernel(ColumnarKernel):
+    """Columnar DataMapper; renames are whole-column moves."""
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        mappings = self.config.get("field_mappings", {})
+        mapped = ColumnBatch({}, {}, batch.size)
+
+        for source_field, target_field in mappings.items():
+            if source_field in batch.columns:
+                self._merge(mapped, target_field, batch, source_field, override=True)
+
+        if self.config.get("include_unmapped", True):
+            for field in batch.columns:
+                if field not in mappings:
+                    self._merge(mapped, field, batch, field, override=False)
+
+        self.logger.info(f"Mapped {mapped.size} records")
+        return mapped
+
+    @staticmethod
+    def _merge(
+        mapped: ColumnBatch,
+        target: str,
+        batch: ColumnBatch,
+        source: str,
+        override: bool
+    ) -> None:
+        """
+        Write source into target. With override, source wins where present;
+        otherwise it only fills records where target is not yet set.
+        """
+        values, mask = batch.columns[source], batch.present[source]
+        if target not in mapped.columns:
+            mapped.set_column(target, values, mask)
+            return
+        if not override and mapped.present[target] is None:
+            return
+
+        current = mapped.present_mask(target)
+        source_mask = batch.present_mask(source)
+        write = source_mask if override else source_mask & ~current
+        merged = mapped.columns[target].copy()
+        merged[write] = values[write]
+        mapped.set_column(target, merged, current | source_mask)
+
+
+class TypeConverterKernel(ColumnarKernel):
+    """
+    Columnar TypeConverter.
+
+    Each column is converted in one numpy cast when possible. If the cast
+    fails for any value the column is converted per value, so failing values
+    keep their original value exactly as in the record backend. Dates are
+    parsed once per distinct string.
+    """
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        type_conversions = self.config.get("type_conversions", {})
+
+        for field, target_type in type_conversions.items():
+            if field not in batch.columns:
+                continue
+            values, mask = batch.columns[field], batch.present[field]
+            rows = np.flatnonzero(batch.present_mask(field) & ~_is_none(values))
+            if not len(rows):
+                continue
+
+            converted = values.copy()
+            converted[rows] = self._convert(field, values[rows], target_type)
+            batch.set_column(field, converted, mask)
+
+        self.logger.info(f"Converted types for {batch.size} records")
+        return batch
+
+    def _convert(self, field: str, cells: np.ndarray, target_type: str) -> np.ndarray:
+        if target_type in ("date", "datetime"):
+            return self._to_datetime(field, cells, target_type)
+        if target_type not in self.CONVERTERS:
+            return cells
+
+        converter = self.CONVERTERS[target_type]
+        if converter is not None:
+            try:
+                result = converter(cells)
+                if result is not None:
+                    return result
+            except (TypeError, ValueError, OverflowError):
+                pass
+
+        return self._convert_each(field, cells, target_type)
+
+    def _convert_each(self, field: str, cells: np.ndarray, target_type: str) -> np.ndarray:
+        result = cells.copy()
+        for i, value in enumerate(cells):
+            try:
+                result[i] = self.transformer._convert_value(value, target_type)
+            except Exception as e:
+                self.logger.warning(f"Failed to convert field '{field}' to {target_type}: {str(e)}")
+        return result
+
+    @staticmethod
+    def _to_string(cells: np.ndarray) -> np.ndarray:
+        if _value_types(cells) <= {str}:
+            return cells
+        return _object_array(list(map(str, cells)))
+
+    @staticmethod
+    def _to_float(cells: np.ndarray) -> Optional[np.ndarray]:
+        if not _value_types(cells) <= {int, float, str, bool}:
+            return None
+        return _object_array(cells.astype(np.float64).tolist())
+
+    @staticmethod
+    def _to_integer(cells: np.ndarray) -> Optional[np.ndarray]:
+        if not _value_types(cells) <= {int, float, str, bool}:
+            return None
+        floats = cells.astype(np.float64)
+        if not (np.isfinite(floats).all() and (np.abs(floats) < _INT64_LIMIT).all()):
+            return None
+        return _object_array(floats.astype(np.int64).tolist())
+
+    @staticmethod
+    def _to_boolean(cells: np.ndarray) -> Optional[np.ndarray]:
+        types = _value_types(cells)
+        if types <= {bool}:
+            return cells
+        if types <= {str}:
+            flags = pd.Series(cells, dtype=object).str.lower().isin(_TRUE_STRINGS)
+            return _object_array(flags.tolist())
+        if types <= {int, float}:
+            return _object_array(cells.astype(bool).tolist())
+        return None
+
+    def _to_datetime(self, field: str, cells: np.ndarray, target_type: str) -> np.ndarray:
+        types = _value_types(cells)
+        if types <= {datetime}:
+            return cells
+        if not types <= {str, datetime}:
+            return self._convert_each(field, cells, target_type)
+
+        parsed = {}
+        result = cells.copy()
+        for i, value in enumerate(cells):
+            if type(value) is datetime:
+                continue
+            if value not in parsed:
+                try:
+                    parsed[value] = date_parser.parse(value)
+                except Exception as e:
+                    parsed[value] = value
+                    self.logger.warning(f"Failed to convert field '{field}' to {target_type}: {str(e)}")
+            result[i] = parsed[value]
+        return result
+
+    # Vectorized converter per target type; None means convert per value
+    CONVERTERS = {
+        "string": _to_string.__func__,
+        "integer": _to_integer.__func__,
+        "float": _to_float.__func__,
+        "boolean": _to_boolean.__func__,
+        "json": None
+    }
+
+
+class EnricherKernel(ColumnarKernel):
+    """
+    Columnar DataEnricher.
+
+    Computed fields are evaluated over the batch columns and constant fields
+    are broadcast. add_timestamp stamps the whole batch with a single time.
+    Hashes still need each full original record.
+    """
+
+    def apply(self, batch: ColumnBatch) -> ColumnBatch:
+        rows = batch.to_records() if self.config.get("add_hash") else None
+
+        if self.config.get("computed_fields"):
+            computed = self.transformer.compute_fields(self._field_columns(batch), batch.size)
+            for field_name, values in computed.items():
+                batch.set_column(field_name, values)
+
+        for field_name, value in self.config.get("constant_fields", {}).items():
+            batch.set_column(field_name, _full(value, batch.size))
+
+        if self.config.get("add_timestamp"):
+            stamp = datetime.utcnow().isoformat()
+            batch.set_column("_enriched_at", _full(stamp, batch.size))
+
+        if self.config.get("add_hash"):
+            hashes = _object_array([self.transformer._compute_hash(record) for record in rows])
+            batch.set_column("_record_hash", hashes)
+
+        self.logger.info(f"Enriched {batch.size} records")
+        return batch
+
+    def _field_columns(self, batch: ColumnBatch) -> Dict[str, np.ndarray]:
+        """Referenced columns with absent cells marked MISSING for expressions."""
+        fields = {
+            field
+            for expression in self.transformer._compiled_expressions().values() if expression is not None
+            for field in expression.fields
+        }
+        columns = {}
+        for name in fields & batch.columns.keys():
+            values, mask = batch.columns[name], batch.present[name]
+            if mask is not None:
+                values = values.copy()
+                values[~mask] = MISSING
+            columns[name] = values
+        return columns
+
+
+# Exact types only: subclasses may override the record-level hooks
+_KERNELS = {
+    DataCleaner: CleanerKernel,
+    DataValidator: ValidatorKernel,
+    DataMapper: MapperKernel,
+    TypeConverter: TypeConverterKernel,
+    DataEnricher: EnricherKernel
+}
+
+
+def compile_transformer(transformer: BaseTransformer) -> ColumnarKernel:
+    """
+    Compile a transformer into a columnar kernel.
+
+    Args:
+        transformer: Transformer instance
+
+    Returns:
+        Columnar kernel, or a RecordKernel if the transformer has none
+    """
+    kernel_class = _KERNELS.get(type(transformer), RecordKernel)
+    return kernel_class(transformer)
+
+
+class ColumnarPipeline:
+    """A TransformationPipeline compiled for columnar execution."""
+
+    def __init__(self, pipeline: TransformationPipeline):
+        """
+        Compile a transformation pipeline.
+
+        Args:
+            pipeline: Pipeline whose transformers to compile
+        """
+        self.kernels = [compile_transformer(t) for t in pipeline.transformers]
+        self.logger = logging.getLogger(__name__)
+
+    def transform_batch(self, batch: ColumnBatch) -> ColumnBatch:
+        """
+        Run every kernel over a column batch.
+
+        Args:
+            batch: Input batch
+
+        Returns:
+            Transformed batch
+        """
+        for i, kernel in enumerate(self.kernels):
+            name = kernel.transformer.__class__.__name__
+            try:
+                self.logger.info(f"Executing transformer {i + 1}/{len(self.kernels)}: {name} ({kernel.__class__.__name__})")
+                batch = kernel.apply(batch)
+            except Exception as e:
+                self.logger.error(f"Transformer {name} failed: {str(e)}")
+                raise
+
+        return batch
+
+    def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Transform records through the compiled pipeline.
+
+        Args:
+            data: Input records
+
+        Returns:
+            Transformed records
+        """
+        if not self.kernels:
+            return data
+        return self.transform_batch(ColumnBatch.from_records(data)).to_records()
+
+    def transform_frame(self, frame: Any) -> pd.DataFrame:
+        """
+        Transform a pandas DataFrame or Arrow Table/RecordBatch.
+
+        Args:
+            frame: Input frame
+
+        Returns:
+            Transformed DataFrame
+        """
+        return self.transform_batch(ColumnBatch.from_frame(frame)).to_frame()
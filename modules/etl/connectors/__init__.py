@@ -2,6 +2,7 @@
 from .base import BaseConnector
 from .csv_connector import CSVConnector
 from .json_connector import JSONConnector
+from .parquet_connector import ParquetConnector
 from .sql_connector import SQLConnector
 from .api_connector import APIConnector
 from .factory import ConnectorFactory
@@ -10,6 +11,7 @@ __all__ = [
     "BaseConnector",
     "CSVConnector",
     "JSONConnector",
+    "ParquetConnector",
     "SQLConnector",
     "APIConnector",
     "ConnectorFactory",
@@ -1,7 +1,8 @@
 """Base connector class."""
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 import pandas as pd
+from modules.etl.pushdown import ScanPlan
 from shared.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -25,6 +26,28 @@ class BaseConnector(ABC):
         """Extract data from source."""
         pass
 
+    def extract_plan(self, query: Optional[Dict[str, Any]], plan: ScanPlan) -> pd.DataFrame:
+        """
+        Extract data applying a scan plan's column selection and row filters.
+
+        Connectors that can evaluate the plan at the source override this;
+        the default applies it after a full extract.
+        """
+        return plan.apply(self.extract(query))
+
+    def extract_batches(
+        self, query: Optional[Dict[str, Any]] = None, batch_size: int = 10000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Extract data as DataFrame chunks of at most batch_size rows.
+
+        The default slices a full extract; file connectors override this to
+        read incrementally so memory stays bounded by the batch size.
+        """
+        df = self.extract(query)
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start:start + batch_size]
+
     @abstractmethod
     def disconnect(self) -> None:
         """Close connection to data source."""
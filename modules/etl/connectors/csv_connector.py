@@ -1,6 +1,8 @@
 """CSV file connector."""
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 import pandas as pd
+from modules.etl.pushdown import DEFAULT_CSV_CHUNK_SIZE, ScanPlan, read_csv
+from modules.etl.readers import iter_frames
 from .base import BaseConnector
 import os
 
@@ -32,25 +34,21 @@ class CSVConnector(BaseConnector):
             self.logger.error(f"Failed to connect to CSV file: {e}")
             return False
 
+    def _read_options(self) -> Dict[str, Any]:
+        """Get pandas.read_csv options from config."""
+        return {
+            "delimiter": self.config.get("delimiter", ","),
+            "encoding": self.config.get("encoding", "utf-8"),
+            "skiprows": self.config.get("skip_rows", None),
+            "usecols": self.config.get("use_cols", None),
+            "dtype": self.config.get("dtype", None),
+        }
+
     def extract(self, query: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
         """Extract data from CSV file."""
         try:
-            # Extract CSV options from config
-            delimiter = self.config.get("delimiter", ",")
-            encoding = self.config.get("encoding", "utf-8")
-            skip_rows = self.config.get("skip_rows", None)
-            use_cols = self.config.get("use_cols", None)
-            dtype = self.config.get("dtype", None)
-
             # Read CSV
-            self.df = pd.read_csv(
-                self.file_path,
-                delimiter=delimiter,
-                encoding=encoding,
-                skiprows=skip_rows,
-                usecols=use_cols,
-                dtype=dtype,
-            )
+            self.df = pd.read_csv(self.file_path, **self._read_options())
 
             # Apply query filters if provided
             if query:
@@ -69,6 +67,35 @@ class CSVConnector(BaseConnector):
             self.logger.error(f"Error extracting data from CSV: {e}")
             raise
 
+    def extract_plan(self, query: Optional[Dict[str, Any]], plan: ScanPlan) -> pd.DataFrame:
+        """Extract data from CSV file, parsing only planned columns and filtering chunks as they are read."""
+        if query:
+            return super().extract_plan(query, plan)
+
+        try:
+            self.df = read_csv(
+                self.file_path,
+                plan,
+                chunk_size=self.config.get("chunk_size", DEFAULT_CSV_CHUNK_SIZE),
+                **self._read_options(),
+            )
+            self.logger.info(f"Extracted {len(self.df)} records from CSV")
+            return self.df
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from CSV: {e}")
+            raise
+
+    def extract_batches(
+        self, query: Optional[Dict[str, Any]] = None, batch_size: int = DEFAULT_CSV_CHUNK_SIZE
+    ) -> Iterator[pd.DataFrame]:
+        """Extract CSV rows as chunks read incrementally from the file."""
+        if query:
+            yield from super().extract_batches(query, batch_size)
+            return
+
+        yield from iter_frames(self.file_path, "csv", batch_size, **self._read_options())
+
     def disconnect(self) -> None:
         """Close connection (cleanup)."""
         self.df = None
@@ -3,6 +3,7 @@ from typing import Dict, Any
 from .base import BaseConnector
 from .csv_connector import CSVConnector
 from .json_connector import JSONConnector
+from .parquet_connector import ParquetConnector
 from .sql_connector import SQLConnector
 from .api_connector import APIConnector
 from modules.etl.core.constants import SourceType
@@ -17,6 +18,7 @@ class ConnectorFactory:
         connector_map = {
             SourceType.CSV: CSVConnector,
             SourceType.JSON: JSONConnector,
+            SourceType.PARQUET: ParquetConnector,
             SourceType.SQL: SQLConnector,
             SourceType.POSTGRESQL: SQLConnector,
             SourceType.MYSQL: SQLConnector,
@@ -36,6 +38,7 @@ class ConnectorFactory:
         return [
             SourceType.CSV,
             SourceType.JSON,
+            SourceType.PARQUET,
             SourceType.SQL,
             SourceType.POSTGRESQL,
             SourceType.MYSQL,
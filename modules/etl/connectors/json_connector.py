@@ -1,6 +1,7 @@
 """JSON file connector."""
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterator, Optional
 import pandas as pd
+from modules.etl.readers import file_format, iter_frames
 from .base import BaseConnector
 import json
 import os
@@ -75,6 +76,28 @@ class JSONConnector(BaseConnector):
             self.logger.error(f"Error extracting data from JSON: {e}")
             raise
 
+    def extract_batches(
+        self, query: Optional[Dict[str, Any]] = None, batch_size: int = 10000
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Extract JSON records as chunks decoded incrementally from the file.
+
+        Top-level arrays and JSON Lines files ("lines": True or a .jsonl/.ndjson
+        extension) are streamed; json_path extraction needs the whole document.
+        """
+        if query or self.config.get("json_path"):
+            yield from super().extract_batches(query, batch_size)
+            return
+
+        lines = self.config.get("lines") or file_format(self.file_path, default="json") == "jsonl"
+        with open(self.file_path, "rb") as stream:
+            yield from iter_frames(
+                stream,
+                "jsonl" if lines else "json",
+                batch_size,
+                encoding=self.config.get("encoding", "utf-8"),
+            )
+
     def _extract_json_path(self, data: Any, path: str) -> Any:
         """Extract data using simple JSONPath-like syntax."""
         # Simple implementation - supports dot notation like "data.items"
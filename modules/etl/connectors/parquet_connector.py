@@ -0,0 +1,90 @@
+"""Parquet file connector."""
+from typing import Any, Dict, Optional
+import pandas as pd
+from modules.etl.pushdown import ScanPlan, read_parquet
+from .base import BaseConnector
+import os
+
+
+class ParquetConnector(BaseConnector):
+    """Connector for Parquet files and datasets."""
+
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.file_path: Optional[str] = None
+        self.df: Optional[pd.DataFrame] = None
+
+    def get_required_fields(self) -> list:
+        """Get required configuration fields."""
+        return ["file_path"]
+
+    def connect(self) -> bool:
+        """Establish connection (validate file or dataset directory exists)."""
+        try:
+            self.validate_config()
+            self.file_path = self.config["file_path"]
+
+            if not os.path.exists(self.file_path):
+                raise FileNotFoundError(f"Parquet file not found: {self.file_path}")
+
+            self.logger.info(f"Connected to Parquet file: {self.file_path}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to connect to Parquet file: {e}")
+            return False
+
+    def extract(self, query: Optional[Dict[str, Any]] = None) -> pd.DataFrame:
+        """Extract data from Parquet file."""
+        query = query or {}
+        plan = ScanPlan(
+            columns=query.get("columns"),
+            filters=[
+                {"column": column, "operator": "==", "value": value}
+                for column, value in query.get("filters", {}).items()
+            ],
+        )
+        df = self.extract_plan(None, plan)
+
+        if "limit" in query:
+            df = df.head(query["limit"])
+        return df
+
+    def extract_plan(self, query: Optional[Dict[str, Any]], plan: ScanPlan) -> pd.DataFrame:
+        """Extract data from Parquet file, pushing columns and filters into the pyarrow reader."""
+        if query:
+            return super().extract_plan(query, plan)
+
+        try:
+            self.df = read_parquet(self.file_path, plan)
+            self.logger.info(f"Extracted {len(self.df)} records from Parquet")
+            return self.df
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from Parquet: {e}")
+            raise
+
+    def disconnect(self) -> None:
+        """Close connection (cleanup)."""
+        self.df = None
+        self.logger.info("Disconnected from Parquet file")
+
+    def test_connection(self) -> bool:
+        """Test if file is accessible and readable."""
+        try:
+            return self.file_path is not None and os.path.exists(self.file_path)
+        except Exception:
+            return False
+
+    def get_schema(self) -> Optional[Dict[str, Any]]:
+        """Get Parquet schema information without reading data."""
+        try:
+            import pyarrow.dataset as ds
+
+            schema = ds.dataset(self.file_path, format="parquet").schema
+            return {
+                "columns": schema.names,
+                "dtypes": {field.name: str(field.type) for field in schema},
+            }
+        except Exception as e:
+            self.logger.error(f"Error getting schema: {e}")
+            return None
@@ -2,6 +2,7 @@
 from typing import Any, Dict, Optional
 import pandas as pd
 from sqlalchemy import create_engine, text
+from modules.etl.pushdown import ScanPlan
 from .base import BaseConnector
 
 
@@ -69,6 +70,43 @@ class SQLConnector(BaseConnector):
             self.logger.error(f"Error extracting data from SQL: {e}")
             raise
 
+    def extract_plan(self, query: Optional[Dict[str, Any]], plan: ScanPlan) -> pd.DataFrame:
+        """Extract data from SQL database with the plan as a SELECT list and WHERE clause."""
+        if query and ("limit" in query or "columns" in query):
+            # Limits and column lists apply to the unfiltered result
+            return super().extract_plan(query, plan)
+
+        try:
+            if not self.connection:
+                raise RuntimeError("Not connected to database")
+
+            sql_query = query.get("sql") if query else self.config.get("query")
+            if not sql_query:
+                raise ValueError("SQL query is required")
+
+            sql_query = sql_query.strip().rstrip(";")
+            if plan.columns is not None:
+                # Steps may name columns the query does not return; only select real ones
+                available = self.connection.execute(
+                    text(f"SELECT * FROM ({sql_query}) AS src WHERE 1 = 0")
+                ).keys()
+                plan = ScanPlan(
+                    columns=[column for column in plan.columns if column in available],
+                    filters=plan.filters,
+                )
+
+            statement, params, residual = plan.to_sql(sql_query, self.connection)
+            df = pd.read_sql(statement, self.connection, params=params)
+            if residual:
+                df = plan.apply(df, residual).reset_index(drop=True)
+
+            self.logger.info(f"Extracted {len(df)} records from SQL database")
+            return df
+
+        except Exception as e:
+            self.logger.error(f"Error extracting data from SQL: {e}")
+            raise
+
     def disconnect(self) -> None:
         """Close database connection."""
         try:
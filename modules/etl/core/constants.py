@@ -9,6 +9,7 @@ class SourceType(str, Enum):
     JSON = "json"
     XML = "xml"
     EXCEL = "excel"
+    PARQUET = "parquet"
     SQL = "sql"
     POSTGRESQL = "postgresql"
     MYSQL = "mysql"
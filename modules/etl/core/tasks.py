@@ -78,6 +78,7 @@ def execute_pipeline_task(self, pipeline_id: str, job_id: str = None) -> dict:
             "load_config": pipeline.load_config,
             "validation_rules": pipeline.validation_rules,
             "deduplication_config": pipeline.deduplication_config,
+            "parallel_processing": pipeline.parallel_processing,
         }
 
         source_config = {"source_type": source.source_type, "connection_config": source.connection_config}
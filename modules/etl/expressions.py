@@ -0,0 +1,513 @@
+"""
+Compiled expressions for computed fields.
+
+Expressions use the DataEnricher syntax: Python arithmetic over ``{field}``
+placeholders, e.g. ``"{price} * {quantity}"`` or ``"'{first} {last}'"``.
+Each expression is parsed once into an AST, checked against a whitelist of
+operators and functions, and evaluated over whole columns at a time.
+
+Placeholders outside string literals bind the field value, with strings
+holding int or float literals read as numbers. Placeholders inside string
+literals are replaced by ``str(value)``; a missing field leaves the
+placeholder text as is.
+"""
+
+import ast
+import operator
+import re
+from functools import lru_cache
+from typing import List, Dict, Any, Callable, Tuple
+
+import numpy as np
+
+from modules.etl.transformers import TransformerException
+
+# Marks a field absent from a record
+MISSING = object()
+
+# Rows evaluated per vectorized step; a failing chunk is re-run per row
+EVALUATION_CHUNK_ROWS = 4096
+
+# Guards against expressions that allocate without bound
+MAX_INTEGER_EXPONENT = 1000
+MAX_SEQUENCE_REPEAT = 10000
+
+# Operand types whose multiplication by an int repeats them
+_SEQUENCE_TYPES = (str, bytes, list, tuple)
+
+_PLACEHOLDER = re.compile(r"\{([^{}]+)\}")
+_TOKEN = "__field_{}__"
+_TOKEN_PATTERN = re.compile(r"__field_(\d+)__")
+
+FUNCTIONS: Dict[str, Callable] = {
+    "abs": abs,
+    "round": round,
+    "min": min,
+    "max": max,
+    "len": len,
+    "str": str,
+    "int": int,
+    "float": float,
+    "bool": bool,
+    "lower": str.lower,
+    "upper": str.upper,
+    "strip": str.strip
+}
+
+
+class ExpressionError(TransformerException):
+    """Exception for expressions that cannot be compiled."""
+    pass
+
+
+def _power(base: Any, exponent: Any) -> Any:
+    if isinstance(base, int) and isinstance(exponent, int) and abs(exponent) > MAX_INTEGER_EXPONENT:
+        raise ValueError(f"Exponent {exponent} exceeds {MAX_INTEGER_EXPONENT}")
+    return base ** exponent
+
+
+def _multiply(left: Any, right: Any) -> Any:
+    for sequence, count in ((left, right), (right, left)):
+        if isinstance(sequence, _SEQUENCE_TYPES) and isinstance(count, int) and count > MAX_SEQUENCE_REPEAT:
+            raise ValueError(f"Sequence repeat {count} exceeds {MAX_SEQUENCE_REPEAT}")
+    return left * right
+
+
+_BINARY_OPERATORS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power
+}
+
+
+def _needs_multiply_guard(left: np.ndarray, right: np.ndarray) -> bool:
+    return any(
+        issubclass(value_type, _SEQUENCE_TYPES)
+        for value_type in _value_types(left) | _value_types(right)
+    )
+
+
+def _needs_power_guard(base: np.ndarray, exponent: np.ndarray) -> bool:
+    return any(type(e) is int and abs(e) > MAX_INTEGER_EXPONENT for e in exponent)
+
+
+# Guarded operators run per cell through np.frompyfunc only for chunks that
+# could trip the guard; everything else uses numpy's object loops
+_GUARDS = {
+    ast.Mult: (operator.mul, _needs_multiply_guard),
+    ast.Pow: (operator.pow, _needs_power_guard)
+}
+
+_UNARY_OPERATORS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+    ast.Not: operator.not_
+}
+
+_COMPARE_OPERATORS = {
+    ast.Eq: operator.eq,
+    ast.NotEq: operator.ne,
+    ast.Lt: operator.lt,
+    ast.LtE: operator.le,
+    ast.Gt: operator.gt,
+    ast.GtE: operator.ge,
+    ast.In: lambda a, b: a in b,
+    ast.NotIn: lambda a, b: a not in b
+}
+
+_not = np.frompyfunc(operator.not_, 1, 1)
+
+
+def _truth(values: np.ndarray) -> np.ndarray:
+    """Return the truthiness of each cell as a bool array."""
+    return values.astype(bool)
+
+
+def _value_types(values: np.ndarray) -> set:
+    """Return the set of exact types present in a column."""
+    return set(map(type, values))
+
+
+def _broadcast(value: Any, size: int) -> np.ndarray:
+    """Return value as an object array of the given length."""
+    if isinstance(value, np.ndarray):
+        return value if value.dtype == object else value.astype(object)
+    values = np.empty(size, dtype=object)
+    values.fill(value)
+    return values
+
+
+def _coerce(value: Any) -> Any:
+    """Read int/float literals out of strings."""
+    if isinstance(value, str):
+        for parse in (int, float):
+            try:
+                return parse(value)
+            except ValueError:
+                pass
+    return value
+
+
+class _Chunk:
+    """Field columns bound for one vectorized evaluation."""
+
+    def __init__(self, raw: Dict[str, np.ndarray], size: int):
+        self.raw = raw
+        self.size = size
+        self._values: Dict[str, np.ndarray] = {}
+
+    def value(self, field: str) -> np.ndarray:
+        """Coerced column for a bare placeholder; raises if any cell is missing."""
+        if field not in self._values:
+            raw = self.raw[field]
+            types = _value_types(raw)
+            if object in types and any(v is MISSING for v in raw):
+                raise KeyError(field)
+            if str in types:
+                raw = np.fromiter(map(_coerce, raw), dtype=object, count=len(raw))
+            self._values[field] = raw
+        return self._values[field]
+
+
+class CompiledExpression:
+    """A computed-field expression parsed and validated once."""
+
+    def __init__(self, expression: str):
+        """
+        Compile an expression.
+
+        Args:
+            expression: Expression with ``{field}`` placeholders
+
+        Raises:
+            ExpressionError: If the expression is not valid Python or uses
+                anything outside the whitelist
+        """
+        self.expression = expression
+        self.fields: List[str] = []
+
+        def tokenize(match: "re.Match") -> str:
+            field = match.group(1)
+            if field not in self.fields:
+                self.fields.append(field)
+            return _TOKEN.format(self.fields.index(field))
+
+        try:
+            tree = ast.parse(_PLACEHOLDER.sub(tokenize, expression).strip(), mode="eval")
+        except SyntaxError as e:
+            raise ExpressionError(f"Invalid expression '{expression}': {e.msg}")
+
+        self._vector = self._compile_vector(tree.body)
+        self._scalar = self._compile_scalar(tree.body)
+
+    def evaluate(self, columns: Dict[str, np.ndarray], size: int) -> Tuple[np.ndarray, Dict[int, str]]:
+        """
+        Evaluate over columns of a batch.
+
+        Chunks are evaluated vectorized; a chunk where any row fails is
+        re-evaluated row by row so that only the failing rows are lost.
+
+        Args:
+            columns: Field name to object array; absent fields hold MISSING
+                or may be left out of the dict entirely
+            size: Number of rows
+
+        Returns:
+            Tuple of (values, errors). Failed rows are None in values and map
+            row index to error message in errors.
+        """
+        missing = None
+        raw_columns = {}
+        for field in self.fields:
+            if field in columns:
+                raw_columns[field] = columns[field]
+            else:
+                if missing is None:
+                    missing = _broadcast(MISSING, size)
+                raw_columns[field] = missing
+
+        values = np.empty(size, dtype=object)
+        errors: Dict[int, str] = {}
+
+        for start in range(0, size, EVALUATION_CHUNK_ROWS):
+            stop = min(start + EVALUATION_CHUNK_ROWS, size)
+            chunk = _Chunk({f: c[start:stop] for f, c in raw_columns.items()}, stop - start)
+            try:
+                values[start:stop] = _broadcast(self._vector(chunk), chunk.size)
+                continue
+            except Exception:
+                pass
+
+            for row in range(start, stop):
+                try:
+                    values[row] = self._scalar({f: c[row] for f, c in raw_columns.items()})
+                except Exception as e:
+                    errors[row] = f"{type(e).__name__}: {e}"
+
+        return values, errors
+
+    def evaluate_record(self, record: Dict[str, Any]) -> Any:
+        """
+        Evaluate for a single record.
+
+        Args:
+            record: Input record
+
+        Returns:
+            Computed value
+
+        Raises:
+            Exception: Whatever the expression raised for this record
+        """
+        return self._scalar({field: record.get(field, MISSING) for field in self.fields})
+
+    def _field(self, node: ast.AST) -> str:
+        match = _TOKEN_PATTERN.fullmatch(node.id) if isinstance(node, ast.Name) else None
+        if not match:
+            name = getattr(node, "id", type(node).__name__)
+            raise ExpressionError(f"Name '{name}' is not allowed in expression '{self.expression}'")
+        return self.fields[int(match.group(1))]
+
+    def _template(self, text: str) -> List[Any]:
+        """Split a string constant into literal text and field names."""
+        parts, position = [], 0
+        for match in _TOKEN_PATTERN.finditer(text):
+            parts.append(text[position:match.start()])
+            parts.append((self.fields[int(match.group(1))],))
+            position = match.end()
+        parts.append(text[position:])
+        return parts
+
+    def _reject(self, node: ast.AST) -> ExpressionError:
+        return ExpressionError(
+            f"{type(node).__name__} is not allowed in expression '{self.expression}'"
+        )
+
+    def _container(self, node: ast.AST) -> Any:
+        """Constant tuple/list on the right of ``in``."""
+        if not isinstance(node, (ast.Tuple, ast.List)):
+            raise self._reject(node)
+        for element in node.elts:
+            if not isinstance(element, ast.Constant) or (
+                isinstance(element.value, str) and _TOKEN_PATTERN.search(element.value)
+            ):
+                raise self._reject(element)
+        return tuple(e.value for e in node.elts)
+
+    def _call(self, node: ast.Call) -> Callable:
+        name = node.func.id if isinstance(node.func, ast.Name) else None
+        if name not in FUNCTIONS or node.keywords or any(isinstance(a, ast.Starred) for a in node.args):
+            raise ExpressionError(
+                f"Call to '{name or type(node.func).__name__}' is not allowed in expression '{self.expression}'"
+            )
+        return FUNCTIONS[name]
+
+    def _compile_vector(self, node: ast.AST) -> Callable[[_Chunk], Any]:
+        """Compile a node into a function of a _Chunk returning an array or scalar."""
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, str) and _TOKEN_PATTERN.search(node.value):
+                parts = self._template(node.value)
+
+                def template(chunk: _Chunk) -> np.ndarray:
+                    result = _broadcast("", chunk.size)
+                    for part in parts:
+                        if isinstance(part, tuple):
+                            raw = chunk.raw[part[0]]
+                            literal = "{" + part[0] + "}"
+                            part = np.fromiter(
+                                (literal if v is MISSING else str(v) for v in raw),
+                                dtype=object, count=chunk.size
+                            )
+                        result = result + _broadcast(part, chunk.size)
+                    return result
+                return template
+
+            value = node.value
+            return lambda chunk: value
+
+        if isinstance(node, ast.Name):
+            field = self._field(node)
+            return lambda chunk: chunk.value(field)
+
+        if isinstance(node, ast.BinOp):
+            op = type(node.op)
+            if op not in _BINARY_OPERATORS:
+                raise self._reject(node.op)
+            left, right = self._compile_vector(node.left), self._compile_vector(node.right)
+            func = _BINARY_OPERATORS[op]
+            native, needs_guard = _GUARDS.get(op, (func, None))
+            guarded = np.frompyfunc(func, 2, 1)
+
+            def binary(chunk: _Chunk) -> np.ndarray:
+                a, b = _broadcast(left(chunk), chunk.size), _broadcast(right(chunk), chunk.size)
+                if needs_guard is not None and needs_guard(a, b):
+                    return guarded(a, b)
+                return native(a, b)
+            return binary
+
+        if isinstance(node, ast.UnaryOp):
+            op = type(node.op)
+            if op not in _UNARY_OPERATORS:
+                raise self._reject(node.op)
+            operand = self._compile_vector(node.operand)
+            ufunc = _not if op is ast.Not else _UNARY_OPERATORS[op]
+            return lambda chunk: ufunc(_broadcast(operand(chunk), chunk.size))
+
+        if isinstance(node, ast.BoolOp):
+            operands = [self._compile_vector(v) for v in node.values]
+            is_and = isinstance(node.op, ast.And)
+
+            def bool_op(chunk: _Chunk) -> np.ndarray:
+                result = _broadcast(operands[0](chunk), chunk.size)
+                for operand in operands[1:]:
+                    truth = _truth(result)
+                    pick_next = truth if is_and else ~truth
+                    result = np.where(pick_next, _broadcast(operand(chunk), chunk.size), result)
+                return result
+            return bool_op
+
+        if isinstance(node, ast.Compare):
+            operands = [self._compile_vector(node.left)]
+            ops = []
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _COMPARE_OPERATORS:
+                    raise self._reject(op)
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    container = self._container(comparator)
+                    operands.append(lambda chunk, container=container: container)
+                else:
+                    operands.append(self._compile_vector(comparator))
+                ops.append(np.frompyfunc(_COMPARE_OPERATORS[type(op)], 2, 1))
+
+            def compare(chunk: _Chunk) -> np.ndarray:
+                left = _broadcast(operands[0](chunk), chunk.size)
+                result = None
+                for ufunc, operand in zip(ops, operands[1:]):
+                    right = _broadcast(operand(chunk), chunk.size)
+                    outcome = ufunc(left, right)
+                    result = outcome if result is None else np.where(_truth(result), outcome, result)
+                    left = right
+                return result
+            return compare
+
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = (self._compile_vector(n) for n in (node.test, node.body, node.orelse))
+            return lambda chunk: np.where(
+                _truth(_broadcast(test(chunk), chunk.size)),
+                _broadcast(body(chunk), chunk.size),
+                _broadcast(orelse(chunk), chunk.size)
+            )
+
+        if isinstance(node, ast.Call):
+            func = self._call(node)
+            args = [self._compile_vector(a) for a in node.args]
+            ufunc = np.frompyfunc(func, len(args), 1) if args else None
+
+            def call(chunk: _Chunk) -> Any:
+                if ufunc is None:
+                    return func()
+                return ufunc(*(_broadcast(a(chunk), chunk.size) for a in args))
+            return call
+
+        raise self._reject(node)
+
+    def _compile_scalar(self, node: ast.AST) -> Callable[[Dict[str, Any]], Any]:
+        """Compile a node into a function of one row's raw field values."""
+        if isinstance(node, ast.Constant):
+            if isinstance(node.value, str) and _TOKEN_PATTERN.search(node.value):
+                parts = self._template(node.value)
+                return lambda row: "".join(
+                    part if not isinstance(part, tuple)
+                    else "{" + part[0] + "}" if row[part[0]] is MISSING
+                    else str(row[part[0]])
+                    for part in parts
+                )
+            value = node.value
+            return lambda row: value
+
+        if isinstance(node, ast.Name):
+            field = self._field(node)
+
+            def name(row: Dict[str, Any]) -> Any:
+                value = row[field]
+                if value is MISSING:
+                    raise KeyError(field)
+                return _coerce(value)
+            return name
+
+        if isinstance(node, ast.BinOp):
+            func = _BINARY_OPERATORS[type(node.op)]
+            left, right = self._compile_scalar(node.left), self._compile_scalar(node.right)
+            return lambda row: func(left(row), right(row))
+
+        if isinstance(node, ast.UnaryOp):
+            func = _UNARY_OPERATORS[type(node.op)]
+            operand = self._compile_scalar(node.operand)
+            return lambda row: func(operand(row))
+
+        if isinstance(node, ast.BoolOp):
+            operands = [self._compile_scalar(v) for v in node.values]
+            is_and = isinstance(node.op, ast.And)
+
+            def bool_op(row: Dict[str, Any]) -> Any:
+                for operand in operands[:-1]:
+                    value = operand(row)
+                    if bool(value) != is_and:
+                        return value
+                return operands[-1](row)
+            return bool_op
+
+        if isinstance(node, ast.Compare):
+            operands = [self._compile_scalar(node.left)]
+            funcs = []
+            for op, comparator in zip(node.ops, node.comparators):
+                if isinstance(op, (ast.In, ast.NotIn)):
+                    container = self._container(comparator)
+                    operands.append(lambda row, container=container: container)
+                else:
+                    operands.append(self._compile_scalar(comparator))
+                funcs.append(_COMPARE_OPERATORS[type(op)])
+
+            def compare(row: Dict[str, Any]) -> Any:
+                left = operands[0](row)
+                result = True
+                for func, operand in zip(funcs, operands[1:]):
+                    right = operand(row)
+                    result = func(left, right)
+                    if not result:
+                        return result
+                    left = right
+                return result
+            return compare
+
+        if isinstance(node, ast.IfExp):
+            test, body, orelse = (self._compile_scalar(n) for n in (node.test, node.body, node.orelse))
+            return lambda row: body(row) if test(row) else orelse(row)
+
+        if isinstance(node, ast.Call):
+            func = self._call(node)
+            args = [self._compile_scalar(a) for a in node.args]
+            return lambda row: func(*(a(row) for a in args))
+
+        raise self._reject(node)
+
+
+@lru_cache(maxsize=256)
+def compile_expression(expression: str) -> CompiledExpression:
+    """
+    Compile a computed-field expression, reusing earlier compilations.
+
+    Args:
+        expression: Expression with ``{field}`` placeholders
+
+    Returns:
+        CompiledExpression
+
+    Raises:
+        ExpressionError: If the expression is invalid or not allowed
+    """
+    return CompiledExpression(expression)
@@ -7,17 +7,21 @@ databases, files, APIs, web scraping, and cloud storage.
 
 import logging
 import json
-import csv
 import io
+import queue
+import threading
+import time
 from abc import ABC, abstractmethod
-from typing import List, Dict, Any, Optional, Iterator, Generator
-from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Iterator, Generator, Tuple, BinaryIO
+from datetime import date, datetime
+from decimal import Decimal
 import hashlib
 
 import pandas as pd
 import sqlalchemy
 from sqlalchemy import create_engine, text
-from sqlalchemy.pool import NullPool
+from sqlalchemy.pool import NullPool, QueuePool
 import pymongo
 import requests
 from bs4 import BeautifulSoup
@@ -26,9 +30,21 @@ from azure.storage.blob import BlobServiceClient
 from google.cloud import storage as gcs_storage
 
 from modules.etl.models import DataSource, SourceType, DatabaseType
+from modules.etl.pushdown import ScanPlan
+from modules.etl.readers import DEFAULT_READ_BLOCK_SIZE, IterStream, file_format, iter_records
 
 logger = logging.getLogger(__name__)
 
+# Records per batch for streaming extraction
+DEFAULT_BATCH_SIZE = 10000
+
+# Attempts per partition for partitioned extraction, and the first retry delay
+DEFAULT_PARTITION_RETRIES = 3
+DEFAULT_PARTITION_RETRY_DELAY = 1.0
+
+# Marks a finished partition on the batch queue
+_PARTITION_DONE = object()
+
 
 class ExtractorException(Exception):
     """Base exception for extractor errors."""
@@ -116,6 +132,59 @@ class BaseExtractor(ABC):
 
         return self.extract(query=query, filters=filters)
 
+    def extract_batches(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Extract data as a stream of record batches.
+
+        The default implementation extracts everything and slices it, so it
+        only bounds downstream memory. Extractors that can read incrementally
+        override this to keep extraction memory bounded as well.
+
+        Args:
+            query: Query or filter expression
+            filters: Additional filters
+            batch_size: Maximum records per batch
+            limit: Maximum number of records to extract
+
+        Yields:
+            Lists of at most batch_size records
+        """
+        data = self.extract(query=query, filters=filters, limit=limit)
+        for start in range(0, len(data), batch_size):
+            yield data[start:start + batch_size]
+
+    def extract_incremental_batches(
+        self,
+        watermark_column: str,
+        last_watermark_value: Optional[Any] = None,
+        query: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Extract new records as batches ordered by the watermark column.
+
+        Ordering lets callers checkpoint the watermark after each batch.
+
+        Args:
+            watermark_column: Column to use for incremental extraction
+            last_watermark_value: Last extracted watermark value
+            query: Base query to modify
+            batch_size: Maximum records per batch
+
+        Yields:
+            Lists of at most batch_size records
+        """
+        data = self.extract_incremental(watermark_column, last_watermark_value, query)
+        data.sort(key=lambda record: (record.get(watermark_column) is None, record.get(watermark_column)))
+        for start in range(0, len(data), batch_size):
+            yield data[start:start + batch_size]
+
     def test_connection(self) -> bool:
         """
         Test connection to the data source.
@@ -157,10 +226,17 @@ class DatabaseExtractor(BaseExtractor):
         """Establish database connection."""
         try:
             connection_string = self._build_connection_string()
+            workers = self._partition_workers()
+            if workers > 1:
+                # Each partition reader holds a pooled connection
+                pool_options = {"poolclass": QueuePool, "pool_size": workers, "max_overflow": 1}
+            else:
+                pool_options = {"poolclass": NullPool}
+
             self._connection = create_engine(
                 connection_string,
-                poolclass=NullPool,
-                echo=self.config.get("echo_sql", False)
+                echo=self.config.get("echo_sql", False),
+                **pool_options
             )
             # Test connection
             with self._connection.connect() as conn:
@@ -225,6 +301,296 @@ class DatabaseExtractor(BaseExtractor):
         except Exception as e:
             raise ExtractionException(f"Failed to extract data from database: {str(e)}")
 
+    def extract_batches(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream query results in batches through a server-side cursor."""
+        if not query:
+            raise ExtractionException("Query is required for database extraction")
+
+        if limit:
+            query += f" LIMIT {limit}"
+
+        yield from self._stream_query(query, {}, batch_size)
+
+    def extract_incremental_batches(
+        self,
+        watermark_column: str,
+        last_watermark_value: Optional[Any] = None,
+        query: Optional[str] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Stream records past the watermark in watermark order."""
+        if not query:
+            raise ExtractionException("Query is required for database extraction")
+
+        incremental_query = f"SELECT * FROM ({query}) AS src"
+        params = {}
+        if last_watermark_value is not None:
+            incremental_query += f" WHERE {watermark_column} > :watermark"
+            params["watermark"] = last_watermark_value
+        incremental_query += f" ORDER BY {watermark_column}"
+
+        yield from self._stream_query(incremental_query, params, batch_size)
+
+    def _partition_workers(self) -> int:
+        partitions = int(self.config.get("partitions", 1))
+        return max(1, min(partitions, int(self.config.get("partition_workers", partitions))))
+
+    def extract_partitioned_batches(
+        self,
+        partition_column: str,
+        query: Optional[str] = None,
+        partitions: Optional[int] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        watermark_column: Optional[str] = None,
+        last_watermark_value: Optional[Any] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream query results split into partition_column ranges read concurrently.
+
+        Numeric and date columns are split into equal-width ranges between
+        their minimum and maximum; other columns into NTILE quantiles. Each
+        partition is read in partition_column order through a server-side
+        cursor on its own pooled connection. A failed partition is retried
+        from the last key it fully delivered, so no row is yielded twice.
+
+        Batches from different partitions are interleaved; there is no global
+        order. Rows with a NULL partition_column are read as one extra
+        partition, which can only be retried if it failed before yielding.
+
+        Args:
+            partition_column: Primary key or other indexed column to split on
+            query: Base query
+            partitions: Number of ranges (default: config "partitions")
+            batch_size: Maximum records per batch
+            watermark_column: Column to filter on for incremental extraction
+            last_watermark_value: Only rows past this watermark are read
+
+        Yields:
+            Lists of at most batch_size records
+        """
+        if not query:
+            raise ExtractionException("Query is required for database extraction")
+
+        partitions = max(1, int(partitions or self.config.get("partitions", 1)))
+        source = f"({query}) AS src"
+        conditions, params = [], {}
+        if watermark_column and last_watermark_value is not None:
+            conditions.append(f"{watermark_column} > :watermark")
+            params["watermark"] = last_watermark_value
+
+        try:
+            ranges = self._partition_ranges(source, conditions, params, partition_column, partitions)
+        except Exception as e:
+            raise ExtractionException(f"Failed to partition {partition_column}: {str(e)}")
+
+        if not watermark_column or last_watermark_value is None:
+            ranges.append((f"{partition_column} IS NULL", {}))
+
+        self.logger.info(f"Extracting {len(ranges)} partitions of {partition_column}")
+        yield from self._read_partitions(source, conditions, params, partition_column, ranges, batch_size)
+
+    def _partition_ranges(
+        self,
+        source: str,
+        conditions: List[str],
+        params: Dict[str, Any],
+        column: str,
+        partitions: int
+    ) -> List[Tuple[str, Dict[str, Any]]]:
+        """Split the non-NULL values of column into (predicate, params) ranges."""
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ""
+        with self._connection.connect() as conn:
+            low, high = conn.execute(
+                text(f"SELECT MIN({column}), MAX({column}) FROM {source}{where}"), params
+            ).one()
+
+            if low is None:
+                return []
+
+            if isinstance(low, (int, float, Decimal, date)) and not isinstance(low, bool):
+                # Equal-width ranges: [cut_i, cut_i+1)
+                step = (high - low) / partitions
+                if isinstance(low, int) and isinstance(high, int):
+                    cuts = [low + (high - low) * i // partitions for i in range(1, partitions)]
+                else:
+                    cuts = [low + step * i for i in range(1, partitions)]
+                lower_op, upper_op = ">=", "<"
+            else:
+                # Quantiles: (cut_i, cut_i+1]
+                cuts = [row[0] for row in conn.execute(
+                    text(
+                        f"SELECT MAX({column}) FROM (SELECT {column}, NTILE(:partitions) "
+                        f"OVER (ORDER BY {column}) AS part FROM {source}{where}) AS tiles "
+                        f"WHERE {column} IS NOT NULL GROUP BY part ORDER BY 1"
+                    ),
+                    {**params, "partitions": partitions}
+                )][:-1]
+                lower_op, upper_op = ">", "<="
+
+        cuts = sorted(set(cuts))
+        ranges = []
+        for i in range(len(cuts) + 1):
+            predicate, bounds = [], {}
+            if i > 0:
+                predicate.append(f"{column} {lower_op} :lower")
+                bounds["lower"] = cuts[i - 1]
+            if i < len(cuts):
+                predicate.append(f"{column} {upper_op} :upper")
+                bounds["upper"] = cuts[i]
+            ranges.append((" AND ".join(predicate) or f"{column} IS NOT NULL", bounds))
+        return ranges
+
+    def _read_partitions(
+        self,
+        source: str,
+        conditions: List[str],
+        params: Dict[str, Any],
+        column: str,
+        ranges: List[Tuple[str, Dict[str, Any]]],
+        batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read ranges concurrently and yield their batches as they arrive."""
+        workers = max(1, min(self._partition_workers(), len(ranges)))
+        batches: queue.Queue = queue.Queue(maxsize=workers * 2)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            while not stop.is_set():
+                try:
+                    batches.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def worker(partition: Tuple[str, Dict[str, Any]]) -> None:
+            try:
+                for batch in self._read_partition(source, conditions, params, column, partition, batch_size, stop):
+                    if not put(batch):
+                        return
+                put(_PARTITION_DONE)
+            except Exception as e:
+                put(e)
+
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etl-partition")
+        try:
+            for partition in ranges:
+                executor.submit(worker, partition)
+
+            remaining, total = len(ranges), 0
+            while remaining:
+                item = batches.get()
+                if item is _PARTITION_DONE:
+                    remaining -= 1
+                elif isinstance(item, Exception):
+                    raise ExtractionException(f"Failed to extract partition: {str(item)}")
+                else:
+                    total += len(item)
+                    yield item
+
+            self.logger.info(f"Extracted {total} records from {len(ranges)} partitions")
+        finally:
+            stop.set()
+            executor.shutdown(wait=True)
+
+    def _read_partition(
+        self,
+        source: str,
+        conditions: List[str],
+        params: Dict[str, Any],
+        column: str,
+        partition: Tuple[str, Dict[str, Any]],
+        batch_size: int,
+        stop: threading.Event
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream one partition in column order, retrying failures.
+
+        Rows sharing the last key of a batch are held back until the key
+        changes, so a retry can resume strictly after the last yielded key.
+        """
+        predicate, bounds = partition
+        retries = int(self.config.get("partition_retries", DEFAULT_PARTITION_RETRIES))
+        delay = float(self.config.get("partition_retry_delay", DEFAULT_PARTITION_RETRY_DELAY))
+        resumable = "IS NULL" not in predicate
+        resume_after, yielded, attempt = None, False, 0
+
+        while True:
+            where = conditions + [predicate]
+            query_params = {**params, **bounds}
+            if resume_after is not None:
+                where.append(f"{column} > :resume_after")
+                query_params["resume_after"] = resume_after
+            query = f"SELECT * FROM {source} WHERE {' AND '.join(where)}"
+            if resumable:
+                query += f" ORDER BY {column}"
+
+            held: List[Dict[str, Any]] = []
+            try:
+                for batch in self._stream_query(query, query_params, batch_size):
+                    if stop.is_set():
+                        return
+                    if not resumable:
+                        yielded = True
+                        yield batch
+                        continue
+
+                    rows = held + batch
+                    last_key = rows[-1][column]
+                    split = len(rows)
+                    while split and rows[split - 1][column] == last_key:
+                        split -= 1
+                    held = rows[split:]
+                    if split:
+                        resume_after = rows[split - 1][column]
+                        yield rows[:split]
+
+                if held:
+                    yield held
+                return
+
+            except Exception as e:
+                attempt += 1
+                if attempt >= retries or (yielded and not resumable) or stop.is_set():
+                    raise
+                self.logger.warning(
+                    f"Partition {predicate} failed (attempt {attempt}/{retries}), retrying: {str(e)}"
+                )
+                time.sleep(delay * 2 ** (attempt - 1))
+
+    def _stream_query(
+        self,
+        query: str,
+        params: Dict[str, Any],
+        batch_size: int
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Execute a query with stream_results and yield row batches."""
+        try:
+            with self._connection.connect() as conn:
+                result = conn.execution_options(
+                    stream_results=True,
+                    max_row_buffer=batch_size
+                ).execute(text(query), params)
+                columns = list(result.keys())
+
+                total = 0
+                for rows in result.partitions(batch_size):
+                    total += len(rows)
+                    yield [dict(zip(columns, row)) for row in rows]
+
+                self.logger.info(f"Streamed {total} records from database")
+
+        except ExtractorException:
+            raise
+        except Exception as e:
+            raise ExtractionException(f"Failed to extract data from database: {str(e)}")
+
     def extract_table(
         self,
         table_name: str,
@@ -366,50 +732,72 @@ class FileExtractor(BaseExtractor):
     ) -> List[Dict[str, Any]]:
         """Extract data from file."""
         try:
-            file_path = self.data_source.file_path
-            file_extension = file_path.split(".")[-1].lower()
-
-            if file_extension == "csv":
-                df = pd.read_csv(file_path)
-            elif file_extension == "json":
-                df = pd.read_json(file_path)
-            elif file_extension in ["xlsx", "xls"]:
-                df = pd.read_excel(file_path)
-            elif file_extension == "parquet":
-                df = pd.read_parquet(file_path)
-            else:
-                raise ExtractionException(f"Unsupported file format: {file_extension}")
-
-            # Apply filters if provided
-            if filters:
-                for field, condition in filters.items():
-                    operator = condition.get("operator", "==")
-                    value = condition.get("value")
-                    if operator == "==":
-                        df = df[df[field] == value]
-                    elif operator == ">":
-                        df = df[df[field] > value]
-                    elif operator == "<":
-                        df = df[df[field] < value]
-
-            # Apply offset and limit
-            if offset:
-                df = df.iloc[offset:]
-            if limit:
-                df = df.head(limit)
+            data = []
+            for batch in self._iter_file(filters, DEFAULT_BATCH_SIZE, offset, limit):
+                data.extend(batch)
 
-            data = df.to_dict(orient="records")
             self.logger.info(f"Extracted {len(data)} records from file")
             return data
 
         except Exception as e:
             raise ExtractionException(f"Failed to extract data from file: {str(e)}")
 
+    def extract_batches(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream file records in batches without loading the whole file.
+
+        Args:
+            query: Unused for files
+            filters: Field conditions applied while reading
+            batch_size: Maximum records per batch
+            limit: Maximum number of records to extract
+
+        Yields:
+            Lists of at most batch_size records
+        """
+        try:
+            yield from self._iter_file(filters, batch_size, None, limit)
+        except Exception as e:
+            raise ExtractionException(f"Failed to extract data from file: {str(e)}")
+
+    def _iter_file(
+        self,
+        filters: Optional[Dict[str, Any]],
+        batch_size: int,
+        offset: Optional[int],
+        limit: Optional[int]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read the source file as record batches with filters evaluated per chunk."""
+        file_path = self.data_source.file_path
+        return iter_records(
+            file_path,
+            file_format(file_path),
+            batch_size=batch_size,
+            plan=_filters_plan(filters),
+            offset=offset,
+            limit=limit or None,
+            **self.config.get("read_options", {})
+        )
+
     def disconnect(self) -> None:
         """No connection to close for file extraction."""
         pass
 
 
+def _filters_plan(filters: Optional[Dict[str, Any]]) -> ScanPlan:
+    """Build a scan plan from extractor field filters."""
+    return ScanPlan(filters=[
+        {"column": field, "operator": condition.get("operator", "=="), "value": condition.get("value")}
+        for field, condition in (filters or {}).items()
+    ])
+
+
 class APIExtractor(BaseExtractor):
     """Extractor for REST APIs."""
 
@@ -600,70 +988,87 @@ class CloudStorageExtractor(BaseExtractor):
     ) -> List[Dict[str, Any]]:
         """Extract data from cloud storage."""
         try:
-            provider = self.config.get("provider", "s3").lower()
-            file_key = query or self.data_source.file_path
+            data = []
+            for batch in self._iter_object(query, filters, DEFAULT_BATCH_SIZE, offset, limit):
+                data.extend(batch)
 
-            if provider == "s3":
-                return self._extract_s3(file_key, limit, offset)
-            elif provider == "azure":
-                return self._extract_azure(file_key, limit, offset)
-            elif provider == "gcs":
-                return self._extract_gcs(file_key, limit, offset)
-            else:
-                raise ValueError(f"Unsupported cloud provider: {provider}")
+            self.logger.info(f"Extracted {len(data)} records from cloud storage")
+            return data
 
         except Exception as e:
             raise ExtractionException(f"Failed to extract data from cloud storage: {str(e)}")
 
-    def _extract_s3(self, file_key: str, limit: Optional[int], offset: Optional[int]) -> List[Dict[str, Any]]:
-        """Extract data from S3."""
-        obj = self._connection.get_object(Bucket=self.data_source.bucket_name, Key=file_key)
-        content = obj["Body"].read()
+    def extract_batches(
+        self,
+        query: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        limit: Optional[int] = None
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Stream object records in batches while the object body downloads.
+
+        Args:
+            query: Object key (default: data source file path)
+            filters: Field conditions applied while reading
+            batch_size: Maximum records per batch
+            limit: Maximum number of records to extract
 
-        return self._parse_content(content, file_key, limit, offset)
+        Yields:
+            Lists of at most batch_size records
+        """
+        try:
+            yield from self._iter_object(query, filters, batch_size, None, limit)
+        except Exception as e:
+            raise ExtractionException(f"Failed to extract data from cloud storage: {str(e)}")
 
-    def _extract_azure(self, file_key: str, limit: Optional[int], offset: Optional[int]) -> List[Dict[str, Any]]:
-        """Extract data from Azure Blob Storage."""
-        blob_client = self._connection.get_blob_client(
-            container=self.data_source.bucket_name,
-            blob=file_key
-        )
-        content = blob_client.download_blob().readall()
-
-        return self._parse_content(content, file_key, limit, offset)
-
-    def _extract_gcs(self, file_key: str, limit: Optional[int], offset: Optional[int]) -> List[Dict[str, Any]]:
-        """Extract data from Google Cloud Storage."""
-        bucket = self._connection.bucket(self.data_source.bucket_name)
-        blob = bucket.blob(file_key)
-        content = blob.download_as_bytes()
-
-        return self._parse_content(content, file_key, limit, offset)
-
-    def _parse_content(self, content: bytes, file_key: str, limit: Optional[int], offset: Optional[int]) -> List[Dict[str, Any]]:
-        """Parse file content based on file type."""
-        file_extension = file_key.split(".")[-1].lower()
-
-        if file_extension == "csv":
-            df = pd.read_csv(io.BytesIO(content))
-        elif file_extension == "json":
-            df = pd.read_json(io.BytesIO(content))
-        elif file_extension in ["xlsx", "xls"]:
-            df = pd.read_excel(io.BytesIO(content))
-        elif file_extension == "parquet":
-            df = pd.read_parquet(io.BytesIO(content))
+    def _iter_object(
+        self,
+        file_key: Optional[str],
+        filters: Optional[Dict[str, Any]],
+        batch_size: int,
+        offset: Optional[int],
+        limit: Optional[int]
+    ) -> Iterator[List[Dict[str, Any]]]:
+        """Read an object's body as record batches."""
+        file_key = file_key or self.data_source.file_path
+        format_name = file_format(file_key)
+
+        stream = self._open_object(file_key)
+        try:
+            yield from iter_records(
+                stream,
+                format_name,
+                batch_size=batch_size,
+                plan=_filters_plan(filters),
+                offset=offset,
+                limit=limit or None,
+                **self.config.get("read_options", {})
+            )
+        finally:
+            stream.close()
+
+    def _open_object(self, file_key: str) -> BinaryIO:
+        """Open a streamed, read-only body for an object."""
+        provider = self.config.get("provider", "s3").lower()
+
+        if provider == "s3":
+            obj = self._connection.get_object(Bucket=self.data_source.bucket_name, Key=file_key)
+            body = obj["Body"]
+            raw = IterStream(body.iter_chunks(DEFAULT_READ_BLOCK_SIZE), on_close=body.close)
+        elif provider == "azure":
+            blob_client = self._connection.get_blob_client(
+                container=self.data_source.bucket_name,
+                blob=file_key
+            )
+            raw = IterStream(blob_client.download_blob().chunks())
+        elif provider == "gcs":
+            bucket = self._connection.bucket(self.data_source.bucket_name)
+            return bucket.blob(file_key).open("rb")
         else:
-            raise ExtractionException(f"Unsupported file format: {file_extension}")
-
-        # Apply offset and limit
-        if offset:
-            df = df.iloc[offset:]
-        if limit:
-            df = df.head(limit)
+            raise ValueError(f"Unsupported cloud provider: {provider}")
 
-        data = df.to_dict(orient="records")
-        self.logger.info(f"Extracted {len(data)} records from cloud storage")
-        return data
+        return io.BufferedReader(raw, DEFAULT_READ_BLOCK_SIZE)
 
     def disconnect(self) -> None:
         """Close cloud storage connection."""
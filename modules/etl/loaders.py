@@ -9,14 +9,19 @@ import logging
 import json
 import csv
 import io
+import math
+import uuid
 from abc import ABC, abstractmethod
 from typing import List, Dict, Any, Optional
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
 
 import pandas as pd
 import sqlalchemy
 from sqlalchemy import create_engine, text, MetaData, Table, Column, String, Integer, Float, Boolean, DateTime
-from sqlalchemy.pool import NullPool
+from sqlalchemy import and_, bindparam, inspect
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import NullPool, QueuePool
 from sqlalchemy.dialects.postgresql import insert as pg_insert
 import pymongo
 import requests
@@ -28,6 +33,10 @@ from modules.etl.models import DataTarget, SourceType, DatabaseType, LoadStrateg
 
 logger = logging.getLogger(__name__)
 
+# Default rows per COPY batch and parallel load connections
+DEFAULT_COPY_BATCH_SIZE = 50000
+DEFAULT_BULK_LOAD_WORKERS = 4
+
 
 class LoaderException(Exception):
     """Base exception for loader errors."""
@@ -120,11 +129,20 @@ class DatabaseLoader(BaseLoader):
         """Establish database connection."""
         try:
             connection_string = self._build_connection_string()
+            workers = self._bulk_load_workers()
+            if self.config.get("bulk_load", True) and workers > 1 and \
+                    make_url(connection_string).get_backend_name() == "postgresql":
+                # Parallel COPY batches each hold a pooled connection
+                pool_options = {"poolclass": QueuePool, "pool_size": workers, "max_overflow": 1}
+            else:
+                pool_options = {"poolclass": NullPool}
+
             self._connection = create_engine(
                 connection_string,
-                poolclass=NullPool,
-                echo=self.config.get("echo_sql", False)
+                echo=self.config.get("echo_sql", False),
+                **pool_options
             )
+            self._copy_supported = None
             # Test connection
             with self._connection.connect() as conn:
                 conn.execute(text("SELECT 1"))
@@ -174,7 +192,9 @@ class DatabaseLoader(BaseLoader):
             raise LoadException("Table name is required for database loading")
 
         try:
-            if strategy == LoadStrategy.FULL:
+            if self.config.get("bulk_load", True):
+                return self._bulk_load(data, table_name, strategy)
+            elif strategy == LoadStrategy.FULL:
                 return self._load_full(data, table_name)
             elif strategy == LoadStrategy.APPEND:
                 return self._load_append(data, table_name)
@@ -188,6 +208,248 @@ class DatabaseLoader(BaseLoader):
         except Exception as e:
             raise LoadException(f"Failed to load data to database: {str(e)}")
 
+    def _bulk_load_workers(self) -> int:
+        return max(1, int(self.config.get("bulk_load_workers", DEFAULT_BULK_LOAD_WORKERS)))
+
+    def _bulk_load(
+        self,
+        data: List[Dict[str, Any]],
+        table_name: str,
+        strategy: LoadStrategy
+    ) -> int:
+        """
+        Load data in bulk.
+
+        PostgreSQL targets (psycopg2/psycopg drivers) get COPY into a staging
+        table over parallel connections followed by a single merge; other
+        targets get batched executemany. Row counts are verified at every step.
+
+        Args:
+            data: Records to load
+            table_name: Target table, optionally schema-qualified
+            strategy: Load strategy
+
+        Returns:
+            Number of records loaded
+        """
+        if strategy not in (LoadStrategy.FULL, LoadStrategy.APPEND, LoadStrategy.UPSERT, LoadStrategy.REPLACE):
+            raise LoadException(f"Unsupported load strategy: {strategy}")
+
+        schema, name = table_name.rpartition(".")[::2]
+        schema = schema or None
+
+        if strategy == LoadStrategy.REPLACE:
+            preparer = self._connection.dialect.identifier_preparer
+            target = preparer.quote(name)
+            if schema:
+                target = f"{preparer.quote_schema(schema)}.{target}"
+            with self._connection.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {target}"))
+            self._create_table_from_data(data, table_name, None)
+            strategy = LoadStrategy.APPEND
+        elif not inspect(self._connection).has_table(name, schema=schema):
+            self._create_table_from_data(data, table_name, None)
+
+        table = Table(name, MetaData(), autoload_with=self._connection, schema=schema)
+        columns = list(dict.fromkeys(key for record in data for key in record))
+        rows = [
+            tuple(self._bulk_value(record.get(column)) for column in columns)
+            for record in data
+        ]
+
+        if self._connection.dialect.name == "postgresql" and self._supports_copy():
+            loaded = self._copy_load(rows, columns, table, strategy)
+        else:
+            loaded = self._executemany_load(rows, columns, table, strategy)
+
+        self.logger.info(f"Bulk loaded {loaded} records to {table_name} ({strategy.value})")
+        return loaded
+
+    @staticmethod
+    def _bulk_value(value: Any) -> Any:
+        """Normalize a value for bulk loading; NaN becomes NULL as with to_sql."""
+        if isinstance(value, float) and math.isnan(value):
+            return None
+        return value
+
+    def _supports_copy(self) -> bool:
+        """Whether the DBAPI driver can COPY (psycopg2 or psycopg)."""
+        if self._copy_supported is None:
+            with self._connection.connect() as conn:
+                cursor = conn.connection.cursor()
+                try:
+                    self._copy_supported = hasattr(cursor, "copy_expert") or hasattr(cursor, "copy")
+                finally:
+                    cursor.close()
+        return self._copy_supported
+
+    def _batches(self, rows: List[tuple], size: int) -> List[tuple]:
+        """Split rows into (first row ordinal, rows) batches."""
+        return [(start, rows[start:start + size]) for start in range(0, len(rows), size)]
+
+    def _run_batches(self, load_batch, batches: List[tuple]) -> int:
+        """Run load_batch over batches on parallel connections; returns total rows."""
+        workers = min(self._bulk_load_workers(), len(batches))
+        if workers <= 1:
+            return sum(load_batch(batch) for batch in batches)
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="etl-bulk-load") as executor:
+            return sum(executor.map(load_batch, batches))
+
+    @staticmethod
+    def _verify_count(actual: int, expected: int, step: str) -> None:
+        if actual >= 0 and actual != expected:
+            raise LoadException(f"{step} affected {actual} rows, expected {expected}")
+
+    def _copy_load(
+        self,
+        rows: List[tuple],
+        columns: List[str],
+        table: Table,
+        strategy: LoadStrategy
+    ) -> int:
+        """COPY rows into an unlogged staging table, then merge in one transaction."""
+        preparer = self._connection.dialect.identifier_preparer
+        target = preparer.format_table(table)
+        stage_name = f"_etl_stage_{table.name}_{uuid.uuid4().hex[:8]}"
+        stage = preparer.quote(stage_name)
+        if table.schema:
+            stage = f"{preparer.quote_schema(table.schema)}.{stage}"
+
+        column_list = ", ".join(preparer.quote(c) for c in columns)
+        copy_sql = f"COPY {stage} ({column_list}, _etl_row) FROM STDIN WITH (FORMAT csv)"
+
+        def copy_batch(batch: tuple) -> int:
+            start, batch_rows = batch
+            buffer = io.StringIO()
+            for ordinal, row in enumerate(batch_rows, start):
+                buffer.write(",".join(self._copy_field(v) for v in row))
+                buffer.write(f",{ordinal}\n")
+
+            with self._connection.begin() as conn:
+                cursor = conn.connection.cursor()
+                try:
+                    if hasattr(cursor, "copy_expert"):
+                        buffer.seek(0)
+                        cursor.copy_expert(copy_sql, buffer)
+                    else:
+                        with cursor.copy(copy_sql) as copy:
+                            copy.write(buffer.getvalue())
+                    copied = cursor.rowcount
+                finally:
+                    cursor.close()
+
+            self._verify_count(copied, len(batch_rows), f"COPY batch at row {start}")
+            return len(batch_rows)
+
+        with self._connection.begin() as conn:
+            # Column types only: no constraints, defaults or sequences
+            conn.execute(text(
+                f"CREATE UNLOGGED TABLE {stage} AS SELECT {column_list} FROM {target} WITH NO DATA"
+            ))
+            conn.execute(text(f"ALTER TABLE {stage} ADD COLUMN _etl_row BIGINT"))
+
+        try:
+            batch_size = self.config.get("copy_batch_size", DEFAULT_COPY_BATCH_SIZE)
+            staged = self._run_batches(copy_batch, self._batches(rows, batch_size))
+            self._verify_count(staged, len(rows), "COPY into staging")
+
+            with self._connection.begin() as conn:
+                if strategy == LoadStrategy.FULL:
+                    conn.execute(text(f"TRUNCATE TABLE {target}"))
+
+                if strategy == LoadStrategy.UPSERT:
+                    key_columns = self.config.get("key_columns", ["id"])
+                    keys = ", ".join(preparer.quote(k) for k in key_columns)
+                    updates = [c for c in columns if c not in key_columns]
+                    conflict = (
+                        "DO UPDATE SET " + ", ".join(
+                            f"{preparer.quote(c)} = EXCLUDED.{preparer.quote(c)}" for c in updates
+                        )
+                        if updates else "DO NOTHING"
+                    )
+                    # The last staged row wins for keys repeated in the data
+                    merged = conn.execute(text(
+                        f"INSERT INTO {target} ({column_list}) "
+                        f"SELECT DISTINCT ON ({keys}) {column_list} FROM {stage} "
+                        f"ORDER BY {keys}, _etl_row DESC "
+                        f"ON CONFLICT ({keys}) {conflict}"
+                    )).rowcount
+                    if updates:
+                        distinct = conn.execute(text(
+                            f"SELECT COUNT(*) FROM (SELECT DISTINCT {keys} FROM {stage}) AS staged_keys"
+                        )).scalar()
+                        self._verify_count(merged, distinct, "Merge into target")
+                else:
+                    merged = conn.execute(text(
+                        f"INSERT INTO {target} ({column_list}) "
+                        f"SELECT {column_list} FROM {stage} ORDER BY _etl_row"
+                    )).rowcount
+                    self._verify_count(merged, staged, "Merge into target")
+        finally:
+            with self._connection.begin() as conn:
+                conn.execute(text(f"DROP TABLE IF EXISTS {stage}"))
+
+        return len(rows)
+
+    @staticmethod
+    def _copy_field(value: Any) -> str:
+        """Format a value as a COPY CSV field; unquoted empty is NULL."""
+        if value is None:
+            return ""
+        if isinstance(value, (dict, list)):
+            value = json.dumps(value, default=str)
+        elif isinstance(value, (bytes, bytearray, memoryview)):
+            value = "\\x" + bytes(value).hex()
+        else:
+            value = str(value)
+        return '"' + value.replace('"', '""') + '"'
+
+    def _executemany_load(
+        self,
+        rows: List[tuple],
+        columns: List[str],
+        table: Table,
+        strategy: LoadStrategy
+    ) -> int:
+        """
+        Load rows with batched executemany in a single transaction, so a
+        failed batch leaves the target unchanged.
+        """
+        batch_size = self.config.get("batch_size", 1000)
+        insert = table.insert()
+        total = len(rows)
+
+        if strategy == LoadStrategy.UPSERT:
+            key_columns = self.config.get("key_columns", ["id"])
+            key_positions = [columns.index(k) for k in key_columns]
+            # Later rows replace earlier ones with the same key, as per-row upserts did
+            rows = list({tuple(row[i] for i in key_positions): row for row in rows}.values())
+
+        def insert_batch(batch: tuple, conn) -> int:
+            start, batch_rows = batch
+            params = [dict(zip(columns, row)) for row in batch_rows]
+            inserted = conn.execute(insert, params).rowcount
+            self._verify_count(inserted, len(batch_rows), f"Insert batch at row {start}")
+            return len(batch_rows)
+
+        batches = self._batches(rows, batch_size)
+        with self._connection.begin() as conn:
+            if strategy == LoadStrategy.FULL:
+                if self._connection.dialect.name == "sqlite":
+                    conn.execute(table.delete())
+                else:
+                    target = self._connection.dialect.identifier_preparer.format_table(table)
+                    conn.execute(text(f"TRUNCATE TABLE {target}"))
+            elif strategy == LoadStrategy.UPSERT:
+                match = and_(*(table.c[k] == bindparam(f"_key_{k}") for k in key_columns))
+                conn.execute(
+                    table.delete().where(match),
+                    [{f"_key_{k}": row[i] for k, i in zip(key_columns, key_positions)} for row in rows]
+                )
+            self._verify_count(sum(insert_batch(batch, conn) for batch in batches), len(rows), "Insert")
+        return total
+
     def _load_full(self, data: List[Dict[str, Any]], table_name: str) -> int:
         """Full load - truncate and insert."""
         with self._connection.begin() as conn:
@@ -304,11 +566,15 @@ class DatabaseLoader(BaseLoader):
         if not data:
             raise LoadException("Cannot create table from empty data")
 
-        # Infer column types from first record
-        sample = data[0]
+        # Columns are the union of the records' keys, typed by their first non-null value
+        samples: Dict[str, Any] = {}
+        for record in data:
+            for key, value in record.items():
+                if samples.get(key) is None:
+                    samples[key] = value
         columns = []
 
-        for key, value in sample.items():
+        for key, value in samples.items():
             if isinstance(value, bool):
                 col_type = Boolean
             elif isinstance(value, int):
@@ -322,8 +588,9 @@ class DatabaseLoader(BaseLoader):
 
             columns.append(Column(key, col_type))
 
+        schema, name = table_name.rpartition(".")[::2]
         metadata = MetaData()
-        table = Table(table_name, metadata, *columns)
+        table = Table(name, metadata, *columns, schema=schema or None)
         table.create(self._connection)
 
     def disconnect(self) -> None:
@@ -6,6 +6,7 @@ metrics collection, alerting, and performance tracking.
 """
 
 import logging
+import sys
 from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -227,20 +228,60 @@ class JobMetrics:
         self.job_run = job_run
         self.start_time = datetime.utcnow()
         self.stage_times: Dict[str, float] = {}
+        self.stage_rows: Dict[str, int] = {}
 
-    def record_stage_time(self, stage: str, duration: float) -> None:
-        """Record execution time for a stage."""
+    def record_stage_time(self, stage: str, duration: float, rows: Optional[int] = None) -> None:
+        """
+        Record execution time for a stage.
+
+        Args:
+            stage: Stage name
+            duration: Stage duration in seconds
+            rows: Rows the stage processed, for throughput
+        """
         self.stage_times[stage] = duration
+        if rows is not None:
+            self.stage_rows[stage] = rows
+
+    def get_stage_throughput(self) -> Dict[str, Dict[str, Any]]:
+        """Get rows, seconds and rows/sec for stages with a row count."""
+        return {
+            stage: {
+                "rows": rows,
+                "seconds": self.stage_times.get(stage, 0.0),
+                "rows_per_sec": rows / self.stage_times[stage] if self.stage_times.get(stage) else None
+            }
+            for stage, rows in self.stage_rows.items()
+        }
 
     def get_metrics(self) -> Dict[str, Any]:
         """Get collected metrics."""
         return {
             "job_run_id": self.job_run.id,
             "stage_times": self.stage_times,
+            "stage_throughput": self.get_stage_throughput(),
+            "peak_rss_bytes": peak_rss_bytes(),
             "total_duration": (datetime.utcnow() - self.start_time).total_seconds()
         }
 
 
+def peak_rss_bytes() -> Optional[int]:
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        Peak RSS in bytes, or None where the platform does not report it
+    """
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
 class DataMetrics:
     """Collects data-level metrics."""
 
@@ -6,21 +6,32 @@ error handling, and retry logic for ETL workflows.
 """
 
 import logging
+import queue
+import threading
 import time
 import traceback
-from typing import List, Dict, Any, Optional, Callable
+from typing import List, Dict, Any, Optional, Callable, Iterator
 from datetime import datetime
 from enum import Enum
 
-from modules.etl.extractors import ExtractorFactory, BaseExtractor
+from modules.etl.extractors import ExtractorFactory, BaseExtractor, DatabaseExtractor, DEFAULT_BATCH_SIZE
 from modules.etl.transformers import TransformerFactory, TransformationPipeline
 from modules.etl.loaders import LoaderFactory, BaseLoader
 from modules.etl.validation import DataQualityCheck, SchemaValidator, ValidationResult
 from modules.etl.mappings import FieldMapper
-from modules.etl.models import ETLJob, JobRun, JobStatus, AuditLog
+from modules.etl.models import ETLJob, JobRun, JobStatus, AuditLog, LoadStrategy
 
 logger = logging.getLogger(__name__)
 
+# Batches buffered between two streaming stages
+DEFAULT_MAX_IN_FLIGHT_BATCHES = 2
+
+# Seconds between stop checks while a streaming stage waits on a queue
+_QUEUE_POLL_INTERVAL = 0.1
+
+# Marks the end of a batch stream
+_END_OF_STREAM = object()
+
 
 class PipelineException(Exception):
     """Base exception for pipeline errors."""
@@ -349,10 +360,13 @@ class ETLPipeline:
             self.logger.info(f"Starting ETL pipeline for job: {self.job.name}")
 
             # Execute pipeline stages
-            self._extract_stage()
-            self._transform_stage()
-            self._validate_stage()
-            self._load_stage()
+            if self.config.get("streaming"):
+                self._execute_streaming(job_run)
+            else:
+                self._extract_stage()
+                self._transform_stage()
+                self._validate_stage()
+                self._load_stage()
 
             duration = time.time() - start_time
             self.logger.info(f"Pipeline completed successfully in {duration:.2f}s")
@@ -402,9 +416,15 @@ class ETLPipeline:
             )
 
             # Execute extraction with retry
+            partition_column = self._partition_column(extractor)
+
             def extract():
                 with extractor:
-                    if self.job.is_incremental and self.job.watermark_column:
+                    if partition_column:
+                        data = []
+                        for batch in self._iter_source_batches(extractor, self.job.batch_size or DEFAULT_BATCH_SIZE):
+                            data.extend(batch)
+                    elif self.job.is_incremental and self.job.watermark_column:
                         data = extractor.extract_incremental(
                             self.job.watermark_column,
                             self.job.last_watermark_value,
@@ -446,7 +466,8 @@ class ETLPipeline:
             # Apply transformation steps
             if self.job.transformation_steps:
                 pipeline = TransformerFactory.create_pipeline(
-                    self.job.transformation_steps
+                    self.job.transformation_steps,
+                    backend=self.config.get("transform_backend", "record")
                 )
                 self.context.data = pipeline.transform(self.context.data)
 
@@ -534,6 +555,379 @@ class ETLPipeline:
             if not self.error_handler.handle_error(e, self.context, "load"):
                 raise
 
+    def _execute_streaming(self, job_run: Optional[JobRun] = None) -> None:
+        """
+        Execute the pipeline one bounded batch at a time.
+
+        Extraction, transformation plus validation, and loading run
+        concurrently, connected by queues holding at most
+        ``max_in_flight_batches`` batches each, so memory depends on the
+        batch size rather than the source size. Loading and checkpointing
+        happen on the calling thread, in extraction order.
+
+        For incremental jobs the watermark is checkpointed after every
+        committed batch, so a failed run resumes after the last committed
+        batch. Data quality checks see one batch at a time; uniqueness is
+        therefore only checked within a batch.
+
+        Args:
+            job_run: Job run record to checkpoint, if any
+        """
+        batch_size = self.config.get("stream_batch_size") or self.job.batch_size or 1000
+        max_in_flight = max(1, self.config.get("max_in_flight_batches", DEFAULT_MAX_IN_FLIGHT_BATCHES))
+
+        self.logger.info(
+            f"Streaming execution: batch_size={batch_size}, max_in_flight={max_in_flight}"
+        )
+
+        stop = threading.Event()
+        extracted: queue.Queue = queue.Queue(maxsize=max_in_flight)
+        transformed: queue.Queue = queue.Queue(maxsize=max_in_flight)
+        stage_stats = {
+            stage.value: {"rows": 0, "seconds": 0.0}
+            for stage in PipelineStage
+        }
+        quality_scores: List[tuple] = []
+
+        extractor = ExtractorFactory.create_extractor(
+            self.job.source,
+            self.job.extraction_config
+        )
+        ordered = self._partition_column(extractor) is None
+
+        def extract_worker() -> None:
+            stats = stage_stats[PipelineStage.EXTRACT.value]
+            try:
+                with extractor:
+                    batches = self._iter_source_batches(extractor, batch_size)
+                    try:
+                        while True:
+                            started = time.time()
+                            batch = next(batches, _END_OF_STREAM)
+                            stats["seconds"] += time.time() - started
+                            if batch is _END_OF_STREAM:
+                                break
+                            stats["rows"] += len(batch)
+                            if not self._put(extracted, batch, stop):
+                                return
+                    finally:
+                        batches.close()
+                self._put(extracted, _END_OF_STREAM, stop)
+            except Exception as e:
+                self.context.add_error("extract", str(e), {
+                    "exception_type": type(e).__name__,
+                    "traceback": traceback.format_exc()
+                })
+                self._put(extracted, e, stop)
+
+        def transform_worker() -> None:
+            mapper = FieldMapper(self.job.mapping) if self.job.mapping else None
+            transformer = (
+                TransformerFactory.create_pipeline(
+                    self.job.transformation_steps,
+                    backend=self.config.get("transform_backend", "record")
+                )
+                if self.job.transformation_steps else None
+            )
+            quality_config = self.config.get("data_quality", {})
+            quality_checker = DataQualityCheck(quality_config) if quality_config else None
+
+            while True:
+                batch = self._get(extracted, stop)
+                if batch is None or batch is _END_OF_STREAM or isinstance(batch, Exception):
+                    if batch is not None:
+                        self._put(transformed, batch, stop)
+                    return
+
+                try:
+                    batch = self._transform_batch(
+                        batch, mapper, transformer, stage_stats[PipelineStage.TRANSFORM.value]
+                    )
+                    score = self._validate_batch(
+                        batch, quality_checker, stage_stats[PipelineStage.VALIDATE.value]
+                    )
+                    if score is not None:
+                        quality_scores.append((score, len(batch)))
+                except Exception as e:
+                    if self.error_handler.handle_error(e, self.context, "transform"):
+                        self.context.metrics["records_failed"] += len(batch)
+                        continue
+                    self._put(transformed, e, stop)
+                    return
+
+                if batch and not self._put(transformed, batch, stop):
+                    return
+
+        workers = [
+            threading.Thread(target=extract_worker, name="etl-stream-extract", daemon=True),
+            threading.Thread(target=transform_worker, name="etl-stream-transform", daemon=True),
+        ]
+        for worker in workers:
+            worker.start()
+
+        try:
+            self._load_stream(
+                transformed, stop, job_run, stage_stats[PipelineStage.LOAD.value], ordered=ordered
+            )
+        finally:
+            stop.set()
+            for worker in workers:
+                worker.join(timeout=10)
+
+            self._record_stream_metrics(stage_stats, quality_scores)
+
+    def _partition_column(self, extractor: BaseExtractor) -> Optional[str]:
+        """
+        Get the column to split extraction on, if partitioned extraction applies.
+
+        Partitioning applies to relational sources configured with more than
+        one partition. The column defaults to the watermark column for
+        incremental jobs and to "id" otherwise.
+        """
+        if not isinstance(extractor, DatabaseExtractor) or int(extractor.config.get("partitions", 1)) <= 1:
+            return None
+
+        default = self.job.watermark_column if self.job.is_incremental and self.job.watermark_column else "id"
+        return extractor.config.get("partition_column", default)
+
+    def _iter_source_batches(self, extractor: BaseExtractor, batch_size: int) -> Iterator[List[Dict[str, Any]]]:
+        """Open the extractor's batch stream for this job."""
+        partition_column = self._partition_column(extractor)
+        if partition_column:
+            incremental = self.job.is_incremental and self.job.watermark_column
+            return extractor.extract_partitioned_batches(
+                partition_column,
+                self.job.extraction_query,
+                batch_size=batch_size,
+                watermark_column=self.job.watermark_column if incremental else None,
+                last_watermark_value=self.job.last_watermark_value if incremental else None
+            )
+
+        if self.job.is_incremental and self.job.watermark_column:
+            return extractor.extract_incremental_batches(
+                self.job.watermark_column,
+                self.job.last_watermark_value,
+                self.job.extraction_query,
+                batch_size=batch_size
+            )
+
+        return extractor.extract_batches(
+            query=self.job.extraction_query,
+            batch_size=batch_size,
+            limit=self.config.get("extract_limit")
+        )
+
+    def _transform_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        mapper: Optional[FieldMapper],
+        transformer: Optional[TransformationPipeline],
+        stats: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Apply field mapping and transformation steps to one batch."""
+        started = time.time()
+
+        if mapper:
+            batch = mapper.map_records(batch)
+        if transformer:
+            batch = transformer.transform(batch)
+
+        stats["rows"] += len(batch)
+        stats["seconds"] += time.time() - started
+        return batch
+
+    def _validate_batch(
+        self,
+        batch: List[Dict[str, Any]],
+        quality_checker: Optional[DataQualityCheck],
+        stats: Dict[str, Any]
+    ) -> Optional[float]:
+        """
+        Run data quality checks on one batch.
+
+        Returns:
+            Batch quality score, or None if no checks are configured
+
+        Raises:
+            PipelineException: If validation fails and failures are fatal
+        """
+        started = time.time()
+        score = None
+
+        if quality_checker and batch:
+            validation_result = quality_checker.validate(batch)
+            if not self.error_handler.handle_validation_errors(validation_result, self.context):
+                raise PipelineException("Data quality validation failed")
+            score = validation_result.metrics.get("overall_score", 100.0)
+
+        stats["rows"] += len(batch)
+        stats["seconds"] += time.time() - started
+        return score
+
+    def _load_stream(
+        self,
+        transformed: queue.Queue,
+        stop: threading.Event,
+        job_run: Optional[JobRun],
+        stats: Dict[str, Any],
+        ordered: bool = True
+    ) -> None:
+        """
+        Load transformed batches, checkpointing after each one.
+
+        Unordered batches, as produced by partitioned extraction, give no safe
+        intermediate watermark, so the watermark is checkpointed only once
+        every batch has loaded.
+        """
+        loader = LoaderFactory.create_loader(
+            self.job.target,
+            {
+                "table_name": self.config.get("target_table"),
+                "batch_size": self.job.batch_size,
+                "key_columns": self.config.get("key_columns", [])
+            }
+        )
+
+        # Truncating/recreating strategies apply to the first batch only
+        strategy = self.job.load_strategy
+        watermark_column = self.job.watermark_column if self.job.is_incremental else None
+        last_watermark = None
+
+        with loader:
+            while True:
+                batch = self._get(transformed, stop)
+                if batch is _END_OF_STREAM:
+                    break
+                if batch is None:
+                    raise PipelineException("Streaming execution stopped")
+                if isinstance(batch, Exception):
+                    raise batch
+
+                started = time.time()
+                loaded = self.retry_logic.execute_with_retry(loader.load, batch, strategy)
+                stats["rows"] += loaded
+                stats["seconds"] += time.time() - started
+
+                self.context.metrics["records_loaded"] += loaded
+                if strategy in (LoadStrategy.FULL, LoadStrategy.REPLACE):
+                    strategy = LoadStrategy.APPEND
+
+                watermark = None
+                if watermark_column and ordered:
+                    watermark, last_watermark = self._batch_watermark(
+                        batch, watermark_column, last_watermark
+                    )
+                elif watermark_column:
+                    values = [record.get(watermark_column) for record in batch]
+                    values = [value for value in values if value is not None]
+                    if values and (last_watermark is None or max(values) > last_watermark):
+                        last_watermark = max(values)
+                self._checkpoint_batch(job_run, watermark)
+
+            # The final batch has no successor, so its last value is safe too
+            if last_watermark is not None:
+                self._checkpoint_batch(job_run, last_watermark)
+
+        self.logger.info(f"Loaded {self.context.metrics['records_loaded']} records")
+
+    @staticmethod
+    def _batch_watermark(
+        batch: List[Dict[str, Any]],
+        watermark_column: str,
+        last_watermark: Optional[Any]
+    ) -> tuple:
+        """
+        Get the watermark that is safe to checkpoint after a batch.
+
+        Batches arrive in watermark order, but rows sharing a batch's last
+        watermark value may continue into the next batch, so only values
+        below it are checkpointed.
+
+        Args:
+            batch: Loaded batch
+            watermark_column: Watermark column
+            last_watermark: Last watermark value seen so far
+
+        Returns:
+            Tuple of (safe watermark or None, last watermark value seen)
+        """
+        values = [record.get(watermark_column) for record in batch]
+        values = [value for value in values if value is not None]
+        if not values:
+            return None, last_watermark
+
+        last = values[-1]
+        below = [value for value in values if value < last]
+        if below:
+            return max(below), last
+
+        # The previous batch's held-back value is now known to be complete
+        if last_watermark is not None and last_watermark < last:
+            return last_watermark, last
+        return None, last
+
+    def _checkpoint_batch(self, job_run: Optional[JobRun], watermark: Optional[Any]) -> None:
+        """Persist progress after a committed batch."""
+        if watermark is not None:
+            self.job.last_watermark_value = str(watermark)
+            if job_run:
+                job_run.watermark_value = self.job.last_watermark_value
+
+        self.context.metadata["batches_loaded"] = self.context.metadata.get("batches_loaded", 0) + 1
+
+        if self.db_session:
+            if job_run:
+                job_run.records_loaded = self.context.metrics["records_loaded"]
+            self.db_session.commit()
+
+    def _record_stream_metrics(self, stage_stats: Dict[str, Dict[str, Any]], quality_scores: List[tuple]) -> None:
+        """Copy streaming stage counters and throughput into the context."""
+        metrics = self.context.metrics
+        metrics["records_extracted"] = stage_stats["extract"]["rows"]
+        metrics["records_transformed"] = stage_stats["transform"]["rows"]
+        metrics["records_validated"] = stage_stats["validate"]["rows"]
+        metrics["extraction_time"] = stage_stats["extract"]["seconds"]
+        metrics["transformation_time"] = stage_stats["transform"]["seconds"]
+        metrics["validation_time"] = stage_stats["validate"]["seconds"]
+        metrics["loading_time"] = stage_stats["load"]["seconds"]
+
+        metrics["stage_throughput"] = {
+            stage: {
+                "rows": stats["rows"],
+                "seconds": round(stats["seconds"], 6),
+                "rows_per_sec": round(stats["rows"] / stats["seconds"], 2) if stats["seconds"] else None,
+            }
+            for stage, stats in stage_stats.items()
+        }
+
+        if quality_scores:
+            total_rows = sum(rows for _, rows in quality_scores)
+            self.context.metadata["data_quality_score"] = (
+                sum(score * rows for score, rows in quality_scores) / total_rows
+                if total_rows else 100.0
+            )
+
+    @staticmethod
+    def _put(target: queue.Queue, item: Any, stop: threading.Event) -> bool:
+        """Put an item on a stage queue, giving up once the run stops."""
+        while not stop.is_set():
+            try:
+                target.put(item, timeout=_QUEUE_POLL_INTERVAL)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    @staticmethod
+    def _get(source: queue.Queue, stop: threading.Event) -> Any:
+        """Get an item from a stage queue, or None once the run stops."""
+        while not stop.is_set():
+            try:
+                return source.get(timeout=_QUEUE_POLL_INTERVAL)
+            except queue.Empty:
+                continue
+        return None
+
     def _create_job_run(self) -> JobRun:
         """Create a job run record."""
         job_run = JobRun(
@@ -569,6 +963,8 @@ class ETLPipeline:
 
         job_run.data_quality_score = self.context.metadata.get("data_quality_score")
 
+        self._record_stage_throughput(job_run)
+
         # Update watermark for incremental loads
         if self.job.is_incremental and self.context.data:
             watermark_column = self.job.watermark_column
@@ -586,6 +982,17 @@ class ETLPipeline:
         self.db_session.commit()
         self.logger.info(f"Updated job run: {job_run.id}")
 
+    def _record_stage_throughput(self, job_run: JobRun) -> None:
+        """Store streaming per-stage throughput on the job run."""
+        if "stage_throughput" not in self.context.metrics:
+            return
+
+        job_run.execution_context = {
+            **(job_run.execution_context or {}),
+            "stage_throughput": self.context.metrics["stage_throughput"],
+            "batches_loaded": self.context.metadata.get("batches_loaded", 0),
+        }
+
     def _fail_job_run(self, job_run: JobRun, error_message: str) -> None:
         """Mark job run as failed."""
         job_run.status = JobStatus.FAILED
@@ -602,5 +1009,7 @@ class ETLPipeline:
         job_run.records_transformed = self.context.metrics.get("records_transformed", 0)
         job_run.records_loaded = self.context.metrics.get("records_loaded", 0)
 
+        self._record_stage_throughput(job_run)
+
         self.db_session.commit()
         self.logger.info(f"Marked job run as failed: {job_run.id}")
@@ -0,0 +1,358 @@
+"""
+Scan plans for predicate and projection pushdown.
+
+A ScanPlan names the source columns a job needs and the row filters that
+can be evaluated while reading, so sources can skip unneeded columns and
+rows instead of materialising them first: SQL sources as a SELECT list and
+WHERE clause, CSV files as usecols plus chunked filtering, and Parquet
+files as pyarrow dataset filters.
+
+Filter conditions use the filter_rows shape:
+{"column": ..., "operator": ..., "value": ...}. Every source evaluates
+conditions it cannot push exactly with filter_mask, so a plan always gives
+the same rows as filtering the full DataFrame.
+"""
+
+import logging
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import pandas as pd
+from sqlalchemy import text
+from sqlalchemy.engine import Connection
+
+logger = logging.getLogger(__name__)
+
+# Rows per chunk when filtering CSV files while reading
+DEFAULT_CSV_CHUNK_SIZE = 100000
+
+# filter_rows operators
+FILTER_OPERATORS = (
+    "==", "!=", ">", ">=", "<", "<=",
+    "in", "not in", "contains", "startswith", "endswith"
+)
+
+_SQL_COMPARISONS = {"==": "=", "!=": "<>", ">": ">", ">=": ">=", "<": "<", "<=": "<="}
+
+# Dialects whose default collations compare strings case-insensitively
+_CASE_INSENSITIVE_DIALECTS = {"mysql", "mariadb", "mssql"}
+
+
+def condition_mask(df: pd.DataFrame, condition: Dict[str, Any]) -> Optional[pd.Series]:
+    """
+    Evaluate one filter_rows condition.
+
+    Args:
+        df: DataFrame to filter
+        condition: Condition with column, operator and value
+
+    Returns:
+        Boolean row mask, or None for unknown operators (which keep every row)
+    """
+    column = df[condition.get("column")]
+    operator = condition.get("operator")
+    value = condition.get("value")
+
+    if operator == "==":
+        return column == value
+    if operator == "!=":
+        return column != value
+    if operator == ">":
+        return column > value
+    if operator == ">=":
+        return column >= value
+    if operator == "<":
+        return column < value
+    if operator == "<=":
+        return column <= value
+    if operator == "in":
+        return column.isin(value)
+    if operator == "not in":
+        return ~column.isin(value)
+    if operator == "contains":
+        return column.str.contains(value, na=False)
+    if operator == "startswith":
+        return column.str.startswith(value, na=False)
+    if operator == "endswith":
+        return column.str.endswith(value, na=False)
+    return None
+
+
+def filter_mask(df: pd.DataFrame, conditions: Iterable[Dict[str, Any]]) -> Optional[pd.Series]:
+    """
+    Combine filter_rows conditions into one row mask.
+
+    Returns:
+        Boolean row mask, or None if no condition filters anything
+    """
+    mask = None
+    for condition in conditions:
+        condition_rows = condition_mask(df, condition)
+        if condition_rows is not None:
+            mask = condition_rows if mask is None else mask & condition_rows
+    return mask
+
+
+class ScanPlan:
+    """Columns and row filters a source should apply while reading."""
+
+    def __init__(
+        self,
+        columns: Optional[Iterable[str]] = None,
+        filters: Optional[List[Dict[str, Any]]] = None
+    ):
+        """
+        Initialize scan plan.
+
+        Args:
+            columns: Source columns to read, or None for all columns
+            filters: filter_rows conditions on source columns, ANDed together
+        """
+        self.columns = list(dict.fromkeys(columns)) if columns is not None else None
+        self.filters = list(filters or [])
+
+    @property
+    def is_empty(self) -> bool:
+        """Whether the plan reads every row and column."""
+        return self.columns is None and not self.filters
+
+    @property
+    def read_columns(self) -> Optional[List[str]]:
+        """Columns to read, including those only needed by filters."""
+        if self.columns is None:
+            return None
+        return list(dict.fromkeys(self.columns + [f.get("column") for f in self.filters]))
+
+    def describe(self) -> Dict[str, Any]:
+        """Summarise the plan for execution reports."""
+        return {"columns": self.columns, "filters": self.filters}
+
+    def apply(self, df: pd.DataFrame, filters: Optional[List[Dict[str, Any]]] = None) -> pd.DataFrame:
+        """
+        Apply the plan to a DataFrame that has already been read.
+
+        Args:
+            df: DataFrame to filter and project
+            filters: Conditions to evaluate (default: all plan filters)
+
+        Returns:
+            Filtered, projected DataFrame
+        """
+        mask = filter_mask(df, self.filters if filters is None else filters)
+        if mask is not None:
+            df = df[mask]
+        if self.columns is not None:
+            df = df[[column for column in self.columns if column in df.columns]]
+        return df
+
+    def split_filters(self, can_push) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """
+        Partition filters into those a source evaluates itself and the rest.
+
+        Args:
+            can_push: Predicate telling whether a condition can be pushed exactly
+
+        Returns:
+            Tuple of (pushed conditions, residual conditions)
+        """
+        pushed, residual = [], []
+        for condition in self.filters:
+            (pushed if can_push(condition) else residual).append(condition)
+        return pushed, residual
+
+    def to_sql(self, query: str, connection: Connection) -> Tuple[Any, Dict[str, Any], List[Dict[str, Any]]]:
+        """
+        Wrap a query with the plan's SELECT list and WHERE clause.
+
+        Args:
+            query: Base SQL query
+            connection: Connection whose dialect renders identifiers
+
+        Returns:
+            Tuple of (statement, bind parameters, residual conditions)
+        """
+        dialect = connection.dialect
+        quote = dialect.identifier_preparer.quote
+        case_insensitive = dialect.name in _CASE_INSENSITIVE_DIALECTS
+        pushed, residual = self.split_filters(
+            lambda condition: _sql_pushable(condition, case_insensitive)
+        )
+
+        columns = self.columns
+        if columns is not None and residual:
+            columns = self.read_columns
+        select_list = ", ".join(quote(column) for column in columns) if columns is not None else "*"
+
+        clauses, params = [], {}
+        for index, condition in enumerate(pushed):
+            clauses.append(_sql_condition(quote(condition["column"]), condition, f"p{index}", params))
+
+        statement = f"SELECT {select_list} FROM ({query}) AS src"
+        if clauses:
+            statement += " WHERE " + " AND ".join(clauses)
+        return text(statement), params, residual
+
+    def arrow_filters(self) -> Tuple[Optional[List[Tuple[str, str, Any]]], List[Dict[str, Any]]]:
+        """
+        Translate filters into pyarrow dataset filters.
+
+        Only conditions pyarrow evaluates exactly like pandas are pushed;
+        null-sensitive and string operators stay residual.
+
+        Returns:
+            Tuple of (pyarrow filter tuples or None, residual conditions)
+        """
+        pushed, residual = self.split_filters(_arrow_pushable)
+        filters = [(c["column"], c["operator"], c["value"]) for c in pushed]
+        return filters or None, residual
+
+
+def _is_scalar(value: Any) -> bool:
+    if value is None or isinstance(value, (list, tuple, set, dict)):
+        return False
+    # NaN never compares equal, in pandas or in SQL
+    return not (isinstance(value, float) and value != value)
+
+
+def _sql_pushable(condition: Dict[str, Any], case_insensitive: bool) -> bool:
+    operator = condition.get("operator")
+    value = condition.get("value")
+
+    if operator in _SQL_COMPARISONS:
+        if not _is_scalar(value):
+            return False
+        return not (case_insensitive and isinstance(value, str))
+    if operator in ("in", "not in"):
+        if not isinstance(value, (list, tuple, set)):
+            return False
+        values = [item for item in value if item is not None]
+        if not all(_is_scalar(item) for item in values):
+            return False
+        return not (case_insensitive and any(isinstance(item, str) for item in values))
+    # LIKE is case-insensitive on some dialects and contains is a regex in pandas
+    return False
+
+
+def _sql_condition(column: str, condition: Dict[str, Any], name: str, params: Dict[str, Any]) -> str:
+    operator = condition["operator"]
+    value = condition["value"]
+
+    if operator in _SQL_COMPARISONS:
+        params[name] = value
+        clause = f"{column} {_SQL_COMPARISONS[operator]} :{name}"
+        # pandas keeps NULLs for != since NaN != value
+        return f"({clause} OR {column} IS NULL)" if operator == "!=" else clause
+
+    values = [item for item in value if item is not None]
+    has_null = len(values) != len(value)
+    names = []
+    for index, item in enumerate(values):
+        params[f"{name}_{index}"] = item
+        names.append(f":{name}_{index}")
+    members = f"{column} IN ({', '.join(names)})" if names else "1 = 0"
+
+    if operator == "in":
+        return f"({members} OR {column} IS NULL)" if has_null else members
+    if has_null:
+        return f"(NOT {members} AND {column} IS NOT NULL)"
+    return f"(NOT {members} OR {column} IS NULL)"
+
+
+def _arrow_pushable(condition: Dict[str, Any]) -> bool:
+    operator = condition.get("operator")
+    value = condition.get("value")
+
+    if operator in ("==", ">", ">=", "<", "<="):
+        return _is_scalar(value)
+    if operator == "in":
+        return isinstance(value, (list, tuple, set)) and bool(value) and all(_is_scalar(v) for v in value)
+    return False
+
+
+def csv_usecols(plan: ScanPlan, usecols: Optional[Iterable[str]] = None):
+    """
+    Get a pandas.read_csv usecols callable for a plan.
+
+    A callable tolerates planned columns the file lacks; steps that need
+    them still fail later exactly as they would without pushdown.
+
+    Args:
+        plan: Scan plan
+        usecols: Columns already restricted by configuration
+
+    Returns:
+        usecols callable, or None to read every column
+    """
+    read_columns = plan.read_columns
+    if read_columns is None:
+        return None
+    wanted = set(read_columns)
+    if usecols is not None:
+        wanted &= set(usecols)
+    return lambda column: column in wanted
+
+
+def read_csv(
+    path: str,
+    plan: Optional[ScanPlan] = None,
+    chunk_size: int = DEFAULT_CSV_CHUNK_SIZE,
+    **options: Any
+) -> pd.DataFrame:
+    """
+    Read a CSV file, applying a scan plan while parsing.
+
+    Only planned columns are parsed, and with filters the file is read in
+    chunks that are filtered before being kept, so peak memory follows the
+    matching rows rather than the whole file.
+
+    Args:
+        path: CSV file path
+        plan: Scan plan to apply
+        chunk_size: Rows per chunk when filtering
+        **options: Extra pandas.read_csv options
+
+    Returns:
+        Filtered, projected DataFrame
+    """
+    if plan is None or plan.is_empty:
+        return pd.read_csv(path, **options)
+
+    usecols = csv_usecols(plan, options.get("usecols"))
+    if usecols is not None:
+        options["usecols"] = usecols
+
+    if not plan.filters:
+        return plan.apply(pd.read_csv(path, **options))
+
+    chunks = [
+        plan.apply(chunk)
+        for chunk in pd.read_csv(path, chunksize=chunk_size, **options)
+    ]
+    if not chunks:
+        return plan.apply(pd.read_csv(path, nrows=0, **options))
+    return pd.concat(chunks, ignore_index=True)
+
+
+def read_parquet(path: str, plan: Optional[ScanPlan] = None, **options: Any) -> pd.DataFrame:
+    """
+    Read a Parquet file, pushing the scan plan into pyarrow.
+
+    Projected columns and exactly-translatable filters are evaluated by the
+    pyarrow dataset reader, which skips row groups whose statistics rule
+    them out; remaining conditions are applied to the result.
+
+    Args:
+        path: Parquet file or dataset path
+        plan: Scan plan to apply
+        **options: Extra pandas.read_parquet options
+
+    Returns:
+        Filtered, projected DataFrame
+    """
+    if plan is None or plan.is_empty:
+        return pd.read_parquet(path, **options)
+
+    filters, residual = plan.arrow_filters()
+    columns = plan.read_columns if residual else plan.columns
+    df = pd.read_parquet(path, columns=columns, filters=filters, **options)
+    return plan.apply(df, residual).reset_index(drop=True)
+
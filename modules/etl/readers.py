@@ -0,0 +1,369 @@
+"""
+Streaming file readers.
+
+Readers turn a file path or binary stream into an iterator of bounded
+DataFrame chunks, so extraction memory depends on the batch size rather
+than the file size:
+
+- CSV and TSV: chunked pandas.read_csv
+- JSON Lines: chunked pandas.read_json(lines=True)
+- JSON arrays: incremental decoding of the top-level array, each chunk
+  typed by pandas.read_json as whole-document reads were
+- Excel (.xlsx): openpyxl read-only worksheets
+- Legacy Excel (.xls): read whole, then sliced, as xlrd cannot stream
+- Parquet: pyarrow record batches, one row group at a time
+
+Formats that need random access (Excel, Parquet) are spooled from
+non-seekable streams to a temporary file first.
+"""
+
+import io
+import json
+import logging
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Union
+
+import pandas as pd
+
+from modules.etl.pushdown import DEFAULT_CSV_CHUNK_SIZE, ScanPlan, csv_usecols
+
+logger = logging.getLogger(__name__)
+
+# Bytes read per step when decoding JSON arrays and spooling streams
+DEFAULT_READ_BLOCK_SIZE = 1024 * 1024
+
+# File extensions handled by each reader
+FILE_FORMATS = {
+    "csv": "csv",
+    "tsv": "tsv",
+    "json": "json",
+    "jsonl": "jsonl",
+    "ndjson": "jsonl",
+    "xlsx": "excel",
+    "xlsm": "excel",
+    "xls": "xls",
+    "parquet": "parquet",
+}
+
+Source = Union[str, BinaryIO]
+
+
+class ReaderException(Exception):
+    """Exception for unreadable or unsupported files."""
+    pass
+
+
+class IterStream(io.RawIOBase):
+    """Readable binary stream over an iterator of byte chunks."""
+
+    def __init__(self, chunks: Iterable[bytes], on_close: Optional[Callable[[], None]] = None):
+        """
+        Initialize stream.
+
+        Args:
+            chunks: Byte chunks in order, e.g. a download's chunk iterator
+            on_close: Called once when the stream is closed
+        """
+        self._chunks = iter(chunks)
+        self._pending = b""
+        self._on_close = on_close
+
+    def readable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        if not self.closed and self._on_close is not None:
+            self._on_close()
+        super().close()
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            try:
+                self._pending = next(self._chunks)
+            except StopIteration:
+                return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
+def file_format(name: str, default: Optional[str] = None) -> str:
+    """
+    Get the reader format for a file name.
+
+    Args:
+        name: File name, path or object key
+        default: Format to use for unknown extensions
+
+    Returns:
+        Reader format name
+
+    Raises:
+        ReaderException: If the extension is unsupported and there is no default
+    """
+    extension = name.rsplit(".", 1)[-1].lower()
+    if extension in FILE_FORMATS:
+        return FILE_FORMATS[extension]
+    if default:
+        return default
+    raise ReaderException(f"Unsupported file format: {extension}")
+
+
+def iter_frames(
+    source: Source,
+    format_name: str,
+    batch_size: int = DEFAULT_CSV_CHUNK_SIZE,
+    plan: Optional[ScanPlan] = None,
+    **options: Any
+) -> Iterator[pd.DataFrame]:
+    """
+    Read a file as DataFrame chunks of at most batch_size rows.
+
+    Args:
+        source: File path or binary stream
+        format_name: csv, tsv, json, jsonl, excel, xls or parquet
+        batch_size: Maximum rows per chunk (before plan filters)
+        plan: Scan plan applied to each chunk
+        **options: Reader options (pandas.read_csv options for CSV and
+            TSV, encoding for JSON, sheet_name for Excel)
+
+    Yields:
+        DataFrame chunks
+    """
+    if format_name == "csv":
+        chunks = _iter_csv(source, batch_size, plan, **options)
+    elif format_name == "tsv":
+        chunks = _iter_csv(source, batch_size, plan, **{"sep": "\t", **options})
+    elif format_name == "jsonl":
+        chunks = _iter_json_lines(source, batch_size, options.get("encoding", "utf-8"))
+    elif format_name == "json":
+        chunks = _iter_json(source, batch_size, options.get("encoding", "utf-8"))
+    elif format_name == "excel":
+        chunks = _iter_excel(source, batch_size, options.get("sheet_name"))
+    elif format_name == "xls":
+        frame = pd.read_excel(source, sheet_name=options.get("sheet_name") or 0)
+        chunks = (frame.iloc[start:start + batch_size] for start in range(0, len(frame), batch_size))
+    elif format_name == "parquet":
+        chunks = _iter_parquet(source, batch_size, plan)
+        plan = None
+    else:
+        raise ReaderException(f"Unsupported file format: {format_name}")
+
+    for chunk in chunks:
+        if plan is not None and not plan.is_empty:
+            chunk = plan.apply(chunk)
+        if len(chunk):
+            yield chunk
+
+
+def iter_records(
+    source: Source,
+    format_name: str,
+    batch_size: int = DEFAULT_CSV_CHUNK_SIZE,
+    plan: Optional[ScanPlan] = None,
+    offset: Optional[int] = None,
+    limit: Optional[int] = None,
+    **options: Any
+) -> Iterator[List[Dict[str, Any]]]:
+    """
+    Read a file as record batches.
+
+    Args:
+        source: File path or binary stream
+        format_name: csv, tsv, json, jsonl, excel, xls or parquet
+        batch_size: Maximum records per batch
+        plan: Scan plan applied while reading
+        offset: Number of matching records to skip
+        limit: Maximum number of records to return
+        **options: Reader options, see iter_frames
+
+    Yields:
+        Lists of at most batch_size records
+    """
+    skip = offset or 0
+    remaining = limit
+
+    for chunk in iter_frames(source, format_name, batch_size, plan, **options):
+        if skip:
+            dropped = min(skip, len(chunk))
+            chunk = chunk.iloc[dropped:]
+            skip -= dropped
+        if remaining is not None:
+            chunk = chunk.head(remaining)
+            remaining -= len(chunk)
+        if len(chunk):
+            yield chunk.to_dict(orient="records")
+        if remaining is not None and remaining <= 0:
+            return
+
+
+def _iter_csv(source: Source, batch_size: int, plan: Optional[ScanPlan], **options: Any) -> Iterator[pd.DataFrame]:
+    if plan is not None:
+        usecols = csv_usecols(plan, options.get("usecols"))
+        if usecols is not None:
+            options["usecols"] = usecols
+    with pd.read_csv(source, chunksize=batch_size, **options) as reader:
+        yield from reader
+
+
+def _iter_json_lines(source: Source, batch_size: int, encoding: str) -> Iterator[pd.DataFrame]:
+    with pd.read_json(source, lines=True, chunksize=batch_size, encoding=encoding) as reader:
+        yield from reader
+
+
+def _records_frame(records: List[Any]) -> pd.DataFrame:
+    """Build a chunk with pandas.read_json's dtype and date inference."""
+    return pd.read_json(io.StringIO(json.dumps(records)))
+
+
+def _iter_json(source: Source, batch_size: int, encoding: str) -> Iterator[pd.DataFrame]:
+    """Decode a JSON document's top-level array incrementally."""
+    stream = open(source, "rb") if isinstance(source, str) else source
+    text = io.TextIOWrapper(stream, encoding=encoding)
+    try:
+        buffer = _read_until_content(text)
+        if not buffer.startswith("["):
+            # Not an array: keep pandas' reading of the whole document
+            yield pd.read_json(io.StringIO(buffer + text.read()))
+            return
+
+        decoder = json.JSONDecoder()
+        position, batch, eof = 1, [], False
+        while True:
+            while position < len(buffer) and (buffer[position].isspace() or buffer[position] == ","):
+                position += 1
+
+            if position < len(buffer) and buffer[position] == "]":
+                break
+
+            try:
+                if position >= len(buffer):
+                    raise ValueError("Buffer exhausted")
+                record, end = decoder.raw_decode(buffer, position)
+                # A number at the end of the buffer may continue in the next block
+                if end == len(buffer) and not eof:
+                    raise ValueError("Value may be truncated")
+            except ValueError:
+                if eof:
+                    raise ReaderException("Invalid or truncated JSON array")
+                block = text.read(DEFAULT_READ_BLOCK_SIZE)
+                eof = not block
+                buffer, position = buffer[position:] + block, 0
+                continue
+
+            batch.append(record)
+            position = end
+            if len(batch) >= batch_size:
+                yield _records_frame(batch)
+                batch = []
+
+        if batch:
+            yield _records_frame(batch)
+    finally:
+        if isinstance(source, str):
+            text.close()
+        else:
+            # Leave the caller's stream open
+            text.detach()
+
+
+def _read_until_content(text: io.TextIOBase) -> str:
+    """Read blocks until the first non-whitespace character."""
+    buffer = ""
+    while True:
+        block = text.read(DEFAULT_READ_BLOCK_SIZE)
+        buffer = (buffer + block).lstrip()
+        if buffer or not block:
+            return buffer
+
+
+def _iter_excel(source: Source, batch_size: int, sheet_name: Optional[Any]) -> Iterator[pd.DataFrame]:
+    """Read worksheet rows through openpyxl's read-only mode."""
+    from openpyxl import load_workbook
+
+    with _seekable(source) as handle:
+        workbook = load_workbook(handle, read_only=True, data_only=True)
+        try:
+            if sheet_name is None or sheet_name == 0:
+                sheet = workbook.worksheets[0]
+            elif isinstance(sheet_name, int):
+                sheet = workbook.worksheets[sheet_name]
+            else:
+                sheet = workbook[sheet_name]
+
+            rows = sheet.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            columns = [
+                column if column is not None else f"Unnamed: {index}"
+                for index, column in enumerate(header)
+            ]
+
+            batch = []
+            for row in rows:
+                if all(value is None for value in row):
+                    continue
+                batch.append(row[:len(columns)])
+                if len(batch) >= batch_size:
+                    yield pd.DataFrame(batch, columns=columns)
+                    batch = []
+            if batch:
+                yield pd.DataFrame(batch, columns=columns)
+        finally:
+            workbook.close()
+
+
+def _iter_parquet(source: Source, batch_size: int, plan: Optional[ScanPlan]) -> Iterator[pd.DataFrame]:
+    """Read Parquet record batches, pushing the plan into pyarrow."""
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+
+    plan = plan or ScanPlan()
+    filters, residual = plan.arrow_filters()
+
+    with _seekable(source) as handle:
+        if isinstance(handle, str):
+            # Dataset scans skip row groups whose statistics rule out the filters
+            batches = ds.dataset(handle, format="parquet").to_batches(
+                columns=plan.read_columns if residual else plan.columns,
+                filter=pq.filters_to_expression(filters) if filters else None,
+                batch_size=batch_size
+            )
+        else:
+            residual = plan.filters
+            batches = pq.ParquetFile(handle).iter_batches(
+                batch_size=batch_size,
+                columns=plan.read_columns if residual else plan.columns
+            )
+
+        for batch in batches:
+            yield plan.apply(batch.to_pandas(), residual)
+
+
+class _seekable:
+    """Context manager giving a path or seekable stream for random-access formats."""
+
+    def __init__(self, source: Source):
+        self.source = source
+        self._spool = None
+
+    def __enter__(self):
+        if isinstance(self.source, str):
+            return self.source
+        try:
+            if self.source.seekable():
+                return self.source
+        except AttributeError:
+            pass
+        # Spool to disk so memory stays bounded
+        self._spool = tempfile.TemporaryFile()
+        shutil.copyfileobj(self.source, self._spool, DEFAULT_READ_BLOCK_SIZE)
+        self._spool.seek(0)
+        return self._spool
+
+    def __exit__(self, *exc_info):
+        if self._spool is not None:
+            self._spool.close()
@@ -2,11 +2,17 @@
 from .transformation_service import TransformationService
 from .validation_service import ValidationService
 from .deduplication_service import DeduplicationService
+from .fuzzy_dedup import FuzzyDeduplicator
 from .pipeline_service import PipelineService
+from .plan_optimizer import PlanOptimizer
+from .dag_executor import DAGExecutor
 
 __all__ = [
     "TransformationService",
     "ValidationService",
     "DeduplicationService",
+    "FuzzyDeduplicator",
     "PipelineService",
+    "PlanOptimizer",
+    "DAGExecutor",
 ]
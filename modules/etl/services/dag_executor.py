@@ -0,0 +1,413 @@
+"""DAG execution for multi-source ETL pipelines."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import pandas as pd
+from shared.utils.logger import get_logger
+
+if TYPE_CHECKING:
+    from modules.etl.services.pipeline_service import PipelineService
+
+logger = get_logger(__name__)
+
+# Nodes run concurrently when parallel processing is enabled
+DEFAULT_DAG_WORKERS = 4
+
+# Number of inputs each node type takes (None: one or more)
+NODE_INPUTS = {
+    "extract": 0,
+    "transform": 1,
+    "join": 2,
+    "union": None,
+    "deduplicate": 1,
+    "validate": 1,
+    "load": 1,
+}
+
+# Loads have side effects, so they run on every execution
+_UNCACHED_NODES = {"load"}
+
+# Connector settings naming a local file whose stat identifies its content
+_FILE_KEYS = ("file_path", "path")
+
+
+class DAGError(ValueError):
+    """Invalid pipeline DAG definition."""
+    pass
+
+
+def validate_dag(nodes: List[Dict[str, Any]]) -> List[str]:
+    """
+    Check a DAG definition and order its nodes.
+
+    Args:
+        nodes: Node definitions with id, type and inputs
+
+    Returns:
+        Node ids in a topological order
+
+    Raises:
+        DAGError: If ids are duplicated or unknown, a node has the wrong
+            number of inputs or the graph has a cycle
+    """
+    if not nodes:
+        raise DAGError("Pipeline DAG has no nodes")
+
+    by_id: Dict[str, Dict[str, Any]] = {}
+    for node in nodes:
+        node_id = node.get("id")
+        if not node_id:
+            raise DAGError("Every DAG node needs an id")
+        if node_id in by_id:
+            raise DAGError(f"Duplicate DAG node id: {node_id}")
+        by_id[node_id] = node
+
+    for node_id, node in by_id.items():
+        node_type = node.get("type")
+        if node_type not in NODE_INPUTS:
+            raise DAGError(f"Unknown node type for '{node_id}': {node_type}")
+        inputs = node.get("inputs", [])
+        arity = NODE_INPUTS[node_type]
+        if (arity is None and not inputs) or (arity is not None and len(inputs) != arity):
+            expected = "one or more" if arity is None else arity
+            raise DAGError(f"Node '{node_id}' ({node_type}) takes {expected} inputs, got {len(inputs)}")
+        for input_id in inputs:
+            if input_id not in by_id:
+                raise DAGError(f"Node '{node_id}' reads unknown node '{input_id}'")
+
+    # Kahn's algorithm
+    remaining = {node_id: len(node.get("inputs", [])) for node_id, node in by_id.items()}
+    consumers = _consumers(nodes)
+    ready = [node_id for node_id, count in remaining.items() if count == 0]
+    order = []
+    while ready:
+        node_id = ready.pop()
+        order.append(node_id)
+        for consumer in consumers[node_id]:
+            remaining[consumer] -= 1
+            if remaining[consumer] == 0:
+                ready.append(consumer)
+
+    if len(order) != len(by_id):
+        cyclic = sorted(node_id for node_id in by_id if node_id not in order)
+        raise DAGError(f"Pipeline DAG has a cycle through: {', '.join(cyclic)}")
+    return order
+
+
+def _consumers(nodes: List[Dict[str, Any]]) -> Dict[str, List[str]]:
+    """Map each node id to the ids of nodes reading it, once per input edge."""
+    consumers: Dict[str, List[str]] = {node["id"]: [] for node in nodes}
+    for node in nodes:
+        for input_id in node.get("inputs", []):
+            consumers[input_id].append(node["id"])
+    return consumers
+
+
+def frame_fingerprint(df: pd.DataFrame) -> Optional[str]:
+    """
+    Hash a DataFrame's columns, dtypes and values.
+
+    Returns:
+        Hex digest, or None if the values are unhashable (e.g. nested JSON)
+    """
+    digest = hashlib.sha256()
+    digest.update(json.dumps([[str(c) for c in df.columns], [str(t) for t in df.dtypes]]).encode())
+    try:
+        digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    except TypeError:
+        return None
+    return digest.hexdigest()
+
+
+def _digest(*parts: Any) -> str:
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class ResultCache:
+    """On-disk cache of node results keyed by node definition and input fingerprints."""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key: str, extension: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{extension}")
+
+    def get(self, key: str) -> Optional[Tuple[pd.DataFrame, Dict[str, Any]]]:
+        """Get a cached result and its metadata, if present."""
+        try:
+            with open(self._path(key, "json")) as f:
+                metadata = json.load(f)
+            return pd.read_pickle(self._path(key, "pkl")), metadata
+        except (OSError, ValueError, EOFError):
+            return None
+
+    def put(self, key: str, df: pd.DataFrame, metadata: Dict[str, Any]) -> None:
+        """Store a result; the metadata file is written last so readers never see partial entries."""
+        for extension, write in (
+            ("pkl", lambda path: df.to_pickle(path)),
+            ("json", lambda path: _write_json(path, metadata)),
+        ):
+            path = self._path(key, extension)
+            partial = f"{path}.{threading.get_ident()}.partial"
+            write(partial)
+            os.replace(partial, path)
+
+
+def _write_json(path: str, data: Dict[str, Any]) -> None:
+    with open(path, "w") as f:
+        json.dump(data, f, default=str)
+
+
+class _NodeResult:
+    """A node's output, held in memory or spilled to disk."""
+
+    def __init__(self, df: pd.DataFrame, fingerprint: Optional[str], spill_path: Optional[str] = None):
+        self.rows = len(df)
+        self.fingerprint = fingerprint
+        self.spill_path = spill_path
+        self._df = None if spill_path else df
+        if spill_path:
+            df.to_pickle(spill_path)
+
+    def frame(self) -> pd.DataFrame:
+        return self._df if self._df is not None else pd.read_pickle(self.spill_path)
+
+    def release(self) -> None:
+        self._df = None
+        if self.spill_path and os.path.exists(self.spill_path):
+            os.remove(self.spill_path)
+
+
+class DAGExecutor:
+    """
+    Runs a pipeline defined as a DAG of extract, transform, join and load nodes.
+
+    Nodes whose inputs are ready run concurrently on a thread pool, so
+    independent source branches extract and transform in parallel. Each
+    intermediate result is freed once every consumer has read it, and
+    results larger than spill_threshold_mb are kept on disk instead of in
+    memory. With a cache_dir, node results are cached under a key derived
+    from the node definition and the fingerprints of its inputs (file
+    stats for file sources, content hashes otherwise), so reruns skip
+    branches whose inputs have not changed.
+    """
+
+    def __init__(
+        self,
+        service: "PipelineService",
+        max_workers: int = DEFAULT_DAG_WORKERS,
+        cache_dir: Optional[str] = None,
+        spill_threshold_mb: Optional[float] = None,
+    ):
+        self.logger = logger
+        self.service = service
+        self.max_workers = max(1, max_workers)
+        self.cache = ResultCache(cache_dir) if cache_dir else None
+        self.spill_threshold_bytes = spill_threshold_mb * 1024 * 1024 if spill_threshold_mb else None
+
+    def execute(
+        self, nodes: List[Dict[str, Any]], source_config: Dict[str, Any], report: Dict[str, Any]
+    ) -> None:
+        """
+        Execute every node, recording per-node steps and totals in the report.
+
+        Args:
+            nodes: Node definitions
+            source_config: Default source for extract nodes without their own
+            report: Execution report to update
+
+        Raises:
+            Exception: The first node failure, after running nodes finish
+        """
+        validate_dag(nodes)
+        by_id = {node["id"]: node for node in nodes}
+        consumers = _consumers(nodes)
+        waiting = {node_id: len(node.get("inputs", [])) for node_id, node in by_id.items()}
+        unread = {node_id: len(readers) for node_id, readers in consumers.items()}
+        results: Dict[str, _NodeResult] = {}
+        steps: Dict[str, Dict[str, Any]] = {}
+        failure: Optional[BaseException] = None
+
+        with tempfile.TemporaryDirectory(prefix="etl-dag-") as spill_dir, \
+                ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="etl-dag") as pool:
+
+            def submit(node_id: str) -> Future:
+                inputs = [results[input_id] for input_id in by_id[node_id].get("inputs", [])]
+                return pool.submit(self._run_node, by_id[node_id], inputs, source_config, spill_dir)
+
+            running = {submit(node_id): node_id for node_id, count in waiting.items() if count == 0}
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node_id = running.pop(future)
+                    try:
+                        results[node_id], steps[node_id] = future.result()
+                    except Exception as e:
+                        self.logger.error(f"DAG node '{node_id}' failed: {e}")
+                        steps[node_id] = {"name": node_id, "type": by_id[node_id]["type"],
+                                          "status": "failed", "error": str(e)}
+                        failure = failure or e
+                        continue
+
+                    for input_id in by_id[node_id].get("inputs", []):
+                        unread[input_id] -= 1
+                        if unread[input_id] == 0:
+                            results[input_id].release()
+                    if not consumers[node_id]:
+                        results[node_id].release()
+
+                    if failure is None:
+                        for consumer in dict.fromkeys(consumers[node_id]):
+                            waiting[consumer] -= by_id[consumer]["inputs"].count(node_id)
+                            if waiting[consumer] == 0:
+                                running[submit(consumer)] = consumer
+
+        for node in nodes:
+            step = steps.get(node["id"]) or {"name": node["id"], "type": node["type"], "status": "skipped"}
+            report["steps"].append(step)
+            if step["status"] in ("completed", "cached"):
+                self._add_totals(node["type"], step, report)
+
+        if failure is not None:
+            raise failure
+
+    @staticmethod
+    def _add_totals(node_type: str, step: Dict[str, Any], report: Dict[str, Any]) -> None:
+        if node_type == "extract":
+            report["records_extracted"] += step["records"]
+        elif node_type == "transform":
+            report["records_transformed"] += step["records"]
+        elif node_type == "deduplicate":
+            report["records_duplicates"] += step.get("report", {}).get("duplicates_removed", 0)
+        elif node_type == "load":
+            report["records_loaded"] += step.get("report", {}).get("records_loaded", step["records"])
+
+    def _run_node(
+        self,
+        node: Dict[str, Any],
+        inputs: List[_NodeResult],
+        source_config: Dict[str, Any],
+        spill_dir: str,
+    ) -> Tuple[_NodeResult, Dict[str, Any]]:
+        """Compute or load from cache one node's result."""
+        start = time.time()
+        node_id, node_type = node["id"], node["type"]
+        key = self._cache_key(node, inputs, source_config)
+
+        cached = self.cache.get(key) if self.cache is not None and key else None
+        if cached is not None:
+            df, metadata = cached
+            step_report = metadata.get("report")
+            status = "cached"
+            fingerprint = metadata.get("fingerprint")
+            self.logger.info(f"DAG node '{node_id}' unchanged; using cached result")
+        else:
+            df, step_report = self._compute(node, [result.frame() for result in inputs], source_config)
+            status = "completed"
+            # Downstream keys only need an identifier that changes when this output can
+            fingerprint = key or frame_fingerprint(df)
+            if self.cache is not None and key:
+                self.cache.put(key, df, {"fingerprint": fingerprint, "report": step_report})
+
+        spill_path = None
+        if self.spill_threshold_bytes and node_type not in _UNCACHED_NODES:
+            if df.memory_usage(deep=True).sum() > self.spill_threshold_bytes:
+                spill_path = os.path.join(spill_dir, f"{hashlib.sha256(node_id.encode()).hexdigest()}.pkl")
+
+        result = _NodeResult(df, fingerprint, spill_path)
+        step = {
+            "name": node_id,
+            "type": node_type,
+            "status": status,
+            "records": result.rows,
+            "duration_seconds": time.time() - start,
+        }
+        if step_report is not None:
+            step["report"] = step_report
+        self.logger.info(f"DAG node '{node_id}' {status}: {result.rows} records")
+        return result, step
+
+    def _cache_key(
+        self, node: Dict[str, Any], inputs: List[_NodeResult], source_config: Dict[str, Any]
+    ) -> Optional[str]:
+        """Key identifying a node's output, or None if it cannot be known before running."""
+        if node["type"] in _UNCACHED_NODES or node.get("cache") is False:
+            return None
+
+        definition = {k: v for k, v in node.items() if k not in ("id", "inputs", "cache")}
+        if node["type"] != "extract":
+            fingerprints = [result.fingerprint for result in inputs]
+            if None in fingerprints:
+                return None
+            return _digest(definition, fingerprints)
+
+        source = node.get("source") or source_config
+        version = node.get("cache_key") or self._source_version(source)
+        if version is None:
+            return None
+        return _digest(definition, source, version)
+
+    @staticmethod
+    def _source_version(source: Dict[str, Any]) -> Optional[List[Any]]:
+        """Size and modification time of a file source, or None for other sources."""
+        config = source.get("connection_config") or {}
+        path = next((config[k] for k in _FILE_KEYS if config.get(k)), None)
+        if not path:
+            return None
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [path, stat.st_size, stat.st_mtime_ns]
+
+    def _compute(
+        self, node: Dict[str, Any], frames: List[pd.DataFrame], source_config: Dict[str, Any]
+    ) -> Tuple[pd.DataFrame, Optional[Dict[str, Any]]]:
+        """Run one node on its input frames."""
+        node_type = node["type"]
+        service = self.service
+
+        if node_type == "extract":
+            # Filters and projections of the branch's own steps go into the scan
+            plan, transformations = service.plan_optimizer.optimize(node.get("transformations") or [])
+            df, extract_report = service._extract_data(
+                node.get("source") or source_config, node.get("extract_config", {}), plan
+            )
+            if transformations:
+                df = service.transformation_service.apply_transformations(df, transformations)
+            return df, extract_report
+
+        if node_type == "transform":
+            return service.transformation_service.apply_transformations(
+                frames[0], node.get("transformations", [])
+            ), None
+
+        if node_type == "join":
+            left, right = frames
+            options = {
+                "how": node.get("how", "inner"),
+                "suffixes": tuple(node.get("suffixes", ("_x", "_y"))),
+            }
+            if node.get("on"):
+                options["on"] = node["on"]
+            else:
+                options["left_on"] = node.get("left_on")
+                options["right_on"] = node.get("right_on")
+            return left.merge(right, **options), None
+
+        if node_type == "union":
+            return pd.concat(frames, ignore_index=True), None
+
+        if node_type == "deduplicate":
+            return service.deduplication_service.deduplicate(frames[0], node.get("config", {}))
+
+        if node_type == "validate":
+            return service.validation_service.validate_data(frames[0], node.get("rules", {}))
+
+        return frames[0], service._load_data(frames[0], node.get("load_config", {}))
@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Optional
 import pandas as pd
 import hashlib
 from shared.utils.logger import get_logger
+from .fuzzy_dedup import FuzzyDeduplicator
 
 logger = get_logger(__name__)
 
@@ -87,8 +88,18 @@ class DeduplicationService:
     def _fuzzy_deduplication(self, df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
         """
         Remove fuzzy duplicates (similar records).
-        Note: This is a basic implementation. For production, consider using libraries like dedupe or fuzzywuzzy.
+
+        Uses the blocking/LSH engine (see FuzzyDeduplicator) unless
+        ``engine`` is "pairwise", which compares every pair of rows with
+        SequenceMatcher and is only practical for small inputs.
         """
+        if config.get("engine", "lsh") != "pairwise":
+            return FuzzyDeduplicator(config).deduplicate(df, config.get("keep", "first"))
+
+        return self._pairwise_fuzzy_deduplication(df, config)
+
+    def _pairwise_fuzzy_deduplication(self, df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
+        """Remove fuzzy duplicates by comparing every pair of rows."""
         from difflib import SequenceMatcher
 
         similarity_threshold = config.get("similarity_threshold", 0.9)
@@ -130,9 +141,23 @@ class DeduplicationService:
         return duplicates.sort_values(by=subset if subset else df.columns.tolist())
 
     def get_duplicate_groups(
-        self, df: pd.DataFrame, subset: Optional[List[str]] = None
+        self, df: pd.DataFrame, subset: Optional[List[str]] = None, config: Optional[Dict[str, Any]] = None
     ) -> Dict[str, pd.DataFrame]:
-        """Get groups of duplicate records."""
+        """
+        Get groups of duplicate records.
+
+        Args:
+            df: Input DataFrame
+            subset: Columns to consider
+            config: Deduplication configuration; with strategy "fuzzy" the
+                groups are fuzzy duplicate clusters
+
+        Returns:
+            Mapping of group hash to the records in each group
+        """
+        if config and config.get("strategy") == "fuzzy":
+            return FuzzyDeduplicator({"subset": subset, **config}).get_duplicate_groups(df)
+
         duplicates = self.identify_duplicates(df, subset)
 
         if len(duplicates) == 0:
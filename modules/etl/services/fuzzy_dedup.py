@@ -0,0 +1,371 @@
+"""Scalable fuzzy deduplication with blocking and MinHash LSH."""
+import hashlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from shared.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+_HASH_MASK = np.uint64(0xFFFFFFFF)
+_HASH_SHIFT = np.uint64(32)
+
+# Weight of missed duplicates against extra candidates when choosing bands
+FALSE_NEGATIVE_WEIGHT = 0.7
+
+# Rows hashed per MinHash chunk; bounds shingle buffer memory
+MINHASH_CHUNK_ROWS = 100_000
+
+# Candidate pairs scored per chunk
+SCORING_CHUNK_PAIRS = 200_000
+
+
+def optimal_bands(threshold: float, num_perm: int) -> int:
+    """
+    Choose the number of LSH bands for a Jaccard similarity threshold.
+
+    Picks the divisor of num_perm whose candidate probability curve
+    ``1 - (1 - s ** rows) ** bands`` minimizes the weighted area of false
+    positives below the threshold and false negatives above it.
+
+    Args:
+        threshold: Jaccard similarity at which pairs should become candidates
+        num_perm: MinHash permutations
+
+    Returns:
+        Number of bands
+    """
+    step = 0.001
+    similarity = np.arange(0, 1 + step, step)
+    below, above = similarity <= threshold, similarity >= threshold
+
+    best_bands, best_error = 1, float("inf")
+    for bands in (b for b in range(1, num_perm + 1) if num_perm % b == 0):
+        probability = 1 - (1 - similarity ** (num_perm // bands)) ** bands
+        false_positive = probability[below].sum() * step
+        false_negative = (1 - probability[above]).sum() * step
+        error = (1 - FALSE_NEGATIVE_WEIGHT) * false_positive + FALSE_NEGATIVE_WEIGHT * false_negative
+        if error < best_error:
+            best_bands, best_error = bands, error
+
+    return best_bands
+
+
+class UnionFind:
+    """Disjoint-set forest with path halving and union by size."""
+
+    def __init__(self, size: int):
+        self.parent = np.arange(size, dtype=np.int64)
+        self.size = np.ones(size, dtype=np.int64)
+
+    def find(self, x: int) -> int:
+        """Return the root of x's set."""
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return int(x)
+
+    def union(self, a: int, b: int) -> None:
+        """Merge the sets containing a and b."""
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        if self.size[root_a] < self.size[root_b]:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.size[root_a] += self.size[root_b]
+
+    def roots(self) -> np.ndarray:
+        """Return the root of every element."""
+        return np.fromiter((self.find(i) for i in range(len(self.parent))), dtype=np.int64, count=len(self.parent))
+
+
+class FuzzyDeduplicator:
+    """
+    Fuzzy duplicate detection in roughly linear time.
+
+    Records are first split into blocks by the blocking keys, so only
+    records that agree on them are ever compared. Within a block,
+    candidate pairs come from MinHash LSH over character shingles of the
+    compared columns. Only candidate pairs are scored. The score is the
+    per-column Dice coefficient of shingle sets, averaged over columns;
+    like SequenceMatcher's ratio it is ``2 * matches / total``. Pairs at or
+    above the threshold are merged into clusters with union-find, so
+    duplicates are transitive.
+
+    Config keys:
+        subset: Columns to compare (default: all columns)
+        similarity_threshold: Minimum average similarity (default 0.9)
+        blocking_keys: Column names, or {"column": name, "prefix": n} to
+            block on the first n characters (default: no blocking)
+        shingle_size: Characters per shingle (default 3)
+        num_perm: MinHash permutations (default 128)
+        bands: LSH bands; must divide num_perm (default: chosen from the
+            threshold, see optimal_bands)
+        max_bucket_size: LSH buckets larger than this are compared with a
+            sliding window of this size instead of all pairs (default 100)
+        seed: Random seed for the MinHash permutations (default 1)
+    """
+
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        config = config or {}
+        self.subset: Optional[List[str]] = config.get("subset")
+        self.threshold = float(config.get("similarity_threshold", 0.9))
+        self.blocking_keys: List[Union[str, Dict[str, Any]]] = config.get("blocking_keys") or []
+        self.shingle_size = int(config.get("shingle_size", 3))
+        self.num_perm = int(config.get("num_perm", 128))
+        # Dice threshold as the equivalent Jaccard similarity
+        jaccard = self.threshold / (2 - self.threshold)
+        self.bands = int(config.get("bands") or optimal_bands(jaccard, self.num_perm))
+        self.max_bucket_size = int(config.get("max_bucket_size", 100))
+
+        if self.num_perm % self.bands:
+            raise ValueError("num_perm must be divisible by bands")
+        self.rows_per_band = self.num_perm // self.bands
+
+        rng = np.random.default_rng(config.get("seed", 1))
+        # Multiply-shift hash functions: ((a * h + b) mod 2^64) >> 32, a odd
+        self._perm_a = rng.integers(0, 1 << 63, size=self.num_perm, dtype=np.uint64) * np.uint64(2) + np.uint64(1)
+        self._perm_b = rng.integers(0, 1 << 63, size=self.num_perm, dtype=np.uint64)
+
+        self.logger = logger
+
+    def find_clusters(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Assign every row to a duplicate cluster.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Array with the cluster label of each row (by position); rows
+            without duplicates are in singleton clusters
+        """
+        n = len(df)
+        if n < 2:
+            return np.arange(n, dtype=np.int64)
+
+        columns = [col for col in (self.subset or df.columns.tolist()) if col in df.columns]
+        if not columns:
+            return np.arange(n, dtype=np.int64)
+
+        texts = {col: df[col].astype(str).str.lower().str.strip() for col in columns}
+        combined = texts[columns[0]] if len(columns) == 1 else pd.Series(
+            [" | ".join(values) for values in zip(*(texts[col] for col in columns))]
+        )
+
+        blocks = self._block_ids(df)
+        signatures = self._minhash(combined.tolist())
+        left, right = self._candidate_pairs(signatures, blocks)
+        self.logger.info(f"Fuzzy dedup: {len(left)} candidate pairs for {n} rows")
+
+        if len(left):
+            scores = np.zeros(len(left), dtype=np.float64)
+            for col in columns:
+                scores += self._pair_similarity(texts[col].tolist(), left, right)
+            scores /= len(columns)
+
+            matched = scores >= self.threshold
+            left, right = left[matched], right[matched]
+
+        union_find = UnionFind(n)
+        for a, b in zip(left.tolist(), right.tolist()):
+            union_find.union(a, b)
+
+        self.logger.info(f"Fuzzy dedup: {len(left)} matching pairs")
+        return union_find.roots()
+
+    def deduplicate(self, df: pd.DataFrame, keep: Union[str, bool] = "first") -> pd.DataFrame:
+        """
+        Drop fuzzy duplicates.
+
+        Args:
+            df: Input DataFrame
+            keep: "first" or "last" keeps one row per cluster; False drops
+                every row that has a duplicate
+
+        Returns:
+            Deduplicated DataFrame with a fresh index
+        """
+        labels = self.find_clusters(df)
+        if keep is False:
+            counts = np.bincount(labels, minlength=len(labels))
+            mask = counts[labels] == 1
+        else:
+            positions = pd.Series(np.arange(len(labels)))
+            keeper = positions.groupby(labels).transform("max" if keep == "last" else "min")
+            mask = (positions == keeper).to_numpy()
+
+        return df[mask].reset_index(drop=True)
+
+    def get_duplicate_groups(self, df: pd.DataFrame) -> Dict[str, pd.DataFrame]:
+        """
+        Get clusters of fuzzy duplicates.
+
+        Args:
+            df: Input DataFrame
+
+        Returns:
+            Mapping of group hash to the rows of each cluster with more
+            than one member
+        """
+        labels = self.find_clusters(df)
+        counts = np.bincount(labels, minlength=len(labels))
+
+        duplicated = np.flatnonzero(counts[labels] > 1)
+
+        groups = {}
+        for _, positions in pd.Series(duplicated).groupby(labels[duplicated]):
+            positions = positions.to_numpy()
+            key = hashlib.md5(str(df.index[positions].tolist()).encode()).hexdigest()
+            groups[key] = df.iloc[positions]
+
+        return groups
+
+    def _block_ids(self, df: pd.DataFrame) -> np.ndarray:
+        """Integer block ID per row from the blocking keys."""
+        if not self.blocking_keys:
+            return np.zeros(len(df), dtype=np.int64)
+
+        parts = []
+        for key in self.blocking_keys:
+            if isinstance(key, dict):
+                values = df[key["column"]].astype(str).str.lower().str.strip()
+                if key.get("prefix"):
+                    values = values.str[: int(key["prefix"])]
+            else:
+                values = df[key].astype(str).str.lower().str.strip()
+            parts.append(values.fillna("").to_numpy())
+
+        codes, _ = pd.MultiIndex.from_arrays(parts).factorize() if len(parts) > 1 else pd.factorize(parts[0])
+        return np.asarray(codes, dtype=np.int64)
+
+    def _shingle_hashes(self, texts: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hash every character shingle of every text.
+
+        Texts shorter than the shingle size are padded so each row has at
+        least one shingle.
+
+        Returns:
+            Tuple of (shingle hashes, start offset of each row's shingles)
+        """
+        k = self.shingle_size
+        encoded = [text.ljust(k).encode("utf-8") for text in texts]
+        lengths = np.fromiter((len(item) for item in encoded), dtype=np.int64, count=len(encoded))
+        buffer = np.frombuffer(b"".join(encoded), dtype=np.uint8).astype(np.uint64)
+
+        # Polynomial rolling hash of k consecutive bytes
+        hashes = np.zeros(len(buffer) - k + 1, dtype=np.uint64)
+        for offset in range(k):
+            hashes = hashes * np.uint64(16777619) + buffer[offset:len(buffer) - k + 1 + offset]
+        hashes &= _HASH_MASK
+
+        # Keep shingles that start and end inside the same row
+        row_starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        counts = lengths - k + 1
+        positions = np.repeat(row_starts - np.concatenate(([0], np.cumsum(counts)[:-1])), counts)
+        positions += np.arange(counts.sum())
+
+        offsets = np.concatenate(([0], np.cumsum(counts)[:-1]))
+        return hashes[positions], offsets
+
+    def _minhash(self, texts: List[str]) -> np.ndarray:
+        """MinHash signature matrix (rows x num_perm) of the texts."""
+        signatures = np.empty((len(texts), self.num_perm), dtype=np.uint32)
+
+        for start in range(0, len(texts), MINHASH_CHUNK_ROWS):
+            chunk = texts[start:start + MINHASH_CHUNK_ROWS]
+            hashes, offsets = self._shingle_hashes(chunk)
+            for p in range(self.num_perm):
+                permuted = (hashes * self._perm_a[p] + self._perm_b[p]) >> _HASH_SHIFT
+                signatures[start:start + len(chunk), p] = np.minimum.reduceat(permuted, offsets)
+
+        return signatures
+
+    def _candidate_pairs(self, signatures: np.ndarray, blocks: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Pairs of row positions sharing a block and at least one LSH band."""
+        n = len(signatures)
+        codes = []
+
+        for band in range(self.bands):
+            band_sig = signatures[:, band * self.rows_per_band:(band + 1) * self.rows_per_band]
+            key = blocks.astype(np.uint64) * np.uint64(0x9E3779B97F4A7C15)
+            for column in range(band_sig.shape[1]):
+                key = (key ^ band_sig[:, column]) * np.uint64(0x100000001B3)
+
+            order = np.argsort(key, kind="stable")
+            sorted_keys = key[order]
+            boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+            run_starts = np.concatenate(([0], boundaries))
+            run_sizes = np.diff(np.concatenate((run_starts, [n])))
+
+            for size in np.unique(run_sizes[run_sizes > 1]):
+                starts = run_starts[run_sizes == size]
+                members = order[starts[:, None] + np.arange(size)]
+                members.sort(axis=1)
+                if size <= self.max_bucket_size:
+                    i, j = np.triu_indices(size, 1)
+                    left, right = members[:, i].ravel(), members[:, j].ravel()
+                else:
+                    # Oversized bucket: compare each row with its next neighbours only
+                    lefts, rights = [], []
+                    for distance in range(1, self.max_bucket_size):
+                        lefts.append(members[:, :-distance].ravel())
+                        rights.append(members[:, distance:].ravel())
+                    left, right = np.concatenate(lefts), np.concatenate(rights)
+                codes.append(left.astype(np.int64) * n + right)
+
+        if not codes:
+            empty = np.empty(0, dtype=np.int64)
+            return empty, empty
+
+        unique = np.unique(np.concatenate(codes))
+        return unique // n, unique % n
+
+    def _pair_similarity(self, texts: List[str], left: np.ndarray, right: np.ndarray) -> np.ndarray:
+        """Dice coefficient of the shingle sets of each candidate pair."""
+        rows = np.unique(np.concatenate((left, right)))
+        hashes, offsets = self._shingle_hashes([texts[row] for row in rows])
+
+        # Deduplicate shingles within each row (sorted sets in CSR form)
+        counts = np.diff(np.concatenate((offsets, [len(hashes)])))
+        owner = np.repeat(np.arange(len(rows), dtype=np.uint64), counts)
+        keys = np.unique((owner << _HASH_SHIFT) | hashes)
+        owner, hashes = (keys >> _HASH_SHIFT).astype(np.int64), keys & _HASH_MASK
+        sizes = np.bincount(owner, minlength=len(rows))
+        starts = np.concatenate(([0], np.cumsum(sizes)[:-1]))
+
+        left_idx = np.searchsorted(rows, left)
+        right_idx = np.searchsorted(rows, right)
+        scores = np.empty(len(left), dtype=np.float64)
+
+        for begin in range(0, len(left), SCORING_CHUNK_PAIRS):
+            a = left_idx[begin:begin + SCORING_CHUNK_PAIRS]
+            b = right_idx[begin:begin + SCORING_CHUNK_PAIRS]
+            pair_ids = np.arange(len(a), dtype=np.uint64)
+
+            # Gather both members' shingles, tagged with the pair ID
+            sides = []
+            for members in (a, b):
+                lengths = sizes[members]
+                index = np.repeat(starts[members] - np.concatenate(([0], np.cumsum(lengths)[:-1])), lengths)
+                index += np.arange(lengths.sum())
+                sides.append((np.repeat(pair_ids, lengths), hashes[index]))
+
+            keys = np.concatenate((
+                (sides[0][0] << _HASH_SHIFT) | sides[0][1],
+                (sides[1][0] << _HASH_SHIFT) | sides[1][1],
+            ))
+            keys.sort()
+
+            # Each set is duplicate-free, so equal neighbours are shared shingles
+            shared = keys[1:][keys[1:] == keys[:-1]]
+            intersections = np.bincount((shared >> _HASH_SHIFT).astype(np.int64), minlength=len(a))
+
+            scores[begin:begin + len(a)] = 2.0 * intersections / (sizes[a] + sizes[b])
+
+        return scores
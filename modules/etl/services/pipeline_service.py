@@ -6,6 +6,9 @@ from modules.etl.connectors.factory import ConnectorFactory
 from modules.etl.services.transformation_service import TransformationService
 from modules.etl.services.validation_service import ValidationService
 from modules.etl.services.deduplication_service import DeduplicationService
+from modules.etl.services.plan_optimizer import PlanOptimizer
+from modules.etl.services.dag_executor import DEFAULT_DAG_WORKERS, DAGExecutor
+from modules.etl.pushdown import ScanPlan
 from shared.utils.logger import get_logger
 
 logger = get_logger(__name__)
@@ -19,6 +22,7 @@ class PipelineService:
         self.transformation_service = TransformationService()
         self.validation_service = ValidationService()
         self.deduplication_service = DeduplicationService()
+        self.plan_optimizer = PlanOptimizer()
 
     def execute_pipeline(
         self, pipeline_config: Dict[str, Any], source_config: Dict[str, Any]
@@ -26,6 +30,9 @@ class PipelineService:
         """
         Execute a complete ETL pipeline.
 
+        A transform_config with a "dag" runs that DAG of nodes instead of the
+        linear extract, transform and load steps; see DAGExecutor.
+
         Args:
             pipeline_config: Pipeline configuration
             source_config: Data source configuration
@@ -50,9 +57,24 @@ class PipelineService:
         try:
             execution_report["status"] = "running"
 
+            dag = (pipeline_config.get("transform_config") or {}).get("dag")
+            if dag:
+                self._execute_dag(dag, pipeline_config, source_config, execution_report)
+                execution_report["status"] = "completed"
+                return execution_report
+
+            # Push filters and column selections into the source unless
+            # pre-transformation validation needs to see the full extract
+            transformations = pipeline_config.get("transform_config", {}).get("transformations") or []
+            plan = ScanPlan()
+            if pipeline_config.get("pushdown", True) and not pipeline_config.get("validation_rules"):
+                plan, transformations = self.plan_optimizer.optimize(transformations)
+
             # Step 1: Extract
             self.logger.info("Starting extraction...")
-            df, extract_report = self._extract_data(source_config, pipeline_config.get("extract_config", {}))
+            df, extract_report = self._extract_data(
+                source_config, pipeline_config.get("extract_config", {}), plan
+            )
             execution_report["records_extracted"] = len(df)
             execution_report["steps"].append({"name": "extract", "status": "completed", "report": extract_report})
             self.logger.info(f"Extracted {len(df)} records")
@@ -70,9 +92,7 @@ class PipelineService:
             # Step 3: Transform
             if pipeline_config.get("transform_config", {}).get("transformations"):
                 self.logger.info("Applying transformations...")
-                df = self.transformation_service.apply_transformations(
-                    df, pipeline_config["transform_config"]["transformations"]
-                )
+                df = self.transformation_service.apply_transformations(df, transformations)
                 execution_report["records_transformed"] = len(df)
                 execution_report["steps"].append(
                     {"name": "transform", "status": "completed", "records": len(df)}
@@ -124,8 +144,26 @@ class PipelineService:
 
         return execution_report
 
+    def _execute_dag(
+        self,
+        dag: Dict[str, Any],
+        pipeline_config: Dict[str, Any],
+        source_config: Dict[str, Any],
+        execution_report: Dict[str, Any],
+    ) -> None:
+        """Run a pipeline DAG, in parallel unless parallel processing is disabled."""
+        default_workers = DEFAULT_DAG_WORKERS if pipeline_config.get("parallel_processing", True) else 1
+        executor = DAGExecutor(
+            self,
+            max_workers=dag.get("max_workers") or default_workers,
+            cache_dir=dag.get("cache_dir"),
+            spill_threshold_mb=dag.get("spill_threshold_mb"),
+        )
+        self.logger.info(f"Executing pipeline DAG with {executor.max_workers} workers...")
+        executor.execute(dag.get("nodes", []), source_config, execution_report)
+
     def _extract_data(
-        self, source_config: Dict[str, Any], extract_config: Dict[str, Any]
+        self, source_config: Dict[str, Any], extract_config: Dict[str, Any], plan: Optional[ScanPlan] = None
     ) -> tuple[pd.DataFrame, Dict[str, Any]]:
         """Extract data from source."""
         try:
@@ -140,7 +178,10 @@ class PipelineService:
                 raise RuntimeError("Failed to connect to data source")
 
             # Extract
-            df = connector.extract(extract_config.get("query"))
+            if plan is not None and not plan.is_empty:
+                df = connector.extract_plan(extract_config.get("query"), plan)
+            else:
+                df = connector.extract(extract_config.get("query"))
 
             # Disconnect
             connector.disconnect()
@@ -150,6 +191,8 @@ class PipelineService:
                 "records_extracted": len(df),
                 "columns": list(df.columns),
             }
+            if plan is not None and not plan.is_empty:
+                report["pushdown"] = plan.describe()
 
             return df, report
 
@@ -0,0 +1,221 @@
+"""Logical plan optimizer for transformation pipelines."""
+from typing import Any, Dict, List, Optional, Set, Tuple
+from modules.etl.core.constants import TransformationType
+from modules.etl.pushdown import FILTER_OPERATORS, ScanPlan
+from shared.utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Steps whose result depends on which rows are present, so filters cannot move past them
+_ROW_DEPENDENT = {
+    TransformationType.AGGREGATE,
+    TransformationType.GROUP_BY,
+    TransformationType.DEDUPLICATE,
+}
+
+# Default new_column suffixes of date_operation
+_DATE_SUFFIXES = {
+    "extract_year": "year",
+    "extract_month": "month",
+    "extract_day": "day",
+    "extract_weekday": "weekday",
+    "diff": "diff",
+}
+
+
+def _names(columns: Any) -> Set[str]:
+    """Column names from a single name or a list of names."""
+    return {columns} if isinstance(columns, str) else set(columns)
+
+
+class PlanOptimizer:
+    """
+    Pushes row filters and column selections from transformations into the source scan.
+
+    filter_rows conditions are hoisted into the scan when every step before
+    them is row-independent and leaves the filtered column unchanged.
+    Projection is derived from the columns the remaining steps read, working
+    back from the last step that narrows the column set (select_columns,
+    aggregate or group_by). Renames are traced so pushed filters and columns
+    use source names.
+    """
+
+    def __init__(self):
+        self.logger = logger
+
+    def optimize(
+        self, transformations: List[Dict[str, Any]]
+    ) -> Tuple[ScanPlan, List[Dict[str, Any]]]:
+        """
+        Split transformations into a scan plan and the steps left to apply.
+
+        Args:
+            transformations: Transformation steps as passed to apply_transformations
+
+        Returns:
+            Tuple of (scan plan, remaining transformations)
+        """
+        filters, remaining = self._push_filters(transformations)
+        plan = ScanPlan(columns=self._required_columns(remaining), filters=filters)
+
+        if not plan.is_empty:
+            self.logger.info(
+                f"Pushed {len(filters)} filters and "
+                f"{len(plan.columns) if plan.columns is not None else 'all'} columns into the scan"
+            )
+        return plan, remaining
+
+    def _push_filters(
+        self, transformations: List[Dict[str, Any]]
+    ) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Hoist filter conditions on unmodified source columns into the scan."""
+        sources: Dict[str, str] = {}
+        modified: Set[str] = set()
+        pushed: List[Dict[str, Any]] = []
+        remaining: List[Dict[str, Any]] = []
+        blocked = False
+
+        for transform in transformations:
+            transform_type = transform.get("type")
+            config = transform.get("config", {})
+
+            if blocked or transform_type != TransformationType.FILTER_ROWS:
+                remaining.append(transform)
+                if blocked:
+                    continue
+
+                if transform_type == TransformationType.RENAME_COLUMNS:
+                    mapping = config.get("mapping", {})
+                    sources = {
+                        mapping.get(name, name): source for name, source in sources.items()
+                    }
+                    for old, new in mapping.items():
+                        sources.setdefault(new, old)
+                        if old in modified:
+                            modified.discard(old)
+                            modified.add(new)
+                        if old not in mapping.values():
+                            # Renamed away; filters on the old name must still fail
+                            modified.add(old)
+                    continue
+
+                if transform_type in _ROW_DEPENDENT or (
+                    transform_type == TransformationType.FILL_NULL
+                    and config.get("strategy", "constant") != "constant"
+                ):
+                    blocked = True
+                    continue
+
+                written = self._written_columns(transform_type, config)
+                if written is None:
+                    blocked = True
+                else:
+                    modified |= written
+                continue
+
+            kept = []
+            for condition in config.get("conditions", []):
+                column = condition.get("column")
+                if column in modified or condition.get("operator") not in FILTER_OPERATORS:
+                    kept.append(condition)
+                else:
+                    pushed.append({**condition, "column": sources.get(column, column)})
+
+            if kept:
+                remaining.append({**transform, "config": {**config, "conditions": kept}})
+
+        return pushed, remaining
+
+    @staticmethod
+    def _written_columns(transform_type: str, config: Dict[str, Any]) -> Optional[Set[str]]:
+        """Columns a step creates or changes, or None if it may change any column."""
+        column = config.get("column")
+
+        if transform_type in (
+            TransformationType.SELECT_COLUMNS,
+            TransformationType.DROP_NULL,
+            TransformationType.SORT,
+        ):
+            return set()
+        if transform_type == TransformationType.DROP_COLUMNS:
+            return _names(config.get("columns", []))
+        if transform_type == TransformationType.CONVERT_TYPE:
+            return set(config.get("conversions", {}))
+        if transform_type == TransformationType.FILL_NULL:
+            columns = config.get("columns")
+            return _names(columns) if columns else None
+        if transform_type == TransformationType.REPLACE_VALUE:
+            return {column}
+        if transform_type == TransformationType.REGEX_EXTRACT:
+            return {config.get("new_column", f"{column}_extracted")}
+        if transform_type == TransformationType.STRING_OPERATION:
+            return {column, *config.get("new_columns", [])}
+        if transform_type == TransformationType.DATE_OPERATION:
+            suffix = _DATE_SUFFIXES.get(config.get("operation"))
+            if suffix is None:
+                return {column}
+            return {column, config.get("new_column", f"{column}_{suffix}")}
+        if transform_type == TransformationType.MATH_OPERATION:
+            return {config.get("new_column", f"{column}_result")}
+        return None
+
+    def _required_columns(self, transformations: List[Dict[str, Any]]) -> Optional[List[str]]:
+        """Work back through the steps to the source columns they need, if bounded."""
+        live: Optional[Set[str]] = None
+
+        for transform in reversed(transformations):
+            transform_type = transform.get("type")
+            config = transform.get("config", {})
+
+            if transform_type == TransformationType.SELECT_COLUMNS:
+                live = _names(config.get("columns", []))
+            elif transform_type == TransformationType.GROUP_BY:
+                live = _names(config.get("columns", [])) | set(config.get("aggregations", {}))
+            elif transform_type == TransformationType.AGGREGATE:
+                live = set(config.get("aggregations", {}))
+            elif live is None:
+                continue
+            elif transform_type == TransformationType.RENAME_COLUMNS:
+                mapping = config.get("mapping", {})
+                inverse = {new: old for old, new in mapping.items()}
+                live = {inverse.get(name, name) for name in live}
+            else:
+                read = self._read_columns(transform_type, config)
+                if read is None:
+                    live = None
+                else:
+                    created = self._written_columns(transform_type, config) or set()
+                    live = (live - (created - read)) | read
+
+        return sorted(live) if live is not None else None
+
+    @staticmethod
+    def _read_columns(transform_type: str, config: Dict[str, Any]) -> Optional[Set[str]]:
+        """Columns a step reads, or None if it depends on every column."""
+        column = config.get("column")
+
+        if transform_type == TransformationType.FILTER_ROWS:
+            return {condition.get("column") for condition in config.get("conditions", [])}
+        if transform_type in (TransformationType.DROP_COLUMNS, TransformationType.SORT):
+            columns = config.get("columns", [])
+            return _names(columns)
+        if transform_type == TransformationType.CONVERT_TYPE:
+            return set(config.get("conversions", {}))
+        if transform_type in (TransformationType.FILL_NULL, TransformationType.DROP_NULL):
+            columns = config.get("columns")
+            return _names(columns) if columns else None
+        if transform_type == TransformationType.DEDUPLICATE:
+            subset = config.get("subset")
+            if not subset:
+                return None
+            return _names(subset)
+        if transform_type in (
+            TransformationType.REPLACE_VALUE,
+            TransformationType.REGEX_EXTRACT,
+            TransformationType.STRING_OPERATION,
+            TransformationType.MATH_OPERATION,
+        ):
+            return {column}
+        if transform_type == TransformationType.DATE_OPERATION:
+            return {column, config.get("other_column")} - {None}
+        return None
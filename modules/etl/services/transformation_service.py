@@ -3,6 +3,7 @@ from typing import Any, Dict, List, Callable
 import pandas as pd
 import numpy as np
 from modules.etl.core.constants import TransformationType
+from modules.etl.pushdown import filter_mask
 from shared.utils.logger import get_logger
 import re
 from datetime import datetime
@@ -36,7 +37,8 @@ class TransformationService:
 
     def apply_transformations(self, df: pd.DataFrame, transformations: List[Dict[str, Any]]) -> pd.DataFrame:
         """Apply a list of transformations to a DataFrame."""
-        result_df = df.copy()
+        # Steps never write into their input frame, so the caller's data needs no deep copy
+        result_df = df.copy(deep=False)
 
         for idx, transform in enumerate(transformations):
             try:
@@ -75,43 +77,13 @@ class TransformationService:
 
     def filter_rows(self, df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
         """Filter rows based on conditions."""
-        conditions = config.get("conditions", [])
-        result_df = df.copy()
-
-        for condition in conditions:
-            column = condition.get("column")
-            operator = condition.get("operator")
-            value = condition.get("value")
-
-            if operator == "==":
-                result_df = result_df[result_df[column] == value]
-            elif operator == "!=":
-                result_df = result_df[result_df[column] != value]
-            elif operator == ">":
-                result_df = result_df[result_df[column] > value]
-            elif operator == ">=":
-                result_df = result_df[result_df[column] >= value]
-            elif operator == "<":
-                result_df = result_df[result_df[column] < value]
-            elif operator == "<=":
-                result_df = result_df[result_df[column] <= value]
-            elif operator == "in":
-                result_df = result_df[result_df[column].isin(value)]
-            elif operator == "not in":
-                result_df = result_df[~result_df[column].isin(value)]
-            elif operator == "contains":
-                result_df = result_df[result_df[column].str.contains(value, na=False)]
-            elif operator == "startswith":
-                result_df = result_df[result_df[column].str.startswith(value, na=False)]
-            elif operator == "endswith":
-                result_df = result_df[result_df[column].str.endswith(value, na=False)]
-
-        return result_df
+        mask = filter_mask(df, config.get("conditions", []))
+        return df if mask is None else df[mask]
 
     def convert_type(self, df: pd.DataFrame, config: Dict[str, Any]) -> pd.DataFrame:
         """Convert column data types."""
         conversions = config.get("conversions", {})
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
 
         for column, dtype in conversions.items():
             if column not in result_df.columns:
@@ -139,7 +111,7 @@ class TransformationService:
         columns = config.get("columns", None)
         value = config.get("value", None)
 
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
         target_columns = columns if columns else result_df.columns
 
         if strategy == "constant":
@@ -171,7 +143,7 @@ class TransformationService:
         column = config.get("column")
         replacements = config.get("replacements", {})
 
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
         result_df[column] = result_df[column].replace(replacements)
         return result_df
 
@@ -207,7 +179,7 @@ class TransformationService:
         pattern = config.get("pattern")
         new_column = config.get("new_column", f"{column}_extracted")
 
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
         result_df[new_column] = result_df[column].str.extract(pattern, expand=False)
         return result_df
 
@@ -216,7 +188,7 @@ class TransformationService:
         column = config.get("column")
         operation = config.get("operation")  # upper, lower, strip, etc.
 
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
 
         if operation == "upper":
             result_df[column] = result_df[column].str.upper()
@@ -247,7 +219,7 @@ class TransformationService:
         column = config.get("column")
         operation = config.get("operation")
 
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
         result_df[column] = pd.to_datetime(result_df[column], errors="coerce")
 
         if operation == "extract_year":
@@ -281,7 +253,7 @@ class TransformationService:
         column = config.get("column")
         new_column = config.get("new_column", f"{column}_result")
 
-        result_df = df.copy()
+        result_df = df.copy(deep=False)
 
         if operation == "add":
             value = config.get("value", 0)
@@ -0,0 +1,71 @@
+"""
+Tests for the pipeline benchmark harness.
+"""
+
+from modules.etl.benchmarks import bench_pipeline
+from modules.etl.models import JobRun
+from modules.etl.monitoring import JobMetrics, peak_rss_bytes
+
+
+def _report(rows_per_sec, peak_rss_mb, load_rows_per_sec):
+    return {
+        "scenarios": [{
+            "name": "csv/batch",
+            "rows_per_sec": rows_per_sec,
+            "peak_rss_mb": peak_rss_mb,
+            "stages": {"load": {"rows": 100, "seconds": 1.0, "rows_per_sec": load_rows_per_sec}},
+        }]
+    }
+
+
+def test_job_metrics_stage_throughput():
+    metrics = JobMetrics(JobRun())
+    metrics.record_stage_time("extract", 2.0, rows=1000)
+    metrics.record_stage_time("load", 0.0, rows=1000)
+    metrics.record_stage_time("notify", 0.5)
+
+    throughput = metrics.get_stage_throughput()
+
+    assert throughput["extract"] == {"rows": 1000, "seconds": 2.0, "rows_per_sec": 500.0}
+    assert throughput["load"]["rows_per_sec"] is None
+    assert "notify" not in throughput
+    assert metrics.get_metrics()["stage_times"]["notify"] == 0.5
+
+
+def test_peak_rss_bytes_is_positive():
+    peak = peak_rss_bytes()
+    assert peak is None or peak > 0
+
+
+def test_compare_flags_regressions_beyond_tolerance():
+    baseline = _report(1000.0, 100.0, 500.0)
+
+    assert bench_pipeline.compare(_report(900.0, 110.0, 450.0), baseline, tolerance=0.2) == []
+
+    regressions = bench_pipeline.compare(_report(700.0, 130.0, 300.0), baseline, tolerance=0.2)
+    assert {r["metric"] for r in regressions} == {"rows_per_sec", "peak_rss_mb", "load.rows_per_sec"}
+
+
+def test_compare_ignores_new_scenarios_and_missing_metrics():
+    report = _report(10.0, None, 5.0)
+    report["scenarios"].append({**report["scenarios"][0], "name": "sqlite/batch"})
+
+    assert bench_pipeline.compare(report, _report(1000.0, None, None), tolerance=0.2) == [
+        {"scenario": "csv/batch", "metric": "rows_per_sec", "baseline": 1000.0, "current": 10.0, "change": -0.99}
+    ]
+
+
+def test_benchmark_runs_pipeline_end_to_end(tmp_path):
+    report = bench_pipeline.benchmark(
+        rows=500, sources=["csv", "sqlite"], modes=["batch", "streaming"],
+        batch_size=100, data_dir=str(tmp_path), isolate=False
+    )
+
+    assert [s["name"] for s in report["scenarios"]] == [
+        "csv/batch", "csv/streaming", "sqlite/batch", "sqlite/streaming"
+    ]
+    for scenario in report["scenarios"]:
+        assert scenario["status"] == "success"
+        assert scenario["stages"]["load"]["rows"] == 500
+        assert scenario["rows_per_sec"] > 0
+    assert report["meta"]["rows"] == 500
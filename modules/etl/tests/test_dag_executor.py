@@ -0,0 +1,154 @@
+"""
+Tests for DAG pipeline execution.
+"""
+
+import os
+import threading
+
+import pandas as pd
+import pytest
+
+from modules.etl.services import PipelineService
+from modules.etl.services.dag_executor import DAGError, validate_dag
+
+
+def _csv_source(path):
+    return {"source_type": "csv", "connection_config": {"file_path": str(path)}}
+
+
+@pytest.fixture
+def sources(tmp_path):
+    """Write orders and customers CSV files."""
+    orders = tmp_path / "orders.csv"
+    customers = tmp_path / "customers.csv"
+    pd.DataFrame({
+        "order_id": [1, 2, 3, 4],
+        "customer_id": [10, 20, 10, 30],
+        "amount": [5.0, 50.0, 25.0, 8.0],
+    }).to_csv(orders, index=False)
+    pd.DataFrame({"customer_id": [10, 20, 30], "name": ["ann", "bob", "cy"]}).to_csv(customers, index=False)
+    return orders, customers
+
+
+def _dag(orders, customers, output, **options):
+    return {"transform_config": {"dag": {
+        "nodes": [
+            {"id": "orders", "type": "extract", "source": _csv_source(orders), "transformations": [
+                {"type": "filter_rows", "config": {"conditions": [
+                    {"column": "amount", "operator": ">", "value": 6}
+                ]}},
+            ]},
+            {"id": "customers", "type": "extract", "source": _csv_source(customers)},
+            {"id": "upper_names", "type": "transform", "inputs": ["customers"], "transformations": [
+                {"type": "string_operation", "config": {"column": "name", "operation": "upper"}},
+            ]},
+            {"id": "joined", "type": "join", "inputs": ["orders", "upper_names"], "on": "customer_id"},
+            {"id": "output", "type": "load", "inputs": ["joined"],
+             "load_config": {"type": "csv", "config": {"path": str(output)}}},
+        ],
+        **options,
+    }}}
+
+
+def _statuses(report):
+    return {step["name"]: step["status"] for step in report["steps"]}
+
+
+def test_dag_joins_independent_branches(sources, tmp_path):
+    orders, customers = sources
+    output = tmp_path / "out.csv"
+
+    report = PipelineService().execute_pipeline(_dag(orders, customers, output), {})
+
+    assert report["status"] == "completed", report["errors"]
+    result = pd.read_csv(output).sort_values("order_id")
+    assert result["order_id"].tolist() == [2, 3, 4]
+    assert result["name"].tolist() == ["BOB", "ANN", "CY"]
+    assert report["records_extracted"] == 3 + 3
+    assert report["records_transformed"] == 3
+    assert report["records_loaded"] == 3
+    assert set(_statuses(report).values()) == {"completed"}
+
+
+def test_dag_extracts_branches_concurrently(sources, tmp_path, monkeypatch):
+    orders, customers = sources
+    service = PipelineService()
+    barrier = threading.Barrier(2, timeout=5)
+    extract = service._extract_data
+
+    def extract_together(*args, **kwargs):
+        # Both extract nodes must be running at once to pass
+        barrier.wait()
+        return extract(*args, **kwargs)
+
+    monkeypatch.setattr(service, "_extract_data", extract_together)
+    report = service.execute_pipeline(_dag(orders, customers, tmp_path / "out.csv"), {})
+
+    assert report["status"] == "completed", report["errors"]
+
+
+def test_dag_reruns_skip_unchanged_branches(sources, tmp_path):
+    orders, customers = sources
+    output = tmp_path / "out.csv"
+    config = _dag(orders, customers, output, cache_dir=str(tmp_path / "cache"))
+
+    first = PipelineService().execute_pipeline(config, {})
+    second = PipelineService().execute_pipeline(config, {})
+
+    assert set(_statuses(first).values()) == {"completed"}
+    assert _statuses(second) == {
+        "orders": "cached", "customers": "cached", "upper_names": "cached",
+        "joined": "cached", "output": "completed",
+    }
+    assert second["records_loaded"] == 3
+
+    pd.DataFrame({"customer_id": [10, 20, 30], "name": ["al", "bo", "cy"]}).to_csv(customers, index=False)
+    os.utime(customers, ns=(0, os.stat(customers).st_mtime_ns + 10**9))
+    third = PipelineService().execute_pipeline(config, {})
+
+    assert _statuses(third) == {
+        "orders": "cached", "customers": "completed", "upper_names": "completed",
+        "joined": "completed", "output": "completed",
+    }
+    assert sorted(pd.read_csv(output)["name"]) == ["AL", "BO", "CY"]
+
+
+def test_dag_spills_large_results(sources, tmp_path):
+    orders, customers = sources
+    output = tmp_path / "out.csv"
+
+    report = PipelineService().execute_pipeline(
+        _dag(orders, customers, output, spill_threshold_mb=1e-6, max_workers=1), {}
+    )
+
+    assert report["status"] == "completed", report["errors"]
+    assert len(pd.read_csv(output)) == 3
+
+
+def test_dag_failure_skips_downstream_nodes(sources, tmp_path):
+    orders, customers = sources
+    config = _dag(orders, customers, tmp_path / "out.csv")
+    config["transform_config"]["dag"]["nodes"][1]["source"] = _csv_source(tmp_path / "missing.csv")
+
+    report = PipelineService().execute_pipeline(config, {})
+
+    assert report["status"] == "failed"
+    statuses = _statuses(report)
+    assert statuses["customers"] == "failed"
+    assert statuses["upper_names"] == statuses["joined"] == statuses["output"] == "skipped"
+
+
+@pytest.mark.parametrize("nodes, message", [
+    ([], "no nodes"),
+    ([{"id": "a", "type": "extract"}, {"id": "a", "type": "extract"}], "Duplicate"),
+    ([{"id": "a", "type": "explode"}], "Unknown node type"),
+    ([{"id": "a", "type": "transform", "inputs": ["b"]}], "unknown node"),
+    ([{"id": "a", "type": "extract"}, {"id": "b", "type": "join", "inputs": ["a"]}], "takes 2 inputs"),
+    ([
+        {"id": "a", "type": "transform", "inputs": ["b"]},
+        {"id": "b", "type": "transform", "inputs": ["a"]},
+    ], "cycle"),
+])
+def test_validate_dag_rejects_invalid_graphs(nodes, message):
+    with pytest.raises(DAGError, match=message):
+        validate_dag(nodes)
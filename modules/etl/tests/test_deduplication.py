@@ -0,0 +1,101 @@
+"""
+Tests for fuzzy deduplication.
+"""
+
+import hashlib
+
+import pandas as pd
+import pytest
+
+from modules.etl.services import DeduplicationService, FuzzyDeduplicator
+from modules.etl.services.fuzzy_dedup import UnionFind
+
+
+@pytest.fixture
+def people():
+    """Records with near-duplicate spellings."""
+    return pd.DataFrame([
+        {"name": "Jonathan Smithers", "city": "Springfield"},
+        {"name": "Jonathan Smithers ", "city": "springfield"},
+        {"name": "Jonathon Smithers", "city": "Springfield"},
+        {"name": "Margaret Holloway", "city": "Shelbyville"},
+        {"name": "Margaret Holloway", "city": "Capital City"},
+        {"name": "Bartholomew Quince", "city": "Ogdenville"},
+    ])
+
+
+def test_fuzzy_deduplication_removes_near_duplicates(people):
+    """Test near-duplicate rows collapse to the first row of each cluster."""
+    service = DeduplicationService()
+    result, report = service.deduplicate(people, {
+        "strategy": "fuzzy",
+        "subset": ["name", "city"],
+        "similarity_threshold": 0.8,
+    })
+
+    assert report["duplicates_removed"] == 2
+    assert result["name"].tolist() == [
+        "Jonathan Smithers", "Margaret Holloway", "Margaret Holloway", "Bartholomew Quince",
+    ]
+
+
+def test_fuzzy_deduplication_respects_blocking_keys(people):
+    """Test rows in different blocks are never compared."""
+    people["region"] = ["north", "south", "north", "east", "east", "west"]
+
+    result = FuzzyDeduplicator({
+        "subset": ["name", "city"],
+        "similarity_threshold": 0.8,
+        "blocking_keys": ["region"],
+    }).deduplicate(people)
+
+    assert len(result) == 5
+    assert "Jonathan Smithers " in result["name"].tolist()
+
+
+def test_fuzzy_duplicate_groups_shape(people):
+    """Test fuzzy groups match the exact-groups mapping shape."""
+    service = DeduplicationService()
+    groups = service.get_duplicate_groups(
+        people, ["name", "city"], {"strategy": "fuzzy", "similarity_threshold": 0.8}
+    )
+
+    assert len(groups) == 1
+    group = next(iter(groups.values()))
+    assert isinstance(group, pd.DataFrame)
+    assert group.index.tolist() == [0, 1, 2]
+    assert len(next(iter(groups))) == 32
+
+
+def test_fuzzy_keep_false_drops_all_members(people):
+    """Test keep=False drops every member of a duplicate cluster."""
+    result = FuzzyDeduplicator({"subset": ["name"], "similarity_threshold": 0.8}).deduplicate(people, keep=False)
+
+    assert result["name"].tolist() == ["Bartholomew Quince"]
+
+
+def test_fuzzy_matches_pairwise_engine():
+    """Test the LSH engine finds the same duplicates as the pairwise scan."""
+    base = [f"{hashlib.md5(str(i).encode()).hexdigest()[:16]} customer" for i in range(200)]
+    typos = [text + "s" for text in base[::10]]
+    df = pd.DataFrame({"name": base + typos})
+
+    service = DeduplicationService()
+    config = {"strategy": "fuzzy", "similarity_threshold": 0.9}
+    lsh, _ = service.deduplicate(df, config)
+    pairwise, _ = service.deduplicate(df, {**config, "engine": "pairwise"})
+
+    assert sorted(lsh["name"]) == sorted(pairwise["name"]) == sorted(base)
+
+
+def test_union_find_merges_transitively():
+    """Test union-find joins chains into one set."""
+    union_find = UnionFind(5)
+    union_find.union(0, 1)
+    union_find.union(1, 2)
+    union_find.union(3, 4)
+
+    roots = union_find.roots()
+    assert roots[0] == roots[1] == roots[2]
+    assert roots[3] == roots[4]
+    assert roots[0] != roots[3]
@@ -0,0 +1,119 @@
+"""
+Tests for compiled computed-field expressions.
+"""
+
+import numpy as np
+import pytest
+from modules.etl.expressions import (
+    MISSING,
+    ExpressionError,
+    compile_expression
+)
+from modules.etl.transformers import DataEnricher
+
+
+def columns(**values):
+    """Build object columns for evaluation."""
+    return {name: np.array(cells, dtype=object) for name, cells in values.items()}
+
+
+def test_arithmetic_over_columns():
+    """Test arithmetic is evaluated over whole columns."""
+    expression = compile_expression("{price} * {qty} - 1")
+    values, errors = expression.evaluate(columns(price=[2.5, 10], qty=[2, 3]), 2)
+
+    assert values.tolist() == [4.0, 29]
+    assert errors == {}
+    assert expression.fields == ["price", "qty"]
+
+
+def test_numeric_strings_are_coerced():
+    """Test string fields holding numbers behave as numbers."""
+    values, _ = compile_expression("{a} + {b}").evaluate(columns(a=["1", "2.5"], b=[1, 1]), 2)
+
+    assert values.tolist() == [2, 3.5]
+
+
+def test_placeholders_inside_strings():
+    """Test placeholders inside string literals are formatted."""
+    expression = compile_expression("'{first} {last}'")
+    values, errors = expression.evaluate(columns(first=["John", "Jane"], last=["Doe", MISSING]), 2)
+
+    assert values.tolist() == ["John Doe", "Jane {last}"]
+    assert errors == {}
+
+
+def test_errors_are_reported_per_row():
+    """Test failing rows do not abort the batch."""
+    expression = compile_expression("{a} / {b}")
+    values, errors = expression.evaluate(columns(a=[1, 2, "x", 4], b=[2, 0, 1, MISSING]), 4)
+
+    assert values.tolist() == [0.5, None, None, None]
+    assert sorted(errors) == [1, 2, 3]
+    assert errors[1].startswith("ZeroDivisionError")
+
+
+def test_sequence_repeat_is_bounded():
+    """Test repeating strings, lists or tuples past the limit fails the row."""
+    sequences = np.empty(3, dtype=object)
+    sequences[:] = ["ab", [0], (1, 2)]
+    expression = compile_expression("{seq} * {n}")
+
+    values, errors = expression.evaluate({"seq": sequences, "n": np.array([2, 2, 2], dtype=object)}, 3)
+    assert values.tolist() == ["abab", [0, 0], (1, 2, 1, 2)]
+    assert errors == {}
+
+    values, errors = expression.evaluate(
+        {"seq": sequences, "n": np.array([10 ** 9] * 3, dtype=object)}, 3
+    )
+    assert values.tolist() == [None, None, None]
+    assert sorted(errors) == [0, 1, 2]
+    assert all(error.startswith("ValueError") for error in errors.values())
+
+
+def test_boolean_logic_short_circuits_per_row():
+    """Test and/or/if only fail rows that evaluate the failing branch."""
+    expression = compile_expression("{b} != 0 and {a} / {b} > 1")
+    values, errors = expression.evaluate(columns(a=[4, 4], b=[2, 0]), 2)
+
+    assert values.tolist() == [True, False]
+    assert errors == {}
+
+
+def test_whitelisted_functions():
+    """Test whitelisted functions can be called."""
+    expression = compile_expression("upper('{name}') + str(round({score}, 1))")
+
+    assert expression.evaluate_record({"name": "ann", "score": 9.46}) == "ANN9.5"
+
+
+@pytest.mark.parametrize("source", [
+    "__import__('os').system('true')",
+    "{a}.__class__",
+    "open('/etc/passwd')",
+    "[x for x in {a}]",
+    "lambda: 1",
+    "{a} {b}"
+])
+def test_disallowed_expressions(source):
+    """Test expressions outside the whitelist are rejected."""
+    with pytest.raises(ExpressionError):
+        compile_expression(source)
+
+
+def test_enricher_evaluates_computed_fields_in_batch():
+    """Test DataEnricher computes fields and tolerates bad rows."""
+    enricher = DataEnricher({
+        "computed_fields": {
+            "total": "{price} * {qty}",
+            "broken": "{price} +"
+        }
+    })
+    result = enricher.transform([
+        {"price": 2, "qty": 3},
+        {"price": None, "qty": 3}
+    ])
+
+    assert result[0]["total"] == 6
+    assert result[1]["total"] is None
+    assert result[0]["broken"] is None
@@ -0,0 +1,121 @@
+"""
+Tests for data loaders.
+"""
+
+import pytest
+from sqlalchemy import create_engine, text
+from modules.etl.loaders import DatabaseLoader, LoadException
+from modules.etl.models import DataTarget, SourceType, DatabaseType, LoadStrategy
+
+
+@pytest.fixture
+def sqlite_target(tmp_path):
+    """SQLite data target with an items table."""
+    database = str(tmp_path / "target.db")
+    engine = create_engine(f"sqlite:///{database}")
+    with engine.begin() as conn:
+        conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, price REAL)"))
+    engine.dispose()
+
+    return DataTarget(
+        name="SQLite Target",
+        target_type=SourceType.DATABASE,
+        database_type=DatabaseType.SQLITE,
+        database_name=database,
+        load_strategy=LoadStrategy.APPEND
+    )
+
+
+def fetch(target, table="items"):
+    """Read all rows from a target table."""
+    engine = create_engine(f"sqlite:///{target.database_name}")
+    with engine.connect() as conn:
+        rows = conn.execute(text(f"SELECT * FROM {table} ORDER BY 1")).fetchall()
+    engine.dispose()
+    return [tuple(row) for row in rows]
+
+
+def test_bulk_append_in_batches(sqlite_target):
+    """Test bulk append loads every batch and maps NaN to NULL."""
+    data = [{"id": i, "name": f"item {i}", "price": 1.5} for i in range(1, 6)]
+    data[1]["price"] = float("nan")
+
+    with DatabaseLoader(sqlite_target, {"table_name": "items", "batch_size": 2}) as loader:
+        loaded = loader.load(data)
+
+    assert loaded == 5
+    rows = fetch(sqlite_target)
+    assert len(rows) == 5
+    assert rows[1] == (2, "item 2", None)
+
+
+def test_bulk_append_failure_is_atomic(sqlite_target):
+    """Test a failing batch leaves no rows from earlier batches behind."""
+    data = [{"id": i, "name": f"item {i}", "price": 1.5} for i in range(1, 41)]
+    data[34]["id"] = 1
+
+    config = {"table_name": "items", "batch_size": 10, "bulk_load_workers": 4}
+    with DatabaseLoader(sqlite_target, config) as loader:
+        with pytest.raises(LoadException):
+            loader.load(data)
+
+    assert fetch(sqlite_target) == []
+
+
+def test_bulk_upsert_last_record_wins(sqlite_target):
+    """Test bulk upsert replaces existing keys and duplicate keys keep the last record."""
+    config = {"table_name": "items", "key_columns": ["id"]}
+
+    with DatabaseLoader(sqlite_target, config) as loader:
+        loader.load([{"id": 1, "name": "a", "price": 1.0}, {"id": 2, "name": "b", "price": 2.0}])
+        loaded = loader.load(
+            [{"id": 2, "name": "B", "price": 3.0}, {"id": 3, "name": "c", "price": 4.0},
+             {"id": 3, "name": "C", "price": 5.0}],
+            LoadStrategy.UPSERT
+        )
+
+    assert loaded == 3
+    assert fetch(sqlite_target) == [(1, "a", 1.0), (2, "B", 3.0), (3, "C", 5.0)]
+
+
+def test_bulk_full_load_replaces_rows(sqlite_target):
+    """Test full load clears the table first."""
+    with DatabaseLoader(sqlite_target, {"table_name": "items"}) as loader:
+        loader.load([{"id": 1, "name": "old", "price": 1.0}])
+        loader.load([{"id": 7, "name": "new", "price": 2.0}], LoadStrategy.FULL)
+
+    assert fetch(sqlite_target) == [(7, "new", 2.0)]
+
+
+def test_bulk_load_creates_missing_table(sqlite_target):
+    """Test bulk load creates the target table when it does not exist."""
+    with DatabaseLoader(sqlite_target, {"table_name": "fresh"}) as loader:
+        loader.load([{"a": 1, "b": "x"}, {"a": 2, "b": None}])
+
+    assert fetch(sqlite_target, "fresh") == [(1, "x"), (2, None)]
+
+
+def test_bulk_load_creates_table_for_all_keys(sqlite_target):
+    """Test a created table has every record's keys and honours the schema."""
+    data = [{"a": 1}, {"a": 2, "b": None}, {"a": 3, "b": "x", "c": 1.5}]
+
+    with DatabaseLoader(sqlite_target, {"table_name": "main.wide"}) as loader:
+        loader.load(data)
+        loader.load(data, LoadStrategy.REPLACE)
+
+    assert fetch(sqlite_target, "wide") == [(1, None, None), (2, None, None), (3, "x", 1.5)]
+
+
+def test_copy_field_formatting():
+    """Test COPY CSV fields distinguish NULL from empty strings."""
+    assert DatabaseLoader._copy_field(None) == ""
+    assert DatabaseLoader._copy_field("") == '""'
+    assert DatabaseLoader._copy_field('say "hi"') == '"say ""hi"""'
+    assert DatabaseLoader._copy_field({"a": 1}) == '"{""a"": 1}"'
+
+
+def test_bulk_load_rejects_unsupported_strategy(sqlite_target):
+    """Test unsupported strategies raise LoadException."""
+    with DatabaseLoader(sqlite_target, {"table_name": "items"}) as loader:
+        with pytest.raises(LoadException):
+            loader.load([{"id": 1}], LoadStrategy.INCREMENTAL)
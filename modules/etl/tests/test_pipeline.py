@@ -0,0 +1,211 @@
+"""
+Tests for streaming pipeline execution.
+"""
+
+import sqlite3
+
+from modules.etl.models import (
+    DataSource,
+    DataTarget,
+    DatabaseType,
+    ETLJob,
+    JobRun,
+    LoadStrategy,
+    SourceType,
+)
+from modules.etl.pipeline import ETLPipeline
+
+
+def _make_source_db(path, rows):
+    """Create a SQLite source table with (id, name, updated_at) rows."""
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE items (id INTEGER PRIMARY KEY, name TEXT, updated_at INTEGER)")
+    conn.executemany("INSERT INTO items VALUES (?, ?, ?)", rows)
+    conn.commit()
+    conn.close()
+
+
+def _count(path, table="items_copy"):
+    """Count rows in a SQLite table."""
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def _make_job(source_path, target_path, **kwargs):
+    """Build an unsaved SQLite-to-SQLite job."""
+    source = DataSource(
+        name="source",
+        source_type=SourceType.DATABASE,
+        database_type=DatabaseType.SQLITE,
+        database_name=str(source_path),
+    )
+    target = DataTarget(
+        name="target",
+        target_type=SourceType.DATABASE,
+        database_type=DatabaseType.SQLITE,
+        database_name=str(target_path),
+        load_strategy=LoadStrategy.APPEND,
+    )
+    job = ETLJob(
+        id=1,
+        name="streaming job",
+        extraction_query="SELECT id, name, updated_at FROM items",
+        extraction_config={},
+        transformation_steps=kwargs.pop("transformation_steps", []),
+        load_strategy=kwargs.pop("load_strategy", LoadStrategy.APPEND),
+        batch_size=kwargs.pop("batch_size", 25),
+        max_retries=0,
+        retry_delay_seconds=0,
+        **kwargs,
+    )
+    job.source = source
+    job.target = target
+    return job
+
+
+def test_streaming_loads_all_batches(tmp_path):
+    """Test streaming mode moves every row through bounded batches."""
+    source_path, target_path = tmp_path / "source.db", tmp_path / "target.db"
+    _make_source_db(source_path, [(i, f"item {i}", i) for i in range(1, 101)])
+
+    job = _make_job(source_path, target_path, load_strategy=LoadStrategy.REPLACE)
+    pipeline = ETLPipeline(job, config={
+        "streaming": True,
+        "target_table": "items_copy",
+        "max_in_flight_batches": 1,
+    })
+
+    result = pipeline.execute()
+
+    assert result["status"] == "success"
+    assert result["metrics"]["records_extracted"] == 100
+    assert result["metrics"]["records_loaded"] == 100
+    assert pipeline.context.metadata["batches_loaded"] == 4
+    assert pipeline.context.data == []
+    assert _count(target_path) == 100
+
+    throughput = result["metrics"]["stage_throughput"]
+    assert set(throughput) == {"extract", "transform", "validate", "load"}
+    assert throughput["load"]["rows"] == 100
+
+
+def test_streaming_applies_transformations(tmp_path):
+    """Test transformation steps run per batch."""
+    source_path, target_path = tmp_path / "source.db", tmp_path / "target.db"
+    _make_source_db(source_path, [(i, f"  item {i}  ", i) for i in range(1, 31)])
+
+    job = _make_job(
+        source_path,
+        target_path,
+        load_strategy=LoadStrategy.REPLACE,
+        transformation_steps=[{"type": "cleaner", "config": {"trim_whitespace": True}}],
+    )
+    pipeline = ETLPipeline(job, config={"streaming": True, "target_table": "items_copy"})
+
+    assert pipeline.execute()["status"] == "success"
+
+    conn = sqlite3.connect(target_path)
+    names = {row[0] for row in conn.execute("SELECT name FROM items_copy")}
+    conn.close()
+    assert names == {f"item {i}" for i in range(1, 31)}
+
+
+def test_streaming_checkpoints_and_resumes(tmp_path, db_session):
+    """Test failed incremental runs resume after the last committed batch."""
+    source_path, target_path = tmp_path / "source.db", tmp_path / "target.db"
+    _make_source_db(source_path, [(i, f"item {i}", i) for i in range(1, 101)])
+
+    job = _make_job(
+        source_path,
+        target_path,
+        load_strategy=LoadStrategy.REPLACE,
+        is_incremental=True,
+        watermark_column="updated_at",
+    )
+    job.id = None
+    db_session.add(job)
+    db_session.commit()
+
+    pipeline = ETLPipeline(job, db_session, config={"streaming": True, "target_table": "items_copy"})
+
+    # Fail the third load
+    original_load = pipeline.retry_logic.execute_with_retry
+    calls = {"count": 0}
+
+    def flaky(func, *args, **kwargs):
+        calls["count"] += 1
+        if calls["count"] == 3:
+            raise RuntimeError("target unavailable")
+        return original_load(func, *args, **kwargs)
+
+    pipeline.retry_logic.execute_with_retry = flaky
+
+    result = pipeline.execute()
+    assert result["status"] == "failed"
+    assert _count(target_path) == 50
+    assert job.last_watermark_value == "49"
+
+    failed_run = db_session.query(JobRun).filter(JobRun.job_id == job.id).one()
+    assert failed_run.records_loaded == 50
+    assert "stage_throughput" in failed_run.execution_context
+
+    # Rows 50..100 are re-read; row 50 was held back because ties may follow
+    job.load_strategy = LoadStrategy.UPSERT
+    resumed = ETLPipeline(job, db_session, config={
+        "streaming": True,
+        "target_table": "items_copy",
+        "key_columns": ["id"],
+    })
+    result = resumed.execute()
+
+    assert result["status"] == "success"
+    assert result["metrics"]["records_extracted"] == 51
+    assert _count(target_path) == 100
+    assert job.last_watermark_value == "100"
+
+
+def test_batch_watermark_holds_back_ties():
+    """Test the trailing tie group is not checkpointed until complete."""
+    batch = [{"ts": 1}, {"ts": 2}, {"ts": 3}, {"ts": 3}]
+
+    assert ETLPipeline._batch_watermark(batch, "ts", None) == (2, 3)
+    assert ETLPipeline._batch_watermark([{"ts": 3}, {"ts": 3}], "ts", 3) == (None, 3)
+    assert ETLPipeline._batch_watermark([{"ts": 4}], "ts", 3) == (3, 4)
+
+
+def test_streaming_extraction_error_fails_run(tmp_path):
+    """Test extraction errors stop the stream and fail the run."""
+    source_path, target_path = tmp_path / "source.db", tmp_path / "target.db"
+    _make_source_db(source_path, [(1, "item", 1)])
+
+    job = _make_job(source_path, target_path)
+    job.extraction_query = "SELECT * FROM missing_table"
+    pipeline = ETLPipeline(job, config={"streaming": True, "target_table": "items_copy"})
+
+    result = pipeline.execute()
+
+    assert result["status"] == "failed"
+    assert any(error["stage"] == "extract" for error in result["errors"])
+
+
+def test_streaming_partitioned_extraction(tmp_path):
+    """Test partitioned extraction loads every row and checkpoints the final watermark."""
+    source_path, target_path = tmp_path / "source.db", tmp_path / "target.db"
+    _make_source_db(source_path, [(i, f"item {i}", i) for i in range(1, 101)])
+
+    job = _make_job(
+        source_path,
+        target_path,
+        load_strategy=LoadStrategy.REPLACE,
+        is_incremental=True,
+        watermark_column="updated_at",
+    )
+    job.extraction_config = {"partitions": 4}
+    pipeline = ETLPipeline(job, config={"streaming": True, "target_table": "items_copy"})
+
+    assert pipeline.execute()["status"] == "success"
+    assert _count(target_path) == 100
+    assert job.last_watermark_value == "100"
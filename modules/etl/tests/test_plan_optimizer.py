@@ -0,0 +1,97 @@
+"""
+Tests for transformation plan optimization.
+"""
+
+import pandas as pd
+
+from modules.etl.services import PlanOptimizer, TransformationService
+from modules.etl.pushdown import read_csv
+
+
+def filter_step(column, operator, value):
+    """Build a single-condition filter_rows step."""
+    return {"type": "filter_rows", "config": {"conditions": [
+        {"column": column, "operator": operator, "value": value}
+    ]}}
+
+
+def test_filters_are_traced_through_renames():
+    """Test a filter after a rename is pushed with the source column name."""
+    plan, remaining = PlanOptimizer().optimize([
+        {"type": "rename_columns", "config": {"mapping": {"amt": "amount"}}},
+        filter_step("amount", ">", 10),
+        {"type": "select_columns", "config": {"columns": ["id", "amount"]}},
+    ])
+
+    assert plan.filters == [{"column": "amt", "operator": ">", "value": 10}]
+    assert plan.columns == ["amt", "id"]
+    assert [step["type"] for step in remaining] == ["rename_columns", "select_columns"]
+
+
+def test_filters_stay_after_modifying_or_row_dependent_steps():
+    """Test filters on changed columns or after deduplication are not pushed."""
+    plan, remaining = PlanOptimizer().optimize([
+        {"type": "string_operation", "config": {"column": "name", "operation": "upper"}},
+        filter_step("name", "==", "A"),
+        filter_step("id", ">", 1),
+        {"type": "deduplicate", "config": {"subset": ["name"]}},
+        filter_step("score", ">", 5),
+    ])
+
+    assert plan.filters == [{"column": "id", "operator": ">", "value": 1}]
+    assert plan.columns is None
+    assert [step["type"] for step in remaining] == [
+        "string_operation", "filter_rows", "deduplicate", "filter_rows",
+    ]
+
+
+def test_projection_includes_columns_read_before_selection():
+    """Test columns read by steps before a selection are kept in the scan."""
+    plan, _ = PlanOptimizer().optimize([
+        {"type": "math_operation", "config": {"column": "price", "operation": "multiply",
+                                             "value": 2, "new_column": "double"}},
+        {"type": "sort", "config": {"columns": ["created"]}},
+        {"type": "select_columns", "config": {"columns": ["id", "double"]}},
+    ])
+
+    assert plan.columns == ["created", "id", "price"]
+
+
+def test_optimized_plan_matches_unoptimized_result(tmp_path):
+    """Test scanning with the plan and applying the rest equals the full pipeline."""
+    df = pd.DataFrame({
+        "id": range(10),
+        "amt": [i * 5.0 for i in range(10)],
+        "name": [f" n{i} " for i in range(10)],
+        "unused": range(10),
+    })
+    path = tmp_path / "data.csv"
+    df.to_csv(path, index=False)
+    transformations = [
+        {"type": "rename_columns", "config": {"mapping": {"amt": "amount"}}},
+        {"type": "string_operation", "config": {"column": "name", "operation": "strip"}},
+        filter_step("amount", ">=", 15),
+        filter_step("name", "!=", "n5"),
+        {"type": "select_columns", "config": {"columns": ["name", "amount"]}},
+    ]
+    service = TransformationService()
+
+    plan, remaining = PlanOptimizer().optimize(transformations)
+    optimized = service.apply_transformations(read_csv(str(path), plan, chunk_size=3), remaining)
+    full = service.apply_transformations(pd.read_csv(path), transformations)
+
+    assert "unused" not in plan.columns
+    pd.testing.assert_frame_equal(optimized.reset_index(drop=True), full.reset_index(drop=True))
+
+
+def test_apply_transformations_leaves_input_unchanged():
+    """Test steps never write into the caller's DataFrame."""
+    df = pd.DataFrame({"name": [" a ", " b "], "value": [1, None]})
+    original = df.copy()
+
+    TransformationService().apply_transformations(df, [
+        {"type": "string_operation", "config": {"column": "name", "operation": "strip"}},
+        {"type": "fill_null", "config": {"columns": ["value"], "value": 0}},
+    ])
+
+    pd.testing.assert_frame_equal(df, original)
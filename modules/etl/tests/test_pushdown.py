@@ -0,0 +1,89 @@
+"""
+Tests for scan plan pushdown.
+"""
+
+import pandas as pd
+import pytest
+from sqlalchemy import create_engine, text
+from modules.etl.pushdown import ScanPlan, filter_mask, read_csv, read_parquet
+
+
+@pytest.fixture
+def frame():
+    """Rows with nulls in both a numeric and a text column."""
+    return pd.DataFrame({
+        "id": [1, 2, 3, 4, 5, 6],
+        "amount": [10.0, None, 30.0, 40.0, 50.0, 60.0],
+        "region": ["north", "south", None, "North", "east", "south"],
+    })
+
+
+CONDITIONS = [
+    [{"column": "amount", "operator": ">", "value": 20}],
+    [{"column": "amount", "operator": "!=", "value": 30}],
+    [{"column": "region", "operator": "==", "value": "north"}],
+    [{"column": "region", "operator": "in", "value": ["south", None]}],
+    [{"column": "region", "operator": "not in", "value": ["south"]}],
+    [{"column": "region", "operator": "not in", "value": ["south", None]}],
+    [{"column": "region", "operator": "startswith", "value": "no"}],
+    [{"column": "amount", "operator": ">=", "value": 30}, {"column": "region", "operator": "!=", "value": "east"}],
+]
+
+
+def expected(frame, conditions, columns=None):
+    """Filter a DataFrame the way filter_rows does."""
+    result = frame[filter_mask(frame, conditions)]
+    return result[columns] if columns else result
+
+
+@pytest.mark.parametrize("conditions", CONDITIONS)
+def test_csv_pushdown_matches_pandas_filtering(tmp_path, frame, conditions):
+    """Test chunked CSV filtering returns the same rows as filtering the full frame."""
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    plan = ScanPlan(columns=["id"], filters=conditions)
+    result = read_csv(str(path), plan, chunk_size=2)
+
+    assert list(result.columns) == ["id"]
+    assert result["id"].tolist() == expected(frame, conditions)["id"].tolist()
+
+
+@pytest.mark.parametrize("conditions", CONDITIONS)
+def test_sql_pushdown_matches_pandas_filtering(frame, conditions):
+    """Test the generated WHERE clause keeps pandas null semantics."""
+    engine = create_engine("sqlite://")
+    frame.to_sql("items", engine, index=False)
+
+    plan = ScanPlan(columns=["id"], filters=conditions)
+    with engine.connect() as conn:
+        statement, params, residual = plan.to_sql("SELECT * FROM items", conn)
+        result = plan.apply(pd.read_sql(statement, conn, params=params), residual)
+
+    assert [c["operator"] for c in residual] == [
+        c["operator"] for c in conditions if c["operator"] == "startswith"
+    ]
+    assert sorted(result["id"]) == expected(frame, conditions)["id"].tolist()
+
+
+def test_csv_projection_without_filters(tmp_path, frame):
+    """Test projection alone parses only the planned columns."""
+    path = tmp_path / "data.csv"
+    frame.to_csv(path, index=False)
+
+    result = read_csv(str(path), ScanPlan(columns=["region", "id"]))
+
+    assert list(result.columns) == ["region", "id"]
+    assert len(result) == len(frame)
+
+
+@pytest.mark.parametrize("conditions", CONDITIONS)
+def test_parquet_pushdown_matches_pandas_filtering(tmp_path, frame, conditions):
+    """Test pyarrow filters plus residual conditions match pandas filtering."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "data.parquet"
+    frame.to_parquet(path, index=False)
+
+    result = read_parquet(str(path), ScanPlan(columns=["id"], filters=conditions))
+
+    assert result["id"].tolist() == expected(frame, conditions)["id"].tolist()
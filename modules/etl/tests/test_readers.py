@@ -0,0 +1,141 @@
+"""
+Tests for streaming file readers.
+"""
+
+import io
+import json
+
+import pandas as pd
+import pytest
+from modules.etl import readers
+from modules.etl.pushdown import ScanPlan
+from modules.etl.readers import IterStream, ReaderException, file_format, iter_frames, iter_records
+
+
+@pytest.fixture
+def frame():
+    """Small frame of orders."""
+    return pd.DataFrame({
+        "id": list(range(1, 11)),
+        "amount": [i * 10.0 for i in range(1, 11)],
+        "status": ["open", "closed"] * 5,
+    })
+
+
+def test_csv_batches_are_bounded(tmp_path, frame):
+    """Test CSV files are read in chunks of the batch size."""
+    path = tmp_path / "orders.csv"
+    frame.to_csv(path, index=False)
+
+    batches = list(iter_records(str(path), "csv", batch_size=3))
+
+    assert [len(batch) for batch in batches] == [3, 3, 3, 1]
+    assert batches[0][0] == {"id": 1, "amount": 10.0, "status": "open"}
+
+
+def test_offset_limit_and_plan_apply_across_batches(tmp_path, frame):
+    """Test offset and limit count matching records across chunks."""
+    path = tmp_path / "orders.csv"
+    frame.to_csv(path, index=False)
+    plan = ScanPlan(filters=[{"column": "status", "operator": "==", "value": "open"}])
+
+    batches = list(iter_records(str(path), "csv", batch_size=2, plan=plan, offset=1, limit=3))
+
+    assert [record["id"] for batch in batches for record in batch] == [3, 5, 7]
+
+
+@pytest.mark.parametrize("block_size", [7, 1024 * 1024])
+def test_json_array_is_decoded_incrementally(monkeypatch, frame, block_size):
+    """Test top-level arrays decode correctly across read block boundaries."""
+    monkeypatch.setattr(readers, "DEFAULT_READ_BLOCK_SIZE", block_size)
+    records = frame.to_dict(orient="records") + [{"id": 11, "amount": 1234567.5, "status": "[x], {y}"}]
+    stream = io.BytesIO(json.dumps(records, indent=2).encode())
+
+    batches = list(iter_records(stream, "json", batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 3]
+    assert [record for batch in batches for record in batch] == records
+    assert not stream.closed
+
+
+def test_json_array_types_match_read_json():
+    """Test array chunks infer dates and numbers as pandas.read_json does."""
+    records = [{"id": "007", "created_at": "2024-01-01T00:00:00"}, {"id": "008", "created_at": "2024-01-02T00:00:00"}]
+    body = json.dumps(records).encode()
+
+    frames = list(iter_frames(io.BytesIO(body), "json", batch_size=1))
+    expected = pd.read_json(io.BytesIO(body))
+
+    assert pd.concat(frames, ignore_index=True).equals(expected)
+    assert frames[0]["id"].tolist() == [7]
+    assert frames[0]["created_at"].tolist() == [pd.Timestamp("2024-01-01")]
+
+
+def test_tsv_uses_tab_separator(tmp_path, frame):
+    """Test .tsv files are split on tabs."""
+    path = tmp_path / "orders.tsv"
+    frame.to_csv(path, index=False, sep="\t")
+
+    batches = list(iter_records(str(path), file_format(str(path)), batch_size=20))
+
+    assert batches[0][0] == {"id": 1, "amount": 10.0, "status": "open"}
+
+
+def test_json_object_document_falls_back_to_pandas():
+    """Test non-array documents are read as pandas reads them."""
+    stream = io.BytesIO(json.dumps({"id": [1, 2], "status": ["a", "b"]}).encode())
+
+    frames = list(iter_frames(stream, "json"))
+
+    assert frames[0]["id"].tolist() == [1, 2]
+
+
+def test_truncated_json_array_raises():
+    """Test a truncated array is reported instead of silently ending."""
+    with pytest.raises(ReaderException):
+        list(iter_frames(io.BytesIO(b'[{"id": 1}, {"id": 2'), "json"))
+
+
+def test_json_lines_from_chunked_stream(frame):
+    """Test JSON Lines read from a chunked, non-seekable stream."""
+    body = frame.to_json(orient="records", lines=True).encode()
+    stream = io.BufferedReader(IterStream(body[i:i + 5] for i in range(0, len(body), 5)))
+
+    batches = list(iter_records(stream, "jsonl", batch_size=4))
+
+    assert sum(len(batch) for batch in batches) == 10
+    assert batches[-1][-1]["id"] == 10
+
+
+def test_excel_read_only_rows(tmp_path, frame):
+    """Test xlsx worksheets stream through openpyxl read-only mode."""
+    pytest.importorskip("openpyxl")
+    path = tmp_path / "orders.xlsx"
+    frame.to_excel(path, index=False)
+
+    with open(path, "rb") as handle:
+        batches = list(iter_records(IterStream([handle.read()]), "excel", batch_size=4))
+
+    assert [len(batch) for batch in batches] == [4, 4, 2]
+    assert batches[0][0]["status"] == "open"
+
+
+def test_parquet_batches_apply_plan(tmp_path, frame):
+    """Test Parquet is read in record batches with the plan applied."""
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "orders.parquet"
+    frame.to_parquet(path, index=False, row_group_size=3)
+    plan = ScanPlan(columns=["id"], filters=[{"column": "amount", "operator": ">", "value": 50}])
+
+    batches = list(iter_records(str(path), "parquet", batch_size=2, plan=plan))
+
+    assert [record for batch in batches for record in batch] == [{"id": i} for i in range(6, 11)]
+
+
+def test_file_format_by_extension():
+    """Test extensions map to readers."""
+    assert file_format("s3/key/data.NDJSON") == "jsonl"
+    assert file_format("book.xlsx") == "excel"
+    assert file_format("export.tsv") == "tsv"
+    with pytest.raises(ReaderException):
+        file_format("archive.zip")
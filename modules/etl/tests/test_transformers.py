@@ -10,6 +10,7 @@ from modules.etl.transformers import (
     DataAggregator,
     DataMapper,
     TypeConverter,
+    CustomTransformer,
     TransformationPipeline,
     TransformerFactory
 )
@@ -202,3 +203,93 @@ def test_create_pipeline_from_config():
     assert len(pipeline.transformers) == 2
     assert isinstance(pipeline.transformers[0], DataCleaner)
     assert isinstance(pipeline.transformers[1], DataMapper)
+
+
+COLUMNAR_RECORDS = [
+    {"id": 1, "name": "  John   Doe ", "amount": 12.345, "qty": "7", "joined": "2024-01-02", "active": "Yes"},
+    {"id": 2, "name": "", "amount": float("nan"), "qty": None, "joined": "2024-01-02", "active": "no"},
+    {"id": 3, "name": "Jane", "amount": 250.0, "qty": "abc", "joined": "not a date"},
+    {"id": 4, "amount": -3, "qty": 12.9, "joined": None, "active": True}
+]
+
+
+@pytest.mark.parametrize("transformer_configs", [
+    [{"type": "cleaner", "config": {"drop_null": True, "lowercase": True}}],
+    [{"type": "cleaner", "config": {
+        "fill_null": True, "null_value": "N/A", "handle_outliers": True,
+        "min_value": 0, "max_value": 100, "round_decimals": 1
+    }}],
+    [{"type": "type_converter", "config": {"type_conversions": {
+        "qty": "integer", "amount": "string", "joined": "datetime", "active": "boolean"
+    }}}],
+    [{"type": "validator", "config": {"validation_rules": {
+        "name": {"required": True, "type": "string", "min_length": 1},
+        "amount": {"min": 0}
+    }}}],
+    [{"type": "mapper", "config": {"field_mappings": {"name": "full_name", "qty": "amount"}}}],
+    [{"type": "enricher", "config": {
+        "computed_fields": {"double_id": "{id} * 2"},
+        "constant_fields": {"source": "test"},
+        "add_hash": True
+    }}],
+    [
+        {"type": "cleaner", "config": {}},
+        {"type": "type_converter", "config": {"type_conversions": {"qty": "float"}}},
+        {"type": "mapper", "config": {"field_mappings": {"qty": "quantity"}}},
+        {"type": "aggregator", "config": {"group_by": ["quantity"], "aggregations": {"id": "count"}}}
+    ]
+])
+def test_columnar_backend_matches_record_backend(transformer_configs):
+    """Test columnar execution produces the same records as record execution."""
+    import copy
+    import math
+
+    expected = TransformerFactory.create_pipeline(transformer_configs).transform(
+        copy.deepcopy(COLUMNAR_RECORDS)
+    )
+    result = TransformerFactory.create_pipeline(transformer_configs, backend="columnar").transform(
+        copy.deepcopy(COLUMNAR_RECORDS)
+    )
+
+    assert len(result) == len(expected)
+    for actual, wanted in zip(result, expected):
+        assert actual.keys() == wanted.keys()
+        for key in wanted:
+            if isinstance(wanted[key], float) and math.isnan(wanted[key]):
+                assert math.isnan(actual[key])
+            else:
+                assert actual[key] == wanted[key]
+                assert type(actual[key]) is type(wanted[key])
+
+
+def test_columnar_backend_runs_custom_transformer_per_record():
+    """Test custom transformers fall back to record execution."""
+    def tag(data, config):
+        return [dict(record, tagged=True) for record in data]
+
+    pipeline = TransformationPipeline(backend="columnar")
+    pipeline.add_transformer(DataCleaner({"uppercase": True}))
+    pipeline.add_transformer(CustomTransformer(tag))
+
+    result = pipeline.transform([{"name": " ann "}, {"name": "bob", "age": 3}])
+
+    assert result == [{"name": "ANN", "tagged": True}, {"name": "BOB", "age": 3, "tagged": True}]
+
+
+def test_columnar_backend_transforms_frames():
+    """Test compiled pipelines accept DataFrames."""
+    import pandas as pd
+
+    pipeline = TransformerFactory.create_pipeline(
+        [{"type": "type_converter", "config": {"type_conversions": {"qty": "integer"}}}],
+        backend="columnar"
+    )
+    frame = pipeline.compile().transform_frame(pd.DataFrame({"qty": ["1", "2.5"]}))
+
+    assert frame["qty"].tolist() == [1, 2]
+
+
+def test_unknown_transformation_backend():
+    """Test unknown backends are rejected."""
+    with pytest.raises(ValueError):
+        TransformationPipeline(backend="gpu")
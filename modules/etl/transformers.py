@@ -20,6 +20,9 @@ from dateutil import parser as date_parser
 
 logger = logging.getLogger(__name__)
 
+# Returned by DataCleaner._clean_value for fields removed by drop_null
+DROP_FIELD = object()
+
 
 class TransformerException(Exception):
     """Base exception for transformer errors."""
@@ -89,27 +92,32 @@ class DataCleaner(BaseTransformer):
         cleaned = {}
 
         for key, value in record.items():
-            # Handle null values
-            if value is None or value == "" or (isinstance(value, float) and np.isnan(value)):
-                if self.config.get("fill_null"):
-                    cleaned[key] = self.config.get("null_value", None)
-                elif self.config.get("drop_null"):
-                    continue
-                else:
-                    cleaned[key] = None
-            else:
-                # Clean strings
-                if isinstance(value, str):
-                    value = self._clean_string(value)
-
-                # Clean numbers
-                elif isinstance(value, (int, float)):
-                    value = self._clean_number(value)
-
+            value = self._clean_value(value)
+            if value is not DROP_FIELD:
                 cleaned[key] = value
 
         return cleaned
 
+    def _clean_value(self, value: Any) -> Any:
+        """Clean a single value; returns DROP_FIELD if the field should be dropped."""
+        # Handle null values
+        if value is None or value == "" or (isinstance(value, float) and np.isnan(value)):
+            if self.config.get("fill_null"):
+                return self.config.get("null_value", None)
+            elif self.config.get("drop_null"):
+                return DROP_FIELD
+            return None
+
+        # Clean strings
+        if isinstance(value, str):
+            return self._clean_string(value)
+
+        # Clean numbers
+        if isinstance(value, (int, float)):
+            return self._clean_number(value)
+
+        return value
+
     def _clean_string(self, value: str) -> str:
         """Clean string values."""
         # Trim whitespace
@@ -262,28 +270,99 @@ class DataValidator(BaseTransformer):
 class DataEnricher(BaseTransformer):
     """Transformer for data enrichment."""
 
+    def __init__(self, config: Optional[Dict[str, Any]] = None):
+        super().__init__(config)
+        self._expressions: Optional[Dict[str, Any]] = None
+
     def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Enrich the data."""
+        computed_columns = self.compute_fields(self._field_columns(data), len(data))
         enriched_data = []
 
-        for record in data:
-            enriched_record = self._enrich_record(record)
+        for i, record in enumerate(data):
+            computed = {name: values[i] for name, values in computed_columns.items()}
+            enriched_record = self._enrich_record(record, computed)
             enriched_data.append(enriched_record)
 
         self.logger.info(f"Enriched {len(enriched_data)} records")
         return enriched_data
 
-    def _enrich_record(self, record: Dict[str, Any]) -> Dict[str, Any]:
+    def compute_fields(self, columns: Dict[str, np.ndarray], size: int) -> Dict[str, np.ndarray]:
+        """
+        Evaluate all computed fields over a batch of columns.
+
+        Rows where an expression fails get None and are logged once per field.
+
+        Args:
+            columns: Field name to object array; absent cells hold
+                expressions.MISSING
+            size: Number of rows
+
+        Returns:
+            Dictionary of computed field name to object array of values
+        """
+        computed = {}
+
+        for field_name, expression in self._compiled_expressions().items():
+            if expression is None:
+                computed[field_name] = np.full(size, None, dtype=object)
+                continue
+
+            values, errors = expression.evaluate(columns, size)
+            if errors:
+                row, error = next(iter(errors.items()))
+                self.logger.warning(
+                    f"Failed to compute field '{field_name}' for {len(errors)} records "
+                    f"(first at row {row}: {error})"
+                )
+            computed[field_name] = values
+
+        return computed
+
+    def _field_columns(self, data: List[Dict[str, Any]]) -> Dict[str, np.ndarray]:
+        """Build columns for the fields referenced by computed fields."""
+        from modules.etl.expressions import MISSING
+
+        fields = dict.fromkeys(
+            field
+            for expression in self._compiled_expressions().values() if expression is not None
+            for field in expression.fields
+        )
+        return {
+            field: np.fromiter((record.get(field, MISSING) for record in data), dtype=object, count=len(data))
+            for field in fields
+        }
+
+    def _compiled_expressions(self) -> Dict[str, Any]:
+        """Compile computed-field expressions once; invalid ones map to None."""
+        if self._expressions is None:
+            from modules.etl.expressions import compile_expression, ExpressionError
+
+            self._expressions = {}
+            for field_name, expression in self.config.get("computed_fields", {}).items():
+                try:
+                    self._expressions[field_name] = compile_expression(expression)
+                except ExpressionError as e:
+                    self.logger.warning(f"Computed field '{field_name}' will be None: {str(e)}")
+                    self._expressions[field_name] = None
+
+        return self._expressions
+
+    def _enrich_record(
+        self,
+        record: Dict[str, Any],
+        computed: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """Enrich a single record."""
         enriched = record.copy()
 
         # Add computed fields
-        computed_fields = self.config.get("computed_fields", {})
-        for field_name, expression in computed_fields.items():
-            try:
-                enriched[field_name] = self._compute_field(record, expression)
-            except Exception as e:
-                self.logger.warning(f"Failed to compute field '{field_name}': {str(e)}")
+        if computed is None:
+            computed = {
+                field_name: self._compute_field(record, expression)
+                for field_name, expression in self.config.get("computed_fields", {}).items()
+            }
+        enriched.update(computed)
 
         # Add constant fields
         constant_fields = self.config.get("constant_fields", {})
@@ -301,14 +380,11 @@ class DataEnricher(BaseTransformer):
         return enriched
 
     def _compute_field(self, record: Dict[str, Any], expression: str) -> Any:
-        """Compute a field value from an expression."""
-        # Support simple expressions like: "{field1} + {field2}"
-        for field, value in record.items():
-            expression = expression.replace(f"{{{field}}}", str(value))
+        """Compute a field value from an expression like "{field1} + {field2}"."""
+        from modules.etl.expressions import compile_expression
 
         try:
-            # Use eval with restricted globals for safety
-            return eval(expression, {"__builtins__": {}}, {})
+            return compile_expression(expression).evaluate_record(record)
         except Exception:
             return None
 
@@ -477,19 +553,45 @@ class CustomTransformer(BaseTransformer):
 class TransformationPipeline:
     """Pipeline for chaining multiple transformers."""
 
-    def __init__(self, transformers: Optional[List[BaseTransformer]] = None):
+    def __init__(
+        self,
+        transformers: Optional[List[BaseTransformer]] = None,
+        backend: str = "record"
+    ):
         """
         Initialize transformation pipeline.
 
         Args:
             transformers: List of transformer instances
+            backend: "record" to run each transformer over record dicts, or
+                "columnar" to run vectorized over column batches
+                (see modules.etl.columnar)
         """
+        if backend not in ("record", "columnar"):
+            raise ValueError(f"Unknown transformation backend: {backend}")
+
         self.transformers = transformers or []
+        self.backend = backend
         self.logger = logging.getLogger(__name__)
+        self._compiled = None
 
     def add_transformer(self, transformer: BaseTransformer) -> None:
         """Add a transformer to the pipeline."""
         self.transformers.append(transformer)
+        self._compiled = None
+
+    def compile(self):
+        """
+        Compile the pipeline for columnar execution.
+
+        Returns:
+            ColumnarPipeline running the same transformers
+        """
+        if self._compiled is None:
+            from modules.etl.columnar import ColumnarPipeline
+
+            self._compiled = ColumnarPipeline(self)
+        return self._compiled
 
     def transform(self, data: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """
@@ -501,6 +603,9 @@ class TransformationPipeline:
         Returns:
             Transformed data
         """
+        if self.backend == "columnar":
+            return self.compile().transform(data)
+
         result = data
         for i, transformer in enumerate(self.transformers):
             try:
@@ -515,6 +620,7 @@ class TransformationPipeline:
     def clear(self) -> None:
         """Clear all transformers from pipeline."""
         self.transformers = []
+        self._compiled = None
 
 
 class TransformerFactory:
@@ -552,18 +658,20 @@ class TransformerFactory:
 
     @staticmethod
     def create_pipeline(
-        transformer_configs: List[Dict[str, Any]]
+        transformer_configs: List[Dict[str, Any]],
+        backend: str = "record"
     ) -> TransformationPipeline:
         """
         Create a transformation pipeline from configuration.
 
         Args:
             transformer_configs: List of transformer configurations
+            backend: Execution backend ("record" or "columnar")
 
         Returns:
             TransformationPipeline instance
         """
-        pipeline = TransformationPipeline()
+        pipeline = TransformationPipeline(backend=backend)
 
         for config in transformer_configs:
             transformer_type = config.get("type")
@@ -0,0 +1,6 @@
+"""
+Orchestration Benchmarks
+
+Standalone benchmarks for workflow execution.
+Run a benchmark with ``python -m modules.orchestration.benchmarks.<name>``.
+"""
@@ -0,0 +1,204 @@
+"""
+DAG Scheduling Benchmark
+
+Compares workflow makespan (time from the first task starting to the last
+one finishing) for three ways of scheduling the same DAG under one
+concurrency cap:
+
+- levels: the previous strategy, running get_parallel_groups() one level
+  at a time
+- ready-fifo: ReadyQueueScheduler starting tasks in readiness order
+- ready-critical-path: ReadyQueueScheduler prioritizing by critical path
+
+Tasks are simulated with sleeps of random duration on synthetic "wide"
+(many tasks per level) and "deep" (long chains with cross links) DAGs, so
+the numbers isolate scheduling from task execution and database overhead.
+
+Usage:
+    python -m modules.orchestration.benchmarks.bench_dag_scheduling
+    python -m modules.orchestration.benchmarks.bench_dag_scheduling --shapes wide --max-parallel 8 32
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List
+
+from modules.orchestration.core.dag import DAGEngine, TaskNode
+from modules.orchestration.core.executor import ReadyQueueScheduler
+
+SHAPES = ["wide", "deep"]
+STRATEGIES = ["levels", "ready-fifo", "ready-critical-path"]
+
+# Task durations are drawn from this range of time units
+DURATION_RANGE = (1, 10)
+
+
+def _add_task(dag: DAGEngine, task_key: str, depends_on: List[str]) -> None:
+    dag.add_task(TaskNode(task_key, task_key, "python", {}, depends_on=depends_on))
+    for dependency in depends_on:
+        dag.add_dependency(dependency, task_key)
+
+
+def build_dag(shape: str, seed: int) -> DAGEngine:
+    """
+    Build a synthetic DAG with a single root and a single sink.
+
+    Args:
+        shape: "wide" (20 levels of 50 tasks, each depending on 1-3 tasks
+            of the previous level) or "deep" (8 chains of 60 tasks with
+            occasional links to other chains)
+        seed: Random seed
+
+    Returns:
+        The DAG
+    """
+    rng = random.Random(seed)
+    dag = DAGEngine()
+    _add_task(dag, "root", [])
+
+    if shape == "wide":
+        previous = ["root"]
+        for level in range(20):
+            current = [f"w{level}_{i}" for i in range(50)]
+            for task_key in current:
+                _add_task(dag, task_key, rng.sample(previous, min(len(previous), rng.randint(1, 3))))
+            previous = current
+        leaves = previous
+    elif shape == "deep":
+        chains = [["root"] for _ in range(8)]
+        for depth in range(60):
+            for chain_index, chain in enumerate(chains):
+                depends_on = [chain[-1]]
+                if depth > 0 and rng.random() < 0.1:
+                    other = chains[rng.randrange(len(chains))]
+                    if other is not chain and len(other) > 1:
+                        depends_on.append(other[rng.randrange(1, len(other))])
+                task_key = f"d{chain_index}_{depth}"
+                _add_task(dag, task_key, sorted(set(depends_on)))
+                chain.append(task_key)
+        leaves = [chain[-1] for chain in chains]
+    else:
+        raise ValueError(f"Unknown shape: {shape}")
+
+    _add_task(dag, "sink", leaves)
+    return dag
+
+
+def draw_durations(dag: DAGEngine, seed: int, unit: float) -> Dict[str, float]:
+    """Draw a duration in seconds for every task."""
+    rng = random.Random(seed + 1)
+    return {task_key: rng.randint(*DURATION_RANGE) * unit for task_key in dag.get_execution_order()}
+
+
+async def _run_levels(dag: DAGEngine, max_parallel: int, run_task) -> None:
+    """Run one parallel group at a time, as execute_workflow used to."""
+    for group in dag.get_parallel_groups():
+        semaphore = asyncio.Semaphore(max_parallel)
+
+        async def limited(task_key):
+            async with semaphore:
+                return await run_task(task_key, {})
+
+        await asyncio.gather(*(limited(task_key) for task_key in group))
+
+
+async def measure(dag: DAGEngine, strategy: str, max_parallel: int, durations: Dict[str, float]) -> float:
+    """
+    Run a DAG of sleeping tasks and time it.
+
+    Returns:
+        Makespan in seconds
+    """
+    async def run_task(task_key: str, outputs: Dict[str, Any]) -> None:
+        await asyncio.sleep(durations[task_key])
+
+    started = time.perf_counter()
+    if strategy == "levels":
+        await _run_levels(dag, max_parallel, run_task)
+    elif strategy == "ready-fifo":
+        await ReadyQueueScheduler(dag, max_parallel, priorities={}).run(run_task)
+    elif strategy == "ready-critical-path":
+        await ReadyQueueScheduler(dag, max_parallel).run(run_task)
+    else:
+        raise ValueError(f"Unknown strategy: {strategy}")
+    return time.perf_counter() - started
+
+
+def benchmark(
+    shapes: List[str],
+    caps: List[int],
+    unit: float,
+    seed: int,
+    repeat: int
+) -> List[Dict[str, Any]]:
+    """
+    Measure every strategy on every shape and concurrency cap.
+
+    Args:
+        shapes: DAG shapes to build
+        caps: Concurrency caps to run with
+        unit: Seconds per duration unit
+        seed: Random seed for DAGs and durations
+        repeat: Runs per measurement; the fastest is kept
+
+    Returns:
+        One result per shape and cap
+    """
+    results = []
+    for shape in shapes:
+        dag = build_dag(shape, seed)
+        durations = draw_durations(dag, seed, unit)
+        critical_path = max(dag.get_critical_path_lengths(durations).values())
+
+        for cap in caps:
+            makespans = {
+                strategy: min(asyncio.run(measure(dag, strategy, cap, durations)) for _ in range(repeat))
+                for strategy in STRATEGIES
+            }
+            results.append({
+                "shape": shape,
+                "tasks": len(dag.tasks),
+                "max_parallel": cap,
+                # Neither the longest chain nor the total work spread over every slot can be beaten
+                "lower_bound_sec": max(critical_path, sum(durations.values()) / cap),
+                "makespan_sec": makespans,
+                "improvement_pct": {
+                    strategy: 100 * (1 - makespans[strategy] / makespans["levels"])
+                    for strategy in STRATEGIES[1:]
+                },
+            })
+    return results
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="DAG scheduling benchmark")
+    parser.add_argument("--shapes", nargs="+", choices=SHAPES, default=SHAPES)
+    parser.add_argument("--max-parallel", type=int, nargs="+", default=[8, 32])
+    parser.add_argument("--unit-ms", type=float, default=2.0, help="Milliseconds per task duration unit")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print results as JSON")
+    args = parser.parse_args(argv)
+
+    results = benchmark(args.shapes, args.max_parallel, args.unit_ms / 1000, args.seed, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'shape':>6} {'tasks':>6} {'cap':>4} {'bound s':>8} "
+          + " ".join(f"{strategy:>20}" for strategy in STRATEGIES))
+    for result in results:
+        cells = [f"{result['makespan_sec']['levels']:>20.2f}"] + [
+            f"{result['makespan_sec'][strategy]:>11.2f} ({result['improvement_pct'][strategy]:>+5.1f}%)"
+            for strategy in STRATEGIES[1:]
+        ]
+        print(f"{result['shape']:>6} {result['tasks']:>6} {result['max_parallel']:>4} "
+              f"{result['lower_bound_sec']:>8.2f} " + " ".join(cells))
+
+
+if __name__ == "__main__":
+    main()
@@ -45,6 +45,13 @@ class Settings(BaseSettings):
     TASK_TIMEOUT: int = 3600  # seconds
     MAX_PARALLEL_TASKS: int = 10
 
+    # Python Tasks
+    PYTHON_EXECUTION_MODE: str = "inline"  # "inline" or "process"
+    PYTHON_POOL_SIZE: Optional[int] = None  # defaults to the CPU count
+    PYTHON_MAX_TASKS_PER_CHILD: Optional[int] = 500
+    PYTHON_TASK_CPU_SECONDS: Optional[int] = 300
+    PYTHON_TASK_MEMORY_MB: Optional[int] = 1024
+
     # Monitoring
     PROMETHEUS_PORT: int = 9090
     METRICS_ENABLED: bool = True
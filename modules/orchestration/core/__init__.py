@@ -4,6 +4,7 @@ from .dag import DAGEngine, DAGBuilder, TaskNode, DAGValidationError
 from .executor import (
     TaskExecutionEngine,
     WorkflowExecutionEngine,
+    ReadyQueueScheduler,
     BaseTaskExecutor,
     get_executor,
 )
@@ -15,6 +16,7 @@ __all__ = [
     "DAGValidationError",
     "TaskExecutionEngine",
     "WorkflowExecutionEngine",
+    "ReadyQueueScheduler",
     "BaseTaskExecutor",
     "get_executor",
 ]
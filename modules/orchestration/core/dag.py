@@ -217,6 +217,31 @@ class DAGEngine:
         except nx.NetworkXError:
             return []
 
+    def get_critical_path_lengths(
+        self, weights: Optional[Dict[str, float]] = None
+    ) -> Dict[str, float]:
+        """
+        Get the length of the critical path starting at each task.
+
+        This is the longest chain of work from the task to the end of the
+        DAG, including the task itself; the largest value is the length of
+        get_critical_path().
+
+        Args:
+            weights: Optional task durations; tasks default to weight 1
+
+        Returns:
+            Dictionary mapping task keys to critical path lengths
+        """
+        weights = weights or {}
+        lengths: Dict[str, float] = {}
+
+        for task_key in reversed(self.get_execution_order()):
+            downstream = [lengths[successor] for successor in self.graph.successors(task_key)]
+            lengths[task_key] = weights.get(task_key, 1) + max(downstream, default=0)
+
+        return lengths
+
     def to_dict(self) -> Dict[str, Any]:
         """Convert DAG to dictionary representation."""
         return {
@@ -1,9 +1,10 @@
 """Task execution engine with retry logic and error handling."""
 
 import asyncio
+import heapq
 import uuid
 from datetime import datetime
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Optional, List, Callable, Awaitable
 from abc import ABC, abstractmethod
 import traceback
 import logging
@@ -22,6 +23,8 @@ from ..db.models import (
     WorkflowStatus,
 )
 from ..db.session import AsyncSessionLocal
+from ..config.settings import settings
+from .sandbox import compile_task_code, get_task_pool
 
 logger = logging.getLogger(__name__)
 
@@ -56,7 +59,15 @@ class BaseTaskExecutor(ABC):
 
 
 class PythonTaskExecutor(BaseTaskExecutor):
-    """Executor for Python code tasks."""
+    """
+    Executor for Python code tasks.
+
+    The code reads ``input`` and fills the ``output`` dictionary. By default
+    it runs in-process. Set ``execution_mode`` to "process" in the task
+    config to run it in a warm process pool instead, so CPU-bound code does
+    not block the event loop, with CPU time, memory and wall-clock limits
+    per task. Its input and output must then be picklable.
+    """
 
     async def execute(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute Python code."""
@@ -64,19 +75,30 @@ class PythonTaskExecutor(BaseTaskExecutor):
         if not code:
             raise TaskExecutionError("No code specified for Python task")
 
-        # Create execution context
-        context = {
-            "input": input_data,
-            "output": {},
-        }
+        mode = self.task_config.get("execution_mode", settings.PYTHON_EXECUTION_MODE)
 
         try:
-            # Execute the code
-            exec(code, context)
-            return context.get("output", {})
+            if mode == "process":
+                memory_mb = self.task_config.get("memory_limit_mb", settings.PYTHON_TASK_MEMORY_MB)
+                return await get_task_pool().run(
+                    code,
+                    input_data,
+                    cpu_seconds=self.task_config.get("cpu_time_limit", settings.PYTHON_TASK_CPU_SECONDS),
+                    memory_bytes=memory_mb * 1024 * 1024 if memory_mb else None,
+                    timeout=self.task_config.get("timeout", settings.TASK_TIMEOUT),
+                )
+            if mode == "inline":
+                context = {
+                    "input": input_data,
+                    "output": {},
+                }
+                exec(compile_task_code(code), context)
+                return context.get("output", {})
         except Exception as e:
             raise TaskExecutionError(f"Python execution failed: {str(e)}")
 
+        raise TaskExecutionError(f"Unknown Python execution mode: {mode}")
+
 
 class HTTPTaskExecutor(BaseTaskExecutor):
     """Executor for HTTP request tasks."""
@@ -293,13 +315,110 @@ class TaskExecutionEngine:
             raise TaskExecutionError(error_message)
 
 
+class ReadyQueueScheduler:
+    """
+    Event-driven DAG scheduler.
+
+    A task starts as soon as its last dependency completes instead of
+    waiting for the rest of its level. Ready tasks are queued by the length
+    of their critical path, so the chains that bound the workflow's total
+    duration get the free slots first, and at most max_parallel_tasks run
+    at once across the whole DAG.
+    """
+
+    def __init__(
+        self,
+        dag: Any,
+        max_parallel_tasks: int = 10,
+        priorities: Optional[Dict[str, float]] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Args:
+            dag: DAGEngine to run
+            max_parallel_tasks: Maximum number of tasks running at once
+            priorities: Task priorities, higher first; defaults to critical path lengths
+        """
+        self.dag = dag
+        self.max_parallel_tasks = max(1, max_parallel_tasks)
+        self.priorities = priorities if priorities is not None else dag.get_critical_path_lengths()
+
+    async def run(
+        self,
+        run_task: Callable[[str, Dict[str, Any]], Awaitable[Any]],
+    ) -> Dict[str, Any]:
+        """
+        Run every task of the DAG.
+
+        After a task fails no new tasks are started; running tasks are
+        allowed to finish and the first failure is raised.
+
+        Args:
+            run_task: Coroutine function called with a task key and the
+                outputs of the tasks completed so far
+
+        Returns:
+            Dictionary mapping task keys to outputs
+        """
+        order = {task_key: i for i, task_key in enumerate(self.dag.get_execution_order())}
+        waiting_on = {
+            task_key: len(set(self.dag.get_dependencies(task_key)))
+            for task_key in self.dag.tasks
+        }
+        ready: List[Any] = []
+        running: Dict[asyncio.Task, str] = {}
+        outputs: Dict[str, Any] = {}
+        failure: Optional[BaseException] = None
+
+        def make_ready(task_key: str) -> None:
+            # Ties go to the task earlier in topological order
+            heapq.heappush(ready, (-self.priorities.get(task_key, 0), order[task_key], task_key))
+
+        for task_key, count in waiting_on.items():
+            if count == 0:
+                make_ready(task_key)
+
+        try:
+            while ready or running:
+                while failure is None and ready and len(running) < self.max_parallel_tasks:
+                    _, _, task_key = heapq.heappop(ready)
+                    running[asyncio.create_task(run_task(task_key, outputs))] = task_key
+
+                if not running:
+                    break
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for finished in done:
+                    task_key = running.pop(finished)
+                    error = finished.exception()
+                    if error is not None:
+                        logger.error(f"Task {task_key} failed: {error}")
+                        failure = failure or error
+                        continue
+
+                    outputs[task_key] = finished.result()
+                    for dependent in self.dag.get_dependents(task_key):
+                        waiting_on[dependent] -= 1
+                        if waiting_on[dependent] == 0:
+                            make_ready(dependent)
+        finally:
+            # Only reached with tasks still running if we were cancelled
+            for pending in running:
+                pending.cancel()
+
+        if failure is not None:
+            raise failure
+        return outputs
+
+
 class WorkflowExecutionEngine:
     """
     Workflow execution engine.
 
     Features:
     - Execute workflows with DAG-based task scheduling
-    - Parallel task execution
+    - Parallel task execution, each task starting as soon as its dependencies complete
     - Error handling and recovery
     - State tracking
     """
@@ -337,47 +456,29 @@ class WorkflowExecutionEngine:
         if not is_valid:
             raise TaskExecutionError(f"Invalid DAG: {error}")
 
-        # Get parallel execution groups
-        parallel_groups = dag.get_parallel_groups()
-
-        # Track task outputs
-        task_outputs: Dict[str, Any] = {}
-
-        # Execute groups sequentially, tasks within groups in parallel
-        for group in parallel_groups:
-            # Limit parallel execution
-            semaphore = asyncio.Semaphore(max_parallel_tasks)
-
-            async def execute_task_with_semaphore(task_key: str):
-                async with semaphore:
-                    return await self._execute_task_in_workflow(
-                        workflow_execution_id,
-                        task_key,
-                        dag.tasks[task_key],
-                        task_outputs,
-                        input_data or {},
-                    )
-
-            # Execute tasks in parallel
-            tasks = [execute_task_with_semaphore(task_key) for task_key in group]
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-
-            # Check for errors
-            for i, result in enumerate(results):
-                task_key = list(group)[i]
-                if isinstance(result, Exception):
-                    self.logger.error(f"Task {task_key} failed: {result}")
-                    # Mark workflow as failed
-                    async with AsyncSessionLocal() as session:
-                        workflow_execution = await session.get(
-                            WorkflowExecution, workflow_execution_id
-                        )
-                        workflow_execution.status = WorkflowStatus.FAILED
-                        workflow_execution.error_message = str(result)
-                        await session.commit()
-                    raise result
-                else:
-                    task_outputs[task_key] = result
+        scheduler = ReadyQueueScheduler(dag, max_parallel_tasks=max_parallel_tasks)
+
+        async def run_task(task_key: str, task_outputs: Dict[str, Any]) -> Dict[str, Any]:
+            return await self._execute_task_in_workflow(
+                workflow_execution_id,
+                task_key,
+                dag.tasks[task_key],
+                task_outputs,
+                input_data or {},
+            )
+
+        try:
+            task_outputs = await scheduler.run(run_task)
+        except Exception as e:
+            # Mark workflow as failed
+            async with AsyncSessionLocal() as session:
+                workflow_execution = await session.get(
+                    WorkflowExecution, workflow_execution_id
+                )
+                workflow_execution.status = WorkflowStatus.FAILED
+                workflow_execution.error_message = str(e)
+                await session.commit()
+            raise
 
         # Mark workflow as completed
         async with AsyncSessionLocal() as session:
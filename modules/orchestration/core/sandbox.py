@@ -0,0 +1,340 @@
+"""Sandboxed execution of Python task code in a warm process pool."""
+
+import asyncio
+import hashlib
+import itertools
+import logging
+import multiprocessing
+import os
+import resource
+import signal
+import sys
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from contextlib import contextmanager
+from types import CodeType
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Compiled code objects kept per process
+CODE_CACHE_SIZE = 256
+
+# Extra seconds the parent waits past a task's timeout before killing the pool
+TIMEOUT_GRACE_SECONDS = 5
+
+_code_cache: "OrderedDict[str, CodeType]" = OrderedDict()
+
+# Queue a pool worker reports (token, pid) on when it starts a task
+_started = None
+
+
+class SandboxError(Exception):
+    """Raised when task code fails or exceeds its limits in the sandbox."""
+    pass
+
+
+class _WorkerLost(Exception):
+    """Raised in the parent when a task's executor broke before it finished."""
+
+    def __init__(self, started: bool):
+        super().__init__()
+        self.started = started
+
+
+class _LimitExceeded(BaseException):
+    """Raised by the limit signal handlers; a BaseException so task code cannot swallow it."""
+    pass
+
+
+def code_hash(code: str) -> str:
+    """Get the cache key of task code."""
+    return hashlib.sha256(code.encode()).hexdigest()
+
+
+def compile_task_code(code: str, digest: Optional[str] = None) -> CodeType:
+    """
+    Compile task code, reusing the code object of earlier runs.
+
+    Args:
+        code: Python source
+        digest: code_hash(code), if already known
+
+    Returns:
+        Compiled code object
+    """
+    digest = digest or code_hash(code)
+    compiled = _code_cache.get(digest)
+    if compiled is None:
+        compiled = compile(code, f"<task {digest[:12]}>", "exec")
+        _code_cache[digest] = compiled
+        if len(_code_cache) > CODE_CACHE_SIZE:
+            _code_cache.popitem(last=False)
+    else:
+        _code_cache.move_to_end(digest)
+    return compiled
+
+
+def _raise_limit(message: str):
+    def handler(signum, frame):
+        raise _LimitExceeded(message)
+    return handler
+
+
+def _init_worker(started=None) -> None:
+    """Install the limit signal handlers in a pool worker."""
+    global _started
+    _started = started
+    signal.signal(signal.SIGXCPU, _raise_limit("CPU time limit exceeded"))
+    signal.signal(signal.SIGALRM, _raise_limit("Timed out"))
+
+
+def _address_space_bytes() -> int:
+    """Get this process's current virtual memory size, or 0 if unknown."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return 0
+
+
+@contextmanager
+def _limits(cpu_seconds: Optional[float], memory_bytes: Optional[int], timeout: Optional[float]):
+    """Apply per-task CPU, memory and wall-clock limits to this worker."""
+    previous_cpu = resource.getrlimit(resource.RLIMIT_CPU)
+    previous_memory = resource.getrlimit(resource.RLIMIT_AS)
+
+    try:
+        if cpu_seconds:
+            # RLIMIT_CPU counts the worker's lifetime, so extend it from current usage
+            usage = resource.getrusage(resource.RUSAGE_SELF)
+            soft = int(usage.ru_utime + usage.ru_stime + cpu_seconds) + 1
+            if previous_cpu[1] != resource.RLIM_INFINITY:
+                soft = min(soft, previous_cpu[1])
+            resource.setrlimit(resource.RLIMIT_CPU, (soft, previous_cpu[1]))
+        if memory_bytes:
+            soft = _address_space_bytes() + memory_bytes
+            if previous_memory[1] != resource.RLIM_INFINITY:
+                soft = min(soft, previous_memory[1])
+            resource.setrlimit(resource.RLIMIT_AS, (soft, previous_memory[1]))
+        if timeout:
+            signal.setitimer(signal.ITIMER_REAL, timeout)
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        resource.setrlimit(resource.RLIMIT_CPU, previous_cpu)
+        resource.setrlimit(resource.RLIMIT_AS, previous_memory)
+
+
+def run_task_code(
+    token: int,
+    digest: str,
+    code: str,
+    input_data: Dict[str, Any],
+    cpu_seconds: Optional[float],
+    memory_bytes: Optional[int],
+    timeout: Optional[float],
+) -> Dict[str, Any]:
+    """
+    Run task code in a pool worker.
+
+    Only the "output" dictionary is sent back to the parent. Errors are
+    re-raised as SandboxError, since exception classes defined by task
+    code cannot be unpickled in the parent.
+    """
+    if _started is not None:
+        _started.put((token, os.getpid()))
+
+    compiled = compile_task_code(code, digest)
+    context = {"input": input_data, "output": {}}
+
+    try:
+        with _limits(cpu_seconds, memory_bytes, timeout):
+            exec(compiled, context)
+    except _LimitExceeded as e:
+        raise SandboxError(str(e)) from None
+    except MemoryError:
+        raise SandboxError("Memory limit exceeded") from None
+    except Exception as e:
+        raise SandboxError(f"{type(e).__name__}: {e}") from None
+
+    return context.get("output", {})
+
+
+class TaskProcessPool:
+    """
+    Warm pool of worker processes for Python tasks.
+
+    Workers are forked from a preloaded fork server, so they start with
+    this module imported, and each keeps its own compiled-code cache. A
+    task that overruns its timeout is stopped by a timer inside its
+    worker; if the worker does not respond, only that worker is killed.
+
+    A dead worker breaks the whole ProcessPoolExecutor, failing the other
+    tasks in it as well. The pool is then replaced and each of those tasks
+    is retried once: tasks that had not started go to the new pool, and
+    tasks that were running, one of which may have killed its worker, get
+    an executor of their own so they cannot break the new pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_tasks_per_child: Optional[int] = None):
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_tasks_per_child = max_tasks_per_child
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._mp_context = None
+        self._started = None
+        self._tokens = itertools.count()
+        # Worker pid of each running task, by token
+        self._workers: Dict[int, int] = {}
+
+    def _context(self):
+        if sys.platform == "linux":
+            context = multiprocessing.get_context("forkserver")
+            context.set_forkserver_preload([__name__])
+            return context
+        return multiprocessing.get_context("spawn")
+
+    def _new_executor(self, max_workers: int) -> ProcessPoolExecutor:
+        if self._mp_context is None:
+            self._mp_context = self._context()
+            self._started = self._mp_context.SimpleQueue()
+
+        return ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(self._started,),
+            max_tasks_per_child=self.max_tasks_per_child,
+        )
+
+    def start(self) -> None:
+        """Start the pool and bring every worker up."""
+        if self._executor is not None:
+            return
+
+        self._executor = self._new_executor(self.max_workers)
+        # Workers are otherwise spawned on first use
+        for _ in range(self.max_workers):
+            self._executor.submit(os.getpid)
+
+    def shutdown(self, kill: bool = False) -> None:
+        """Stop the pool, killing the workers of running tasks if requested."""
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        if kill:
+            # ProcessPoolExecutor cannot stop a running call, so end its process
+            self._collect_workers()
+            for token in list(self._workers):
+                self._kill_worker(token)
+        executor.shutdown(wait=not kill, cancel_futures=True)
+
+    def _collect_workers(self) -> None:
+        """Record the workers that have reported starting a task."""
+        while self._started is not None and not self._started.empty():
+            token, pid = self._started.get()
+            self._workers[token] = pid
+
+    def _kill_worker(self, token: int) -> None:
+        pid = self._workers.pop(token, None)
+        if pid is None:
+            return
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def _replace(self, executor: ProcessPoolExecutor) -> None:
+        """Drop a broken executor so the next task starts a new pool."""
+        if self._executor is executor:
+            self._executor = None
+            # Its tasks fail with BrokenProcessPool rather than being cancelled
+            executor.shutdown(wait=False)
+
+    async def _submit(self, executor: ProcessPoolExecutor, code: str, args: tuple, timeout: Optional[float]):
+        token = next(self._tokens)
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, run_task_code, token, code_hash(code), code, *args, timeout,
+        )
+
+        try:
+            if timeout:
+                return await asyncio.wait_for(future, timeout + TIMEOUT_GRACE_SECONDS)
+            return await future
+        except asyncio.TimeoutError:
+            logger.error("Python task did not stop at its timeout; killing its worker")
+            self._collect_workers()
+            self._kill_worker(token)
+            self._replace(executor)
+            raise SandboxError(f"Timed out after {timeout} seconds")
+        except BrokenProcessPool:
+            self._collect_workers()
+            raise _WorkerLost(started=token in self._workers) from None
+        finally:
+            self._collect_workers()
+            self._workers.pop(token, None)
+
+    async def run(
+        self,
+        code: str,
+        input_data: Dict[str, Any],
+        cpu_seconds: Optional[float] = None,
+        memory_bytes: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        Run task code in the pool.
+
+        Args:
+            code: Python source; reads ``input`` and fills ``output``
+            input_data: Task input
+            cpu_seconds: CPU time limit
+            memory_bytes: Memory limit on top of the worker's own footprint
+            timeout: Wall-clock limit in seconds
+
+        Returns:
+            The code's ``output`` dictionary
+        """
+        self.start()
+        executor = self._executor
+        args = (input_data, cpu_seconds, memory_bytes)
+
+        try:
+            return await self._submit(executor, code, args, timeout)
+        except _WorkerLost as lost:
+            self._replace(executor)
+            if lost.started:
+                # It may have killed the worker itself, so keep it apart from other tasks
+                logger.warning("Python task lost its worker; retrying it in a process of its own")
+                executor = self._new_executor(1)
+            else:
+                self.start()
+                executor = self._executor
+
+        try:
+            return await self._submit(executor, code, args, timeout)
+        except _WorkerLost:
+            logger.error("Python task worker died")
+            self._replace(executor)
+            raise SandboxError("Worker process died, possibly by exceeding a resource limit")
+        finally:
+            if executor is not self._executor:
+                executor.shutdown(wait=False)
+
+
+_pool: Optional[TaskProcessPool] = None
+
+
+def get_task_pool() -> TaskProcessPool:
+    """Get the shared Python task pool, creating it from settings on first use."""
+    global _pool
+    if _pool is None:
+        from ..config.settings import settings
+
+        _pool = TaskProcessPool(
+            max_workers=settings.PYTHON_POOL_SIZE,
+            max_tasks_per_child=settings.PYTHON_MAX_TASKS_PER_CHILD,
+        )
+    return _pool
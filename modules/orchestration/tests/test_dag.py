@@ -176,3 +176,25 @@ def test_root_and_leaf_tasks():
 
     assert root_tasks == ["task1"]
     assert leaf_tasks == ["task3"]
+
+
+def test_critical_path_lengths():
+    """Test critical path length from each task."""
+    dag = DAGEngine()
+
+    tasks = [
+        TaskNode("task1", "Task 1", "python", {}),
+        TaskNode("task2", "Task 2", "python", {}, depends_on=["task1"]),
+        TaskNode("task3", "Task 3", "python", {}, depends_on=["task2"]),
+        TaskNode("task4", "Task 4", "python", {}, depends_on=["task1"]),
+    ]
+
+    dag.build_from_tasks(tasks)
+
+    lengths = dag.get_critical_path_lengths()
+    assert lengths == {"task1": 3, "task2": 2, "task3": 1, "task4": 1}
+    assert lengths["task1"] == len(dag.get_critical_path())
+
+    # Weighted, the short branch becomes the critical one
+    weighted = dag.get_critical_path_lengths({"task4": 5})
+    assert weighted["task1"] == 6
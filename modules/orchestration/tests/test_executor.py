@@ -0,0 +1,99 @@
+"""Tests for workflow task scheduling."""
+
+import asyncio
+
+import pytest
+from modules.orchestration.core.dag import DAGEngine, TaskNode
+from modules.orchestration.core.executor import ReadyQueueScheduler, TaskExecutionError
+
+
+def build_dag(edges):
+    """Build a DAG from a mapping of task key to dependencies."""
+    dag = DAGEngine()
+    dag.build_from_tasks([
+        TaskNode(task_key, task_key, "python", {}, depends_on=depends_on)
+        for task_key, depends_on in edges.items()
+    ])
+    return dag
+
+
+def run(scheduler, durations, log=None, fail=()):
+    """Run a scheduler over tasks that sleep for the given durations."""
+    async def run_task(task_key, outputs):
+        if log is not None:
+            log.append(("start", task_key))
+        await asyncio.sleep(durations.get(task_key, 0))
+        if log is not None:
+            log.append(("end", task_key))
+        if task_key in fail:
+            raise TaskExecutionError(f"{task_key} failed")
+        return {"task": task_key, "inputs": sorted(outputs)}
+
+    return asyncio.run(scheduler.run(run_task))
+
+
+def test_task_starts_when_its_dependencies_finish():
+    """Test a task does not wait for unrelated tasks of its level."""
+    dag = build_dag({
+        "root": [],
+        "fast": ["root"],
+        "slow": ["root"],
+        "after_fast": ["fast"],
+    })
+    log = []
+
+    outputs = run(ReadyQueueScheduler(dag), {"fast": 0.01, "slow": 0.2}, log)
+
+    assert log.index(("start", "after_fast")) < log.index(("end", "slow"))
+    assert set(outputs) == {"root", "fast", "slow", "after_fast"}
+    assert outputs["after_fast"]["inputs"] == ["fast", "root"]
+
+
+def test_concurrency_cap_applies_across_the_dag():
+    """Test no more than max_parallel_tasks run at once."""
+    dag = build_dag({"root": [], **{f"t{i}": ["root"] for i in range(10)}})
+    log = []
+
+    run(ReadyQueueScheduler(dag, max_parallel_tasks=3), {f"t{i}": 0.01 for i in range(10)}, log)
+
+    running = peak = 0
+    for event, _ in log:
+        running += 1 if event == "start" else -1
+        peak = max(peak, running)
+    assert peak == 3
+
+
+def test_longest_chain_starts_first():
+    """Test ready tasks are ordered by critical path length."""
+    dag = build_dag({
+        "root": [],
+        "short": ["root"],
+        "long1": ["root"],
+        "long2": ["long1"],
+        "long3": ["long2"],
+    })
+    log = []
+
+    run(ReadyQueueScheduler(dag, max_parallel_tasks=1), {}, log)
+
+    starts = [task_key for event, task_key in log if event == "start"]
+    assert starts.index("long1") < starts.index("short")
+
+
+def test_failure_stops_scheduling_and_raises():
+    """Test dependents of a failed task never start."""
+    dag = build_dag({
+        "root": [],
+        "bad": ["root"],
+        "slow": ["root"],
+        "after_bad": ["bad"],
+        "after_slow": ["slow"],
+    })
+    log = []
+
+    with pytest.raises(TaskExecutionError, match="bad failed"):
+        run(ReadyQueueScheduler(dag), {"slow": 0.05}, log, fail={"bad"})
+
+    assert ("end", "slow") in log
+    assert ("start", "after_bad") not in log
+    assert ("start", "after_slow") not in log
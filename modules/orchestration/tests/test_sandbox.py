@@ -0,0 +1,167 @@
+"""Tests for sandboxed Python task execution."""
+
+import asyncio
+import os
+import time
+
+import pytest
+from modules.orchestration.core import sandbox
+from modules.orchestration.core.executor import PythonTaskExecutor, TaskExecutionError
+from modules.orchestration.core.sandbox import TaskProcessPool, code_hash, compile_task_code
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    """A small pool used as the shared Python task pool."""
+    pool = TaskProcessPool(max_workers=2)
+    monkeypatch.setattr(sandbox, "_pool", pool)
+    yield pool
+    pool.shutdown(kill=True)
+
+
+def execute(code, input_data=None, **config):
+    """Run code through PythonTaskExecutor, in the process pool unless told otherwise."""
+    executor = PythonTaskExecutor({"code": code, "execution_mode": "process", **config})
+    return asyncio.run(executor.execute(input_data or {}))
+
+
+def test_process_mode_returns_output(pool):
+    """Test task code sees its input and returns its output from a worker."""
+    output = execute(
+        "import os\noutput['total'] = sum(input['values'])\noutput['pid'] = os.getpid()",
+        {"values": [1, 2, 3]},
+    )
+
+    assert output["total"] == 6
+    assert output["pid"] in {process.pid for process in pool._executor._processes.values()}
+
+
+def test_compiled_code_is_cached():
+    """Test code is compiled once per hash."""
+    code = "output['x'] = 1"
+
+    assert compile_task_code(code) is compile_task_code(code, code_hash(code))
+    assert compile_task_code(code) is not compile_task_code(code + "\n")
+
+
+def test_event_loop_runs_during_cpu_bound_task(pool):
+    """Test CPU-bound code does not block other coroutines."""
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ticker = asyncio.create_task(tick())
+        executor = PythonTaskExecutor({
+            "code": "import time\nend = time.time() + 0.5\nwhile time.time() < end: pass",
+            "execution_mode": "process",
+        })
+        await executor.execute({})
+        ticker.cancel()
+        return ticks
+
+    assert asyncio.run(run()) > 20
+
+
+def test_timeout_stops_task(pool):
+    """Test a task is stopped at its timeout and its worker reused."""
+    started = time.monotonic()
+    with pytest.raises(TaskExecutionError, match="Timed out"):
+        execute("while True: pass", timeout=0.5)
+
+    assert time.monotonic() - started < 3
+    assert execute("output['ok'] = True") == {"ok": True}
+
+
+def test_task_cannot_swallow_timeout(pool):
+    """Test catching exceptions in task code does not defeat the timeout."""
+    with pytest.raises(TaskExecutionError, match="Timed out"):
+        execute("import time\ntry:\n    time.sleep(5)\nexcept Exception:\n    time.sleep(5)", timeout=0.5)
+
+
+def test_memory_limit(pool):
+    """Test a task allocating past its memory limit fails."""
+    with pytest.raises(TaskExecutionError, match="Memory limit exceeded"):
+        execute("data = bytearray(512 * 1024 * 1024)", memory_limit_mb=64)
+
+    assert execute("output['size'] = len(bytearray(16 * 1024 * 1024))", memory_limit_mb=64) == {
+        "size": 16 * 1024 * 1024
+    }
+
+
+def test_cpu_time_limit(pool):
+    """Test a task is stopped after its CPU time."""
+    with pytest.raises(TaskExecutionError, match="CPU time limit exceeded"):
+        execute("while True: pass", cpu_time_limit=1, timeout=30)
+
+
+def test_pool_recovers_after_worker_dies(pool):
+    """Test a task killing its worker fails and the pool is replaced."""
+    with pytest.raises(TaskExecutionError, match="Worker process died"):
+        execute("import os\nos._exit(1)")
+
+    assert execute("output['ok'] = True") == {"ok": True}
+
+
+def test_killed_worker_does_not_fail_other_tasks(pool, monkeypatch):
+    """Test tasks sharing the pool with a stuck task are not failed when its worker is killed."""
+    monkeypatch.setattr(sandbox, "TIMEOUT_GRACE_SECONDS", 0.5)
+    stuck = "import signal\nsignal.pthread_sigmask(signal.SIG_BLOCK, {signal.SIGALRM})\nwhile True: pass"
+
+    async def run():
+        return await asyncio.gather(
+            PythonTaskExecutor({"code": stuck, "execution_mode": "process", "timeout": 0.5}).execute({}),
+            PythonTaskExecutor({
+                "code": "import time\ntime.sleep(2)\noutput['ok'] = True",
+                "execution_mode": "process",
+            }).execute({}),
+            return_exceptions=True,
+        )
+
+    timed_out, other = asyncio.run(run())
+
+    assert "Timed out" in str(timed_out)
+    assert other == {"ok": True}
+
+
+def test_dead_worker_does_not_fail_other_tasks(pool):
+    """Test a task killing its worker fails alone."""
+    async def run():
+        return await asyncio.gather(
+            PythonTaskExecutor({
+                "code": "import os, time\ntime.sleep(0.5)\nos._exit(1)",
+                "execution_mode": "process",
+            }).execute({}),
+            PythonTaskExecutor({
+                "code": "import time\ntime.sleep(1)\noutput['ok'] = True",
+                "execution_mode": "process",
+            }).execute({}),
+            return_exceptions=True,
+        )
+
+    died, other = asyncio.run(run())
+
+    assert "Worker process died" in str(died)
+    assert other == {"ok": True}
+
+
+def test_errors_in_task_code(pool):
+    """Test exceptions raised by task code are reported."""
+    with pytest.raises(TaskExecutionError, match="ValueError: bad input"):
+        execute("class Custom(ValueError): pass\nraise ValueError('bad input')")
+
+
+def test_inline_mode_is_default():
+    """Test Python tasks run in-process unless they opt in to the pool."""
+    executor = PythonTaskExecutor({"code": "import os\noutput['pid'] = os.getpid()"})
+
+    assert asyncio.run(executor.execute({})) == {"pid": os.getpid()}
+
+
+def test_inline_mode():
+    """Test inline mode runs the code in-process."""
+    assert execute("output['doubled'] = input['x'] * 2", {"x": 21}, execution_mode="inline") == {"doubled": 42}
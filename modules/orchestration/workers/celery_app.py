@@ -1,7 +1,7 @@
 """Celery application for distributed task execution."""
 
 from celery import Celery
-from celery.signals import task_prerun, task_postrun, task_failure
+from celery.signals import task_prerun, task_postrun, task_failure, worker_process_shutdown
 from kombu import Exchange, Queue
 import logging
 
@@ -64,3 +64,11 @@ def task_postrun_handler(task_id, task, *args, **kwargs):
 def task_failure_handler(task_id, exception, *args, **kwargs):
     """Handler for task failure signal."""
     logger.error(f"Task [{task_id}] failed: {exception}")
+
+
+@worker_process_shutdown.connect
+def worker_process_shutdown_handler(*args, **kwargs):
+    """Stop the Python task process pool with the worker process."""
+    from ..core.sandbox import get_task_pool
+
+    get_task_pool().shutdown()
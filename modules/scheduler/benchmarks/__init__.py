@@ -0,0 +1,6 @@
+"""
+Scheduler Benchmarks
+
+Standalone benchmarks for the scheduler engine.
+Run a benchmark with ``python -m modules.scheduler.benchmarks.<name>``.
+"""
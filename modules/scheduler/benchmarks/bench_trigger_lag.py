@@ -0,0 +1,286 @@
+"""
+Scheduler Trigger Lag Benchmark
+
+Measures how late SchedulerEngine fires cron jobs when every active job is
+due at the same instant (a minute boundary for "* * * * *" jobs), for an
+unsharded node and for sharded clusters of several node processes.
+
+Each node process runs a real SchedulerEngine against Redis. Jobs are
+written straight into the job stores with a common next run time T0;
+lag is the time from T0 until a node submits the job for execution, so it
+covers loading due jobs from Redis, dispatch and rescheduling.
+
+Without ``--redis-url`` an in-process fakeredis TCP server is used. It is
+single-threaded Python, so it caps cluster throughput; run against a real
+Redis for representative sharded numbers.
+
+Usage:
+    python -m modules.scheduler.benchmarks.bench_trigger_lag --jobs 10000 50000 100000 --nodes 1 4
+    python -m modules.scheduler.benchmarks.bench_trigger_lag --redis-url redis://localhost:6379/15
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import pickle
+import queue
+import socket
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
+
+from apscheduler.events import EVENT_JOB_SUBMITTED
+from apscheduler.job import Job
+from apscheduler.schedulers.background import BackgroundScheduler
+from apscheduler.triggers.cron import CronTrigger
+from redis import Redis
+
+from modules.scheduler.services.sharding import HashRing, ShardLeaseManager, shard_store_keys
+
+# Lease settings for benchmark nodes; short so clusters settle quickly
+LEASE_TTL_SECONDS = 6.0
+LEASE_RENEW_SECONDS = 1.0
+
+# Jobs written per Redis pipeline
+_WRITE_BATCH = 1000
+
+
+async def _noop(job_id: int) -> None:
+    """Job function; a coroutine so the executor does not need a thread per job"""
+
+
+# Textual reference, so node processes resolve it even when this file runs as __main__
+_NOOP_REF = "modules.scheduler.benchmarks.bench_trigger_lag:_noop"
+
+
+def _configure(redis_url: str, sharded: bool, shards: int, node_id: str) -> None:
+    """Point this process's scheduler settings at the benchmark Redis"""
+    from modules.scheduler.config import settings
+
+    url = urlparse(redis_url)
+    settings.REDIS_HOST = url.hostname
+    settings.REDIS_PORT = url.port or 6379
+    settings.REDIS_DB = int(url.path.lstrip("/") or 0)
+    settings.SCHEDULER_SHARDING_ENABLED = sharded
+    settings.SCHEDULER_SHARD_COUNT = shards
+    settings.SCHEDULER_NODE_ID = node_id
+    settings.SCHEDULER_LEASE_TTL_SECONDS = LEASE_TTL_SECONDS
+    settings.SCHEDULER_LEASE_RENEW_SECONDS = LEASE_RENEW_SECONDS
+
+
+def _run_node(redis_url: str, sharded: bool, shards: int, node_id: str, events, stop) -> None:
+    """Benchmark node process: run a SchedulerEngine and report submission lags"""
+    _configure(redis_url, sharded, shards, node_id)
+    from modules.scheduler.services.scheduler_engine import SchedulerEngine
+
+    async def serve():
+        engine = SchedulerEngine()
+        submitted: List[tuple] = []
+
+        def on_submitted(event):
+            run_time = event.scheduled_run_times[0].timestamp()
+            submitted.append((event.job_id, run_time, time.time() - run_time))
+
+        engine._scheduler.add_listener(on_submitted, EVENT_JOB_SUBMITTED)
+        engine.start()
+        events.put(("ready", node_id))
+        try:
+            while not stop.is_set():
+                await asyncio.sleep(0.2)
+                # Jobs are written straight to Redis, so wake the scheduler to read them
+                engine._scheduler.wakeup()
+                if submitted:
+                    events.put(("submitted", submitted[:]))
+                    submitted.clear()
+        finally:
+            engine.shutdown(wait=False)
+
+    asyncio.run(serve())
+
+
+def _fake_redis_url() -> str:
+    """Serve fakeredis over TCP in a background thread"""
+    from fakeredis import TcpFakeServer
+
+    class Server(TcpFakeServer):
+        def get_request(self):
+            # Replies are written in pieces; without TCP_NODELAY each MULTI/EXEC
+            # round trip stalls on delayed ACKs
+            connection, address = super().get_request()
+            connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            return connection, address
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+    server = Server(("127.0.0.1", port), server_type="redis")
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f"redis://127.0.0.1:{port}/0"
+
+
+def _write_jobs(redis: Redis, count: int, ring: Optional[HashRing], run_at: datetime) -> None:
+    """Write cron jobs due at run_at directly into their job stores"""
+    scheduler = BackgroundScheduler(timezone=timezone.utc)
+    trigger = CronTrigger.from_crontab("* * * * *", timezone=timezone.utc)
+    timestamp = run_at.timestamp()
+
+    with redis.pipeline(transaction=False) as pipe:
+        for index in range(count):
+            job_id = f"job_{index}"
+            job = Job(
+                scheduler, id=job_id, func=_NOOP_REF, trigger=trigger, executor="default",
+                args=[index], kwargs={}, name=job_id, misfire_grace_time=300,
+                coalesce=True, max_instances=3, next_run_time=run_at,
+            )
+            if ring is None:
+                jobs_key, run_times_key = "apscheduler.jobs", "apscheduler.run_times"
+            else:
+                jobs_key, run_times_key = shard_store_keys(ring.shard_for(job_id))
+            pipe.hset(jobs_key, job_id, pickle.dumps(job.__getstate__(), pickle.HIGHEST_PROTOCOL))
+            pipe.zadd(run_times_key, {job_id: timestamp})
+            if (index + 1) % _WRITE_BATCH == 0:
+                pipe.execute()
+        pipe.execute()
+
+
+def _wait_for_leases(redis: Redis, nodes: int, shards: int, timeout: float) -> None:
+    """Wait until every shard is leased and the nodes hold a balanced share"""
+    observer = ShardLeaseManager(redis, "bench-observer", shards, LEASE_TTL_SECONDS)
+    deadline = time.monotonic() + timeout
+    share = -(-shards // nodes)
+    while time.monotonic() < deadline:
+        owners = list(observer.lease_owners().values())
+        counts = [owners.count(owner) for owner in set(owners)]
+        if None not in owners and len(counts) == nodes and max(counts) <= share:
+            return
+        time.sleep(0.2)
+    raise TimeoutError("Scheduler nodes did not settle shard leases")
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+def run_scenario(
+    redis_url: str,
+    jobs: int,
+    nodes: int,
+    sharded: bool,
+    shards: int,
+    timeout: float
+) -> Dict[str, Any]:
+    """
+    Start scheduler nodes, make jobs due at once and collect trigger lags.
+
+    Args:
+        redis_url: Redis to run against (flushed first)
+        jobs: Number of active cron jobs
+        nodes: Number of scheduler node processes
+        sharded: Run in sharded mode
+        shards: Shard count for sharded mode
+        timeout: Seconds to wait for every job to fire
+
+    Returns:
+        Scenario report
+    """
+    redis = Redis.from_url(redis_url)
+    redis.flushdb()
+
+    context = multiprocessing.get_context("spawn")
+    events, stop = context.Queue(), context.Event()
+    processes = [
+        context.Process(
+            target=_run_node,
+            args=(redis_url, sharded, shards, f"bench-{index}", events, stop),
+            daemon=True,
+        )
+        for index in range(nodes)
+    ]
+    for process in processes:
+        process.start()
+
+    lags: Dict[str, float] = {}
+    duplicates = 0
+    try:
+        for _ in processes:
+            events.get(timeout=120)
+        if sharded:
+            _wait_for_leases(redis, nodes, shards, timeout=LEASE_TTL_SECONDS * 4)
+
+        # Time a sample write (overwritten below) so T0 falls after the full write
+        ring = HashRing(shards) if sharded else None
+        sample = min(jobs, _WRITE_BATCH)
+        started = time.monotonic()
+        _write_jobs(redis, sample, ring, datetime.now(timezone.utc) + timedelta(days=1))
+        write_estimate = (time.monotonic() - started) * jobs / sample
+        run_at = datetime.now(timezone.utc) + timedelta(seconds=write_estimate * 1.5 + 2)
+        _write_jobs(redis, jobs, ring, run_at)
+
+        deadline = run_at.timestamp() + timeout
+        while len(lags) < jobs and time.time() < deadline:
+            try:
+                _, payload = events.get(timeout=max(0.1, min(1.0, deadline - time.time())))
+            except queue.Empty:
+                continue
+            for job_id, run_time, lag in payload:
+                if abs(run_time - run_at.timestamp()) > 0.001:
+                    continue
+                if job_id in lags:
+                    duplicates += 1
+                else:
+                    lags[job_id] = lag
+    finally:
+        stop.set()
+        for process in processes:
+            process.join(timeout=30)
+            if process.is_alive():
+                process.terminate()
+
+    lags = sorted(lags.values())
+    return {
+        "name": f"{'sharded' if sharded else 'single'}-{nodes}",
+        "jobs": jobs,
+        "nodes": nodes,
+        "shards": shards if sharded else None,
+        "fired": len(lags),
+        "duplicates": duplicates,
+        "p50_lag_sec": _percentile(lags, 0.50) if lags else None,
+        "p95_lag_sec": _percentile(lags, 0.95) if lags else None,
+        "p99_lag_sec": _percentile(lags, 0.99) if lags else None,
+        "max_lag_sec": lags[-1] if lags else None,
+        "jobs_per_sec": len(lags) / lags[-1] if lags and lags[-1] > 0 else None,
+    }
+
+
+def main(argv: List[str] = None) -> None:
+    """Run the benchmark from the command line."""
+    parser = argparse.ArgumentParser(description="Scheduler trigger lag benchmark")
+    parser.add_argument("--jobs", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--nodes", type=int, nargs="+", default=[1, 4],
+                        help="Sharded cluster sizes; an unsharded node is always run as a baseline")
+    parser.add_argument("--shards", type=int, default=32)
+    parser.add_argument("--redis-url", help="Redis to run against; its database is flushed")
+    parser.add_argument("--timeout", type=float, default=300.0)
+    args = parser.parse_args(argv)
+
+    redis_url = args.redis_url or _fake_redis_url()
+    scenarios = [(1, False)] + [(nodes, True) for nodes in args.nodes]
+
+    print(f"{'scenario':>12} {'jobs':>8} {'fired':>8} {'dup':>5} {'p50 s':>8} {'p95 s':>8} {'p99 s':>8} {'max s':>8} {'jobs/s':>9}")
+    for jobs in args.jobs:
+        for nodes, sharded in scenarios:
+            result = run_scenario(redis_url, jobs, nodes, sharded, args.shards, args.timeout)
+            print(
+                f"{result['name']:>12} {jobs:>8} {result['fired']:>8} {result['duplicates']:>5} "
+                + " ".join(
+                    f"{result[key]:>8.2f}" if result[key] is not None else f"{'-':>8}"
+                    for key in ("p50_lag_sec", "p95_lag_sec", "p99_lag_sec", "max_lag_sec")
+                )
+                + f" {result['jobs_per_sec'] or 0:>9.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -37,11 +37,32 @@ class Settings(BaseSettings):
     SMTP_PASSWORD: Optional[str] = None
     TELEGRAM_BOT_TOKEN: Optional[str] = None
 
+    # Notification outbox sender
+    NOTIFICATION_SENDER_ENABLED: bool = True  # Run the sender in the API process
+    NOTIFICATION_BATCH_SIZE: int = 200
+    NOTIFICATION_POLL_SECONDS: float = 2.0
+    NOTIFICATION_MAX_ATTEMPTS: int = 5
+    NOTIFICATION_RETRY_DELAY: int = 30  # seconds, doubled per attempt
+    NOTIFICATION_CLAIM_TIMEOUT: int = 300  # seconds before a claimed notification is retried
+    NOTIFICATION_COALESCE_MAX: int = 20  # Events merged into one email / Telegram message
+    NOTIFICATION_EMAIL_CONCURRENCY: int = 2
+    NOTIFICATION_TELEGRAM_CONCURRENCY: int = 5
+    NOTIFICATION_WEBHOOK_CONCURRENCY: int = 20
+
     # Scheduler
     DEFAULT_TIMEZONE: str = "UTC"
     MAX_RETRY_ATTEMPTS: int = 3
     TASK_TIMEOUT: int = 3600
     ENABLE_SCHEDULER: bool = True
+    SCHEDULER_DISPATCH_BATCH_SIZE: int = 500  # Due jobs claimed per transaction
+
+    # Sharded scheduling: jobs are spread over SCHEDULER_SHARD_COUNT shards,
+    # each run by whichever scheduler node holds its Redis lease
+    SCHEDULER_SHARDING_ENABLED: bool = False
+    SCHEDULER_SHARD_COUNT: int = 32
+    SCHEDULER_NODE_ID: Optional[str] = None  # Defaults to hostname-pid
+    SCHEDULER_LEASE_TTL_SECONDS: float = 10.0
+    SCHEDULER_LEASE_RENEW_SECONDS: float = 3.0
 
     class Config:
         env_file = ".env"
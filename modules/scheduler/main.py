@@ -6,6 +6,7 @@ import uvicorn
 
 from modules.scheduler.api import api_router
 from modules.scheduler.services.scheduler_engine import SchedulerEngine
+from modules.scheduler.services.notification_sender import NotificationSender
 from modules.scheduler.config import settings
 
 
@@ -21,6 +22,12 @@ async def lifespan(app: FastAPI):
         scheduler.start()
         print("✅ Scheduler engine started")
 
+    # Deliver queued job notifications
+    if settings.NOTIFICATION_SENDER_ENABLED:
+        sender = NotificationSender()
+        sender.start()
+        print("✅ Notification sender started")
+
     yield
 
     # Shutdown
@@ -29,6 +36,9 @@ async def lifespan(app: FastAPI):
         scheduler = SchedulerEngine()
         scheduler.shutdown()
         print("✅ Scheduler engine stopped")
+    if settings.NOTIFICATION_SENDER_ENABLED:
+        await sender.stop()
+        print("✅ Notification sender stopped")
 
 
 # Create FastAPI app
@@ -1,12 +1,12 @@
 """Database models for scheduler"""
 from .database import Base, get_db, get_sync_db, async_engine, sync_engine
 from .schemas import (
-    ScheduledJob, JobExecution, JobNotification, JobDependency,
-    JobStatus, JobType, NotificationChannel
+    ScheduledJob, JobExecution, JobNotification, JobDependency, NotificationOutbox,
+    JobStatus, JobType, NotificationChannel, OutboxStatus
 )
 
 __all__ = [
     "Base", "get_db", "get_sync_db", "async_engine", "sync_engine",
-    "ScheduledJob", "JobExecution", "JobNotification", "JobDependency",
-    "JobStatus", "JobType", "NotificationChannel"
+    "ScheduledJob", "JobExecution", "JobNotification", "JobDependency", "NotificationOutbox",
+    "JobStatus", "JobType", "NotificationChannel", "OutboxStatus"
 ]
@@ -19,6 +19,13 @@ class JobStatus(str, enum.Enum):
     PAUSED = "paused"
 
 
+class OutboxStatus(str, enum.Enum):
+    """Notification delivery status"""
+    PENDING = "pending"
+    SENT = "sent"
+    FAILED = "failed"
+
+
 class JobType(str, enum.Enum):
     """Job scheduling type"""
     CRON = "cron"
@@ -176,6 +183,41 @@ class JobNotification(Base):
         return f"<JobNotification(id={self.id}, job_id={self.job_id}, channel={self.channel})>"
 
 
+class NotificationOutbox(Base):
+    """Notification waiting for delivery, written with the execution change that triggered it"""
+    __tablename__ = "notification_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    notification_id = Column(Integer, ForeignKey("job_notifications.id", ondelete="CASCADE"), nullable=False)
+    execution_id = Column(Integer, ForeignKey("job_executions.id", ondelete="CASCADE"), index=True)
+    event = Column(String(20), nullable=False)
+
+    # Message, rendered when the event happened
+    channel = Column(SQLEnum(NotificationChannel), nullable=False)
+    recipient = Column(String(255), nullable=False)
+    subject = Column(String(255))
+    body = Column(Text)  # Email / Telegram text
+    payload = Column(JSON)  # Webhook body
+    headers = Column(JSON, default=dict)  # Webhook headers
+
+    # Delivery state
+    status = Column(SQLEnum(OutboxStatus), default=OutboxStatus.PENDING, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    next_attempt_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    last_error = Column(Text)
+
+    created_at = Column(DateTime(timezone=True), default=datetime.utcnow, nullable=False)
+    sent_at = Column(DateTime(timezone=True))
+
+    # Indexes
+    __table_args__ = (
+        Index('idx_outbox_pending', 'status', 'next_attempt_at'),
+    )
+
+    def __repr__(self):
+        return f"<NotificationOutbox(id={self.id}, channel={self.channel}, status={self.status})>"
+
+
 class JobDependency(Base):
     """Job dependencies for workflow orchestration"""
     __tablename__ = "job_dependencies"
@@ -1,5 +1,6 @@
 """Services module"""
 from .scheduler_engine import SchedulerEngine
 from .notification_service import NotificationService
+from .notification_sender import NotificationSender
 
-__all__ = ["SchedulerEngine", "NotificationService"]
+__all__ = ["SchedulerEngine", "NotificationService", "NotificationSender"]
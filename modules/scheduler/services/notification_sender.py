@@ -0,0 +1,300 @@
+"""Asynchronous delivery of queued job notifications"""
+import asyncio
+import smtplib
+import threading
+from datetime import datetime, timedelta
+from email.mime.text import MIMEText
+from email.mime.multipart import MIMEMultipart
+from typing import Dict, List, Optional, Tuple
+import httpx
+import pytz
+from sqlalchemy import select, update
+from modules.scheduler.config import settings
+from modules.scheduler.models.database import AsyncSessionLocal
+from modules.scheduler.models.schemas import NotificationChannel, NotificationOutbox, OutboxStatus
+
+
+class DeliveryNotConfigured(Exception):
+    """A channel is missing credentials; retrying will not help"""
+
+
+class SMTPPool:
+    """Logged-in SMTP connections reused across messages, used from worker threads"""
+
+    def __init__(self):
+        self._idle: List[smtplib.SMTP] = []
+        self._lock = threading.Lock()
+
+    def _connect(self) -> smtplib.SMTP:
+        server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT, timeout=30)
+        server.starttls()
+        server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
+        return server
+
+    def send(self, message: MIMEMultipart):
+        """Send a message, reconnecting once if the pooled connection went stale"""
+        with self._lock:
+            server = self._idle.pop() if self._idle else None
+
+        try:
+            if server is None:
+                server = self._connect()
+            try:
+                server.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                server = self._connect()
+                server.send_message(message)
+        except Exception:
+            if server is not None:
+                server.close()
+            raise
+
+        with self._lock:
+            self._idle.append(server)
+
+    def close(self):
+        """Close idle connections"""
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for server in idle:
+            try:
+                server.quit()
+            except smtplib.SMTPException:
+                server.close()
+
+
+def coalesce(entries: List[NotificationOutbox]) -> List[List[NotificationOutbox]]:
+    """
+    Group outbox entries into deliveries
+
+    Email and Telegram entries for the same recipient are merged into one
+    message of up to NOTIFICATION_COALESCE_MAX events; webhooks are posted
+    one per event.
+    """
+    groups: Dict[Tuple, List[NotificationOutbox]] = {}
+    deliveries = []
+
+    for entry in sorted(entries, key=lambda entry: entry.id):
+        if entry.channel == NotificationChannel.WEBHOOK:
+            deliveries.append([entry])
+            continue
+
+        key = (entry.channel, entry.recipient)
+        group = groups.get(key)
+        if group is None or len(group) >= settings.NOTIFICATION_COALESCE_MAX:
+            group = groups[key] = []
+            deliveries.append(group)
+        group.append(entry)
+
+    return deliveries
+
+
+class NotificationSender:
+    """
+    Drains the notification outbox
+
+    Entries are claimed in batches with SKIP LOCKED, so several senders can
+    run at once. A claim pushes next_attempt_at past the claim timeout and
+    counts the attempt, so entries claimed by a sender that died are picked
+    up again. Deliveries share one HTTP client and a pool of SMTP
+    connections, and each channel has its own concurrency limit so a slow
+    SMTP server does not hold up webhooks.
+    """
+
+    def __init__(
+        self,
+        session_factory=AsyncSessionLocal,
+        http_client: Optional[httpx.AsyncClient] = None,
+        smtp_pool: Optional[SMTPPool] = None
+    ):
+        self.session_factory = session_factory
+        self.http_client = http_client or httpx.AsyncClient(
+            timeout=10,
+            limits=httpx.Limits(
+                max_connections=settings.NOTIFICATION_TELEGRAM_CONCURRENCY
+                + settings.NOTIFICATION_WEBHOOK_CONCURRENCY
+            )
+        )
+        self.smtp_pool = smtp_pool or SMTPPool()
+        self._limits = {
+            NotificationChannel.EMAIL: asyncio.Semaphore(settings.NOTIFICATION_EMAIL_CONCURRENCY),
+            NotificationChannel.TELEGRAM: asyncio.Semaphore(settings.NOTIFICATION_TELEGRAM_CONCURRENCY),
+            NotificationChannel.WEBHOOK: asyncio.Semaphore(settings.NOTIFICATION_WEBHOOK_CONCURRENCY),
+        }
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Start draining in the background on the running event loop"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        """Stop draining and close connections"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+        await self.http_client.aclose()
+        await asyncio.to_thread(self.smtp_pool.close)
+
+    async def run(self):
+        """Drain the outbox until cancelled"""
+        while True:
+            try:
+                drained = await self.drain_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error draining notification outbox: {e}")
+                drained = 0
+
+            # Keep going while full batches come back
+            if drained < settings.NOTIFICATION_BATCH_SIZE:
+                await asyncio.sleep(settings.NOTIFICATION_POLL_SECONDS)
+
+    async def drain_once(self) -> int:
+        """Claim, deliver and record one batch; returns the number of entries claimed"""
+        entries = await self.claim()
+        if entries:
+            results = await self.deliver(coalesce(entries))
+            await self.record(results)
+        return len(entries)
+
+    async def claim(self) -> List[NotificationOutbox]:
+        """Claim a batch of due outbox entries"""
+        now = datetime.now(pytz.utc)
+
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(NotificationOutbox)
+                .where(
+                    NotificationOutbox.status == OutboxStatus.PENDING,
+                    NotificationOutbox.next_attempt_at <= now
+                )
+                .order_by(NotificationOutbox.id)
+                .limit(settings.NOTIFICATION_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )
+            entries = list(result.scalars().all())
+
+            for entry in entries:
+                entry.attempts += 1
+                entry.next_attempt_at = now + timedelta(seconds=settings.NOTIFICATION_CLAIM_TIMEOUT)
+            await db.commit()
+
+            for entry in entries:
+                db.expunge(entry)
+
+        return entries
+
+    async def deliver(
+        self,
+        deliveries: List[List[NotificationOutbox]]
+    ) -> List[Tuple[List[NotificationOutbox], Optional[Exception]]]:
+        """Send every delivery concurrently within the channel limits"""
+        async def send(group):
+            async with self._limits[group[0].channel]:
+                try:
+                    await self._send(group)
+                    return group, None
+                except Exception as e:
+                    return group, e
+
+        return await asyncio.gather(*(send(group) for group in deliveries))
+
+    async def record(self, results: List[Tuple[List[NotificationOutbox], Optional[Exception]]]):
+        """Mark deliveries sent, or schedule their retry"""
+        now = datetime.now(pytz.utc)
+
+        async with self.session_factory() as db:
+            sent = [entry.id for group, error in results if error is None for entry in group]
+            if sent:
+                await db.execute(
+                    update(NotificationOutbox)
+                    .where(NotificationOutbox.id.in_(sent))
+                    .values(status=OutboxStatus.SENT, sent_at=now, last_error=None)
+                )
+
+            for group, error in results:
+                if error is None:
+                    continue
+                print(f"Error sending {group[0].channel.value} notification: {error}")
+
+                for entry in group:
+                    values = {"last_error": str(error)}
+                    if isinstance(error, DeliveryNotConfigured) or entry.attempts >= settings.NOTIFICATION_MAX_ATTEMPTS:
+                        values["status"] = OutboxStatus.FAILED
+                    else:
+                        delay = settings.NOTIFICATION_RETRY_DELAY * (2 ** (entry.attempts - 1))
+                        values["next_attempt_at"] = now + timedelta(seconds=delay)
+                    await db.execute(
+                        update(NotificationOutbox)
+                        .where(NotificationOutbox.id == entry.id)
+                        .values(**values)
+                    )
+
+            await db.commit()
+
+    async def _send(self, group: List[NotificationOutbox]):
+        """Send one delivery"""
+        channel = group[0].channel
+        if channel == NotificationChannel.EMAIL:
+            await self._send_email(group)
+        elif channel == NotificationChannel.TELEGRAM:
+            await self._send_telegram(group)
+        elif channel == NotificationChannel.WEBHOOK:
+            await self._send_webhook(group[0])
+
+    async def _send_email(self, group: List[NotificationOutbox]):
+        """Send email notification, one message for the whole group"""
+        if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
+            raise DeliveryNotConfigured("SMTP credentials are not configured")
+
+        msg = MIMEMultipart()
+        msg['From'] = settings.SMTP_USER
+        msg['To'] = group[0].recipient
+        msg['Subject'] = group[0].subject if len(group) == 1 else f"{len(group)} job notifications"
+        msg.attach(MIMEText("\n\n".join(entry.body for entry in group), 'plain'))
+
+        # smtplib blocks, so it runs in a worker thread
+        await asyncio.to_thread(self.smtp_pool.send, msg)
+
+    async def _send_telegram(self, group: List[NotificationOutbox]):
+        """Send Telegram notification, one message for the whole group"""
+        if not settings.TELEGRAM_BOT_TOKEN:
+            raise DeliveryNotConfigured("Telegram bot token is not configured")
+
+        response = await self.http_client.post(
+            f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage",
+            json={
+                "chat_id": group[0].recipient,
+                "text": "\n".join(entry.body for entry in group),
+                "parse_mode": "Markdown"
+            }
+        )
+        response.raise_for_status()
+
+    async def _send_webhook(self, entry: NotificationOutbox):
+        """Send webhook notification"""
+        response = await self.http_client.post(
+            entry.recipient,
+            json=entry.payload,
+            headers=entry.headers or {}
+        )
+        response.raise_for_status()
+
+
+async def _main():
+    sender = NotificationSender()
+    try:
+        await sender.run()
+    finally:
+        await sender.stop()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main())
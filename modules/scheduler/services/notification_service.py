@@ -1,32 +1,38 @@
 """Notification service for job events"""
-import smtplib
-from email.mime.text import MIMEText
-from email.mime.multipart import MIMEMultipart
-from typing import Optional
-import httpx
-from modules.scheduler.config import settings
 from modules.scheduler.models.schemas import (
-    ScheduledJob, JobExecution, JobNotification, NotificationChannel
+    ScheduledJob, JobExecution, JobNotification, NotificationChannel, NotificationOutbox, OutboxStatus
 )
 
 
 class NotificationService:
-    """Service for sending job notifications"""
+    """
+    Service for queueing job notifications
+
+    Notifications are written to the outbox in the caller's session, so they
+    commit or roll back together with the execution change that triggered
+    them; NotificationSender delivers them.
+    """
 
     @staticmethod
-    def send_notification(
+    def enqueue_notifications(
         job: ScheduledJob,
         execution: JobExecution,
         event: str,
         db
-    ):
-        """Send notifications for job event"""
+    ) -> int:
+        """
+        Queue notifications for job event; the caller commits
+
+        A notification that cannot be rendered is stored as failed instead
+        of raising into the caller's transaction.
+        """
         # Get active notifications for this job and event
         notifications = db.query(JobNotification).filter(
             JobNotification.job_id == job.id,
             JobNotification.is_active == True
         ).all()
 
+        queued = 0
         for notification in notifications:
             # Check if notification should be sent for this event
             should_send = False
@@ -39,56 +45,86 @@ class NotificationService:
             elif event == "retry" and notification.on_retry:
                 should_send = True
 
-            if not should_send:
+            if not should_send or notification.channel == NotificationChannel.IN_APP:
                 continue
 
-            # Send notification based on channel
             try:
-                if notification.channel == NotificationChannel.EMAIL:
-                    NotificationService._send_email(
-                        notification, job, execution, event
-                    )
-                elif notification.channel == NotificationChannel.TELEGRAM:
-                    NotificationService._send_telegram(
-                        notification, job, execution, event
-                    )
-                elif notification.channel == NotificationChannel.WEBHOOK:
-                    NotificationService._send_webhook(
-                        notification, job, execution, event
-                    )
-
+                entry = NotificationService._outbox_entry(notification, job, execution, event)
             except Exception as e:
-                print(f"Error sending notification: {e}")
+                # A bad template must not fail the job; keep the error for the notification's owner
+                print(f"Error rendering notification {notification.id}: {e!r}")
+                db.add(NotificationOutbox(
+                    notification_id=notification.id,
+                    execution_id=execution.id,
+                    event=event,
+                    channel=notification.channel,
+                    recipient=notification.recipient,
+                    status=OutboxStatus.FAILED,
+                    last_error=f"Rendering failed: {e!r}"
+                ))
+                continue
+
+            db.add(entry)
+            queued += 1
+
+        return queued
+
+    @staticmethod
+    def _outbox_entry(
+        notification: JobNotification,
+        job: ScheduledJob,
+        execution: JobExecution,
+        event: str
+    ) -> NotificationOutbox:
+        """Render a notification into an outbox entry"""
+        entry = NotificationOutbox(
+            notification_id=notification.id,
+            execution_id=execution.id,
+            event=event,
+            channel=notification.channel,
+            recipient=notification.recipient
+        )
+
+        if notification.channel == NotificationChannel.EMAIL:
+            entry.subject = f"Job {event.upper()}: {job.name}"
+            entry.body = NotificationService._render_email(notification, job, execution, event)
+        elif notification.channel == NotificationChannel.TELEGRAM:
+            entry.body = NotificationService._render_telegram(notification, job, execution, event)
+        elif notification.channel == NotificationChannel.WEBHOOK:
+            entry.payload = NotificationService._webhook_payload(job, execution, event)
+            entry.headers = (notification.config or {}).get("headers", {})
+
+        return entry
 
     @staticmethod
-    def _send_email(
+    def _render_template(
         notification: JobNotification,
         job: ScheduledJob,
         execution: JobExecution,
         event: str
-    ):
-        """Send email notification"""
-        if not settings.SMTP_USER or not settings.SMTP_PASSWORD:
-            return
-
-        # Create message
-        msg = MIMEMultipart()
-        msg['From'] = settings.SMTP_USER
-        msg['To'] = notification.recipient
-        msg['Subject'] = f"Job {event.upper()}: {job.name}"
-
-        # Create body
+    ) -> str:
+        """Render the notification's custom message template"""
+        return notification.message_template.format(
+            job_name=job.name,
+            event=event,
+            status=execution.status,
+            started_at=execution.started_at,
+            completed_at=execution.completed_at,
+            error_message=execution.error_message or ""
+        )
+
+    @staticmethod
+    def _render_email(
+        notification: JobNotification,
+        job: ScheduledJob,
+        execution: JobExecution,
+        event: str
+    ) -> str:
+        """Render email body"""
         if notification.message_template:
-            body = notification.message_template.format(
-                job_name=job.name,
-                event=event,
-                status=execution.status,
-                started_at=execution.started_at,
-                completed_at=execution.completed_at,
-                error_message=execution.error_message or ""
-            )
-        else:
-            body = f"""
+            return NotificationService._render_template(notification, job, execution, event)
+
+        return f"""
 Job: {job.name}
 Event: {event.upper()}
 Status: {execution.status}
@@ -97,41 +133,18 @@ Completed: {execution.completed_at}
 Error: {execution.error_message or "None"}
             """
 
-        msg.attach(MIMEText(body, 'plain'))
-
-        # Send email
-        try:
-            server = smtplib.SMTP(settings.SMTP_HOST, settings.SMTP_PORT)
-            server.starttls()
-            server.login(settings.SMTP_USER, settings.SMTP_PASSWORD)
-            server.send_message(msg)
-            server.quit()
-        except Exception as e:
-            print(f"Error sending email: {e}")
-
     @staticmethod
-    def _send_telegram(
+    def _render_telegram(
         notification: JobNotification,
         job: ScheduledJob,
         execution: JobExecution,
         event: str
-    ):
-        """Send Telegram notification"""
-        if not settings.TELEGRAM_BOT_TOKEN:
-            return
-
-        # Create message
+    ) -> str:
+        """Render Telegram message"""
         if notification.message_template:
-            message = notification.message_template.format(
-                job_name=job.name,
-                event=event,
-                status=execution.status,
-                started_at=execution.started_at,
-                completed_at=execution.completed_at,
-                error_message=execution.error_message or ""
-            )
-        else:
-            message = f"""
+            return NotificationService._render_template(notification, job, execution, event)
+
+        return f"""
 🤖 Job {event.upper()}
 
 📋 Job: {job.name}
@@ -141,28 +154,14 @@ Error: {execution.error_message or "None"}
 ❌ Error: {execution.error_message or "None"}
             """
 
-        # Send via Telegram API
-        try:
-            url = f"https://api.telegram.org/bot{settings.TELEGRAM_BOT_TOKEN}/sendMessage"
-            data = {
-                "chat_id": notification.recipient,
-                "text": message,
-                "parse_mode": "Markdown"
-            }
-            httpx.post(url, json=data)
-        except Exception as e:
-            print(f"Error sending Telegram message: {e}")
-
     @staticmethod
-    def _send_webhook(
-        notification: JobNotification,
+    def _webhook_payload(
         job: ScheduledJob,
         execution: JobExecution,
         event: str
-    ):
-        """Send webhook notification"""
-        # Prepare payload
-        payload = {
+    ) -> dict:
+        """Build webhook payload"""
+        return {
             "event": event,
             "job": {
                 "id": job.id,
@@ -179,15 +178,3 @@ Error: {execution.error_message or "None"}
                 "error_message": execution.error_message
             }
         }
-
-        # Send webhook
-        try:
-            headers = notification.config.get("headers", {})
-            httpx.post(
-                notification.recipient,
-                json=payload,
-                headers=headers,
-                timeout=10
-            )
-        except Exception as e:
-            print(f"Error sending webhook: {e}")
@@ -4,18 +4,41 @@ from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.jobstores.redis import RedisJobStore
+from apscheduler.jobstores.base import ConflictingIdError, JobLookupError
+from apscheduler.job import Job
+from redis import Redis
+from redis.exceptions import RedisError
 from datetime import datetime
 from typing import Optional
+import os
+import socket
+import threading
 import pytz
 from modules.scheduler.config import settings
 from modules.scheduler.models.schemas import ScheduledJob, JobType
+from modules.scheduler.services.sharding import HashRing, ShardLeaseManager, shard_store_keys
+
+
+def execute_job_callback(job_id: int):
+    """APScheduler job function; module-level so jobs loaded from Redis can resolve it"""
+    SchedulerEngine()._execute_job_callback(job_id)
 
 
 class SchedulerEngine:
-    """Singleton scheduler engine"""
+    """
+    Singleton scheduler engine
+
+    With SCHEDULER_SHARDING_ENABLED, jobs are assigned to shards by
+    consistent hashing of their id and stored in one Redis job store per
+    shard. Each node only runs the shards whose lease it holds; a lease
+    thread renews leases, rebalances shards across live nodes and attaches
+    or detaches the matching job stores.
+    """
 
     _instance = None
     _scheduler = None
+    _ring = None
+    _leases = None
 
     def __new__(cls):
         if cls._instance is None:
@@ -26,23 +49,43 @@ class SchedulerEngine:
     def _initialize_scheduler(self):
         """Initialize APScheduler"""
         if self._scheduler is None:
-            jobstores = {
-                'default': RedisJobStore(
-                    host=settings.REDIS_HOST,
-                    port=settings.REDIS_PORT,
-                    db=settings.REDIS_DB
-                )
-            }
-
-            job_defaults = {
+            self._job_defaults = {
                 'coalesce': True,
                 'max_instances': 3,
                 'misfire_grace_time': 300
             }
 
+            if settings.SCHEDULER_SHARDING_ENABLED:
+                # Shard stores are attached as leases are won
+                jobstores = {}
+                self._redis = Redis(
+                    host=settings.REDIS_HOST,
+                    port=settings.REDIS_PORT,
+                    db=settings.REDIS_DB
+                )
+                self._ring = HashRing(settings.SCHEDULER_SHARD_COUNT)
+                self._leases = ShardLeaseManager(
+                    self._redis,
+                    settings.SCHEDULER_NODE_ID or f"{socket.gethostname()}-{os.getpid()}",
+                    settings.SCHEDULER_SHARD_COUNT,
+                    settings.SCHEDULER_LEASE_TTL_SECONDS
+                )
+                self._shard_stores = {}
+                self._attached_shards = set()
+                self._lease_stop = threading.Event()
+                self._lease_thread = None
+            else:
+                jobstores = {
+                    'default': RedisJobStore(
+                        host=settings.REDIS_HOST,
+                        port=settings.REDIS_PORT,
+                        db=settings.REDIS_DB
+                    )
+                }
+
             self._scheduler = AsyncIOScheduler(
                 jobstores=jobstores,
-                job_defaults=job_defaults,
+                job_defaults=self._job_defaults,
                 timezone=pytz.timezone(settings.DEFAULT_TIMEZONE)
             )
 
@@ -51,9 +94,32 @@ class SchedulerEngine:
         if self._scheduler and not self._scheduler.running:
             self._scheduler.start()
 
+            if self._leases:
+                self._sync_shards()
+                # A thread rather than a scheduler job, so renewals keep going
+                # while the event loop is busy firing a burst of due jobs
+                self._lease_stop.clear()
+                self._lease_thread = threading.Thread(
+                    target=self._lease_loop, name="scheduler-leases", daemon=True
+                )
+                self._lease_thread.start()
+
     def shutdown(self, wait: bool = True):
         """Shutdown the scheduler"""
         if self._scheduler and self._scheduler.running:
+            if self._leases:
+                self._lease_stop.set()
+                if self._lease_thread:
+                    self._lease_thread.join()
+                # Release leases so other nodes take over without waiting for expiry
+                try:
+                    self._leases.release_all()
+                except RedisError as e:
+                    print(f"Error releasing shard leases: {e}")
+                for shard in sorted(self._attached_shards):
+                    self._scheduler.remove_jobstore(self._shard_alias(shard), shutdown=False)
+                self._attached_shards.clear()
+
             self._scheduler.shutdown(wait=wait)
 
     async def register_job(self, job: ScheduledJob) -> str:
@@ -70,8 +136,12 @@ class SchedulerEngine:
         job_id = f"job_{job.id}"
 
         try:
+            if self._ring:
+                self._store_shard_job(job_id, trigger, job.name, [job.id])
+                return job_id
+
             self._scheduler.add_job(
-                func=self._execute_job_callback,
+                func=execute_job_callback,
                 trigger=trigger,
                 id=job_id,
                 args=[job.id],
@@ -90,7 +160,9 @@ class SchedulerEngine:
 
         try:
             # Remove old job
-            if self._scheduler.get_job(job_id):
+            if self._ring:
+                self._remove_shard_job(job_id)
+            elif self._scheduler.get_job(job_id):
                 self._scheduler.remove_job(job_id)
 
             # Re-register if active
@@ -108,7 +180,9 @@ class SchedulerEngine:
         scheduler_job_id = f"job_{job_id}"
 
         try:
-            if self._scheduler.get_job(scheduler_job_id):
+            if self._ring:
+                self._remove_shard_job(scheduler_job_id)
+            elif self._scheduler.get_job(scheduler_job_id):
                 self._scheduler.remove_job(scheduler_job_id)
             return True
 
@@ -121,7 +195,11 @@ class SchedulerEngine:
         scheduler_job_id = f"job_{job_id}"
 
         try:
-            if self._scheduler.get_job(scheduler_job_id):
+            if self._ring:
+                stored = self._shard_store(scheduler_job_id).lookup_job(scheduler_job_id)
+                if stored:
+                    self._modify_shard_job(stored, next_run_time=None)
+            elif self._scheduler.get_job(scheduler_job_id):
                 self._scheduler.pause_job(scheduler_job_id)
             return True
 
@@ -134,7 +212,14 @@ class SchedulerEngine:
         scheduler_job_id = f"job_{job.id}"
 
         try:
-            if self._scheduler.get_job(scheduler_job_id):
+            if self._ring:
+                stored = self._shard_store(scheduler_job_id).lookup_job(scheduler_job_id)
+                if stored:
+                    now = datetime.now(self._scheduler.timezone)
+                    self._modify_shard_job(stored, next_run_time=stored.trigger.get_next_fire_time(None, now))
+                else:
+                    await self.register_job(job)
+            elif self._scheduler.get_job(scheduler_job_id):
                 self._scheduler.resume_job(scheduler_job_id)
             else:
                 # Re-register if not exists
@@ -153,17 +238,24 @@ class SchedulerEngine:
     ) -> str:
         """Execute a job immediately"""
         from modules.scheduler.tasks.job_tasks import execute_scheduled_job
+        from modules.scheduler.tasks.dispatcher import advance_due_job
         from modules.scheduler.models import get_sync_db, JobExecution
 
         # Create execution record
         db = next(get_sync_db())
         try:
+            now = datetime.now(pytz.utc)
             execution = JobExecution(
                 job_id=job.id,
-                scheduled_at=datetime.utcnow(),
+                scheduled_at=now,
                 attempt_number=1
             )
             db.add(execution)
+
+            # A due scheduled run is covered by this one
+            stored_job = db.get(ScheduledJob, job.id)
+            if stored_job:
+                advance_due_job(stored_job, now)
             db.commit()
             db.refresh(execution)
 
@@ -221,7 +313,12 @@ class SchedulerEngine:
 
     def _execute_job_callback(self, job_id: int):
         """Callback function executed by APScheduler"""
+        if self._leases and not self._leases.owns(self._ring.shard_for(f"job_{job_id}")):
+            # The shard's lease lapsed since this run was scheduled; its new owner fires it
+            return
+
         from modules.scheduler.tasks.job_tasks import execute_scheduled_job
+        from modules.scheduler.tasks.dispatcher import advance_due_job
         from modules.scheduler.models import get_sync_db, ScheduledJob, JobExecution
 
         db = next(get_sync_db())
@@ -231,13 +328,15 @@ class SchedulerEngine:
             if not job:
                 return
 
-            # Create execution record
+            # Create execution record; the dispatcher must not start this run again
+            now = datetime.now(pytz.utc)
             execution = JobExecution(
                 job_id=job_id,
-                scheduled_at=datetime.utcnow(),
+                scheduled_at=now,
                 attempt_number=1
             )
             db.add(execution)
+            advance_due_job(job, now)
             db.commit()
             db.refresh(execution)
 
@@ -256,7 +355,10 @@ class SchedulerEngine:
     def get_job_info(self, job_id: int) -> Optional[dict]:
         """Get job information from scheduler"""
         scheduler_job_id = f"job_{job_id}"
-        job = self._scheduler.get_job(scheduler_job_id)
+        if self._ring:
+            job = self._shard_store(scheduler_job_id).lookup_job(scheduler_job_id)
+        else:
+            job = self._scheduler.get_job(scheduler_job_id)
 
         if job:
             return {
@@ -270,7 +372,14 @@ class SchedulerEngine:
 
     def get_all_jobs(self) -> list:
         """Get all jobs from scheduler"""
-        jobs = self._scheduler.get_jobs()
+        if self._ring:
+            jobs = [
+                job
+                for shard in range(self._ring.shard_count)
+                for job in self._shard_store_by_index(shard).get_all_jobs()
+            ]
+        else:
+            jobs = self._scheduler.get_jobs()
         return [
             {
                 'id': job.id,
@@ -280,3 +389,107 @@ class SchedulerEngine:
             }
             for job in jobs
         ]
+
+    def get_shard_status(self) -> Optional[dict]:
+        """Get this node's shards and every shard's lease owner, if sharding is enabled"""
+        if not self._leases:
+            return None
+
+        return {
+            'node_id': self._leases.node_id,
+            'owned_shards': sorted(self._leases.owned),
+            'live_nodes': self._leases.live_nodes(),
+            'owners': self._leases.lease_owners()
+        }
+
+    def _lease_loop(self):
+        """Renew and rebalance shard leases until shutdown"""
+        while not self._lease_stop.wait(settings.SCHEDULER_LEASE_RENEW_SECONDS):
+            self._sync_shards()
+
+    def _sync_shards(self):
+        """Rebalance leases and attach job stores for exactly the shards held"""
+        try:
+            self._leases.rebalance()
+        except RedisError as e:
+            # Held leases lapse locally, so this node stops firing shards it may have lost
+            print(f"Error renewing shard leases: {e}")
+
+        owned = self._leases.owned
+        for shard in sorted(owned - self._attached_shards):
+            self._scheduler.add_jobstore(self._create_shard_store(shard), alias=self._shard_alias(shard))
+            self._attached_shards.add(shard)
+        for shard in sorted(self._attached_shards - owned):
+            # The store shares this engine's connection pool, so leave it open
+            self._scheduler.remove_jobstore(self._shard_alias(shard), shutdown=False)
+            self._attached_shards.discard(shard)
+
+        # Pick up jobs other nodes wrote into shards held here
+        self._scheduler.wakeup()
+
+    @staticmethod
+    def _shard_alias(shard: int) -> str:
+        return f"shard-{shard}"
+
+    def _create_shard_store(self, shard: int) -> RedisJobStore:
+        """Create a job store over one shard's Redis keys"""
+        jobs_key, run_times_key = shard_store_keys(shard)
+        return RedisJobStore(
+            jobs_key=jobs_key,
+            run_times_key=run_times_key,
+            connection_pool=self._redis.connection_pool
+        )
+
+    def _shard_store_by_index(self, shard: int) -> RedisJobStore:
+        """Get the store used to read and write a shard's jobs from any node"""
+        store = self._shard_stores.get(shard)
+        if store is None:
+            store = self._create_shard_store(shard)
+            store.start(self._scheduler, self._shard_alias(shard))
+            self._shard_stores[shard] = store
+        return store
+
+    def _shard_store(self, scheduler_job_id: str) -> RedisJobStore:
+        """Get the store for the shard a job hashes to"""
+        return self._shard_store_by_index(self._ring.shard_for(scheduler_job_id))
+
+    def _store_shard_job(self, scheduler_job_id: str, trigger, name: str, args: list, func=execute_job_callback):
+        """Add or replace a job in its shard, whichever node owns the shard"""
+        now = datetime.now(self._scheduler.timezone)
+        job = Job(
+            self._scheduler,
+            id=scheduler_job_id,
+            func=func,
+            trigger=trigger,
+            executor='default',
+            args=args,
+            kwargs={},
+            name=name,
+            next_run_time=trigger.get_next_fire_time(None, now),
+            **self._job_defaults
+        )
+
+        store = self._shard_store(scheduler_job_id)
+        try:
+            store.add_job(job)
+        except ConflictingIdError:
+            store.update_job(job)
+        self._wakeup_owner(scheduler_job_id)
+
+    def _modify_shard_job(self, job: Job, **changes):
+        """Apply changes to a stored job, as BaseScheduler.modify_job does for attached stores"""
+        job._modify(**changes)
+        self._shard_store(job.id).update_job(job)
+        self._wakeup_owner(job.id)
+
+    def _remove_shard_job(self, scheduler_job_id: str):
+        """Remove a job from its shard if present"""
+        try:
+            self._shard_store(scheduler_job_id).remove_job(scheduler_job_id)
+        except JobLookupError:
+            pass
+
+    def _wakeup_owner(self, scheduler_job_id: str):
+        """Reschedule now if this node runs the job's shard; other owners notice on their next lease tick"""
+        if self._scheduler.running and self._ring.shard_for(scheduler_job_id) in self._attached_shards:
+            self._scheduler.wakeup()
@@ -0,0 +1,175 @@
+"""Consistent-hash job sharding and leased shard ownership for scheduler nodes"""
+import bisect
+import hashlib
+import math
+import time
+from typing import Dict, List, Optional, Set, Tuple
+
+from redis import Redis
+
+
+# Lua: extend a lease only if this node still holds it
+_RENEW_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('pexpire', KEYS[1], ARGV[2])
+end
+return 0
+"""
+
+# Lua: drop a lease only if this node still holds it
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+def _hash(value: str) -> int:
+    """Stable 64-bit hash, identical on every node and Python process"""
+    return int.from_bytes(hashlib.blake2b(value.encode(), digest_size=8).digest(), "big")
+
+
+def shard_store_keys(shard: int) -> Tuple[str, str]:
+    """Get the Redis keys of a shard's job store: (jobs hash, run times sorted set)"""
+    return f"apscheduler.shard.{shard}.jobs", f"apscheduler.shard.{shard}.run_times"
+
+
+class HashRing:
+    """
+    Consistent hash ring mapping job ids to shards
+
+    Each shard is placed on the ring at several virtual points, so changing
+    the shard count only moves the jobs between neighbouring points rather
+    than reshuffling every job.
+    """
+
+    def __init__(self, shard_count: int, replicas: int = 64):
+        if shard_count < 1:
+            raise ValueError("shard_count must be at least 1")
+
+        self.shard_count = shard_count
+        points = sorted(
+            (_hash(f"shard-{shard}-{replica}"), shard)
+            for shard in range(shard_count)
+            for replica in range(replicas)
+        )
+        self._keys = [point for point, _ in points]
+        self._shards = [shard for _, shard in points]
+
+    def shard_for(self, job_id: str) -> int:
+        """Get the shard owning a job id"""
+        index = bisect.bisect(self._keys, _hash(job_id)) % len(self._keys)
+        return self._shards[index]
+
+
+class ShardLeaseManager:
+    """
+    Holds Redis leases on scheduler shards for one node
+
+    A lease is a key set with a TTL; the node that created it owns the shard
+    until it stops renewing. Each rebalance() heartbeats the node, renews
+    held leases, gives up shards above this node's fair share and claims
+    free shards up to it, so a dead node's shards are claimed by the
+    survivors within one lease TTL plus one renew interval.
+    """
+
+    def __init__(
+        self,
+        redis: Redis,
+        node_id: str,
+        shard_count: int,
+        lease_ttl: float,
+        key_prefix: str = "scheduler"
+    ):
+        self.redis = redis
+        self.node_id = node_id
+        self.shard_count = shard_count
+        self.lease_ttl = lease_ttl
+        self.key_prefix = key_prefix
+        self._expires: Dict[int, float] = {}
+        self._renew = redis.register_script(_RENEW_SCRIPT)
+        self._release = redis.register_script(_RELEASE_SCRIPT)
+
+    @property
+    def nodes_key(self) -> str:
+        return f"{self.key_prefix}:nodes"
+
+    def lease_key(self, shard: int) -> str:
+        return f"{self.key_prefix}:shard:{shard}:lease"
+
+    @property
+    def owned(self) -> Set[int]:
+        """Shards whose lease this node holds and has not let lapse"""
+        now = time.monotonic()
+        return {shard for shard, expires in self._expires.items() if expires > now}
+
+    def owns(self, shard: int) -> bool:
+        """Check whether this node currently holds a shard"""
+        return self._expires.get(shard, 0) > time.monotonic()
+
+    def live_nodes(self) -> List[str]:
+        """Get nodes that have heartbeated within one lease TTL"""
+        cutoff = time.time() - self.lease_ttl
+        self.redis.zremrangebyscore(self.nodes_key, 0, cutoff)
+        return [node.decode() if isinstance(node, bytes) else node
+                for node in self.redis.zrange(self.nodes_key, 0, -1)]
+
+    def rebalance(self) -> Tuple[Set[int], Set[int]]:
+        """
+        Renew, release and claim leases
+
+        Returns: (shards gained, shards lost)
+        """
+        ttl_ms = int(self.lease_ttl * 1000)
+        # Count a lease as held for slightly less than its TTL, so this node
+        # stops firing its jobs before another node can claim the shard
+        local_ttl = self.lease_ttl * 0.9
+        previously_owned = self.owned
+
+        self.redis.zadd(self.nodes_key, {self.node_id: time.time()})
+        nodes = self.live_nodes()
+
+        renewed_at = time.monotonic()
+        for shard in list(self._expires):
+            if self._renew(keys=[self.lease_key(shard)], args=[self.node_id, ttl_ms]):
+                self._expires[shard] = renewed_at + local_ttl
+            else:
+                del self._expires[shard]
+
+        target = math.ceil(self.shard_count / max(len(nodes), 1))
+
+        # Hand surplus shards back so newly joined nodes can claim them
+        for shard in sorted(self._expires, reverse=True)[:max(len(self._expires) - target, 0)]:
+            self._release(keys=[self.lease_key(shard)], args=[self.node_id])
+            del self._expires[shard]
+
+        if len(self._expires) < target:
+            # Start at a node-specific offset to avoid every node racing for shard 0
+            start = _hash(self.node_id) % self.shard_count
+            for step in range(self.shard_count):
+                if len(self._expires) >= target:
+                    break
+                shard = (start + step) % self.shard_count
+                if shard in self._expires:
+                    continue
+                if self.redis.set(self.lease_key(shard), self.node_id, nx=True, px=ttl_ms):
+                    self._expires[shard] = time.monotonic() + local_ttl
+
+        owned = self.owned
+        return owned - previously_owned, previously_owned - owned
+
+    def release_all(self) -> None:
+        """Give up every lease and leave the node set, for a clean shutdown"""
+        for shard in list(self._expires):
+            self._release(keys=[self.lease_key(shard)], args=[self.node_id])
+        self._expires.clear()
+        self.redis.zrem(self.nodes_key, self.node_id)
+
+    def lease_owners(self) -> Dict[int, Optional[str]]:
+        """Get the current owner of every shard, for monitoring"""
+        owners = self.redis.mget([self.lease_key(shard) for shard in range(self.shard_count)])
+        return {
+            shard: owner.decode() if isinstance(owner, bytes) else owner
+            for shard, owner in enumerate(owners)
+        }
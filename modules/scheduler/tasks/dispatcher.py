@@ -0,0 +1,183 @@
+"""Batched dispatch of due scheduled jobs"""
+from datetime import datetime
+from typing import List, NamedTuple, Optional
+import pytz
+from celery import Task
+from sqlalchemy import DateTime, Integer, cast, column, insert, literal, select, update, values
+from sqlalchemy.orm import Session
+from modules.scheduler.config import settings
+from modules.scheduler.models import ScheduledJob, JobExecution, JobStatus, JobType
+from modules.scheduler.utils.cron_utils import calculate_next_run
+
+
+class DispatchedExecution(NamedTuple):
+    """Execution created for a claimed job, ready to be published"""
+    execution_id: int
+    job_id: int
+    priority: Optional[int]
+
+
+def next_run_after(job, now: datetime) -> Optional[datetime]:
+    """
+    Get the run time following a dispatch at now
+
+    One-time and calendar jobs get no next run, so they are not claimed again.
+    """
+    if job.job_type in (JobType.DATE, JobType.CALENDAR):
+        return None
+
+    tz = pytz.timezone(job.timezone or "UTC")
+    return calculate_next_run(
+        job_type=job.job_type,
+        cron_expression=job.cron_expression,
+        interval_seconds=job.interval_seconds,
+        timezone=job.timezone or "UTC",
+        base_time=now.astimezone(tz)
+    )
+
+
+def advance_due_job(job, now: datetime) -> None:
+    """
+    Advance next_run_at of a job run outside the dispatcher
+
+    Runs started by APScheduler or on demand cover a due next_run_at; left
+    as is, the dispatcher would start the job again on its next tick.
+    """
+    if job.next_run_at is not None and job.next_run_at <= now:
+        job.next_run_at = next_run_after(job, now)
+
+
+def claim_due_jobs(db: Session, now: datetime, limit: int) -> list:
+    """
+    Lock up to limit due jobs for this transaction
+
+    SKIP LOCKED lets concurrent dispatchers claim disjoint batches instead of
+    waiting on each other or dispatching the same job twice.
+    """
+    query = (
+        select(
+            ScheduledJob.id,
+            ScheduledJob.job_type,
+            ScheduledJob.cron_expression,
+            ScheduledJob.interval_seconds,
+            ScheduledJob.timezone,
+            ScheduledJob.priority,
+            ScheduledJob.next_run_at
+        )
+        .where(ScheduledJob.is_active == True, ScheduledJob.next_run_at <= now)
+        .order_by(ScheduledJob.priority.desc(), ScheduledJob.next_run_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True)
+    )
+    return db.execute(query).all()
+
+
+def record_dispatch(db: Session, jobs: list, now: datetime) -> List[DispatchedExecution]:
+    """
+    Advance next_run_at of claimed jobs and create their executions
+
+    Both happen in one statement: the UPDATE runs as a CTE whose returned
+    job ids feed a bulk INSERT into job_executions.
+    """
+    next_runs = values(
+        column("id", Integer),
+        column("next_run_at", DateTime(timezone=True)),
+        name="next_runs"
+    ).data([(job.id, next_run_after(job, now)) for job in jobs])
+
+    advanced = (
+        update(ScheduledJob)
+        .where(ScheduledJob.id == next_runs.c.id)
+        .values(next_run_at=cast(next_runs.c.next_run_at, DateTime(timezone=True)))
+        .returning(ScheduledJob.id)
+        .cte("advanced")
+    )
+
+    statement = (
+        insert(JobExecution)
+        .from_select(
+            ["job_id", "scheduled_at", "status", "attempt_number", "is_retry", "created_at"],
+            select(
+                advanced.c.id,
+                literal(now, DateTime(timezone=True)),
+                literal(JobStatus.PENDING, JobExecution.status.type),
+                literal(1),
+                literal(False),
+                literal(now, DateTime(timezone=True))
+            )
+        )
+        .returning(JobExecution.id, JobExecution.job_id)
+    )
+
+    priorities = {job.id: job.priority for job in jobs}
+    return [
+        DispatchedExecution(execution_id, job_id, priorities[job_id])
+        for execution_id, job_id in db.execute(statement).all()
+    ]
+
+
+def dispatch_due_jobs(
+    db: Session,
+    task: Task,
+    now: Optional[datetime] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Claim, record and queue every due job, a batch per transaction
+
+    Messages are published after the batch commits, so workers always find
+    their execution row. If publishing fails, the unqueued executions are
+    marked failed rather than left pending, and their jobs get their
+    previous next_run_at back so a later tick dispatches them again.
+
+    Returns: number of jobs dispatched
+    """
+    now = now or datetime.now(pytz.utc)
+    batch_size = batch_size or settings.SCHEDULER_DISPATCH_BATCH_SIZE
+    dispatched = 0
+
+    while True:
+        jobs = claim_due_jobs(db, now, batch_size)
+        if not jobs:
+            break
+
+        executions = record_dispatch(db, jobs, now)
+        db.commit()
+
+        # One broker connection for the whole batch
+        published = 0
+        try:
+            with task.app.producer_or_acquire() as producer:
+                for execution in executions:
+                    task.apply_async(
+                        kwargs={
+                            'job_id': execution.job_id,
+                            'execution_id': execution.execution_id
+                        },
+                        priority=execution.priority,
+                        producer=producer
+                    )
+                    published += 1
+        except Exception as e:
+            unpublished = executions[published:]
+            db.execute(
+                update(JobExecution)
+                .where(JobExecution.id.in_([execution.execution_id for execution in unpublished]))
+                .values(status=JobStatus.FAILED, completed_at=now, error_message=f"Dispatch failed: {e}")
+            )
+            previous_runs = {job.id: job.next_run_at for job in jobs}
+            db.execute(
+                update(ScheduledJob),
+                [
+                    {"id": execution.job_id, "next_run_at": previous_runs[execution.job_id]}
+                    for execution in unpublished
+                ]
+            )
+            db.commit()
+            raise
+
+        dispatched += len(executions)
+        if len(jobs) < batch_size:
+            break
+
+    return dispatched
@@ -6,8 +6,7 @@ import traceback
 from modules.scheduler.tasks.celery_app import celery_app
 from modules.scheduler.models import get_sync_db, ScheduledJob, JobExecution, JobStatus
 from modules.scheduler.services.notification_service import NotificationService
-from modules.scheduler.utils.cron_utils import calculate_next_run
-from sqlalchemy import select, and_
+from modules.scheduler.tasks.dispatcher import dispatch_due_jobs
 
 
 class CallbackTask(Task):
@@ -37,32 +36,33 @@ def execute_scheduled_job(
     """Execute a scheduled job"""
     db = next(get_sync_db())
     start_time = datetime.utcnow()
+    execution = job = None
 
+    # Notifications are queued in the same transaction as the status change
+    # they report, and delivered by NotificationSender
     try:
         # Get execution record
         execution = db.query(JobExecution).filter(JobExecution.id == execution_id).first()
         if not execution:
             raise ValueError(f"Execution {execution_id} not found")
 
-        # Update status to running
-        execution.status = JobStatus.RUNNING
-        execution.started_at = start_time
-        execution.task_id = self.request.id
-        execution.worker_name = self.request.hostname
-        db.commit()
-
         # Get job
         job = db.query(ScheduledJob).filter(ScheduledJob.id == job_id).first()
         if not job:
             raise ValueError(f"Job {job_id} not found")
 
-        # Send start notification
-        NotificationService.send_notification(
+        # Update status to running
+        execution.status = JobStatus.RUNNING
+        execution.started_at = start_time
+        execution.task_id = self.request.id
+        execution.worker_name = self.request.hostname
+        NotificationService.enqueue_notifications(
             job=job,
             execution=execution,
             event="start",
             db=db
         )
+        db.commit()
 
         # Execute the actual task
         # This is a placeholder - in production, you'd dynamically import and execute the task
@@ -78,36 +78,24 @@ def execute_scheduled_job(
         execution.completed_at = end_time
         execution.duration_seconds = int((end_time - start_time).total_seconds())
         execution.result = result
-        db.commit()
 
-        # Update job last run time
+        # Update job last run time; next_run_at was advanced when the run started
         job.last_run_at = end_time
         job.status = JobStatus.COMPLETED
-
-        # Calculate next run
-        if job.is_active:
-            next_run = calculate_next_run(
-                job_type=job.job_type,
-                cron_expression=job.cron_expression,
-                interval_seconds=job.interval_seconds,
-                scheduled_time=job.scheduled_time,
-                timezone=job.timezone
-            )
-            job.next_run_at = next_run
-
-        db.commit()
-
-        # Send success notification
-        NotificationService.send_notification(
+        NotificationService.enqueue_notifications(
             job=job,
             execution=execution,
             event="success",
             db=db
         )
+        db.commit()
 
         return result
 
     except Exception as exc:
+        if execution is None or job is None:
+            raise
+
         # Update execution as failed
         end_time = datetime.utcnow()
         execution.status = JobStatus.FAILED
@@ -115,16 +103,13 @@ def execute_scheduled_job(
         execution.duration_seconds = int((end_time - start_time).total_seconds())
         execution.error_message = str(exc)
         execution.traceback = traceback.format_exc()
-        db.commit()
 
         # Update job status
         job.status = JobStatus.FAILED
-        db.commit()
 
         # Check if we should retry
         if execution.attempt_number < job.max_retries:
-            # Send retry notification
-            NotificationService.send_notification(
+            NotificationService.enqueue_notifications(
                 job=job,
                 execution=execution,
                 event="retry",
@@ -159,13 +144,13 @@ def execute_scheduled_job(
                 }
             )
         else:
-            # Send failure notification
-            NotificationService.send_notification(
+            NotificationService.enqueue_notifications(
                 job=job,
                 execution=execution,
                 event="failure",
                 db=db
             )
+            db.commit()
 
         raise
 
@@ -194,41 +179,15 @@ def execute_task_function(task_name: str, args: List[Any], kwargs: Dict[str, Any
 
 @celery_app.task
 def check_scheduled_jobs():
-    """Check for jobs that need to be executed"""
+    """Dispatch jobs that are due"""
     db = next(get_sync_db())
 
     try:
-        now = datetime.utcnow()
-
-        # Find jobs that are due
-        jobs = db.query(ScheduledJob).filter(
-            and_(
-                ScheduledJob.is_active == True,
-                ScheduledJob.next_run_at <= now
-            )
-        ).all()
-
-        for job in jobs:
-            # Create execution record
-            execution = JobExecution(
-                job_id=job.id,
-                scheduled_at=now,
-                attempt_number=1
-            )
-            db.add(execution)
-            db.commit()
-            db.refresh(execution)
-
-            # Queue the task
-            execute_scheduled_job.apply_async(
-                kwargs={
-                    'job_id': job.id,
-                    'execution_id': execution.id
-                },
-                priority=job.priority
-            )
+        dispatched = dispatch_due_jobs(db, execute_scheduled_job)
+        return {'dispatched': dispatched}
 
     except Exception as e:
+        db.rollback()
         print(f"Error checking scheduled jobs: {e}")
         traceback.print_exc()
 
@@ -0,0 +1,263 @@
+"""Tests for batched due-job dispatch"""
+import os
+import re
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+import pytest
+import pytz
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import sessionmaker
+
+from modules.scheduler.models import Base, ScheduledJob, JobExecution, JobStatus, JobType
+from modules.scheduler.tasks.dispatcher import (
+    advance_due_job,
+    claim_due_jobs,
+    dispatch_due_jobs,
+    next_run_after,
+    record_dispatch,
+)
+
+# Dispatch relies on PostgreSQL (FOR UPDATE SKIP LOCKED, UPDATE in a CTE)
+DATABASE_URL = os.environ.get("SCHEDULER_TEST_DATABASE_URL")
+requires_postgres = pytest.mark.skipif(
+    not DATABASE_URL, reason="SCHEDULER_TEST_DATABASE_URL not set"
+)
+
+NOW = datetime(2024, 1, 15, 10, 0, tzinfo=pytz.utc)
+
+
+class FakeTask:
+    """Stands in for the Celery task, recording published messages"""
+
+    def __init__(self, fail_after=None):
+        self.sent = []
+        self.fail_after = fail_after
+        self.app = SimpleNamespace(producer_or_acquire=self._producer)
+
+    @contextmanager
+    def _producer(self):
+        yield "producer"
+
+    def apply_async(self, kwargs, priority, producer):
+        if self.fail_after is not None and len(self.sent) >= self.fail_after:
+            raise ConnectionError("broker unavailable")
+        self.sent.append((kwargs, priority))
+
+
+class CapturingSession:
+    """Stands in for a session, recording executed statements"""
+
+    def __init__(self):
+        self.statements = []
+
+    def execute(self, statement):
+        self.statements.append(statement)
+        return SimpleNamespace(all=lambda: [])
+
+    def sql(self):
+        """Last statement compiled for PostgreSQL"""
+        return str(self.statements[-1].compile(dialect=postgresql.dialect()))
+
+
+@pytest.fixture
+def session_factory():
+    """Fresh scheduler tables in the test database"""
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def add_job(db, name, next_run_at, job_type=JobType.CRON, priority=5, **kwargs):
+    job = ScheduledJob(
+        name=name,
+        job_type=job_type,
+        cron_expression="0 * * * *" if job_type == JobType.CRON else None,
+        task_name="example.hello_world",
+        timezone="UTC",
+        is_active=True,
+        priority=priority,
+        next_run_at=next_run_at,
+        **kwargs
+    )
+    db.add(job)
+    db.commit()
+    return job.id
+
+
+class TestNextRunAfter:
+    """Test next run calculation at dispatch"""
+
+    def test_cron_job_advances_to_next_slot(self):
+        """Test cron jobs move to the next matching time after now"""
+        job = SimpleNamespace(job_type=JobType.CRON, cron_expression="0 * * * *",
+                              interval_seconds=None, timezone="Europe/Berlin")
+
+        assert next_run_after(job, NOW) == NOW + timedelta(hours=1)
+
+    def test_interval_job_advances_by_interval(self):
+        """Test interval jobs move forward by their interval"""
+        job = SimpleNamespace(job_type=JobType.INTERVAL, cron_expression=None,
+                              interval_seconds=90, timezone="UTC")
+
+        assert next_run_after(job, NOW) == NOW + timedelta(seconds=90)
+
+    def test_date_job_has_no_next_run(self):
+        """Test one-time jobs are not scheduled again"""
+        job = SimpleNamespace(job_type=JobType.DATE, cron_expression=None,
+                              interval_seconds=None, timezone="UTC")
+
+        assert next_run_after(job, NOW) is None
+
+
+class TestAdvanceDueJob:
+    """Test runs started outside the dispatcher advance due jobs"""
+
+    def test_due_job_is_advanced(self):
+        """Test a due job moves past the run"""
+        job = SimpleNamespace(job_type=JobType.CRON, cron_expression="0 * * * *", interval_seconds=None,
+                              timezone="UTC", next_run_at=NOW - timedelta(minutes=1))
+
+        advance_due_job(job, NOW)
+
+        assert job.next_run_at == NOW + timedelta(hours=1)
+
+    def test_due_date_job_is_not_run_again(self):
+        """Test a due one-time job gets no next run"""
+        job = SimpleNamespace(job_type=JobType.DATE, cron_expression=None, interval_seconds=None,
+                              timezone="UTC", next_run_at=NOW)
+
+        advance_due_job(job, NOW)
+
+        assert job.next_run_at is None
+
+    def test_future_run_is_kept(self):
+        """Test an on-demand run does not skip a run that is not yet due"""
+        job = SimpleNamespace(job_type=JobType.CRON, cron_expression="0 * * * *", interval_seconds=None,
+                              timezone="UTC", next_run_at=NOW + timedelta(minutes=30))
+
+        advance_due_job(job, NOW)
+
+        assert job.next_run_at == NOW + timedelta(minutes=30)
+
+
+class TestDispatchStatements:
+    """Test the SQL compiled for PostgreSQL, without a database"""
+
+    def test_claim_skips_locked_jobs(self):
+        """Test due jobs are claimed in priority order with SKIP LOCKED"""
+        db = CapturingSession()
+
+        claim_due_jobs(db, NOW, limit=50)
+
+        sql = db.sql()
+        assert "WHERE scheduled_jobs.is_active = true AND scheduled_jobs.next_run_at <=" in sql
+        assert "ORDER BY scheduled_jobs.priority DESC, scheduled_jobs.next_run_at" in sql
+        assert sql.rstrip().endswith("FOR UPDATE SKIP LOCKED")
+
+    def test_record_dispatch_advances_and_inserts_in_one_statement(self):
+        """Test next_run_at is advanced in a CTE feeding the execution insert"""
+        db = CapturingSession()
+        jobs = [
+            SimpleNamespace(id=1, job_type=JobType.CRON, cron_expression="0 * * * *",
+                            interval_seconds=None, timezone="UTC", priority=5),
+            SimpleNamespace(id=2, job_type=JobType.DATE, cron_expression=None,
+                            interval_seconds=None, timezone="UTC", priority=1),
+        ]
+
+        assert record_dispatch(db, jobs, NOW) == []
+
+        assert len(db.statements) == 1
+        statement = db.statements[0].compile(dialect=postgresql.dialect())
+        sql = str(statement)
+        assert sql.startswith("WITH advanced AS \n(UPDATE scheduled_jobs SET ")
+        assert "next_run_at=CAST(next_runs.next_run_at AS TIMESTAMP WITH TIME ZONE)" in sql
+        assert "AS next_runs (id, next_run_at) WHERE scheduled_jobs.id = next_runs.id" in sql
+        assert "RETURNING scheduled_jobs.id)\n INSERT INTO job_executions (job_id, scheduled_at" in sql
+        assert sql.rstrip().endswith("FROM advanced RETURNING job_executions.id, job_executions.job_id")
+
+        next_runs = re.search(r"FROM \(VALUES (.*)\) AS next_runs", sql).group(1)
+        values = [statement.params[name] for name in re.findall(r"%\((\w+)\)s", next_runs)]
+        # The one-time job's row advances to NULL
+        assert values == [1, NOW + timedelta(hours=1), 2]
+        assert next_runs.endswith("::INTEGER, NULL)")
+
+
+@requires_postgres
+class TestDispatchDueJobs:
+    """Test claiming and dispatching due jobs"""
+
+    def test_dispatches_each_due_job_once(self, session_factory):
+        """Test due jobs get one execution each and are advanced"""
+        db = session_factory()
+        due = [add_job(db, f"due {i}", NOW - timedelta(minutes=1), priority=i) for i in range(5)]
+        later = add_job(db, "later", NOW + timedelta(minutes=5))
+        once = add_job(db, "once", NOW, job_type=JobType.DATE, scheduled_time=NOW)
+        task = FakeTask()
+
+        assert dispatch_due_jobs(db, task, now=NOW, batch_size=2) == 6
+        assert dispatch_due_jobs(db, task, now=NOW, batch_size=2) == 0
+
+        sent = {kwargs["job_id"]: priority for kwargs, priority in task.sent}
+        assert sent == {**{job_id: i for i, job_id in enumerate(due)}, once: 5}
+
+        db.expire_all()
+        executions = db.query(JobExecution).all()
+        assert sorted(e.job_id for e in executions) == sorted(due + [once])
+        assert {e.id for e in executions} == {kwargs["execution_id"] for kwargs, _ in task.sent}
+        assert all(e.status == JobStatus.PENDING for e in executions)
+
+        jobs = {job.id: job for job in db.query(ScheduledJob).all()}
+        assert all(jobs[job_id].next_run_at == NOW + timedelta(hours=1) for job_id in due)
+        assert jobs[once].next_run_at is None
+        assert jobs[later].next_run_at == NOW + timedelta(minutes=5)
+        db.close()
+
+    def test_concurrent_dispatchers_claim_disjoint_jobs(self, session_factory):
+        """Test a second dispatcher skips jobs locked by the first"""
+        setup = session_factory()
+        for i in range(4):
+            add_job(setup, f"due {i}", NOW)
+        setup.close()
+
+        first, second = session_factory(), session_factory()
+        claimed = claim_due_jobs(first, NOW, limit=3)
+        task = FakeTask()
+
+        assert dispatch_due_jobs(second, task, now=NOW) == 1
+        assert task.sent[0][0]["job_id"] not in {job.id for job in claimed}
+        first.rollback()
+        first.close()
+        second.close()
+
+    def test_publish_failure_fails_unqueued_executions(self, session_factory):
+        """Test executions whose message was not sent are marked failed and their jobs kept due"""
+        db = session_factory()
+        for i in range(2):
+            add_job(db, f"due {i}", NOW - timedelta(minutes=i), priority=5 - i)
+        once = add_job(db, "once", NOW, job_type=JobType.DATE, scheduled_time=NOW, priority=1)
+        task = FakeTask(fail_after=1)
+
+        with pytest.raises(ConnectionError):
+            dispatch_due_jobs(db, task, now=NOW)
+
+        db.expire_all()
+        statuses = sorted(e.status.value for e in db.query(JobExecution).all())
+        assert statuses == ["failed", "failed", "pending"]
+
+        sent = task.sent[0][0]["job_id"]
+        jobs = {job.id: job for job in db.query(ScheduledJob).all()}
+        assert jobs[sent].next_run_at == NOW + timedelta(hours=1)
+        assert sorted(job.next_run_at for job_id, job in jobs.items() if job_id != sent) == [
+            NOW - timedelta(minutes=1), NOW
+        ]
+        assert jobs[once].next_run_at == NOW
+
+        # The jobs left due are dispatched on the next tick
+        task.fail_after = None
+        assert dispatch_due_jobs(db, task, now=NOW) == 2
+        db.close()
@@ -0,0 +1,227 @@
+"""Tests for the notification outbox and sender"""
+import asyncio
+import os
+import time
+import httpx
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from modules.scheduler.config import settings
+from modules.scheduler.models import (
+    Base, ScheduledJob, JobExecution, JobNotification, NotificationOutbox,
+    JobStatus, NotificationChannel, OutboxStatus
+)
+from modules.scheduler.services.notification_sender import NotificationSender, coalesce
+from modules.scheduler.services.notification_service import NotificationService
+
+# Outbox storage relies on PostgreSQL (FOR UPDATE SKIP LOCKED)
+DATABASE_URL = os.environ.get("SCHEDULER_TEST_DATABASE_URL")
+requires_postgres = pytest.mark.skipif(
+    not DATABASE_URL, reason="SCHEDULER_TEST_DATABASE_URL not set"
+)
+
+
+def entry(id, channel, recipient="ops@example.com", body="event"):
+    return NotificationOutbox(id=id, channel=channel, recipient=recipient, body=body,
+                              subject=f"subject {id}", payload={"id": id}, headers={})
+
+
+class FakeSMTPPool:
+    """Records sent messages, optionally taking a while per message"""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.messages = []
+
+    def send(self, message):
+        time.sleep(self.delay)
+        self.messages.append(message)
+
+    def close(self):
+        pass
+
+
+class TestCoalesce:
+    """Test grouping of outbox entries into deliveries"""
+
+    def test_merges_messages_per_recipient(self, monkeypatch):
+        """Test email and Telegram entries merge per recipient, webhooks do not"""
+        monkeypatch.setattr(settings, "NOTIFICATION_COALESCE_MAX", 2)
+        entries = [
+            entry(1, NotificationChannel.EMAIL),
+            entry(2, NotificationChannel.EMAIL),
+            entry(3, NotificationChannel.EMAIL),
+            entry(4, NotificationChannel.EMAIL, recipient="dev@example.com"),
+            entry(5, NotificationChannel.TELEGRAM, recipient="42"),
+            entry(6, NotificationChannel.WEBHOOK, recipient="https://hooks.example.com"),
+            entry(7, NotificationChannel.WEBHOOK, recipient="https://hooks.example.com"),
+        ]
+
+        groups = [[e.id for e in group] for group in coalesce(entries)]
+
+        assert groups == [[1, 2], [3], [4], [5], [6], [7]]
+
+
+class TestSenderDelivery:
+    """Test delivery concurrency"""
+
+    def test_webhooks_respect_channel_limit(self, monkeypatch):
+        """Test no more webhooks are in flight than the channel allows"""
+        monkeypatch.setattr(settings, "NOTIFICATION_WEBHOOK_CONCURRENCY", 3)
+        in_flight = peak = 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200)
+
+        async def run():
+            sender = NotificationSender(
+                session_factory=None,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                smtp_pool=FakeSMTPPool()
+            )
+            deliveries = [[entry(i, NotificationChannel.WEBHOOK, recipient="https://hooks.example.com")]
+                          for i in range(12)]
+            results = await sender.deliver(deliveries)
+            await sender.stop()
+            return results
+
+        results = asyncio.run(run())
+
+        assert all(error is None for _, error in results)
+        assert peak == 3
+
+    def test_slow_smtp_does_not_delay_webhooks(self, monkeypatch):
+        """Test webhooks complete while email is still being sent"""
+        monkeypatch.setattr(settings, "SMTP_USER", "scheduler@example.com")
+        monkeypatch.setattr(settings, "SMTP_PASSWORD", "secret")
+        finished = {}
+
+        async def handler(request):
+            finished.setdefault("webhook", time.monotonic())
+            return httpx.Response(200)
+
+        async def run():
+            sender = NotificationSender(
+                session_factory=None,
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                smtp_pool=FakeSMTPPool(delay=0.3)
+            )
+            results = await sender.deliver([
+                [entry(1, NotificationChannel.EMAIL)],
+                [entry(2, NotificationChannel.WEBHOOK, recipient="https://hooks.example.com")],
+            ])
+            finished["email"] = time.monotonic()
+            await sender.stop()
+            return sender, results
+
+        sender, results = asyncio.run(run())
+
+        assert all(error is None for _, error in results)
+        assert len(sender.smtp_pool.messages) == 1
+        assert finished["email"] - finished["webhook"] > 0.2
+
+
+@pytest.fixture
+def session_factory():
+    """Fresh scheduler tables in the test database"""
+    engine = create_engine(DATABASE_URL)
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    yield sessionmaker(bind=engine)
+    Base.metadata.drop_all(engine)
+    engine.dispose()
+
+
+def add_job_with_webhook(db):
+    job = ScheduledJob(name="report", task_name="example.hello_world", timezone="UTC")
+    db.add(job)
+    db.flush()
+    db.add(JobNotification(job_id=job.id, channel=NotificationChannel.WEBHOOK,
+                           recipient="https://hooks.example.com", on_start=True, on_failure=True))
+    execution = JobExecution(job_id=job.id, scheduled_at=job.created_at, status=JobStatus.RUNNING)
+    db.add(execution)
+    db.commit()
+    return job, execution
+
+
+@requires_postgres
+class TestOutbox:
+    """Test queueing and draining outbox entries"""
+
+    def test_notifications_commit_with_the_status_change(self, session_factory):
+        """Test queued notifications roll back with the transaction"""
+        db = session_factory()
+        job, execution = add_job_with_webhook(db)
+
+        assert NotificationService.enqueue_notifications(job, execution, "success", db) == 0
+        assert NotificationService.enqueue_notifications(job, execution, "start", db) == 1
+        db.rollback()
+        assert db.query(NotificationOutbox).count() == 0
+
+        NotificationService.enqueue_notifications(job, execution, "start", db)
+        db.commit()
+        queued = db.query(NotificationOutbox).one()
+        assert queued.payload["execution"]["status"] == "running"
+        assert queued.status == OutboxStatus.PENDING
+        db.close()
+
+    def test_bad_template_is_stored_as_failed(self, session_factory):
+        """Test a template that cannot be rendered does not raise into the job's transaction"""
+        db = session_factory()
+        job, execution = add_job_with_webhook(db)
+        db.add(JobNotification(job_id=job.id, channel=NotificationChannel.EMAIL, recipient="ops@example.com",
+                               on_start=True, message_template="{job_name} {unknown}"))
+        db.commit()
+
+        assert NotificationService.enqueue_notifications(job, execution, "start", db) == 1
+        db.commit()
+
+        entries = {e.channel: e for e in db.query(NotificationOutbox).all()}
+        assert entries[NotificationChannel.WEBHOOK].status == OutboxStatus.PENDING
+        assert entries[NotificationChannel.EMAIL].status == OutboxStatus.FAILED
+        assert "unknown" in entries[NotificationChannel.EMAIL].last_error
+        db.close()
+
+    def test_sender_delivers_and_retries(self, session_factory, monkeypatch):
+        """Test delivered entries are marked sent and failed ones retried later"""
+        monkeypatch.setattr(settings, "NOTIFICATION_MAX_ATTEMPTS", 2)
+        db = session_factory()
+        job, execution = add_job_with_webhook(db)
+        NotificationService.enqueue_notifications(job, execution, "start", db)
+        NotificationService.enqueue_notifications(job, execution, "failure", db)
+        db.commit()
+
+        responses = iter([200, 500])
+
+        async def handler(request):
+            return httpx.Response(next(responses))
+
+        async def run():
+            engine = create_async_engine(DATABASE_URL.replace("postgresql://", "postgresql+asyncpg://", 1))
+            sender = NotificationSender(
+                session_factory=async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False),
+                http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+                smtp_pool=FakeSMTPPool()
+            )
+            claimed = await sender.drain_once()
+            again = await sender.drain_once()
+            await sender.stop()
+            await engine.dispose()
+            return claimed, again
+
+        assert asyncio.run(run()) == (2, 0)
+
+        db.expire_all()
+        start, failure = db.query(NotificationOutbox).order_by(NotificationOutbox.id).all()
+        assert start.status == OutboxStatus.SENT and start.sent_at is not None
+        assert failure.status == OutboxStatus.PENDING
+        assert failure.attempts == 1 and "500" in failure.last_error
+        assert failure.next_attempt_at > start.sent_at
+        db.close()
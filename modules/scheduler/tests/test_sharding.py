@@ -0,0 +1,177 @@
+"""Tests for sharded scheduling"""
+import asyncio
+import time
+import pytest
+from collections import Counter
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")  # Lua scripting for fakeredis
+
+from modules.scheduler.config import settings
+from modules.scheduler.models.schemas import ScheduledJob, JobType
+from modules.scheduler.services import scheduler_engine
+from modules.scheduler.services.scheduler_engine import SchedulerEngine
+from modules.scheduler.services.sharding import HashRing, ShardLeaseManager
+
+
+@pytest.fixture
+def server():
+    """Shared fake Redis server"""
+    return fakeredis.FakeServer()
+
+
+def make_manager(server, node_id, shards=8, ttl=10.0):
+    return ShardLeaseManager(fakeredis.FakeRedis(server=server), node_id, shards, ttl)
+
+
+class TestHashRing:
+    """Test consistent hashing of job ids"""
+
+    def test_spreads_jobs_evenly(self):
+        """Test every shard gets a fair share of jobs"""
+        ring = HashRing(16)
+        counts = Counter(ring.shard_for(f"job_{i}") for i in range(20000))
+
+        assert set(counts) == set(range(16))
+        assert max(counts.values()) < 2 * min(counts.values())
+
+    def test_adding_a_shard_moves_few_jobs(self):
+        """Test growing the ring only moves jobs onto the new shard"""
+        before, after = HashRing(16), HashRing(17)
+        moved = [
+            i for i in range(20000)
+            if before.shard_for(f"job_{i}") != after.shard_for(f"job_{i}")
+        ]
+
+        assert len(moved) < 20000 * 0.12
+        assert all(after.shard_for(f"job_{i}") == 16 for i in moved)
+
+
+class TestShardLeases:
+    """Test lease ownership across nodes"""
+
+    def test_shards_rebalance_when_a_node_joins(self, server):
+        """Test the first node takes every shard and hands half to a new node"""
+        a, b = make_manager(server, "a"), make_manager(server, "b")
+
+        gained, lost = a.rebalance()
+        assert gained == set(range(8)) and lost == set()
+
+        assert b.rebalance() == (set(), set())
+        a.rebalance()
+        b.rebalance()
+
+        assert len(a.owned) == len(b.owned) == 4
+        assert a.owned.isdisjoint(b.owned)
+        owners = a.lease_owners()
+        assert all(owners[shard] == "a" for shard in a.owned)
+
+    def test_dead_node_shards_are_taken_over(self, server):
+        """Test a node that stops renewing loses its shards after one TTL"""
+        a, b = make_manager(server, "a", ttl=0.2), make_manager(server, "b", ttl=0.2)
+        a.rebalance()
+        b.rebalance()
+        a.rebalance()
+        b.rebalance()
+        assert len(b.owned) == 4
+
+        time.sleep(0.3)
+        b.rebalance()
+
+        assert b.owned == set(range(8))
+        assert b.live_nodes() == ["b"]
+        assert not a.owned
+
+    def test_stolen_lease_is_not_renewed(self, server):
+        """Test renewal fails once another node holds the lease"""
+        a = make_manager(server, "a", shards=1)
+        a.rebalance()
+        a.redis.set(a.lease_key(0), "b")
+
+        gained, lost = a.rebalance()
+
+        assert lost == {0} and not a.owns(0)
+
+    def test_release_all_frees_shards(self, server):
+        """Test a clean shutdown frees shards for other nodes immediately"""
+        a, b = make_manager(server, "a"), make_manager(server, "b")
+        a.rebalance()
+        a.release_all()
+
+        b.rebalance()
+
+        assert b.owned == set(range(8))
+
+
+@pytest.fixture
+def sharded_engine(server, monkeypatch):
+    """SchedulerEngine in sharded mode over a fake Redis server"""
+    monkeypatch.setattr(settings, "SCHEDULER_SHARDING_ENABLED", True)
+    monkeypatch.setattr(settings, "SCHEDULER_SHARD_COUNT", 4)
+    monkeypatch.setattr(settings, "SCHEDULER_NODE_ID", "node-1")
+    monkeypatch.setattr(scheduler_engine, "Redis", lambda **kwargs: fakeredis.FakeRedis(server=server))
+    monkeypatch.setattr(SchedulerEngine, "_instance", None)
+    monkeypatch.setattr(SchedulerEngine, "_scheduler", None)
+    monkeypatch.setattr(SchedulerEngine, "_ring", None)
+    monkeypatch.setattr(SchedulerEngine, "_leases", None)
+    return SchedulerEngine()
+
+
+def cron_job(job_id):
+    return ScheduledJob(
+        id=job_id,
+        name=f"job {job_id}",
+        job_type=JobType.CRON,
+        cron_expression="*/5 * * * *",
+        timezone="UTC",
+        is_active=True
+    )
+
+
+class TestShardedEngine:
+    """Test SchedulerEngine in sharded mode"""
+
+    def test_jobs_are_stored_in_their_shard(self, sharded_engine):
+        """Test registered jobs land in the shard their id hashes to"""
+        for job_id in range(20):
+            assert asyncio.run(sharded_engine.register_job(cron_job(job_id))) == f"job_{job_id}"
+
+        redis = sharded_engine._redis
+        for job_id in range(20):
+            shard = sharded_engine._ring.shard_for(f"job_{job_id}")
+            assert redis.hexists(f"apscheduler.shard.{shard}.jobs", f"job_{job_id}")
+        assert len(sharded_engine.get_all_jobs()) == 20
+
+    def test_pause_resume_and_remove(self, sharded_engine):
+        """Test job management works without owning the job's shard"""
+        asyncio.run(sharded_engine.register_job(cron_job(7)))
+        assert sharded_engine.get_job_info(7)["next_run_time"] is not None
+
+        asyncio.run(sharded_engine.pause_job(7))
+        assert sharded_engine.get_job_info(7)["next_run_time"] is None
+
+        asyncio.run(sharded_engine.resume_job(cron_job(7)))
+        assert sharded_engine.get_job_info(7)["next_run_time"] is not None
+
+        asyncio.run(sharded_engine.remove_job(7))
+        assert sharded_engine.get_job_info(7) is None
+
+    def test_started_node_runs_owned_shards(self, sharded_engine):
+        """Test a started node attaches its shards and skips jobs of lapsed leases"""
+        async def run():
+            sharded_engine.start()
+            try:
+                status = sharded_engine.get_shard_status()
+                assert status["owned_shards"] == [0, 1, 2, 3]
+                assert set(status["owners"].values()) == {"node-1"}
+                assert all(f"shard-{shard}" in sharded_engine._scheduler._jobstores for shard in range(4))
+
+                # Returns before touching the database once the lease has lapsed
+                sharded_engine._leases._expires[sharded_engine._ring.shard_for("job_3")] = 0
+                assert sharded_engine._execute_job_callback(3) is None
+            finally:
+                sharded_engine.shutdown(wait=False)
+
+        asyncio.run(run())
+
+        assert all(owner is None for owner in sharded_engine._leases.lease_owners().values())